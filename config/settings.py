@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/3.2/ref/settings/
 """
 
 import os
+import sys
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -38,15 +39,19 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'rest_framework',
     'management'
 ]
 
 MIDDLEWARE = [
+    'management.instrumentation.RequestTimingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'management.db_router.ReadYourWritesMiddleware',
+    'management.profiling.ProfilingMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -65,6 +70,7 @@ TEMPLATES = [
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
                 'management.context_processors.company_context',
+                'management.context_processors.report_selector',
             ],
         },
     },
@@ -162,3 +168,159 @@ LOGIN_REDIRECT_URL = 'borrower_portfolio'
 # https://docs.djangoproject.com/en/3.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+
+# Postgres declarative partitioning for the largest sheet tables.
+# Applied with `python manage.py partition_rows convert`, an offline step that
+# locks each table for its whole copy (schedule downtime); models are unchanged.
+# "hash" spreads rows over N partitions by borrower_id, "range" creates one
+# partition per month of `column` (rows with a NULL date land in the default
+# partition).
+ROW_TABLE_PARTITIONING = {
+    "aging_composition": {"strategy": "hash", "column": "borrower_id", "partitions": 16},
+    "ar_metrics": {"strategy": "range", "column": "as_of_date"},
+    "historical_top_20_sk_us": {"strategy": "hash", "column": "borrower_id", "partitions": 16},
+    "collateral_overview": {"strategy": "hash", "column": "borrower_id", "partitions": 16},
+}
+
+
+# Per-request timing (Server-Timing header + one JSON log line per request)
+# and SQL query budgets per URL name. Over-budget requests log a warning, and
+# fail outright when running the test suite.
+TESTING = len(sys.argv) > 1 and sys.argv[1] == "test"
+QUERY_BUDGET_RAISE = TESTING
+DEFAULT_VIEW_QUERY_BUDGET = None
+VIEW_QUERY_BUDGETS = {
+    "borrower_portfolio": 20,
+    "watchlist": 10,
+    "dashboard": 30,
+    "collateral_dynamic": 80,
+    "collateral_static": 40,
+    "forecast": 20,
+    "risk": 20,
+    "limits": 20,
+}
+
+# Statements slower than SLOW_QUERY_THRESHOLD_MS during a request are stored
+# as SlowQuery rows (None disables capture); this share of the plain SELECTs
+# is queued for EXPLAIN (ANALYZE, BUFFERS), which `manage.py run_workers`
+# fills in. Ranked on /diagnostics/slow-queries/.
+SLOW_QUERY_THRESHOLD_MS = int(os.environ.get("SLOW_QUERY_THRESHOLD_MS", "200"))
+SLOW_QUERY_EXPLAIN_SAMPLE_RATE = 0.1
+
+# cProfile output (collapsed stacks + summaries) from `manage.py profile_view`
+# and the staff-only ?__profile=1 flag.
+PROFILE_OUTPUT_ROOT = BASE_DIR / "uploads" / "profiles"
+
+# Metrics registry (see management/metrics.py). Each process writes its
+# counters to METRICS_DIR so /metrics/ aggregates every gunicorn worker and
+# management command (exited processes are folded into archive.json there);
+# None keeps them in memory only.
+METRICS_DIR = None if TESTING else os.environ.get("METRICS_DIR", str(BASE_DIR / "uploads" / "metrics"))
+METRICS_FLUSH_INTERVAL = 5
+# Prometheus scrapes /metrics/ with this secret, sent as a bearer token or as
+# the basic-auth password (any username); unset, only staff sessions can
+# read it.
+METRICS_SCRAPE_TOKEN = os.environ.get("METRICS_SCRAPE_TOKEN") or None
+
+# Dashboard builders are cached per report (management/report_cache.py).
+# Reports do not change once imported, so entries never expire; the file
+# cache is shared by every worker. The report selector lists this many of a
+# borrower's most recent reports.
+CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "reports": (
+        {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "reports", "TIMEOUT": None}
+        if TESTING
+        else {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": os.environ.get("REPORT_CACHE_DIR", str(BASE_DIR / "uploads" / "report_cache")),
+            "TIMEOUT": None,
+            "OPTIONS": {"MAX_ENTRIES": 20000},
+        }
+    ),
+}
+REPORT_CACHE_ALIAS = "reports"
+REPORT_SELECTOR_LIMIT = 24
+
+# Background jobs (management/jobs.py, run by `manage.py run_workers`).
+# Failed attempts are retried after JOB_RETRY_BACKOFF_SECONDS, doubling each
+# time; a running job whose progress has not moved for JOB_STALE_SECONDS is
+# assumed to have lost its worker and is queued again. Export jobs write
+# their files under JOB_EXPORT_ROOT.
+JOB_MAX_ATTEMPTS = 3
+JOB_RETRY_BACKOFF_SECONDS = 30
+JOB_STALE_SECONDS = 15 * 60
+JOB_EXPORT_ROOT = BASE_DIR / "uploads" / "exports"
+
+# Chunked workbook uploads (management/uploads.py). Chunks are appended to a
+# file under UPLOAD_ROOT as they arrive; clients send at most
+# UPLOAD_CHUNK_BYTES per request and resume from the offset the server has.
+UPLOAD_ROOT = BASE_DIR / "uploads" / "incoming"
+UPLOAD_CHUNK_BYTES = 8 * 1024 * 1024
+UPLOAD_MAX_BYTES = 500 * 1024 * 1024
+
+# Read replica (management/db_router.py). Views marked @read_replica read
+# from the aliases in DATABASE_REPLICAS; writes, the admin and reads inside
+# a transaction use the primary. Set DATABASE_REPLICA_HOST to a streaming
+# replica of the primary to turn it on. A user who has just written stays on
+# the primary for READ_YOUR_WRITES_SECONDS so replica lag never hides their
+# change. Tests get a separate, empty database for the alias and opt in with
+# override_settings(DATABASE_REPLICAS=["replica"]).
+DATABASES["replica"] = {
+    **DATABASES["default"],
+    "HOST": os.environ.get("DATABASE_REPLICA_HOST", DATABASES["default"]["HOST"]),
+    "TEST": {"NAME": "test_" + DATABASES["default"]["NAME"] + "_replica"},
+}
+DATABASE_ROUTERS = ["management.db_router.PrimaryReplicaRouter"]
+DATABASE_REPLICAS = ["replica"] if os.environ.get("DATABASE_REPLICA_HOST") and not TESTING else []
+READ_YOUR_WRITES_SECONDS = 30
+
+# Dashboard loads (management/concurrency.py). With DASHBOARD_LOAD_WORKERS
+# of 2 or more, the dashboards run their independent queries on one thread
+# pool of that size per web process, shared by all of its requests. Each
+# pool thread holds its own database connection, so budget processes x
+# (request threads + workers) against the server's connection limit. Pool
+# threads close their connection after every load unless CONN_MAX_AGE is
+# set, and on SQLite gathering measured slower than loading serially
+# (`manage.py benchmark_dashboard_loads`). The default of 0 loads
+# everything on the request thread; only raise it after benchmarking on
+# PostgreSQL with CONN_MAX_AGE set.
+DASHBOARD_LOAD_WORKERS = int(os.environ.get("DASHBOARD_LOAD_WORKERS", "0"))
+
+# Read-only data API under /api/v1/ (management/views/api.py). Clients sign
+# in with a session or HTTP basic auth; row listings are cursor-paginated,
+# API_PAGE_SIZE rows a page unless ?page_size= asks for up to
+# API_MAX_PAGE_SIZE.
+REST_FRAMEWORK = {
+    "DEFAULT_AUTHENTICATION_CLASSES": [
+        "rest_framework.authentication.SessionAuthentication",
+        "rest_framework.authentication.BasicAuthentication",
+    ],
+    "DEFAULT_PERMISSION_CLASSES": ["rest_framework.permissions.IsAuthenticated"],
+    "DEFAULT_RENDERER_CLASSES": ["rest_framework.renderers.JSONRenderer"],
+    "DEFAULT_VERSIONING_CLASS": "rest_framework.versioning.URLPathVersioning",
+    "ALLOWED_VERSIONS": ["v1"],
+}
+API_PAGE_SIZE = 500
+API_MAX_PAGE_SIZE = 5000
+
+# Streaming sheet exports (management/exports.py): rows are fetched and
+# written EXPORT_CHUNK_SIZE at a time.
+EXPORT_CHUNK_SIZE = 2000
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "management": {"handlers": ["console"], "level": "WARNING"},
+        "management.timing": {
+            "handlers": ["console"],
+            "level": "WARNING" if TESTING else "INFO",
+            "propagate": False,
+        },
+    },
+}
@@ -25,6 +25,9 @@ urlpatterns = [
     path('', RedirectView.as_view(pattern_name='login', permanent=False)),
     path('login/', management_views.login_view, name='login'),
     path('portfolio/', management_views.borrower_portfolio_view, name='borrower_portfolio'),
+    path('portfolio/watchlist/', management_views.watchlist_view, name='watchlist'),
+    path('portfolio/scenarios/', management_views.scenarios_view, name='scenarios'),
+    path('portfolio/alerts/', management_views.alerts_view, name='alerts'),
     path('dashboard/', management_views.summary_view, name='dashboard'),
     path('collateral-dynamic/', management_views.collateral_dynamic_view, name='collateral_dynamic'),
     path('collateral-dynamic/static/', management_views.collateral_static_view, name='collateral_static'),
@@ -41,7 +44,28 @@ urlpatterns = [
         management_views.reports_generate_bbc,
         name='reports_generate_bbc',
     ),
+    path('jobs/', management_views.job_submit, name='job_submit'),
+    path('jobs/<int:job_id>/', management_views.job_status, name='job_status'),
+    path('jobs/<int:job_id>/download/', management_views.job_download, name='job_download'),
+    path('uploads/', management_views.upload_create, name='upload_create'),
+    path('uploads/<int:upload_id>/', management_views.upload_detail, name='upload_detail'),
+    path('api/<str:version>/borrowers/', management_views.api_borrowers, name='api_borrowers'),
+    path('api/<str:version>/borrowers/<int:borrower_id>/', management_views.api_borrower, name='api_borrower'),
+    path(
+        'api/<str:version>/borrowers/<int:borrower_id>/reports/',
+        management_views.api_reports,
+        name='api_reports',
+    ),
+    path('api/<str:version>/sheets/', management_views.api_sheets, name='api_sheets'),
+    path(
+        'api/<str:version>/borrowers/<int:borrower_id>/sheets/<slug:sheet>/',
+        management_views.api_sheet_rows,
+        name='api_sheet_rows',
+    ),
+    path('exports/<slug:sheet>/', management_views.export_rows_view, name='export_rows'),
     path('limits/', management_views.limits_view, name='limits'),
+    path('metrics/', management_views.metrics_view, name='metrics'),
+    path('diagnostics/slow-queries/', management_views.slow_queries_view, name='slow_queries'),
     path('logout/', management_views.logout_view, name='logout'),
     path('admin/workspace/<slug:component_slug>/', management_views.admin_component_view, name='admin_component'),
     path('admin/dashboard/', management_views.admin_dashboard_view, name='admin_dashboard'),
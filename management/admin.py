@@ -1,6 +1,7 @@
 from django.contrib import admin
 
 from management import models
+from management.risk_scorecard import refresh_scorecard_for_row
 
 
 @admin.register(models.Company)
@@ -28,8 +29,20 @@ class BaseBorrowerModelAdmin(admin.ModelAdmin):
     search_fields = ("borrower__primary_contact", "borrower__company__company")
 
 
+class RiskScorecardRefreshMixin:
+    """Keeps `BorrowerRiskScorecard` in step with edits to its input rows."""
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        refresh_scorecard_for_row(obj)
+
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        refresh_scorecard_for_row(obj)
+
+
 @admin.register(models.ARMetricsRow)
-class ARMetricsRowAdmin(BaseBorrowerModelAdmin):
+class ARMetricsRowAdmin(RiskScorecardRefreshMixin, BaseBorrowerModelAdmin):
     list_display = (
         "borrower",
         "division",
@@ -119,3 +132,33 @@ class FGGrossRecoveryHistoryRowAdmin(BaseBorrowerModelAdmin):
     list_display = ("borrower", "division", "as_of_date", "category", "gross_recovery")
     list_filter = ("division",)
     date_hierarchy = "as_of_date"
+
+
+@admin.register(models.AlertRule)
+class AlertRuleAdmin(admin.ModelAdmin):
+    list_display = ("name", "metric", "comparison", "threshold", "severity", "company", "is_active")
+    list_filter = ("metric", "severity", "is_active")
+    search_fields = ("name",)
+
+
+@admin.register(models.Alert)
+class AlertAdmin(BaseBorrowerModelAdmin):
+    list_display = ("borrower", "rule", "severity", "message", "report", "is_read", "created_at")
+    list_filter = ("severity", "is_read", "rule")
+    date_hierarchy = "created_at"
+
+
+@admin.register(models.Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ("id", "kind", "status", "progress", "attempts", "worker", "created_by", "created_at", "finished_at")
+    list_filter = ("kind", "status")
+    search_fields = ("message", "error")
+    date_hierarchy = "created_at"
+
+
+@admin.register(models.Upload)
+class UploadAdmin(admin.ModelAdmin):
+    list_display = ("id", "filename", "status", "received", "size", "job", "created_by", "created_at")
+    list_filter = ("status",)
+    search_fields = ("filename",)
+    date_hierarchy = "created_at"
@@ -0,0 +1,204 @@
+"""
+Covenant and threshold alerts.
+
+Rules live in the AlertRule table. Each rule compiles to one statement over
+the whole borrower book: the rule's metric is a correlated subquery on the
+rows of each borrower's latest report (the report the alert is recorded
+against, read through the (borrower, report) indexes the watchlist uses),
+the threshold becomes a filter and borrowers already alerted for the same
+rule and report are excluded. A new report without the sheet a rule reads
+raises nothing for it. Matches are written as
+Alert rows in one bulk insert per rule, so a rerun for an unchanged report
+raises nothing new.
+"""
+from decimal import Decimal
+
+from django.db.models import Case, DecimalField, Exists, F, IntegerField, Max, OuterRef, Subquery, Value, When, Window
+from django.db.models.functions import Lag
+
+from management.models import (
+    Alert,
+    AlertRule,
+    ARMetricsRow,
+    Borrower,
+    BorrowerReport,
+    CompositeIndexRow,
+    ConcentrationADODSORow,
+    ForecastRow,
+)
+
+VALUE_FIELD = DecimalField(max_digits=20, decimal_places=6)
+VALUE_PLACES = Decimal("0.000001")
+
+
+def _fraction(field):
+    # Sheets mix fractions (0.12) and whole percentages (12); see _normalize_pct.
+    return Case(
+        When(**{f"{field}__gt": 1}, then=F(field) * Value(Decimal("0.01"), output_field=VALUE_FIELD)),
+        default=F(field),
+        output_field=VALUE_FIELD,
+    )
+
+
+def _latest_report():
+    return BorrowerReport.objects.filter(borrower=OuterRef("pk")).order_by("-report_date", "-created_at", "-id")
+
+
+def _report_rows(model_cls):
+    return model_cls.objects.filter(borrower=OuterRef("pk"), report_id=OuterRef("alert_report_id"))
+
+
+def _current_forecast():
+    """
+    The forecast row the cash forecast page opens on: of the latest as-of
+    date, the first "Actual" row, else the earliest period.
+    """
+    return (
+        _report_rows(ForecastRow)
+        .annotate(
+            is_forecast=Case(
+                When(actual_forecast__icontains="actual", then=Value(0)),
+                default=Value(1),
+                output_field=IntegerField(),
+            )
+        )
+        .order_by(F("as_of_date").desc(nulls_last=True), "is_forecast", F("period").asc(nulls_first=True), "id")
+    )
+
+
+def _ar_history():
+    return (
+        _report_rows(ARMetricsRow)
+        .filter(pct_past_due__isnull=False)
+        .annotate(
+            past_due=_fraction("pct_past_due"),
+            prior_past_due=Window(
+                Lag(_fraction("pct_past_due")),
+                partition_by=[F("borrower"), F("division")],
+                order_by=[F("as_of_date").asc(), F("id").asc()],
+            ),
+        )
+        .order_by("-as_of_date", "-id")
+    )
+
+
+def _composite_history():
+    return (
+        _report_rows(CompositeIndexRow)
+        .filter(overall_score__isnull=False)
+        .annotate(
+            prior_score=Window(
+                Lag("overall_score"),
+                partition_by=[F("borrower")],
+                order_by=[F("date").asc(), F("id").asc()],
+            )
+        )
+        .order_by("-date", "-id")
+    )
+
+
+def _excess_availability():
+    current = _current_forecast().annotate(excess=F("available_collateral") - F("loan_balance"))
+    return current.values("excess")[:1]
+
+
+def _pct_past_due():
+    return _ar_history().values("past_due")[:1]
+
+
+def _pct_past_due_change():
+    return _ar_history().annotate(change=F("past_due") - F("prior_past_due")).values("change")[:1]
+
+
+def _max_concentration_pct():
+    return (
+        _report_rows(ConcentrationADODSORow)
+        .order_by()
+        .values("borrower")
+        .annotate(top=Max(_fraction("current_concentration_pct")))
+        .values("top")
+    )
+
+
+def _overall_score():
+    return _composite_history().values("overall_score")[:1]
+
+
+def _overall_score_change():
+    return _composite_history().annotate(change=F("overall_score") - F("prior_score")).values("change")[:1]
+
+
+# metric -> (kind, subquery yielding one value per borrower)
+METRICS = {
+    "excess_availability": ("money", _excess_availability),
+    "pct_past_due": ("pct", _pct_past_due),
+    "pct_past_due_change": ("pct", _pct_past_due_change),
+    "max_concentration_pct": ("pct", _max_concentration_pct),
+    "overall_score": ("score", _overall_score),
+    "overall_score_change": ("score", _overall_score_change),
+}
+
+
+def _display(kind, value):
+    if kind == "money":
+        return f"-${abs(value):,.0f}" if value < 0 else f"${value:,.0f}"
+    if kind == "pct":
+        return f"{value * 100:.1f}%"
+    return f"{value:.2f}"
+
+
+def _message(rule, value):
+    kind, _expression = METRICS[rule.metric]
+    return (
+        f"{rule.get_metric_display()} {_display(kind, value)} is "
+        f"{rule.get_comparison_display()} {_display(kind, rule.threshold)}"
+    )
+
+
+def rule_matches(rule, borrowers=None):
+    """Borrowers tripping `rule` on their latest report and not yet alerted for it."""
+    if rule.metric not in METRICS:
+        raise ValueError(f"Unknown alert metric {rule.metric!r}")
+    _kind, expression = METRICS[rule.metric]
+    qs = borrowers if borrowers is not None else Borrower.objects.all()
+    if rule.company_id:
+        qs = qs.filter(company_id=rule.company_id)
+    already_alerted = Alert.objects.filter(rule=rule, borrower=OuterRef("pk"), report=OuterRef("alert_report_id"))
+    return (
+        qs.order_by()
+        .annotate(alert_report_id=Subquery(_latest_report().values("id")[:1]))
+        .filter(alert_report_id__isnull=False)
+        .annotate(alert_value=Subquery(expression(), output_field=VALUE_FIELD))
+        .filter(**{"alert_value__isnull": False, f"alert_value__{rule.comparison}": rule.threshold})
+        .exclude(Exists(already_alerted))
+        .values_list("pk", "alert_report_id", "alert_value")
+    )
+
+
+def evaluate_rules(borrowers=None, rules=None):
+    """
+    Evaluate `rules` (default: every active AlertRule) for `borrowers`
+    (default: all) and write an Alert per new match. Returns {rule: alerts
+    created}.
+    """
+    rules = rules if rules is not None else AlertRule.objects.filter(is_active=True).order_by("id")
+    created = {}
+    for rule in rules:
+        alerts = []
+        for borrower_id, report_id, value in rule_matches(rule, borrowers):
+            value = Decimal(str(value)).quantize(VALUE_PLACES)
+            alerts.append(
+                Alert(
+                    rule=rule,
+                    borrower_id=borrower_id,
+                    report_id=report_id,
+                    severity=rule.severity,
+                    value=value,
+                    threshold=rule.threshold,
+                    message=_message(rule, value),
+                )
+            )
+        # A concurrent run may have raised the same alert since the read.
+        Alert.objects.bulk_create(alerts, ignore_conflicts=True)
+        created[rule] = len(alerts)
+    return created
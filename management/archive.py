@@ -0,0 +1,217 @@
+import os
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+import pandas as pd
+from django.conf import settings
+from django.db import transaction
+
+from management.models import BorrowerReport
+
+try:  # Parquet needs pyarrow; fall back to gzipped CSV without it.
+    import pyarrow  # noqa: F401
+
+    ARCHIVE_FORMAT = "parquet"
+except ImportError:
+    ARCHIVE_FORMAT = "csv.gz"
+
+ARCHIVE_ROOT = Path(getattr(settings, "REPORT_ARCHIVE_ROOT", Path(settings.BASE_DIR) / "uploads" / "archive"))
+DEFAULT_BATCH_SIZE = 2000
+
+
+def row_models():
+    from management.management.commands.import_cora_xlsx import SHEET_MODEL_MAP
+
+    return list(dict.fromkeys(SHEET_MODEL_MAP.values()))
+
+
+def _ordered_reports(borrower_id):
+    return list(
+        BorrowerReport.objects.filter(borrower_id=borrower_id).order_by("created_at", "id")
+    )
+
+
+def reports_to_archive(borrower_id, keep=6, keep_month_ends=True):
+    """
+    Reports of a borrower that fall outside the hot window: everything except
+    the `keep` most recent reports and, optionally, the last report of each
+    calendar month.
+    """
+    reports = _ordered_reports(borrower_id)
+    by_recency = sorted(reports, key=lambda r: (r.report_date or r.created_at.date(), r.created_at), reverse=True)
+    kept = {report.pk for report in by_recency[:keep]}
+    if keep_month_ends:
+        month_ends = {}
+        for report in by_recency:
+            day = report.report_date or report.created_at.date()
+            month_ends.setdefault((day.year, day.month), report.pk)
+        kept.update(month_ends.values())
+    return [report for report in reports if report.pk not in kept]
+
+
+def report_rows(model_cls, report, next_report=None):
+    """
+    Rows written by the import that created `report`. Models with a report FK
+    are matched on it; the rest are matched by borrower and by falling
+    between this report's creation and the next one's.
+    """
+    field_names = {field.name for field in model_cls._meta.fields}
+    if "report" in field_names:
+        return model_cls.objects.filter(report=report)
+    if "borrower" not in field_names:
+        return model_cls.objects.none()
+    qs = model_cls.objects.filter(borrower_id=report.borrower_id, created_at__gte=report.created_at)
+    if next_report is not None:
+        qs = qs.filter(created_at__lt=next_report.created_at)
+    return qs
+
+
+def archive_dir(borrower_id, report_id):
+    return ARCHIVE_ROOT / f"borrower_{borrower_id}" / f"report_{report_id}"
+
+
+def _part_path(directory, model_cls, fmt):
+    # Every run writes a new part: a rerun after a crash mid-delete must not
+    # replace the part holding rows that are already gone from the table.
+    return directory / f"{model_cls._meta.db_table}.{time.time_ns()}.{fmt}"
+
+
+def _archive_parts(directory, model_cls):
+    """Every archived part of one sheet, oldest first (including the pre-part `<table>.<fmt>` name)."""
+    table = model_cls._meta.db_table
+    return sorted(
+        path
+        for path in directory.glob(f"{table}.*")
+        if path.name.endswith((".parquet", ".csv.gz"))
+    )
+
+
+def _write_frame(df, path):
+    tmp_path = path.with_name(path.name + ".tmp")
+    if path.suffix == ".parquet":
+        df.to_parquet(tmp_path, index=False)
+    else:
+        df.to_csv(tmp_path, index=False, compression="gzip")
+    os.replace(tmp_path, path)
+
+
+def _read_frame(path):
+    if path.name.endswith(".parquet"):
+        return pd.read_parquet(path)
+    return pd.read_csv(path, compression="gzip", dtype=str, keep_default_na=False)
+
+
+def _delete_in_batches(model_cls, ids, batch_size):
+    for start in range(0, len(ids), batch_size):
+        with transaction.atomic():
+            model_cls.objects.filter(pk__in=ids[start:start + batch_size]).delete()
+
+
+def archive_report(report, next_report=None, batch_size=DEFAULT_BATCH_SIZE, dry_run=False):
+    """
+    Write every sheet of `report` to a new part file in its archive
+    directory, then delete the archived rows in short per-batch
+    transactions. A run that dies partway through the deletes is safe to
+    repeat: the rerun archives the surviving rows to another part, and
+    restore_report reads every part. Returns {db_table: rows}.
+    """
+    directory = archive_dir(report.borrower_id, report.pk)
+    counts = {}
+    for model_cls in row_models():
+        qs = report_rows(model_cls, report, next_report).order_by("pk")
+        columns = [field.attname for field in model_cls._meta.concrete_fields]
+        records = list(qs.values_list(*columns).iterator(chunk_size=batch_size))
+        if not records:
+            continue
+        counts[model_cls._meta.db_table] = len(records)
+        if dry_run:
+            continue
+        directory.mkdir(parents=True, exist_ok=True)
+        frame = pd.DataFrame.from_records(records, columns=columns)
+        _write_frame(frame, _part_path(directory, model_cls, ARCHIVE_FORMAT))
+        pk_index = columns.index(model_cls._meta.pk.attname)
+        _delete_in_batches(model_cls, [record[pk_index] for record in records], batch_size)
+    return counts
+
+
+def _clean_value(field, value):
+    if value is None or value == "":
+        return None
+    try:
+        if pd.isna(value):
+            return None
+    except (TypeError, ValueError):
+        pass
+    if hasattr(value, "item"):
+        value = value.item()
+    return field.to_python(value)
+
+
+@contextmanager
+def preserve_timestamps(model_cls):
+    """Keep archived created_at/updated_at instead of stamping the restore time."""
+    fields = [
+        field
+        for field in model_cls._meta.concrete_fields
+        if getattr(field, "auto_now", False) or getattr(field, "auto_now_add", False)
+    ]
+    saved = [(field, field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+def restore_report(borrower_id, report_id, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Load an archived report back into the hot tables and drop its files.
+    Rows archived more than once (a rerun after an interrupted archive) are
+    restored once.
+    """
+    directory = archive_dir(borrower_id, report_id)
+    counts = {}
+    if not directory.exists():
+        return counts
+    for model_cls in row_models():
+        fields = {field.attname: field for field in model_cls._meta.concrete_fields}
+        pk_name = model_cls._meta.pk.attname
+        seen = set()
+        for path in _archive_parts(directory, model_cls):
+            frame = _read_frame(path)
+            objs = []
+            for record in frame.to_dict("records"):
+                data = {
+                    name: _clean_value(fields[name], value)
+                    for name, value in record.items()
+                    if name in fields
+                }
+                if data.get(pk_name) in seen:
+                    continue
+                seen.add(data.get(pk_name))
+                objs.append(model_cls(**data))
+            with preserve_timestamps(model_cls):
+                for start in range(0, len(objs), batch_size):
+                    with transaction.atomic():
+                        model_cls.objects.bulk_create(objs[start:start + batch_size], ignore_conflicts=True)
+            counts[model_cls._meta.db_table] = counts.get(model_cls._meta.db_table, 0) + len(objs)
+            path.unlink()
+    try:
+        directory.rmdir()
+    except OSError:
+        pass
+    return counts
+
+
+def archived_report_ids(borrower_id):
+    root = ARCHIVE_ROOT / f"borrower_{borrower_id}"
+    if not root.exists():
+        return []
+    return sorted(
+        int(path.name.split("_", 1)[1])
+        for path in root.iterdir()
+        if path.is_dir() and path.name.startswith("report_") and any(path.iterdir())
+    )
@@ -0,0 +1,461 @@
+import asyncio
+import datetime
+import json
+import math
+import statistics
+import time
+import tracemalloc
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.handlers.asgi import ASGIHandler
+from django.db import connection
+from django.db.models import Max
+from django.db.models.signals import post_init
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from management.models import Borrower
+
+# (name, url name, query params) for each page driven by the benchmark.
+BENCHMARK_VIEWS = [
+    ("borrower_portfolio", "borrower_portfolio", {}),
+    ("summary", "dashboard", {}),
+    ("collateral_dynamic_ar", "collateral_dynamic", {"section": "accounts_receivable"}),
+    ("collateral_dynamic_fg", "collateral_dynamic", {"section": "inventory", "inventory_tab": "finished_goods"}),
+    ("collateral_static", "collateral_static", {}),
+    ("risk", "risk", {}),
+    ("forecast", "forecast", {}),
+    ("limits", "limits", {}),
+    ("watchlist", "watchlist", {}),
+]
+# Pages measured once over the whole lender book (every borrower, no company
+# selected) rather than per sampled borrower.
+BOOK_VIEWS = [
+    ("watchlist_book", "watchlist", {}),
+]
+# Median wall time each view must stay under with the book seeded at scale,
+# e.g. `manage.py seed_synthetic --borrowers 10000 --reports 2 --rows-per-sheet 2`.
+WALL_BUDGETS_MS = {
+    "watchlist_book": 200,
+}
+METRICS = ("wall_ms", "queries", "rows", "peak_kb")
+BENCHMARK_USERNAME = "benchmark"
+
+
+class _RowCounter:
+    """Counts model instances built while active, as a proxy for rows fetched."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, sender, **kwargs):
+        self.count += 1
+
+    def __enter__(self):
+        post_init.connect(self, weak=False)
+        return self
+
+    def __exit__(self, *exc_info):
+        post_init.disconnect(self)
+
+
+def _benchmark_client(username=BENCHMARK_USERNAME):
+    user, created = get_user_model().objects.get_or_create(
+        username=username,
+        defaults={"is_staff": True},
+    )
+    if created:
+        user.set_unusable_password()
+        user.save(update_fields=["password"])
+    client = Client()
+    client.force_login(user)
+    return client
+
+
+def _select_borrower(client, borrower):
+    session = client.session
+    session["selected_borrower_id"] = borrower.pk
+    session["company_id"] = borrower.company_id
+    session.save()
+
+
+def _select_book(client):
+    session = client.session
+    session.pop("selected_borrower_id", None)
+    session.pop("company_id", None)
+    session.save()
+
+
+def measure(client, url, params):
+    with CaptureQueriesContext(connection) as queries, _RowCounter() as rows:
+        started = time.perf_counter()
+        response = client.get(url, params)
+        elapsed = time.perf_counter() - started
+    if response.status_code != 200:
+        raise RuntimeError(f"{url} returned {response.status_code}")
+    return {"wall_ms": elapsed * 1000, "queries": len(queries), "rows": rows.count}
+
+
+def measure_peak_memory(client, url, params):
+    # Traced separately: tracemalloc slows the request down too much to time it.
+    tracemalloc.start()
+    try:
+        client.get(url, params)
+        _current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 1024
+
+
+def run_view_benchmarks(borrowers=3, repeat=3, views=None, log=None):
+    """
+    Drive each benchmark view for the first `borrowers` borrowers, `repeat`
+    times each, and return the median of every metric per view.
+    """
+    log = log or (lambda message: None)
+    client = _benchmark_client()
+    sample = list(Borrower.objects.order_by("id")[:borrowers])
+    results = {}
+
+    def record(name, url, params, borrowers):
+        samples = []
+        for borrower in borrowers:
+            if borrower is None:
+                _select_book(client)
+            else:
+                _select_borrower(client, borrower)
+            measure(client, url, params)  # warm-up: session, template and scorecard caches
+            for _ in range(repeat):
+                samples.append(measure(client, url, params))
+            samples[-1]["peak_kb"] = measure_peak_memory(client, url, params)
+        if not samples:
+            return
+        results[name] = {
+            metric: round(statistics.median(sample[metric] for sample in samples if metric in sample), 2)
+            for metric in METRICS
+        }
+        log(f"{name}: " + ", ".join(f"{metric}={results[name][metric]}" for metric in METRICS))
+
+    for name, url_name, params in BENCHMARK_VIEWS:
+        if not views or name in views:
+            record(name, reverse(url_name), params, sample)
+    for name, url_name, params in BOOK_VIEWS:
+        if (not views or name in views) and sample:
+            record(name, reverse(url_name), params, [None])
+    return {
+        "meta": {
+            "borrowers": len(sample),
+            "book_borrowers": Borrower.objects.count(),
+            "repeat": repeat,
+            "vendor": connection.vendor,
+        },
+        "results": results,
+    }
+
+
+def budget_overruns(results, budgets=None):
+    """Views whose median wall time is over their WALL_BUDGETS_MS entry."""
+    budgets = WALL_BUDGETS_MS if budgets is None else budgets
+    return [
+        f"{name}: wall_ms {results['results'][name]['wall_ms']} over budget {budget}"
+        for name, budget in budgets.items()
+        if name in results["results"] and results["results"][name]["wall_ms"] > budget
+    ]
+
+
+def compare(baseline, current, threshold=0.2, min_wall_delta_ms=10.0):
+    """
+    Regressions of `current` against `baseline`: any query or row count
+    increase, or a wall time / peak memory increase above `threshold`.
+    Wall time increases under `min_wall_delta_ms` are treated as noise.
+    """
+    regressions = []
+    for name, metrics in current["results"].items():
+        before = baseline.get("results", {}).get(name)
+        if not before:
+            continue
+        for metric in ("queries", "rows"):
+            if metrics[metric] > before[metric]:
+                regressions.append(f"{name}: {metric} {before[metric]} -> {metrics[metric]}")
+        for metric in ("wall_ms", "peak_kb"):
+            if metric == "wall_ms" and metrics[metric] - before[metric] < min_wall_delta_ms:
+                continue
+            if before[metric] and metrics[metric] > before[metric] * (1 + threshold):
+                regressions.append(f"{name}: {metric} {before[metric]} -> {metrics[metric]}")
+    return regressions
+
+
+def load_baseline(path):
+    with open(path) as handle:
+        return json.load(handle)
+
+
+def write_baseline(path, payload):
+    with open(path, "w") as handle:
+        json.dump(payload, handle, indent=2, sort_keys=True)
+
+
+IMPORT_STAGES = ("read", "header_detection", "conversion", "staging", "publish")
+
+
+def _peak_rss_mb():
+    import resource
+
+    # ru_maxrss is reported in kilobytes on Linux.
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_import_benchmark(xlsx_path, keep=False, log=None):
+    """
+    Time each importer stage over every mapped sheet of `xlsx_path`: reading
+    the raw sheet, header detection, row conversion, writing the staging
+    tables and the publish transaction. Peak RSS is the process high-water
+    mark once the stage finishes, so the first stage that pushes it up is
+    the one to look at. Inserts are rolled back unless `keep` is set.
+    """
+    import pandas as pd
+    from django.db import transaction
+
+    from management.management.commands.import_cora_xlsx import (
+        HEADER_HINTS,
+        SHEET_MODEL_MAP,
+        build_sheet_objects,
+        frame_from_raw,
+        read_raw_sheet,
+    )
+    from management.models import BorrowerReport, Company
+    from management.staging import ImportStaging
+
+    log = log or (lambda message: None)
+    stages = {stage: {"seconds": 0.0, "rows": 0, "peak_rss_mb": 0.0} for stage in IMPORT_STAGES}
+
+    def record(stage, started, rows):
+        stages[stage]["seconds"] += time.perf_counter() - started
+        stages[stage]["rows"] += rows
+        stages[stage]["peak_rss_mb"] = max(stages[stage]["peak_rss_mb"], _peak_rss_mb())
+
+    with ImportStaging() as staging, transaction.atomic():
+        company = Company.objects.create(
+            company="Import Benchmark",
+            company_id=(Company.objects.aggregate(top=Max("company_id"))["top"] or 0) + 1,
+        )
+        borrower = Borrower.objects.create(company=company, primary_contact="Import Benchmark")
+        report = BorrowerReport(borrower=borrower, source_file=str(xlsx_path))
+
+        started = time.perf_counter()
+        workbook = pd.ExcelFile(xlsx_path)
+        record("read", started, 0)
+        for sheet, model_cls in SHEET_MODEL_MAP.items():
+            if sheet not in workbook.sheet_names:
+                continue
+            started = time.perf_counter()
+            raw = read_raw_sheet(workbook, sheet)
+            record("read", started, len(raw))
+
+            started = time.perf_counter()
+            df, _meta = frame_from_raw(raw, model_cls, header_hint=HEADER_HINTS.get(sheet))
+            record("header_detection", started, len(df))
+
+            started = time.perf_counter()
+            objs, _skipped, _reasons, _messages = build_sheet_objects(model_cls, df, report)
+            record("conversion", started, len(df))
+
+            started = time.perf_counter()
+            staging.stage(model_cls, objs)
+            record("staging", started, len(objs))
+            log(f"{sheet}: {len(raw)} raw rows, {len(objs)} staged")
+
+        started = time.perf_counter()
+        report.save()
+        published = staging.publish(report, borrower)
+        record("publish", started, sum(published.values()))
+        if not keep:
+            transaction.set_rollback(True)
+
+    for stage in stages.values():
+        stage["rows_per_sec"] = round(stage["rows"] / stage["seconds"], 1) if stage["seconds"] else None
+        stage["seconds"] = round(stage["seconds"], 3)
+        stage["peak_rss_mb"] = round(stage["peak_rss_mb"], 1)
+    return {"file": str(xlsx_path), "stages": stages}
+
+
+def _median_ms(func, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - started) * 1000)
+    return round(statistics.median(samples), 3)
+
+
+def date_filter_cases(borrower):
+    """
+    (name, legacy queryset, as-of queryset) pairs for the collateral filters
+    the summary, portfolio and inventory views used to run on created_at.
+    """
+    from management.models import CollateralOverviewRow
+
+    rows = CollateralOverviewRow.objects.filter(borrower=borrower)
+    latest = rows.aggregate(date=Max("as_of_date"), time=Max("created_at"))
+    if latest["date"] is None or latest["time"] is None:
+        return []
+    as_of_end = latest["date"]
+    created_end = latest["time"].date()
+    window = datetime.timedelta(days=365)
+    return [
+        (
+            "range_12_months",
+            rows.filter(created_at__date__range=(created_end - window, created_end)),
+            rows.filter(as_of_date__range=(as_of_end - window, as_of_end)),
+        ),
+        (
+            "latest_period",
+            rows.filter(created_at__date=created_end),
+            rows.filter(as_of_date=as_of_end),
+        ),
+    ]
+
+
+def run_date_filter_benchmark(borrowers=3, repeat=5, log=None):
+    """
+    Median wall time and query plan of each legacy created_at__date filter
+    against its as_of_date replacement, for the first `borrowers` borrowers.
+    The plans show whether the date predicate is an index condition or a
+    per-row filter.
+    """
+    log = log or (lambda message: None)
+    results = {}
+    for borrower in Borrower.objects.order_by("id")[:borrowers]:
+        for name, legacy, as_of in date_filter_cases(borrower):
+            entry = results.setdefault(name, {"legacy_ms": [], "as_of_ms": [], "rows": []})
+            entry["legacy_ms"].append(_median_ms(lambda: list(legacy.all()), repeat))
+            entry["as_of_ms"].append(_median_ms(lambda: list(as_of.all()), repeat))
+            entry["rows"].append(as_of.count())
+            entry.setdefault("legacy_plan", legacy.explain())
+            entry.setdefault("as_of_plan", as_of.explain())
+    for name, entry in results.items():
+        for metric in ("legacy_ms", "as_of_ms", "rows"):
+            entry[metric] = round(statistics.median(entry[metric]), 3)
+        log(f"{name}: legacy={entry['legacy_ms']}ms as_of={entry['as_of_ms']}ms rows={entry['rows']}")
+    return {"meta": {"borrowers": borrowers, "repeat": repeat, "vendor": connection.vendor}, "results": results}
+
+
+# Views whose independent loads go through management.concurrency.gather.
+CONCURRENT_VIEWS = ("summary", "collateral_dynamic_ar", "collateral_static")
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of `values`; pct is 0-100."""
+    ordered = sorted(values)
+    if not ordered:
+        return None
+    return ordered[max(math.ceil(pct / 100 * len(ordered)), 1) - 1]
+
+
+async def _asgi_get(app, path, params, cookie):
+    """One GET through `app` the way an ASGI server would send it; returns wall ms."""
+    finished = asyncio.Event()
+    received = False
+    status = None
+
+    async def receive():
+        nonlocal received
+        if not received:
+            received = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await finished.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        elif message["type"] == "http.response.body" and not message.get("more_body"):
+            finished.set()
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": urlencode(params).encode(),
+        "root_path": "",
+        "headers": [(b"host", b"testserver"), (b"cookie", cookie.encode())],
+        "client": ("127.0.0.1", 0),
+        "server": ("testserver", 80),
+    }
+    started = time.perf_counter()
+    await app(scope, receive, send)
+    elapsed = time.perf_counter() - started
+    finished.set()
+    if status != 200:
+        raise RuntimeError(f"{path} returned {status}")
+    return elapsed * 1000
+
+
+async def _drive(app, path, params, cookie, requests, concurrency):
+    # `concurrency` clients, each sending its next request when the last returns.
+    slots = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with slots:
+            return await _asgi_get(app, path, params, cookie)
+
+    return await asyncio.gather(*(one() for _ in range(requests)))
+
+
+def run_concurrency_benchmark(views=None, requests=20, concurrency=4, workers=4, log=None):
+    """
+    p50/p95 latency of each dashboard view served through Django's ASGI
+    handler (what uvicorn or daphne call) with its loads run one after
+    another (DASHBOARD_LOAD_WORKERS=0) and gathered on `workers` threads.
+    `concurrency` clients send `requests` requests per view and mode. The
+    report cache is bypassed so every request does its loads.
+    """
+    log = log or (lambda message: None)
+    selected = [entry for entry in BENCHMARK_VIEWS if entry[0] in (views or CONCURRENT_VIEWS)]
+    borrower = Borrower.objects.order_by("id").first()
+    if borrower is None:
+        return {"meta": {}, "results": {}}
+    client = _benchmark_client()
+    _select_borrower(client, borrower)
+    cookie = f"{settings.SESSION_COOKIE_NAME}={client.cookies[settings.SESSION_COOKIE_NAME].value}"
+    app = ASGIHandler()
+    uncached = {
+        **settings.CACHES,
+        getattr(settings, "REPORT_CACHE_ALIAS", "default"): {
+            "BACKEND": "django.core.cache.backends.dummy.DummyCache",
+        },
+    }
+    results = {}
+    for name, url_name, params in selected:
+        path = reverse(url_name)
+        results[name] = {}
+        for mode, load_workers in (("sync", 0), ("gathered", workers)):
+            with override_settings(DASHBOARD_LOAD_WORKERS=load_workers, CACHES=uncached):
+                asyncio.run(_drive(app, path, params, cookie, 1, 1))  # warm-up
+                samples = asyncio.run(_drive(app, path, params, cookie, requests, concurrency))
+            results[name][mode] = {
+                "p50_ms": round(percentile(samples, 50), 2),
+                "p95_ms": round(percentile(samples, 95), 2),
+            }
+        log(
+            f"{name}: sync p50={results[name]['sync']['p50_ms']} p95={results[name]['sync']['p95_ms']}, "
+            f"gathered p50={results[name]['gathered']['p50_ms']} p95={results[name]['gathered']['p95_ms']}"
+        )
+    return {
+        "meta": {
+            "borrower": borrower.pk,
+            "requests": requests,
+            "concurrency": concurrency,
+            "workers": workers,
+            "vendor": connection.vendor,
+        },
+        "results": results,
+    }
@@ -0,0 +1,334 @@
+"""
+Borrowing-base engine.
+
+Evaluates CollateralOverviewRow data for one or many borrowers as numpy
+columns instead of row by row:
+
+    eligible     = eligible collateral (beginning less ineligibles when blank)
+    advance rate = advanced rate (NOLV % x NOLV advance factor when blank)
+    utilized     = min(advance rate, rate limit), the rate limit coming from
+                   the borrower's CollateralLimitsRow for the collateral type
+    availability = eligible x utilized                  (pre-reserve collateral)
+    net          = availability - |reserves|
+
+Money is held as int64 cents and rates as int64 millionths (the PctField
+precision), so every product is rounded once, half-up, to the cent and sums
+are exact. Results are grouped per main type, per borrower or by any per-row
+key in a single pass.
+
+Values the borrower certified on the sheet win over recomputed ones (the
+sheet carries rates at more precision than PctField stores); the engine
+fills in whatever the sheet leaves blank. With sheet_values=False it is
+the other way round: every column is derived from its inputs wherever they
+are given, which is what management.scenarios compares.
+"""
+from decimal import ROUND_HALF_UP, Decimal
+
+import numpy as np
+
+MONEY_PLACES = 2
+RATE_PLACES = 6
+RATE_SCALE = 10 ** RATE_PLACES
+INT64_LIMIT = 2 ** 63 - 1
+
+COLLATERAL_FIELDS = (
+    "id",
+    "borrower_id",
+    "main_type",
+    "sub_type",
+    "beginning_collateral",
+    "ineligibles",
+    "eligible_collateral",
+    "nolv_pct",
+    "dilution_rate",
+    "advanced_rate",
+    "rate_limit",
+    "utilized_rate",
+    "pre_reserve_collateral",
+    "reserves",
+    "net_collateral",
+)
+MONEY_FIELDS = (
+    "beginning_collateral",
+    "ineligibles",
+    "eligible_collateral",
+    "pre_reserve_collateral",
+    "reserves",
+    "net_collateral",
+)
+RATE_FIELDS = ("nolv_pct", "dilution_rate", "advanced_rate", "rate_limit", "utilized_rate")
+LIMIT_FIELDS = ("borrower_id", "collateral_type", "pct_limit")
+
+
+def _scaled(value, places):
+    return int(Decimal(value).scaleb(places).quantize(Decimal("1"), rounding=ROUND_HALF_UP))
+
+
+def _rate(value):
+    # Sheets mix fractions (0.85) and whole percentages (85); see _normalize_pct.
+    rate = Decimal(value)
+    if rate > 1:
+        rate /= 100
+    return rate
+
+
+def _money_column(values):
+    valid = np.array([value is not None for value in values], dtype=bool)
+    data = [_scaled(value, MONEY_PLACES) if value is not None else 0 for value in values]
+    return _int_array(data), valid
+
+
+def _rate_column(values):
+    valid = np.array([value is not None for value in values], dtype=bool)
+    data = [_scaled(_rate(value), RATE_PLACES) if value is not None else 0 for value in values]
+    return _int_array(data), valid
+
+
+def _int_array(values):
+    if values and max(abs(value) for value in values) > INT64_LIMIT:
+        return np.array(values, dtype=object)
+    return np.array(values, dtype=np.int64)
+
+
+def _mul_rate(amount, rate):
+    """amount x rate / RATE_SCALE, rounded half-up (away from zero) to an integer."""
+    if amount.dtype != object and amount.size:
+        bound = int(np.abs(amount).max()) * max(int(np.abs(rate).max()), 1)
+        if bound > INT64_LIMIT:
+            amount = amount.astype(object)
+    product = amount * rate
+    magnitude = (np.abs(product) + RATE_SCALE // 2) // RATE_SCALE
+    return np.where(product < 0, -magnitude, magnitude)
+
+
+def _key(value):
+    return (value or "").strip().lower()
+
+
+def _limit_lookup(limit_records):
+    """{borrower_id: {collateral type: pct_limit}}, first row per type wins."""
+    lookup = {}
+    for borrower_id, collateral_type, pct_limit in limit_records:
+        key = _key(collateral_type)
+        if key and pct_limit is not None:
+            lookup.setdefault(borrower_id, {}).setdefault(key, pct_limit)
+    return lookup
+
+
+def _to_decimal(data, valid, places):
+    if not valid:
+        return None
+    return Decimal(int(data)).scaleb(-places)
+
+
+class BorrowingBase:
+    """Computed borrowing base for a batch of collateral rows."""
+
+    def __init__(self, records, limit_records=(), sheet_values=True, adjust=None):
+        records = list(records)
+        columns = list(zip(*records)) if records else [()] * len(COLLATERAL_FIELDS)
+        raw = dict(zip(COLLATERAL_FIELDS, columns))
+        self.ids = np.array(raw["id"], dtype=object)
+        self.borrower_ids = np.array(raw["borrower_id"], dtype=object)
+        self.main_types = list(raw["main_type"])
+        self.sub_types = list(raw["sub_type"])
+
+        self.inputs = {}
+        for name in MONEY_FIELDS:
+            self.inputs[name] = _money_column(list(raw[name]))
+        for name in RATE_FIELDS:
+            self.inputs[name] = _rate_column(list(raw[name]))
+
+        # Per-borrower limit from the Collateral Limits sheet, matched on main type then sub type.
+        lookup = _limit_lookup(limit_records)
+        limits = []
+        for borrower_id, main_type, sub_type in zip(self.borrower_ids, self.main_types, self.sub_types):
+            entries = lookup.get(borrower_id, {})
+            limit = entries.get(_key(main_type)) if main_type else None
+            if limit is None and sub_type:
+                limit = entries.get(_key(sub_type))
+            limits.append(limit)
+        self.limit_rates = _rate_column(limits)
+        self.sheet_values = sheet_values
+        self.outputs = compute(self.inputs, self.limit_rates, sheet_values=sheet_values, adjust=adjust)
+
+    @classmethod
+    def from_instances(cls, rows, limit_rows=(), **kwargs):
+        records = [tuple(getattr(row, field) for field in COLLATERAL_FIELDS) for row in rows]
+        limits = [tuple(getattr(row, field) for field in LIMIT_FIELDS) for row in limit_rows]
+        return cls(records, limits, **kwargs)
+
+    @classmethod
+    def from_queryset(cls, collateral_qs, limit_qs=None, **kwargs):
+        records = collateral_qs.order_by("borrower_id", "id").values_list(*COLLATERAL_FIELDS)
+        limits = limit_qs.order_by("borrower_id", "id").values_list(*LIMIT_FIELDS) if limit_qs is not None else ()
+        return cls(records, limits, **kwargs)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def row(self, index):
+        """Computed values of one row as Decimals (None where unknown)."""
+        values = {}
+        for name, (data, valid) in self.outputs.items():
+            places = RATE_PLACES if name in RATE_FIELDS else MONEY_PLACES
+            values[name] = _to_decimal(data[index], valid[index], places)
+        return values
+
+    def rows(self):
+        return [self.row(index) for index in range(len(self))]
+
+    def recompute(self, **kwargs):
+        """Outputs for the same inputs under other compute() options."""
+        return compute(self.inputs, self.limit_rates, **kwargs)
+
+    def totals(self, keys, outputs=None, fields=None):
+        """
+        Aggregate rows sharing a key (one key per row, in row order). Money
+        is summed exactly; rates are averaged weighted by eligible
+        collateral, or plainly when the group has no eligible collateral.
+        Returns {key: values} in order of first appearance. `outputs` (from
+        recompute) and `fields` narrow what is aggregated.
+        """
+        outputs = outputs or self.outputs
+        keys = list(keys)
+        order = list(dict.fromkeys(keys))
+        position = {key: idx for idx, key in enumerate(order)}
+        codes = np.array([position[key] for key in keys], dtype=np.int64)
+        groups = len(order)
+        weight, weight_valid = outputs["eligible_collateral"]
+        weight = np.where(weight_valid, weight, 0).astype(object)
+
+        columns = {}
+        for name, (data, valid) in outputs.items():
+            if fields is not None and name not in fields:
+                continue
+            if name in RATE_FIELDS:
+                columns[name] = _weighted_rates(codes, groups, data, valid, weight)
+            else:
+                columns[name] = _group_sums(codes, groups, data, valid)
+        result = {}
+        for idx, key in enumerate(order):
+            values = {}
+            for name, (data, valid) in columns.items():
+                if name in RATE_FIELDS:
+                    values[name] = data[idx] if valid[idx] else None
+                else:
+                    values[name] = _to_decimal(data[idx], valid[idx], MONEY_PLACES)
+            result[key] = values
+        return result
+
+    def total(self):
+        """All rows as one group, or None when there are none."""
+        return self.totals([None] * len(self)).get(None)
+
+    def main_type_totals(self):
+        return self.totals(zip(self.borrower_ids, (_key(main_type) for main_type in self.main_types)))
+
+    def borrower_totals(self):
+        return self.totals(self.borrower_ids)
+
+
+def _unchanged(name, data, valid):
+    return data, valid
+
+
+def compute(inputs, limit_rates, sheet_values=True, adjust=None):
+    """
+    Derive the computed columns from input columns; returns {field: (data,
+    valid)}. `adjust(name, data, valid)` may replace the nolv_pct, reserves,
+    advanced_rate and rate_limit columns on their way into the calculation.
+    """
+    adjust = adjust or _unchanged
+    beginning, beginning_valid = inputs["beginning_collateral"]
+    ineligibles, ineligibles_valid = inputs["ineligibles"]
+    nolv, nolv_valid = adjust("nolv_pct", *inputs["nolv_pct"])
+    factor, factor_valid = inputs["dilution_rate"]
+    reserves, reserves_valid = adjust("reserves", *inputs["reserves"])
+    limit, limit_valid = limit_rates
+
+    def sheet(name, computed, computed_valid):
+        stored, stored_valid = inputs[name]
+        if not sheet_values:
+            return np.where(computed_valid, computed, stored), stored_valid | computed_valid
+        return np.where(stored_valid, stored, computed), stored_valid | computed_valid
+
+    # Ineligibles are signed either way on the sheets; they always reduce collateral.
+    eligible, eligible_valid = sheet(
+        "eligible_collateral",
+        beginning - np.abs(np.where(ineligibles_valid, ineligibles, 0)),
+        beginning_valid,
+    )
+    nolv_advance, nolv_advance_valid = _mul_rate(nolv, factor), nolv_valid & factor_valid
+    advance, advance_valid = adjust("advanced_rate", *sheet("advanced_rate", nolv_advance, nolv_advance_valid))
+    # A rate limit from the Collateral Limits sheet overrides the row's own.
+    sheet_limit, sheet_limit_valid = inputs["rate_limit"]
+    rate_limit, rate_limit_valid = adjust(
+        "rate_limit",
+        np.where(limit_valid, limit, sheet_limit),
+        limit_valid | sheet_limit_valid,
+    )
+
+    utilized, utilized_valid = sheet(
+        "utilized_rate",
+        np.where(
+            advance_valid & rate_limit_valid,
+            np.minimum(advance, rate_limit),
+            np.where(advance_valid, advance, rate_limit),
+        ),
+        advance_valid | rate_limit_valid,
+    )
+    pre_reserve, pre_reserve_valid = sheet(
+        "pre_reserve_collateral",
+        _mul_rate(eligible, utilized),
+        eligible_valid & utilized_valid,
+    )
+    net, net_valid = sheet(
+        "net_collateral",
+        pre_reserve - np.abs(np.where(reserves_valid, reserves, 0)),
+        pre_reserve_valid,
+    )
+    return {
+        "beginning_collateral": (beginning, beginning_valid),
+        "ineligibles": (ineligibles, ineligibles_valid),
+        "eligible_collateral": (eligible, eligible_valid),
+        "nolv_pct": (nolv, nolv_valid),
+        "dilution_rate": (factor, factor_valid),
+        "advanced_rate": (advance, advance_valid),
+        "rate_limit": (rate_limit, rate_limit_valid),
+        "utilized_rate": (utilized, utilized_valid),
+        "pre_reserve_collateral": (pre_reserve, pre_reserve_valid),
+        "reserves": (reserves, reserves_valid),
+        "net_collateral": (net, net_valid),
+    }
+
+
+def _group_sums(codes, groups, data, valid):
+    sums = np.zeros(groups, dtype=object)
+    np.add.at(sums, codes, np.where(valid, data, 0).astype(object))
+    counts = np.bincount(codes[valid], minlength=groups)
+    return sums, counts > 0
+
+
+def _weighted_rates(codes, groups, data, valid, weight):
+    """Eligible-weighted average rate per group, as Decimal fractions."""
+    values = np.where(valid, data, 0).astype(object)
+    row_weight = np.where(valid, weight, 0)
+    weighted = np.zeros(groups, dtype=object)
+    total_weight = np.zeros(groups, dtype=object)
+    plain = np.zeros(groups, dtype=object)
+    np.add.at(weighted, codes, values * row_weight)
+    np.add.at(total_weight, codes, row_weight)
+    np.add.at(plain, codes, values)
+    counts = np.bincount(codes[valid], minlength=groups)
+    averages = []
+    for idx in range(groups):
+        if total_weight[idx] > 0:
+            average = Decimal(weighted[idx]) / Decimal(total_weight[idx])
+        elif counts[idx]:
+            average = Decimal(plain[idx]) / Decimal(int(counts[idx]))
+        else:
+            averages.append(None)
+            continue
+        averages.append(average.scaleb(-RATE_PLACES))
+    return averages, counts > 0
@@ -0,0 +1,79 @@
+"""
+Concurrent data loads for the dashboards.
+
+A dashboard is a handful of independent queries (inventory, receivables,
+forecast, availability, ...) that the sync views used to run one after
+another. gather() runs them on a bounded, process-wide thread pool and
+returns their results in order, so a page costs roughly its slowest load
+rather than the sum of them.
+
+Each load runs in a copy of the caller's context, so report_scope(),
+replica_reads() and request timings apply to it as they would inline, and
+on a thread with its own database connection. Loads run inline instead
+when DASHBOARD_LOAD_WORKERS is 0 or 1 (the default; see the settings
+comment before raising it), when already inside a pooled load
+(a nested gather would wait on the pool it is occupying), and when the
+caller has a transaction open: other connections cannot see its rows.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from contextvars import ContextVar, copy_context
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, close_old_connections, connections
+
+from management.instrumentation import current_timings, record_queries
+
+_in_pool = ContextVar("dashboard_load", default=False)
+_executors = {}
+_executors_lock = threading.Lock()
+
+
+def load_workers():
+    return max(int(getattr(settings, "DASHBOARD_LOAD_WORKERS", 0) or 0), 0)
+
+
+def _executor(workers):
+    with _executors_lock:
+        executor = _executors.get(workers)
+        if executor is None:
+            executor = _executors[workers] = ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="dashboard-load"
+            )
+        return executor
+
+
+def _run_inline(funcs):
+    return len(funcs) < 2 or load_workers() < 2 or _in_pool.get() or connections[DEFAULT_DB_ALIAS].in_atomic_block
+
+
+def _pooled(func, spans):
+    _in_pool.set(True)
+    timings = current_timings()
+    try:
+        if timings is None:
+            return func()
+        with record_queries(timings), timings.continue_spans(spans):
+            return func()
+    finally:
+        # Pool threads outlive requests; treat each load like one. This drops
+        # the thread's connection when it is broken or older than
+        # CONN_MAX_AGE, which with Django's default of 0 is after every load.
+        close_old_connections()
+
+
+def gather(*funcs):
+    """
+    Call each of `funcs` (no arguments; bind them with functools.partial or
+    a closure) and return their results as a list, in order. The first
+    exception raised by a load is re-raised once every load has finished.
+    """
+    if _run_inline(funcs):
+        return [func() for func in funcs]
+    executor = _executor(load_workers())
+    timings = current_timings()
+    spans = timings.open_spans() if timings is not None else []
+    futures = [executor.submit(copy_context().run, _pooled, func, spans) for func in funcs]
+    # Let every load finish (and release its connection) before raising.
+    wait(futures)
+    return [future.result() for future in futures]
@@ -1,6 +1,5 @@
-from django.conf import settings
-
 from management.models import Company
+from management.report_scope import REPORT_PARAM
 
 
 def company_context(request):
@@ -16,3 +15,39 @@ def company_context(request):
         "company_name": company_name,
         "company_contact": company_contact,
     }
+
+
+def report_selector(request):
+    """Options for the report selector on views wrapped in report_scoped."""
+    options = getattr(request, "report_options", None)
+    if not options:
+        return {}
+    selected = getattr(request, "borrower_report", None) or options[0]
+    if selected not in options:
+        options = [*options, selected]
+    choices = [
+        {
+            "id": report.pk,
+            "label": _report_label(report, is_latest=report == options[0]),
+            "selected": report == selected,
+        }
+        for report in options
+    ]
+    return {
+        "report_choices": choices,
+        "selected_report": selected,
+        "is_historical_report": selected != options[0],
+        "report_form_params": [
+            (key, value)
+            for key, value in request.GET.items()
+            if key != REPORT_PARAM and not key.endswith("page")
+        ],
+    }
+
+
+def _report_label(report, is_latest=False):
+    if report.report_date:
+        label = report.report_date.strftime("%m/%d/%Y")
+    else:
+        label = report.source_file or f"Report {report.pk}"
+    return f"{label} (latest)" if is_latest else label
@@ -0,0 +1,115 @@
+"""
+Read replicas for the dashboards.
+
+Heavy read-only views opt in with @read_replica (and background readers
+with `with replica_reads():`); inside that scope PrimaryReplicaRouter sends
+reads of this app's models to one of DATABASE_REPLICAS. Everything else
+stays on the primary: writes, the admin and workspace views (never marked),
+auth and sessions, and any read made while a transaction is open on the
+primary, which may depend on rows the replica has not seen.
+
+Replicas lag. A request that writes one of our models (an admin save, a
+workspace edit, marking alerts read) marks the user's session, and so does
+seeing an import job finish; for READ_YOUR_WRITES_SECONDS afterwards that
+user's reads stay on the primary, so they see their own changes.
+"""
+import functools
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+APP_LABEL = "management"
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS", "TRACE")
+SESSION_KEY = "db_primary_until"
+
+_replica_scope = ContextVar("replica_scope", default=False)
+_request_writes = ContextVar("request_writes", default=None)
+
+
+def replica_aliases():
+    return [alias for alias in getattr(settings, "DATABASE_REPLICAS", []) if alias in settings.DATABASES]
+
+
+@contextmanager
+def replica_reads(enabled=True):
+    token = _replica_scope.set(enabled)
+    try:
+        yield
+    finally:
+        _replica_scope.reset(token)
+
+
+def primary_pinned(request):
+    """True while `request`'s user is inside their read-your-writes window."""
+    session = getattr(request, "session", None)
+    return session is not None and session.get(SESSION_KEY, 0) > time.time()
+
+
+def note_write(request, at=None):
+    """Keep `request`'s user on the primary for READ_YOUR_WRITES_SECONDS after `at` (default: now)."""
+    session = getattr(request, "session", None)
+    if session is None:
+        return
+    written = at.timestamp() if at is not None else time.time()
+    until = written + settings.READ_YOUR_WRITES_SECONDS
+    if until > time.time() and until > session.get(SESSION_KEY, 0):
+        session[SESSION_KEY] = until
+
+
+def _in_transaction(connection):
+    # TestCase wraps each test in a transaction of its own; that one does not count.
+    return any(not getattr(block, "_from_testcase", False) for block in connection.atomic_blocks)
+
+
+def read_replica(view):
+    """Serve a read-only view from a replica unless the user just wrote something."""
+
+    @functools.wraps(view)
+    def wrapper(request, *args, **kwargs):
+        with replica_reads(not primary_pinned(request)):
+            return view(request, *args, **kwargs)
+
+    return wrapper
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label != APP_LABEL or not _replica_scope.get():
+            return None
+        aliases = replica_aliases()
+        if not aliases or _in_transaction(connections[DEFAULT_DB_ALIAS]):
+            return None
+        return random.choice(aliases)
+
+    def db_for_write(self, model, **hints):
+        writes = _request_writes.get()
+        if writes is not None and model._meta.app_label == APP_LABEL:
+            writes["seen"] = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary.
+        return True
+
+
+class ReadYourWritesMiddleware:
+    """Start the read-your-writes window for form posts and API calls that wrote to our models."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        writes = {"seen": False}
+        token = _request_writes.set(writes)
+        try:
+            response = self.get_response(request)
+        finally:
+            _request_writes.reset(token)
+        # GETs that materialize derived rows (a first scorecard) are not the user's writes.
+        if writes["seen"] and request.method not in SAFE_METHODS:
+            note_write(request)
+        return response
@@ -0,0 +1,84 @@
+from decimal import Decimal, InvalidOperation
+
+from django.utils import timezone
+
+
+def _format_currency(value):
+    if value is None:
+        return "—"
+    try:
+        amount = Decimal(value)
+    except (InvalidOperation, TypeError, ValueError):
+        try:
+            amount = Decimal(str(value))
+        except Exception:
+            return "—"
+    return f"${amount:,.0f}"
+
+
+def _format_pct(value):
+    if value is None:
+        return "—"
+    try:
+        pct = Decimal(value)
+    except (InvalidOperation, TypeError, ValueError):
+        try:
+            pct = Decimal(str(value))
+        except Exception:
+            return "—"
+
+    if pct <= Decimal("1"):
+        pct *= Decimal("100")
+
+    return f"{pct:.1f}%"
+
+
+def _normalize_pct(value):
+    if value is None:
+        return None
+    try:
+        pct = Decimal(value)
+    except (InvalidOperation, TypeError, ValueError):
+        try:
+            pct = Decimal(str(value))
+        except Exception:
+            return None
+
+    if pct <= Decimal("1"):
+        pct *= Decimal("100")
+
+    return pct
+
+
+def _format_date(value):
+    if not value:
+        return "—"
+    return value.strftime("%m/%d/%Y")
+
+
+def _format_datetime(value):
+    if not value:
+        return "—"
+    if timezone.is_aware(value):
+        value = timezone.localtime(value)
+    return value.strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _safe_str(value, default="—"):
+    if value is None or value == "":
+        return default
+    return str(value)
+
+
+def _to_decimal(value):
+    if value is None:
+        return Decimal("0")
+    if isinstance(value, Decimal):
+        return value
+    try:
+        return Decimal(value)
+    except (InvalidOperation, TypeError, ValueError):
+        try:
+            return Decimal(str(value))
+        except Exception:
+            return Decimal("0")
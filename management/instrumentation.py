@@ -0,0 +1,238 @@
+import functools
+import json
+import logging
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections
+
+from management.metrics import REQUEST_LATENCY, REQUEST_QUERIES, REQUESTS
+from management.slow_queries import save_slow_queries, threshold_ms as slow_query_threshold_ms
+
+logger = logging.getLogger("management.timing")
+
+_current = ContextVar("request_timings", default=None)
+
+
+class QueryBudgetExceeded(AssertionError):
+    """A view ran more SQL queries than its configured budget."""
+
+
+class RequestTimings:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.sql_count = 0
+        self.sql_seconds = 0.0
+        self.spans = {}
+        self.slow_queries = []
+        # Loads gathered onto other threads (management.concurrency) record
+        # here too; each thread keeps its own span stack.
+        self._stacks = {}
+        self._lock = threading.Lock()
+
+    @property
+    def _stack(self):
+        return self._stacks.setdefault(threading.get_ident(), [])
+
+    def record_query(self, seconds, sql=None, params=None, alias=None):
+        stack = self._stack
+        threshold = slow_query_threshold_ms()
+        with self._lock:
+            self.sql_count += 1
+            self.sql_seconds += seconds
+            if sql is not None and threshold is not None and seconds * 1000 >= threshold:
+                self.slow_queries.append({
+                    "sql": sql,
+                    "params": params,
+                    "alias": alias,
+                    "seconds": seconds,
+                    "builder": stack[-1] if stack else None,
+                })
+            for name in stack:
+                entry = self.spans[name]
+                entry["sql_count"] += 1
+                entry["sql_seconds"] += seconds
+
+    @contextmanager
+    def span(self, name):
+        with self._lock:
+            entry = self.spans.setdefault(name, {"calls": 0, "seconds": 0.0, "sql_count": 0, "sql_seconds": 0.0})
+            entry["calls"] += 1
+        stack = self._stack
+        # Spans can nest; re-entering one already on the stack must not double-count its SQL.
+        active = name not in stack
+        if active:
+            stack.append(name)
+        started = time.perf_counter()
+        try:
+            yield entry
+        finally:
+            if active:
+                with self._lock:
+                    entry["seconds"] += time.perf_counter() - started
+                stack.remove(name)
+
+    def open_spans(self):
+        return list(self._stack)
+
+    @contextmanager
+    def continue_spans(self, names):
+        """Attribute this thread's queries to `names`, spans opened on another thread."""
+        stack = self._stack
+        stack[:] = names
+        try:
+            yield self
+        finally:
+            stack.clear()
+
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    def server_timing(self):
+        parts = [
+            f'total;dur={self.elapsed() * 1000:.1f}',
+            f'db;dur={self.sql_seconds * 1000:.1f};desc="{self.sql_count} queries"',
+        ]
+        for name, entry in self.spans.items():
+            parts.append(
+                f'{name};dur={entry["seconds"] * 1000:.1f};'
+                f'desc="{entry["sql_count"]} queries, {entry["sql_seconds"] * 1000:.1f}ms SQL"'
+            )
+        return ", ".join(parts)
+
+    def as_dict(self):
+        return {
+            "total_ms": round(self.elapsed() * 1000, 2),
+            "sql_count": self.sql_count,
+            "sql_ms": round(self.sql_seconds * 1000, 2),
+            "spans": {
+                name: {
+                    "calls": entry["calls"],
+                    "ms": round(entry["seconds"] * 1000, 2),
+                    "sql_count": entry["sql_count"],
+                    "sql_ms": round(entry["sql_seconds"] * 1000, 2),
+                }
+                for name, entry in self.spans.items()
+            },
+        }
+
+
+def current_timings():
+    return _current.get()
+
+
+@contextmanager
+def span(name):
+    """Time a block of work within the current request; a no-op outside one."""
+    timings = _current.get()
+    if timings is None:
+        yield None
+        return
+    with timings.span(name) as entry:
+        yield entry
+
+
+def timed(name=None):
+    """Decorator form of `span`, named after the function by default."""
+
+    def decorator(func):
+        span_name = name or func.__name__.lstrip("_")
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(span_name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def _query_recorder(timings, alias):
+    def wrapper(execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            if many:
+                timings.record_query(elapsed)
+            else:
+                timings.record_query(elapsed, sql, params, alias)
+
+    return wrapper
+
+
+@contextmanager
+def record_queries(timings):
+    """Record this thread's queries into `timings`; connections are per thread."""
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(_query_recorder(timings, connection.alias)))
+        yield timings
+
+
+@contextmanager
+def track_request():
+    timings = RequestTimings()
+    token = _current.set(timings)
+    try:
+        with record_queries(timings):
+            yield timings
+    finally:
+        _current.reset(token)
+
+
+def query_budget(url_name):
+    budgets = getattr(settings, "VIEW_QUERY_BUDGETS", {})
+    return budgets.get(url_name, getattr(settings, "DEFAULT_VIEW_QUERY_BUDGET", None))
+
+
+class RequestTimingMiddleware:
+    """
+    Records wall time and SQL per request and per `span`, adds a
+    Server-Timing header, logs one JSON line per request, stores slow
+    queries and enforces settings.VIEW_QUERY_BUDGETS.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with track_request() as timings:
+            response = self.get_response(request)
+
+        match = getattr(request, "resolver_match", None)
+        url_name = match.url_name if match else None
+        response["Server-Timing"] = timings.server_timing()
+        payload = {
+            "event": "request_timing",
+            "method": request.method,
+            "path": request.path,
+            "view": url_name,
+            "status": response.status_code,
+            **timings.as_dict(),
+        }
+        logger.info(json.dumps(payload))
+
+        save_slow_queries(timings.slow_queries, url_name)
+
+        view = url_name or "unmatched"
+        REQUEST_LATENCY.observe(timings.elapsed(), view=view, method=request.method)
+        REQUESTS.inc(view=view, status=response.status_code)
+        REQUEST_QUERIES.observe(timings.sql_count, view=view)
+
+        budget = query_budget(url_name) if url_name else None
+        if budget is not None and timings.sql_count > budget:
+            if getattr(settings, "QUERY_BUDGET_RAISE", False):
+                raise QueryBudgetExceeded(f"{url_name} ran {timings.sql_count} queries (budget {budget})")
+            logger.warning(json.dumps({
+                "event": "query_budget_exceeded",
+                "view": url_name,
+                "sql_count": timings.sql_count,
+                "budget": budget,
+            }))
+        return response
@@ -0,0 +1,302 @@
+"""
+Database-backed background jobs.
+
+Web views enqueue a Job row and return at once; `manage.py run_workers`
+claims due jobs with SELECT ... FOR UPDATE SKIP LOCKED, so any number of
+worker processes share one queue without a broker, and runs the handler
+registered for the job's kind. Handlers report progress through
+Job.set_progress. A failed attempt is retried with exponential backoff
+until max_attempts; JobError fails the job at once (bad parameters and the
+like). Running jobs whose progress stops moving for JOB_STALE_SECONDS lost
+their worker and are queued again.
+"""
+import logging
+import os
+import socket
+import threading
+import time
+import traceback
+from datetime import timedelta
+from io import StringIO
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management import call_command
+from django.db import connections, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from management.db_router import replica_reads
+from management.metrics import JOB_SECONDS, JOBS
+from management.models import Borrower, BorrowerReport, Job, SlowQuery
+from management.report_scope import latest_report, report_scope
+
+logger = logging.getLogger(__name__)
+
+JOB_HANDLERS = {}
+
+
+class JobError(Exception):
+    """A failure retrying will not fix; the job fails without further attempts."""
+
+
+def job_handler(kind):
+    """Register `func(job) -> result` as the handler for jobs of `kind`."""
+
+    def register(func):
+        JOB_HANDLERS[kind] = func
+        return func
+
+    return register
+
+
+def enqueue(kind, params=None, user=None, max_attempts=None, delay=0):
+    if kind not in JOB_HANDLERS:
+        raise ValueError(f"Unknown job kind {kind!r}")
+    return Job.objects.create(
+        kind=kind,
+        params=params or {},
+        created_by=user if getattr(user, "is_authenticated", False) else None,
+        max_attempts=max_attempts or settings.JOB_MAX_ATTEMPTS,
+        run_after=timezone.now() + timedelta(seconds=delay),
+    )
+
+
+def retry_delay(attempts):
+    return settings.JOB_RETRY_BACKOFF_SECONDS * 2 ** max(attempts - 1, 0)
+
+
+def claim(worker, kinds=None):
+    """Take the oldest due queued job for `worker`, or None when nothing is due."""
+    while True:
+        with transaction.atomic():
+            qs = Job.objects.select_for_update(skip_locked=True).filter(
+                status=Job.QUEUED,
+                run_after__lte=timezone.now(),
+            )
+            if kinds:
+                qs = qs.filter(kind__in=kinds)
+            job = qs.order_by("run_after", "id").first()
+            if job is None:
+                return None
+            now = timezone.now()
+            # Backends without row locks (SQLite) let two workers read the same
+            # job; only the one whose update still sees it queued gets it.
+            claimed = Job.objects.filter(pk=job.pk, status=Job.QUEUED).update(
+                status=Job.RUNNING,
+                attempts=F("attempts") + 1,
+                worker=worker,
+                started_at=now,
+                finished_at=None,
+                updated_at=now,
+            )
+        if claimed:
+            job.refresh_from_db()
+            return job
+
+
+def requeue_stale():
+    """Queue running jobs again whose worker stopped reporting; returns how many."""
+    cutoff = timezone.now() - timedelta(seconds=settings.JOB_STALE_SECONDS)
+    return Job.objects.filter(status=Job.RUNNING, updated_at__lt=cutoff).update(
+        status=Job.QUEUED,
+        worker="",
+        message="Requeued after the worker stopped responding",
+        updated_at=timezone.now(),
+    )
+
+
+def run(job):
+    """Run one claimed job and record the outcome."""
+    handler = JOB_HANDLERS.get(job.kind)
+    started = time.perf_counter()
+    try:
+        if handler is None:
+            raise JobError(f"No handler for job kind {job.kind!r}")
+        result = handler(job)
+    except Exception as exc:
+        job.error = "".join(traceback.format_exception_only(type(exc), exc)).strip()
+        retry = not isinstance(exc, JobError) and job.attempts < job.max_attempts
+        if retry:
+            job.status = Job.QUEUED
+            job.run_after = timezone.now() + timedelta(seconds=retry_delay(job.attempts))
+            job.message = f"Attempt {job.attempts} failed; retrying"
+        else:
+            job.status = Job.FAILED
+            job.finished_at = timezone.now()
+            job.message = "Failed"
+            logger.exception("Job %s failed", job.pk)
+    else:
+        job.status = Job.SUCCEEDED
+        job.result = result
+        job.progress = 100
+        job.message = "Done"
+        job.error = ""
+        job.finished_at = timezone.now()
+    job.save()
+    JOBS.inc(kind=job.kind, status=job.status)
+    JOB_SECONDS.observe(time.perf_counter() - started, kind=job.kind)
+    return job
+
+
+def worker_name(index=0):
+    return f"{socket.gethostname()}:{os.getpid()}:{index}"
+
+
+def _close_old_connections():
+    """
+    close_old_connections() for a long-running worker, except that a
+    connection with a transaction open (a caller that wraps work() in
+    atomic(), such as a TestCase) is left alone: closing it would break the
+    caller's transaction.
+    """
+    for connection in connections.all(initialized_only=True):
+        if not connection.in_atomic_block:
+            connection.close_if_unusable_or_obsolete()
+
+
+def work(worker, stop=None, burst=False, poll_interval=1.0, kinds=None):
+    """
+    Claim and run jobs until `stop` is set, or, with `burst`, until none is
+    due. Returns the number of jobs run.
+    """
+    stop = stop or threading.Event()
+    done = 0
+    while not stop.is_set():
+        _close_old_connections()
+        job = claim(worker, kinds=kinds)
+        if job is None:
+            if burst:
+                break
+            stop.wait(poll_interval)
+            continue
+        run(job)
+        done += 1
+    _close_old_connections()
+    return done
+
+
+def job_payload(job):
+    """What the status endpoint returns for `job`."""
+    return {
+        "id": job.pk,
+        "kind": job.kind,
+        "status": job.status,
+        "progress": job.progress,
+        "message": job.message,
+        "attempts": job.attempts,
+        "error": job.error if job.status == Job.FAILED else "",
+        "result": job.result,
+        "created_at": job.created_at.isoformat(),
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+    }
+
+
+def _borrower(job):
+    borrower = Borrower.objects.select_related("company").filter(pk=job.params.get("borrower_id")).first()
+    if borrower is None:
+        raise JobError("Borrower not found")
+    return borrower
+
+
+@job_handler("import_workbook")
+def import_workbook(job):
+    from management.management.commands.import_cora_xlsx import Command as ImportCommand
+
+    path = Path(job.params.get("path", ""))
+    if not path.is_file():
+        raise JobError(f"Workbook {path.name or '?'} is missing")
+    command = ImportCommand(stdout=StringIO())
+    command.progress = job.set_progress
+    options = {"file": str(path), "source_file": job.params.get("source_file", path.name)}
+    if job.params.get("report_date"):
+        options["report_date"] = job.params["report_date"]
+    call_command(command, **options)
+    return {"report_id": command.report.pk, "borrower_id": command.report.borrower_id}
+
+
+@job_handler("export_report")
+def export_report(job):
+    from management.views.reports import PREFIX_MAP, _build_bbc_workbook
+
+    borrower = _borrower(job)
+    report = None
+    if job.params.get("report_id"):
+        report = BorrowerReport.objects.filter(pk=job.params["report_id"], borrower=borrower).first()
+    report = report or latest_report(borrower)
+    job.set_progress(10, "Building workbook")
+    with report_scope(report), replica_reads():
+        workbook = _build_bbc_workbook(borrower)
+    export_root = Path(settings.JOB_EXPORT_ROOT)
+    export_root.mkdir(parents=True, exist_ok=True)
+    path = export_root / f"job_{job.pk}.xlsx"
+    path.write_bytes(workbook.getvalue())
+    prefix = PREFIX_MAP.get(job.params.get("report_type"), "BBC")
+    company = borrower.company.company if borrower.company else "Borrower"
+    label = report.report_date.isoformat() if report and report.report_date else "latest"
+    return {"file": path.name, "filename": f"{company} - {prefix} {label}.xlsx"}
+
+
+@job_handler("warm_cache")
+def warm_cache(job):
+    """Build every cached dashboard section for the latest report of each borrower."""
+    from management.risk_scorecard import _report_scorecard_payload
+    from management.views import collateral_dynamic, forecast, summary
+
+    builders = [
+        lambda borrower: summary._summary_context(borrower, "last_12_months", "all"),
+        collateral_dynamic._week_summary_context,
+        collateral_dynamic._inventory_context,
+        lambda borrower: collateral_dynamic._accounts_receivable_context(borrower, "last_12_months", "all"),
+        lambda borrower: collateral_dynamic._finished_goals_context(borrower, "last_12_months", "all"),
+        lambda borrower: collateral_dynamic._raw_materials_context(borrower, "last_12_months", "all"),
+        lambda borrower: collateral_dynamic._work_in_progress_context(borrower, "last_12_months", "all"),
+        collateral_dynamic._other_collateral_context,
+        collateral_dynamic._liquidation_model_context,
+        forecast._forecast_charts,
+        _report_scorecard_payload,
+    ]
+    borrowers = Borrower.objects.order_by("id")
+    if job.params.get("borrower_ids"):
+        borrowers = borrowers.filter(pk__in=job.params["borrower_ids"])
+    borrowers = list(borrowers)
+    failures = 0
+    for position, borrower in enumerate(borrowers):
+        job.set_progress(100 * position // max(len(borrowers), 1), f"Warming borrower {borrower.pk}")
+        report = latest_report(borrower)
+        if report is None:
+            continue
+        with report_scope(report), replica_reads():
+            for build in builders:
+                # Warming is best effort: a section that fails here fails on the page too.
+                try:
+                    build(borrower)
+                except Exception:
+                    failures += 1
+                    logger.warning("Warming %s for borrower %s failed", build.__name__, borrower.pk, exc_info=True)
+    return {"borrowers": len(borrowers), "failures": failures}
+
+
+@job_handler("archive_reports")
+def archive_reports(job):
+    output = StringIO()
+    options = {"keep": job.params.get("keep", 6), "stdout": output}
+    if job.params.get("borrower_ids"):
+        options["borrower"] = job.params["borrower_ids"]
+    job.set_progress(5, "Archiving")
+    call_command("archive_reports", **options)
+    lines = output.getvalue().strip().splitlines()
+    return {"summary": lines[-1] if lines else ""}
+
+
+@job_handler("explain_slow_query")
+def explain_slow_query(job):
+    from management.slow_queries import explain
+
+    slow_query = SlowQuery.objects.filter(pk=job.params.get("slow_query_id")).first()
+    if slow_query is None:
+        raise JobError("Slow query not found")
+    plan = explain(slow_query.database, job.params.get("sql", ""), job.params.get("params") or [])
+    if plan:
+        SlowQuery.objects.filter(pk=slow_query.pk).update(explain=plan)
+    return {"slow_query_id": slow_query.pk, "explained": bool(plan)}
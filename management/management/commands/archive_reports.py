@@ -0,0 +1,87 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from management.archive import (
+    ARCHIVE_FORMAT,
+    DEFAULT_BATCH_SIZE,
+    archive_report,
+    archived_report_ids,
+    reports_to_archive,
+    restore_report,
+)
+from management.models import Borrower, BorrowerReport
+
+
+class Command(BaseCommand):
+    help = (
+        "Move sheet rows of superseded reports out of the hot tables into per-borrower "
+        "archive files under uploads/archive, or restore them."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--borrower", type=int, action="append", help="Limit to this borrower id (repeatable).")
+        parser.add_argument(
+            "--keep",
+            type=int,
+            default=6,
+            help="Most recent reports per borrower to keep in the hot tables (default: 6).",
+        )
+        parser.add_argument(
+            "--no-month-end",
+            action="store_true",
+            help="Do not keep the last report of each month in the hot tables.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help=f"Rows deleted or restored per transaction (default: {DEFAULT_BATCH_SIZE}).",
+        )
+        parser.add_argument("--dry-run", action="store_true", help="Report what would be archived.")
+        parser.add_argument("--restore", action="store_true", help="Restore archived reports instead.")
+        parser.add_argument("--report", type=int, action="append", help="Report id to restore (repeatable).")
+
+    def handle(self, *args, **options):
+        if options["keep"] < 1:
+            raise CommandError("--keep must be at least 1.")
+        borrower_ids = options["borrower"] or list(Borrower.objects.order_by("id").values_list("id", flat=True))
+
+        if options["restore"]:
+            self._restore(borrower_ids, options)
+            return
+
+        total = 0
+        for borrower_id in borrower_ids:
+            candidates = reports_to_archive(
+                borrower_id,
+                keep=options["keep"],
+                keep_month_ends=not options["no_month_end"],
+            )
+            if not candidates:
+                continue
+            ordered = list(BorrowerReport.objects.filter(borrower_id=borrower_id).order_by("created_at", "id"))
+            following = {report.pk: nxt for report, nxt in zip(ordered, ordered[1:])}
+            for report in candidates:
+                counts = archive_report(
+                    report,
+                    next_report=following.get(report.pk),
+                    batch_size=options["batch_size"],
+                    dry_run=options["dry_run"],
+                )
+                rows = sum(counts.values())
+                total += rows
+                verb = "would archive" if options["dry_run"] else f"archived ({ARCHIVE_FORMAT})"
+                self.stdout.write(f"borrower {borrower_id} report {report.pk}: {verb} {rows} rows")
+        self.stdout.write(self.style.SUCCESS(f"Done: {total} rows"))
+
+    def _restore(self, borrower_ids, options):
+        requested = set(options["report"] or [])
+        total = 0
+        for borrower_id in borrower_ids:
+            for report_id in archived_report_ids(borrower_id):
+                if requested and report_id not in requested:
+                    continue
+                counts = restore_report(borrower_id, report_id, batch_size=options["batch_size"])
+                rows = sum(counts.values())
+                total += rows
+                self.stdout.write(f"borrower {borrower_id} report {report_id}: restored {rows} rows")
+        self.stdout.write(self.style.SUCCESS(f"Done: {total} rows restored"))
@@ -0,0 +1,47 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from management.benchmarks import BENCHMARK_VIEWS, CONCURRENT_VIEWS, run_concurrency_benchmark
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare p50/p95 latency of the dashboards served through the ASGI handler with their "
+        "data loads run one after another against gathered on a thread pool."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--view",
+            action="append",
+            choices=[name for name, _url_name, _params in BENCHMARK_VIEWS],
+            help=f"Benchmark this view (repeatable; default: {', '.join(CONCURRENT_VIEWS)}).",
+        )
+        parser.add_argument("--requests", type=int, default=20, help="Requests per view and mode (default: 20).")
+        parser.add_argument("--concurrency", type=int, default=4, help="Clients sending at once (default: 4).")
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=4,
+            help="DASHBOARD_LOAD_WORKERS for the gathered run (default: 4).",
+        )
+        parser.add_argument("--output", help="Write the results as JSON to this path.")
+
+    def handle(self, *args, **options):
+        if min(options["requests"], options["concurrency"]) < 1 or options["workers"] < 2:
+            raise CommandError("--requests and --concurrency must be at least 1, --workers at least 2.")
+        results = run_concurrency_benchmark(
+            views=options["view"],
+            requests=options["requests"],
+            concurrency=options["concurrency"],
+            workers=options["workers"],
+            log=self.stdout.write,
+        )
+        if not results["results"]:
+            raise CommandError("Nothing was benchmarked; seed data first (manage.py seed_synthetic).")
+        if options["output"]:
+            with open(options["output"], "w") as handle:
+                json.dump(results, handle, indent=2, sort_keys=True)
+            self.stdout.write(f"Results written to {options['output']}")
+        self.stdout.write(self.style.SUCCESS("Done."))
@@ -0,0 +1,32 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from management.benchmarks import run_date_filter_benchmark
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the legacy created_at__date collateral filters with the indexed as_of_date "
+        "filters: median wall time and query plan of each."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--borrowers", type=int, default=3, help="Borrowers sampled (default: 3).")
+        parser.add_argument("--repeat", type=int, default=5, help="Timed runs per query (default: 5).")
+        parser.add_argument("--output", help="Also write the results as JSON to this path.")
+
+    def handle(self, *args, **options):
+        results = run_date_filter_benchmark(borrowers=options["borrowers"], repeat=options["repeat"])
+        if not results["results"]:
+            raise CommandError("No collateral rows to benchmark; seed data first (manage.py seed_synthetic).")
+        for name, entry in results["results"].items():
+            self.stdout.write(self.style.SUCCESS(
+                f"{name}: created_at__date {entry['legacy_ms']}ms -> as_of_date {entry['as_of_ms']}ms "
+                f"({entry['rows']} rows)"
+            ))
+            self.stdout.write(f"  legacy plan:\n    {entry['legacy_plan'].replace(chr(10), chr(10) + '    ')}")
+            self.stdout.write(f"  as-of plan:\n    {entry['as_of_plan'].replace(chr(10), chr(10) + '    ')}")
+        if options["output"]:
+            with open(options["output"], "w") as handle:
+                json.dump(results, handle, indent=2)
@@ -0,0 +1,52 @@
+import json
+import os
+import tempfile
+
+from django.core.management.base import BaseCommand, CommandError
+
+from management.benchmarks import IMPORT_STAGES, run_import_benchmark
+from management.synthetic import write_cora_workbook
+
+
+class Command(BaseCommand):
+    help = "Measure import_cora_xlsx throughput (rows/sec) and peak RSS per importer stage."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--file", help="Workbook to import; omit to generate a synthetic one")
+        parser.add_argument("--rows", type=int, default=1000, help="Rows per sheet when generating (default: 1000).")
+        parser.add_argument("--noise", type=float, default=0.05, help="Noise level when generating (default: 0.05).")
+        parser.add_argument("--seed", type=int, default=42, help="Random seed when generating (default: 42).")
+        parser.add_argument("--keep", action="store_true", help="Commit the imported rows instead of rolling back.")
+        parser.add_argument("--output", help="Also write the results as JSON to this path.")
+
+    def handle(self, *args, **options):
+        path = options["file"]
+        generated = None
+        if not path:
+            handle, generated = tempfile.mkstemp(suffix=".xlsx")
+            os.close(handle)
+            write_cora_workbook(generated, rows_per_sheet=options["rows"], noise=options["noise"], seed_value=options["seed"])
+            path = generated
+        elif not os.path.exists(path):
+            raise CommandError(f"No such file: {path}")
+
+        try:
+            results = run_import_benchmark(
+                path,
+                keep=options["keep"],
+                log=self.stdout.write if options["verbosity"] > 1 else None,
+            )
+        finally:
+            if generated:
+                os.remove(generated)
+
+        self.stdout.write(f"{'stage':<18}{'seconds':>10}{'rows':>10}{'rows/sec':>12}{'peak RSS MB':>14}")
+        for stage in IMPORT_STAGES:
+            row = results["stages"][stage]
+            self.stdout.write(
+                f"{stage:<18}{row['seconds']:>10}{row['rows']:>10}"
+                f"{row['rows_per_sec'] or '—':>12}{row['peak_rss_mb']:>14}"
+            )
+        if options["output"]:
+            with open(options["output"], "w") as handle:
+                json.dump(results, handle, indent=2)
@@ -0,0 +1,73 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from management.benchmarks import (
+    BENCHMARK_VIEWS,
+    BOOK_VIEWS,
+    WALL_BUDGETS_MS,
+    budget_overruns,
+    compare,
+    load_baseline,
+    run_view_benchmarks,
+    write_baseline,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the dashboard views through the test client: wall time, query count, "
+        "model rows loaded and peak Python memory per view."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--borrowers", type=int, default=3, help="Borrowers sampled per view (default: 3).")
+        parser.add_argument("--repeat", type=int, default=3, help="Measured requests per borrower (default: 3).")
+        parser.add_argument(
+            "--view",
+            action="append",
+            choices=[name for name, _url_name, _params in BENCHMARK_VIEWS + BOOK_VIEWS],
+            help="Limit to this view (repeatable).",
+        )
+        parser.add_argument("--output", help="Write the results as a JSON baseline to this path.")
+        parser.add_argument("--compare", help="Baseline JSON to compare against; regressions fail the command.")
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=0.2,
+            help="Allowed relative wall time / memory increase before flagging (default: 0.2).",
+        )
+        parser.add_argument(
+            "--check-budgets",
+            action="store_true",
+            help=(
+                "Fail when a view's median wall time is over its budget "
+                f"({', '.join(f'{name} {ms} ms' for name, ms in WALL_BUDGETS_MS.items())}); "
+                "seed the book at scale first."
+            ),
+        )
+
+    def handle(self, *args, **options):
+        results = run_view_benchmarks(
+            borrowers=options["borrowers"],
+            repeat=options["repeat"],
+            views=options["view"],
+            log=self.stdout.write,
+        )
+        if not results["results"]:
+            raise CommandError("Nothing was benchmarked; seed data first (manage.py seed_synthetic).")
+        if options["output"]:
+            write_baseline(options["output"], results)
+            self.stdout.write(f"Baseline written to {options['output']}")
+        if options["compare"]:
+            regressions = compare(load_baseline(options["compare"]), results, threshold=options["threshold"])
+            if regressions:
+                for line in regressions:
+                    self.stdout.write(self.style.ERROR(line))
+                raise CommandError(f"{len(regressions)} regression(s) against {options['compare']}")
+            self.stdout.write(self.style.SUCCESS("No regressions."))
+        if options["check_budgets"]:
+            overruns = budget_overruns(results)
+            if overruns:
+                for line in overruns:
+                    self.stdout.write(self.style.ERROR(line))
+                raise CommandError(f"{len(overruns)} view(s) over budget")
+            self.stdout.write(self.style.SUCCESS(f"Within budget over {results['meta']['book_borrowers']} borrowers."))
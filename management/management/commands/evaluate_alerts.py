@@ -0,0 +1,34 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from management.alerts import evaluate_rules
+from management.models import AlertRule, Borrower
+
+
+class Command(BaseCommand):
+    help = (
+        "Evaluate the active alert rules against every borrower's latest data and raise "
+        "alerts for new matches. Safe to schedule: a report alerts at most once per rule."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--borrower", type=int, action="append", help="Limit to this borrower id (repeatable).")
+        parser.add_argument("--rule", type=int, action="append", help="Evaluate only this rule id (repeatable).")
+
+    def handle(self, *args, **options):
+        rules = AlertRule.objects.filter(is_active=True).order_by("id")
+        if options["rule"]:
+            rules = rules.filter(pk__in=options["rule"])
+        if not rules.exists():
+            raise CommandError("No active alert rules to evaluate.")
+        borrowers = None
+        if options["borrower"]:
+            borrowers = Borrower.objects.filter(pk__in=options["borrower"])
+
+        started = time.perf_counter()
+        created = evaluate_rules(borrowers=borrowers, rules=rules)
+        elapsed = time.perf_counter() - started
+        for rule, count in created.items():
+            self.stdout.write(f"rule {rule.pk} {rule.name}: {count} new alerts")
+        self.stdout.write(self.style.SUCCESS(f"Done: {sum(created.values())} alerts in {elapsed:.2f}s"))
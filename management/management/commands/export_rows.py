@@ -0,0 +1,71 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from management.db_router import replica_reads
+from management.exports import EXPORT_FORMATS, ExportError, RowExport
+from management.models import Borrower, BorrowerReport
+
+
+class Command(BaseCommand):
+    help = (
+        "Stream one sheet's rows (a *Row table, e.g. ar_aging_row) for a borrower, report "
+        "and/or date range as CSV or NDJSON, to a file or stdout."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("sheet", help="Sheet (row table) to export.")
+        parser.add_argument("--borrower", type=int, help="Borrower id.")
+        parser.add_argument("--report", type=int, help="Report id (limits the export to that report's rows).")
+        parser.add_argument("--start", help="First date to include, YYYY-MM-DD.")
+        parser.add_argument("--end", help="Last date to include, YYYY-MM-DD.")
+        parser.add_argument("--format", choices=sorted(EXPORT_FORMATS), default="csv", help="(default: csv).")
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            help=f"Rows fetched and written at a time (default: {settings.EXPORT_CHUNK_SIZE}).",
+        )
+        parser.add_argument("--output", help="File to write (default: stdout).")
+        parser.add_argument("--primary", action="store_true", help="Read from the primary, not a replica.")
+
+    def handle(self, *args, **options):
+        borrower = report = None
+        if options["borrower"] is not None:
+            borrower = Borrower.objects.filter(pk=options["borrower"]).first()
+            if borrower is None:
+                raise CommandError(f"No borrower {options['borrower']}.")
+        if options["report"] is not None:
+            report = BorrowerReport.objects.filter(pk=options["report"]).first()
+            if report is None:
+                raise CommandError(f"No report {options['report']}.")
+        if options["chunk_size"] is not None and options["chunk_size"] < 1:
+            raise CommandError("--chunk-size must be at least 1.")
+        try:
+            export = RowExport(
+                options["sheet"],
+                borrower=borrower,
+                report=report,
+                start=options["start"],
+                end=options["end"],
+                fmt=options["format"],
+                chunk_size=options["chunk_size"],
+            )
+        except ExportError as exc:
+            raise CommandError(str(exc))
+
+        started = time.perf_counter()
+        with replica_reads(not options["primary"]):
+            if options["output"]:
+                with open(options["output"], "w", newline="", encoding="utf-8") as handle:
+                    for chunk in export.stream():
+                        handle.write(chunk)
+            else:
+                for chunk in export.stream():
+                    self.stdout.write(chunk, ending="")
+        status = f"Done: {export.rows} rows in {time.perf_counter() - started:.2f}s"
+        if options["output"]:
+            self.stdout.write(self.style.SUCCESS(f"{status} -> {options['output']}"))
+        else:
+            # Keep stdout to the export itself.
+            self.stderr.write(status, style_func=self.style.SUCCESS)
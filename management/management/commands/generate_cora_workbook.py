@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from management.synthetic import write_cora_workbook
+
+
+class Command(BaseCommand):
+    help = "Write a synthetic CORA-format XLSX workbook for importer benchmarks."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--output", required=True, help="Path of the XLSX file to write")
+        parser.add_argument("--rows", type=int, default=100, help="Data rows per sheet (default: 100).")
+        parser.add_argument(
+            "--noise",
+            type=float,
+            default=0.05,
+            help="Per-cell probability of each noise kind, 0-1 (default: 0.05).",
+        )
+        parser.add_argument("--seed", type=int, default=42, help="Random seed (default: 42).")
+        parser.add_argument(
+            "--no-group-headers",
+            action="store_true",
+            help="Only add group-header rows where the real workbook has them.",
+        )
+
+    def handle(self, *args, **options):
+        if not 0 <= options["noise"] <= 1:
+            raise CommandError("--noise must be between 0 and 1.")
+        path = write_cora_workbook(
+            options["output"],
+            rows_per_sheet=options["rows"],
+            noise=options["noise"],
+            seed_value=options["seed"],
+            group_headers=not options["no_group_headers"],
+        )
+        self.stdout.write(self.style.SUCCESS(f"Wrote {path}"))
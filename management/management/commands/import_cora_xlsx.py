@@ -2,6 +2,7 @@ from collections import defaultdict
 import datetime as dt
 import math
 import re
+import time
 from decimal import Decimal
 
 import pandas as pd
@@ -9,6 +10,13 @@ from django.core.management.base import BaseCommand
 from django.db import transaction
 from django.utils.timezone import now
 
+from management.metrics import (
+    IMPORT_PUBLISH_SECONDS,
+    IMPORT_SHEET_ROWS,
+    IMPORT_SHEET_SECONDS,
+    IMPORT_SHEET_THROUGHPUT,
+    registry as metrics_registry,
+)
 from management.models import (
     Company,
     Borrower,
@@ -62,6 +70,10 @@ from management.models import (
     CollateralLimitsRow,
     IneligiblesRow,
 )
+from management.alerts import evaluate_rules
+from management.risk_scorecard import refresh_risk_scorecard
+from management.snapshots import write_report_snapshot
+from management.staging import ImportStaging
 
 
 
@@ -364,8 +376,12 @@ def apply_header_aliases(columns, model_fields):
     return renamed
 
 
-def read_sheet_df(xlsx_path, sheet_name, model_cls, header_hint=None):
-    raw = pd.read_excel(xlsx_path, sheet_name=sheet_name, header=None, dtype=object)
+def read_raw_sheet(xlsx_path, sheet_name):
+    return pd.read_excel(xlsx_path, sheet_name=sheet_name, header=None, dtype=object)
+
+
+def frame_from_raw(raw, model_cls, header_hint=None):
+    """Detect the header row(s) of a raw sheet and return its data frame."""
     expected = expected_headers_for_model(model_cls)
     max_scan = min(12, len(raw))
 
@@ -427,9 +443,13 @@ def read_sheet_df(xlsx_path, sheet_name, model_cls, header_hint=None):
     }
 
 
-def import_sheet_rows(model_cls, df, report, borrower=None, debug=False, debug_limit=10):
+def read_sheet_df(xlsx_path, sheet_name, model_cls, header_hint=None):
+    return frame_from_raw(read_raw_sheet(xlsx_path, sheet_name), model_cls, header_hint=header_hint)
+
+
+def build_sheet_objects(model_cls, df, report, borrower=None, debug=False, debug_limit=10):
     """
-    Generic importer:
+    Convert sheet rows into unsaved model instances:
     - Only sets fields that exist on model
     - Converts types for Date/Decimal/Int where needed
     """
@@ -448,7 +468,7 @@ def import_sheet_rows(model_cls, df, report, borrower=None, debug=False, debug_l
         f for f in required_fields if f not in df.columns
     ]
     if missing_required_columns:
-        return 0, len(df), {"missing_required_columns": len(df)}, []
+        return [], len(df), {"missing_required_columns": len(df)}, []
 
     objs = []
     skipped = 0
@@ -508,29 +528,97 @@ def import_sheet_rows(model_cls, df, report, borrower=None, debug=False, debug_l
         if row_errors and debug and len(debug_messages) < debug_limit:
             debug_messages.append(f"Row {row_idx + 1}: {', '.join(row_errors)}")
 
+        if report is not None and model_cls in REPORT_DATED_MODELS and data.get("as_of_date") is None:
+            data["as_of_date"] = report.report_date
+
         objs.append(model_cls(**data))
 
-    if objs:
-        model_cls.objects.bulk_create(objs, batch_size=1000)
+    return objs, skipped, reasons, debug_messages
+
+
+SHEET_MODEL_MAP = {
+    "Collateral Overview": CollateralOverviewRow,
+    "Machinery & Equipment ": MachineryEquipmentRow,
+    "Aging Composition": AgingCompositionRow,
+    "AR_Metrics": ARMetricsRow,
+    "Top20_By_Total_AR": Top20ByTotalARRow,
+    "Top20_By_PastDue": Top20ByPastDueRow,
+    "Ineligible_Trend": IneligibleTrendRow,
+    "Ineligible_Overview": IneligibleOverviewRow,
+    "Concentration_ADO_DSO": ConcentrationADODSORow,
+
+    "FG_Inventory_Metrics": FGInventoryMetricsRow,
+    "FG_Ineligible_detail": FGIneligibleDetailRow,
+    "FG_Composition": FGCompositionRow,
+    "FG_Inline_Category_Analysis": FGInlineCategoryAnalysisRow,
+    "Sales_GM_Trend": SalesGMTrendRow,
+    "FG_Inline_Excess_By_Category": FGInlineExcessByCategoryRow,
+    "Historical_Top_20_SKUs": HistoricalTop20SKUsRow,
+
+    "RM_Inventory_Metrics": RMInventoryMetricsRow,
+    "RM_Ineligible_Overview": RMIneligibleOverviewRow,
+    "RM_Category_History": RMCategoryHistoryRow,
+    "RM_Top20_History": RMTop20HistoryRow,
+
+    "WIP_Inventory_Metrics": WIPInventoryMetricsRow,
+    "WIP_Ineligible_Overview": WIPIneligibleOverviewRow,
+    "WIP_Category_History": WIPCategoryHistoryRow,
+    "WIP_Top20_History": WIPTop20HistoryRow,
+
+    "FG_Gross_Recovery_History": FGGrossRecoveryHistoryRow,
+    "WIP_Recovery": WIPRecoveryRow,
+    "Raw_Material_Recovery": RawMaterialRecoveryRow,
+
+    "NOLV_Table": NOLVTableRow,
+    "Risk_Subfactors": RiskSubfactorsRow,
+    "Composite_Index": CompositeIndexRow,
+
+    "Forecast": ForecastRow,
+    "Availability Forecast": AvailabilityForecastRow,
+    "Cash Flow Forecast": CashFlowForecastRow,
+    "Cash Forecast": CashForecastRow,
+
+    "Current Week Variance": CurrentWeekVarianceRow,
+    "Cummulative Variance": CummulativeVarianceRow,
+
+    "Collateral Limits ": CollateralLimitsRow,
+    "Ineligibles": IneligiblesRow,
+}
+
+HEADER_HINTS = {
+    "Cash Flow Forecast": 1,
+    "Cash Forecast": 1,
+    "Availability Forecast": 1,
+}
 
-    return len(objs), skipped, reasons, debug_messages
+# Sheets without a date column of their own; their rows are dated with the
+# report's report_date so views can filter on an indexed business date.
+REPORT_DATED_MODELS = (CollateralOverviewRow,)
 
 
 class Command(BaseCommand):
     help = "Import CORA multi-sheet XLSX into Postgres using BorrowerReport + *Row models"
 
+    # Set by management.jobs: called as progress(percent, message) once per sheet.
+    progress = None
+    # The published BorrowerReport, for callers running the command in-process.
+    report = None
+
     def add_arguments(self, parser):
         parser.add_argument("--file", required=True, help="Path to XLSX file")
         parser.add_argument("--source-file", default="", help="Original filename (optional)")
         parser.add_argument("--report-date", default="", help="YYYY-MM-DD (optional)")
         parser.add_argument("--debug", action="store_true", help="Verbose import logging")
 
-    @transaction.atomic
     def handle(self, *args, **opts):
         xlsx_path = opts["file"]
         source_file = opts["source_file"] or xlsx_path.split("/")[-1]
         debug = opts.get("debug", False)
 
+        # Everything up to the publish step runs with no transaction open:
+        # rows are parsed, converted and written to per-import staging tables
+        # that no reader can see (management.staging).
+
         # ---------------------------
         # 1) Borrower Overview (special format)
         # ---------------------------
@@ -544,6 +632,147 @@ class Command(BaseCommand):
         if not company_id:
             raise Exception("Borrower Overview sheet missing Company ID")
 
+        # report_date preference: CLI -> Current Update -> today
+        report_date = opts["report_date"]
+        report_date = pd.to_datetime(report_date).date() if report_date else (to_date(overview.get("Current Update")) or now().date())
+
+        # Saved, with its borrower, only when the staged rows are published.
+        report = BorrowerReport(source_file=source_file, report_date=report_date)
+
+        with ImportStaging() as staging:
+            # also store Borrower Overview into borrower_overview table
+            bo_df = pd.read_excel(xlsx_path, sheet_name="Borrower Overview", header=1).dropna(how="all")
+            bo_df.columns = [normalize_header(c) for c in bo_df.columns]
+            objs, _skipped, _reasons, _debug_msgs = build_sheet_objects(BorrowerOverviewRow, bo_df, report, debug=debug)
+            staging.stage(BorrowerOverviewRow, objs)
+
+            # ---------------------------
+            # 2) Map other sheets -> models
+            # ---------------------------
+            workbook = pd.ExcelFile(xlsx_path)
+            for sheet in workbook.sheet_names:
+                if sheet == "Borrower Overview":
+                    continue
+                if sheet not in SHEET_MODEL_MAP:
+                    if ">>>" in sheet:
+                        if debug:
+                            self.stdout.write(f"Skipping section marker sheet: {sheet}")
+                    else:
+                        self.stdout.write(f"Skipping unmapped sheet: {sheet}")
+                    continue
+
+            summary = []
+
+            for position, (sheet, model_cls) in enumerate(SHEET_MODEL_MAP.items()):
+                if self.progress:
+                    # Publishing takes the last few percent.
+                    self.progress(90 * position // len(SHEET_MODEL_MAP), f"Reading {sheet.strip()}")
+                if sheet not in workbook.sheet_names:
+                    self.stdout.write(f"Missing sheet in workbook: {sheet}")
+                    continue
+                started = time.perf_counter()
+                try:
+                    df, meta = read_sheet_df(
+                        workbook,
+                        sheet,
+                        model_cls,
+                        header_hint=HEADER_HINTS.get(sheet),
+                    )
+                except Exception as exc:
+                    self.stdout.write(f"{sheet}: failed to read ({exc})")
+                    continue
+
+                if df.empty:
+                    summary.append(
+                        {
+                            "sheet": sheet,
+                            "model": model_cls.__name__,
+                            "imported": 0,
+                            "skipped": 0,
+                            "header_rows": meta.get("header_rows"),
+                            "data_start": meta.get("data_start_row"),
+                        }
+                    )
+                    continue
+
+                if debug:
+                    self.stdout.write(f"{sheet}: detected columns {meta.get('columns')}")
+                    model_fields = sorted(get_model_fields(model_cls))
+                    used_columns = sorted(
+                        c for c in meta.get("columns", []) if c in model_fields
+                    )
+                    self.stdout.write(f"{sheet}: used columns {used_columns}")
+
+                objs, skipped, reasons, debug_msgs = build_sheet_objects(
+                    model_cls,
+                    df,
+                    report,
+                    debug=debug,
+                )
+                imported = staging.stage(model_cls, objs)
+
+                if debug_msgs:
+                    for msg in debug_msgs:
+                        self.stdout.write(f"{sheet}: {msg}")
+
+                if reasons and skipped:
+                    self.stdout.write(f"{sheet}: skipped reasons {dict(reasons)}")
+
+                elapsed = time.perf_counter() - started
+                IMPORT_SHEET_ROWS.inc(imported, sheet=sheet)
+                IMPORT_SHEET_SECONDS.observe(elapsed, sheet=sheet)
+                if elapsed > 0:
+                    IMPORT_SHEET_THROUGHPUT.observe(imported / elapsed, sheet=sheet)
+
+                summary.append(
+                    {
+                        "sheet": sheet,
+                        "model": model_cls.__name__,
+                        "imported": imported,
+                        "skipped": skipped,
+                        "header_rows": meta.get("header_rows"),
+                        "data_start": meta.get("data_start_row"),
+                    }
+                )
+
+            # ---------------------------
+            # 3) Publish: the only transaction of the import
+            # ---------------------------
+            if self.progress:
+                self.progress(90, "Publishing")
+            started = time.perf_counter()
+            with transaction.atomic():
+                borrower = self._borrower(overview, company_id)
+                report.borrower = borrower
+                report.save()
+                published = staging.publish(report, borrower)
+                refresh_risk_scorecard(borrower, report=report)
+                transaction.on_commit(lambda: write_report_snapshot(report))
+                transaction.on_commit(evaluate_rules)
+            publish_seconds = time.perf_counter() - started
+        self.report = report
+        IMPORT_PUBLISH_SECONDS.observe(publish_seconds)
+        metrics_registry.flush()
+
+        if summary:
+            self.stdout.write("Import summary:")
+            for row in summary:
+                self.stdout.write(
+                    f"{row['sheet']} | {row['model']} | imported={row['imported']} "
+                    f"| skipped={row['skipped']} | header_row={row['header_rows']} "
+                    f"| data_start={row['data_start']}"
+                )
+
+        self.stdout.write(
+            f"Published {sum(published.values())} rows in {publish_seconds * 1000:.0f} ms"
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"✅ Imported XLSX into report_id={report.id} for borrower_id={borrower.id}"
+            )
+        )
+
+    def _borrower(self, overview, company_id):
         company, _ = Company.objects.get_or_create(
             company_id=company_id,
             defaults={
@@ -578,167 +807,4 @@ class Command(BaseCommand):
                 specific_individual=str(si_name) if si_name else None,
                 specific_id=to_int(si_id),
             )
-
-        # report_date preference: CLI -> Current Update -> today
-        report_date = opts["report_date"]
-        report_date = pd.to_datetime(report_date).date() if report_date else (to_date(overview.get("Current Update")) or now().date())
-
-        report = BorrowerReport.objects.create(
-            borrower=borrower,
-            source_file=source_file,
-            report_date=report_date,
-        )
-
-        # also store Borrower Overview into borrower_overview table
-        bo_df = pd.read_excel(xlsx_path, sheet_name="Borrower Overview", header=1).dropna(how="all")
-        bo_df.columns = [normalize_header(c) for c in bo_df.columns]
-        import_sheet_rows(BorrowerOverviewRow, bo_df, report, borrower=borrower, debug=debug)
-
-        # ---------------------------
-        # 2) Map other sheets -> models
-        # ---------------------------
-        sheet_model_map = {
-            "Collateral Overview": CollateralOverviewRow,
-            "Machinery & Equipment ": MachineryEquipmentRow,
-            "Aging Composition": AgingCompositionRow,
-            "AR_Metrics": ARMetricsRow,
-            "Top20_By_Total_AR": Top20ByTotalARRow,
-            "Top20_By_PastDue": Top20ByPastDueRow,
-            "Ineligible_Trend": IneligibleTrendRow,
-            "Ineligible_Overview": IneligibleOverviewRow,
-            "Concentration_ADO_DSO": ConcentrationADODSORow,
-
-            "FG_Inventory_Metrics": FGInventoryMetricsRow,
-            "FG_Ineligible_detail": FGIneligibleDetailRow,
-            "FG_Composition": FGCompositionRow,
-            "FG_Inline_Category_Analysis": FGInlineCategoryAnalysisRow,
-            "Sales_GM_Trend": SalesGMTrendRow,
-            "FG_Inline_Excess_By_Category": FGInlineExcessByCategoryRow,
-            "Historical_Top_20_SKUs": HistoricalTop20SKUsRow,
-
-            "RM_Inventory_Metrics": RMInventoryMetricsRow,
-            "RM_Ineligible_Overview": RMIneligibleOverviewRow,
-            "RM_Category_History": RMCategoryHistoryRow,
-            "RM_Top20_History": RMTop20HistoryRow,
-
-            "WIP_Inventory_Metrics": WIPInventoryMetricsRow,
-            "WIP_Ineligible_Overview": WIPIneligibleOverviewRow,
-            "WIP_Category_History": WIPCategoryHistoryRow,
-            "WIP_Top20_History": WIPTop20HistoryRow,
-
-            "FG_Gross_Recovery_History": FGGrossRecoveryHistoryRow,
-            "WIP_Recovery": WIPRecoveryRow,
-            "Raw_Material_Recovery": RawMaterialRecoveryRow,
-
-            "NOLV_Table": NOLVTableRow,
-            "Risk_Subfactors": RiskSubfactorsRow,
-            "Composite_Index": CompositeIndexRow,
-
-            "Forecast": ForecastRow,
-            "Availability Forecast": AvailabilityForecastRow,
-            "Cash Flow Forecast": CashFlowForecastRow,
-            "Cash Forecast": CashForecastRow,
-
-            "Current Week Variance": CurrentWeekVarianceRow,
-            "Cummulative Variance": CummulativeVarianceRow,
-
-            "Collateral Limits ": CollateralLimitsRow,
-            "Ineligibles": IneligiblesRow,
-        }
-
-        header_hints = {
-            "Cash Flow Forecast": 1,
-            "Cash Forecast": 1,
-            "Availability Forecast": 1,
-        }
-
-        workbook = pd.ExcelFile(xlsx_path)
-        for sheet in workbook.sheet_names:
-            if sheet == "Borrower Overview":
-                continue
-            if sheet not in sheet_model_map:
-                if ">>>" in sheet:
-                    if debug:
-                        self.stdout.write(f"Skipping section marker sheet: {sheet}")
-                else:
-                    self.stdout.write(f"Skipping unmapped sheet: {sheet}")
-                continue
-
-        summary = []
-
-        for sheet, model_cls in sheet_model_map.items():
-            if sheet not in workbook.sheet_names:
-                self.stdout.write(f"Missing sheet in workbook: {sheet}")
-                continue
-            try:
-                df, meta = read_sheet_df(
-                    xlsx_path,
-                    sheet,
-                    model_cls,
-                    header_hint=header_hints.get(sheet),
-                )
-            except Exception as exc:
-                self.stdout.write(f"{sheet}: failed to read ({exc})")
-                continue
-
-            if df.empty:
-                summary.append(
-                    {
-                        "sheet": sheet,
-                        "model": model_cls.__name__,
-                        "imported": 0,
-                        "skipped": 0,
-                        "header_rows": meta.get("header_rows"),
-                        "data_start": meta.get("data_start_row"),
-                    }
-                )
-                continue
-
-            if debug:
-                self.stdout.write(f"{sheet}: detected columns {meta.get('columns')}")
-                model_fields = sorted(get_model_fields(model_cls))
-                used_columns = sorted(
-                    c for c in meta.get("columns", []) if c in model_fields
-                )
-                self.stdout.write(f"{sheet}: used columns {used_columns}")
-
-            imported, skipped, reasons, debug_msgs = import_sheet_rows(
-                model_cls,
-                df,
-                report,
-                borrower=borrower,
-                debug=debug,
-            )
-
-            if debug_msgs:
-                for msg in debug_msgs:
-                    self.stdout.write(f"{sheet}: {msg}")
-
-            if reasons and skipped:
-                self.stdout.write(f"{sheet}: skipped reasons {dict(reasons)}")
-
-            summary.append(
-                {
-                    "sheet": sheet,
-                    "model": model_cls.__name__,
-                    "imported": imported,
-                    "skipped": skipped,
-                    "header_rows": meta.get("header_rows"),
-                    "data_start": meta.get("data_start_row"),
-                }
-            )
-
-        if summary:
-            self.stdout.write("Import summary:")
-            for row in summary:
-                self.stdout.write(
-                    f"{row['sheet']} | {row['model']} | imported={row['imported']} "
-                    f"| skipped={row['skipped']} | header_row={row['header_rows']} "
-                    f"| data_start={row['data_start']}"
-                )
-
-        self.stdout.write(
-            self.style.SUCCESS(
-                f"✅ Imported XLSX into report_id={report.id} for borrower_id={borrower.id}"
-            )
-        )
+        return borrower
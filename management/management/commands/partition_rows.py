@@ -0,0 +1,110 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from management.partitioning import (
+    convert_table,
+    detach_partitions,
+    extend_partitions,
+    is_partitioned,
+    list_partitions,
+    partition_config,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Manage Postgres partitioning of the large sheet tables configured in "
+        "settings.ROW_TABLE_PARTITIONING."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "action",
+            choices=["status", "convert", "extend", "detach", "explain"],
+            help=(
+                "status: list partitions; convert: rebuild tables as partitioned (offline: "
+                "each table is locked against reads and writes for its whole copy, so "
+                "schedule downtime); "
+                "extend: create upcoming monthly partitions; detach: detach old monthly "
+                "partitions; explain: EXPLAIN ANALYZE a borrower-scoped read."
+            ),
+        )
+        parser.add_argument("--table", action="append", help="Limit to this table (repeatable).")
+        parser.add_argument(
+            "--months-ahead",
+            type=int,
+            default=3,
+            help="Monthly partitions to keep created ahead of today (default: 3).",
+        )
+        parser.add_argument(
+            "--keep-months",
+            type=int,
+            default=24,
+            help="Months of range partitions to keep attached when detaching (default: 24).",
+        )
+        parser.add_argument(
+            "--archive-schema",
+            help="Move detached partitions into this schema instead of leaving them in public.",
+        )
+        parser.add_argument("--borrower", type=int, help="Borrower id used by the explain action.")
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("Table partitioning requires PostgreSQL.")
+
+        try:
+            config = partition_config()
+        except ValueError as exc:
+            raise CommandError(str(exc))
+        tables = options["table"] or list(config)
+        unknown = [table for table in tables if table not in config]
+        if unknown:
+            raise CommandError(f"Not configured for partitioning: {', '.join(unknown)}")
+
+        action = options["action"]
+        for table in tables:
+            spec = config[table]
+            if action == "status":
+                self._status(table, spec)
+            elif action == "convert":
+                if is_partitioned(table):
+                    self.stdout.write(f"skip  {table}: already partitioned")
+                    continue
+                convert_table(table, spec, options["months_ahead"], log=self.stdout.write)
+            elif action == "explain":
+                self._explain(table, options["borrower"])
+            elif not is_partitioned(table):
+                self.stdout.write(f"skip  {table}: not partitioned (run convert first)")
+            elif action == "extend":
+                created = extend_partitions(table, spec, options["months_ahead"])
+                self.stdout.write(f"{table}: {len(created)} partition(s) created {', '.join(created)}".rstrip())
+            elif action == "detach":
+                detached = detach_partitions(
+                    table,
+                    spec,
+                    options["keep_months"],
+                    archive_schema=options["archive_schema"],
+                )
+                self.stdout.write(f"{table}: {len(detached)} partition(s) detached {', '.join(detached)}".rstrip())
+
+    def _status(self, table, spec):
+        if not is_partitioned(table):
+            self.stdout.write(f"{table}: not partitioned (configured: {spec['strategy']} on {spec['column']})")
+            return
+        partitions = list_partitions(table)
+        self.stdout.write(f"{table}: {spec['strategy']} on {spec['column']}, {len(partitions)} partition(s)")
+        for name, bound in partitions:
+            self.stdout.write(f"  {name}\t{bound}")
+
+    def _explain(self, table, borrower_id):
+        if borrower_id is None:
+            raise CommandError("--borrower is required for explain.")
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'EXPLAIN (ANALYZE, BUFFERS) SELECT * FROM "{table}" '
+                f'WHERE "borrower_id" = %s ORDER BY "id" DESC LIMIT 100',
+                [borrower_id],
+            )
+            self.stdout.write(f"-- {table}")
+            for (line,) in cursor.fetchall():
+                self.stdout.write(line)
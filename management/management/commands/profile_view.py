@@ -0,0 +1,67 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import NoReverseMatch, reverse
+
+from management.benchmarks import _benchmark_client, _select_borrower
+from management.models import Borrower
+from management.profiling import DEFAULT_TOP, VIEWS_PATH, profile_call, write_profile
+
+
+class Command(BaseCommand):
+    help = (
+        "Run one dashboard view for a borrower under cProfile and write collapsed stacks "
+        "(for flamegraph tools) plus a top-N summary of management/views functions."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("view", help="URL name of the view, e.g. collateral_dynamic, dashboard, collateral_static.")
+        parser.add_argument("--borrower", type=int, required=True, help="Borrower id to select.")
+        parser.add_argument("--section", help="Value for the ?section= query parameter.")
+        parser.add_argument(
+            "--param",
+            action="append",
+            default=[],
+            metavar="KEY=VALUE",
+            help="Extra query parameter (repeatable), e.g. --param inventory_tab=finished_goods.",
+        )
+        parser.add_argument("--top", type=int, default=DEFAULT_TOP, help=f"Functions in the summary (default: {DEFAULT_TOP}).")
+        parser.add_argument("--all-functions", action="store_true", help="Rank every function, not only management/views.")
+        parser.add_argument("--output-dir", help="Where to write the files (default: settings.PROFILE_OUTPUT_ROOT).")
+        parser.add_argument("--warmup", type=int, default=1, help="Unprofiled requests run first (default: 1).")
+
+    def handle(self, *args, **options):
+        try:
+            url = reverse(options["view"])
+        except NoReverseMatch:
+            raise CommandError(f"Unknown view '{options['view']}'.")
+        borrower = Borrower.objects.filter(pk=options["borrower"]).first()
+        if borrower is None:
+            raise CommandError(f"Borrower {options['borrower']} does not exist.")
+
+        params = {}
+        if options["section"]:
+            params["section"] = options["section"]
+        for raw in options["param"]:
+            key, sep, value = raw.partition("=")
+            if not sep or not key:
+                raise CommandError(f"--param expects KEY=VALUE, got '{raw}'.")
+            params[key] = value
+
+        client = _benchmark_client()
+        _select_borrower(client, borrower)
+        for _ in range(options["warmup"]):
+            client.get(url, params)
+
+        response, stats = profile_call(client.get, url, params)
+        if response.status_code != 200:
+            raise CommandError(f"{url} returned {response.status_code}")
+
+        collapsed_path, summary_path, summary = write_profile(
+            f"{options['view']}-{borrower.pk}",
+            stats,
+            title=f"{options['view']} borrower={borrower.pk} params={params}",
+            top=options["top"],
+            path_prefix=None if options["all_functions"] else VIEWS_PATH,
+            output_dir=options["output_dir"],
+        )
+        self.stdout.write(summary)
+        self.stdout.write(self.style.SUCCESS(f"Collapsed stacks: {collapsed_path}\nSummary: {summary_path}"))
@@ -0,0 +1,81 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from management.models import Borrower
+from management.scenarios import OPERATIONS, SCENARIO_FIELDS, SCOPES, ScenarioError, run_scenario
+
+
+def _parse_override(text):
+    override = {}
+    for part in text.split(","):
+        name, sep, value = part.partition("=")
+        if not sep:
+            raise CommandError(f"Bad --override part {part!r}; expected name=value.")
+        override[name.strip()] = value.strip()
+    return override
+
+
+class Command(BaseCommand):
+    help = (
+        "Evaluate a what-if scenario against every borrower's latest report and print "
+        "the availability deltas. Nothing is written."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--override",
+            action="append",
+            default=[],
+            help=(
+                "Override as comma-separated name=value pairs, e.g. "
+                "'field=advanced_rate,change=-5,main_type=Inventory' (repeatable). "
+                f"Fields: {', '.join(SCENARIO_FIELDS)}; operations: {', '.join(OPERATIONS)}; "
+                f"scopes: {', '.join(SCOPES)}."
+            ),
+        )
+        parser.add_argument("--file", help="JSON file holding a list of overrides.")
+        parser.add_argument("--borrower", type=int, action="append", help="Limit to this borrower id (repeatable).")
+        parser.add_argument("--json", action="store_true", help="Print the full result as JSON.")
+        parser.add_argument("--no-cache", action="store_true", help="Recompute even if the result is cached.")
+
+    def handle(self, *args, **options):
+        overrides = [_parse_override(text) for text in options["override"]]
+        if options["file"]:
+            try:
+                with open(options["file"], encoding="utf-8") as handle:
+                    loaded = json.load(handle)
+            except (OSError, ValueError) as exc:
+                raise CommandError(f"Cannot read {options['file']}: {exc}")
+            if not isinstance(loaded, list):
+                raise CommandError("--file must hold a JSON list of overrides.")
+            overrides.extend(loaded)
+        if not overrides:
+            raise CommandError("Give at least one --override or --file.")
+
+        borrowers = Borrower.objects.all()
+        if options["borrower"]:
+            borrowers = borrowers.filter(pk__in=options["borrower"])
+        try:
+            result = run_scenario(overrides, borrowers=borrowers, use_cache=not options["no_cache"])
+        except ScenarioError as exc:
+            raise CommandError(str(exc))
+
+        if options["json"]:
+            self.stdout.write(json.dumps(result, indent=2))
+            return
+        for row in result["borrowers"]:
+            if not row["affected"]:
+                continue
+            self.stdout.write(
+                f"borrower {row['borrower_id']} report {row['report_id']}: "
+                f"availability {row['baseline_availability']} -> {row['scenario_availability']} "
+                f"({row['availability_delta']})"
+            )
+        portfolio = result["portfolio"]
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Portfolio availability {portfolio['baseline_availability']} -> "
+                f"{portfolio['scenario_availability']} ({portfolio['availability_delta']})"
+            )
+        )
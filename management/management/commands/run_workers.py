@@ -0,0 +1,84 @@
+import signal
+import threading
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from management.jobs import JOB_HANDLERS, requeue_stale, work, worker_name
+from management.metrics import registry as metrics_registry
+
+
+class Command(BaseCommand):
+    help = (
+        "Run background jobs (imports, exports, cache warming, archival) from the job table. "
+        "Start as many of these as you like; workers share the queue through row locks."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=2,
+            help="Jobs to run at once in this process, one thread each (default: 2).",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=1.0,
+            help="Seconds an idle worker waits before looking for work again (default: 1.0).",
+        )
+        parser.add_argument(
+            "--kind",
+            action="append",
+            choices=sorted(JOB_HANDLERS),
+            help="Only run jobs of this kind (repeatable).",
+        )
+        parser.add_argument("--burst", action="store_true", help="Exit once no job is due instead of waiting.")
+
+    def handle(self, *args, **options):
+        concurrency = options["concurrency"]
+        if concurrency < 1:
+            raise CommandError("--concurrency must be at least 1.")
+        requeued = requeue_stale()
+        if requeued:
+            self.stdout.write(f"Requeued {requeued} stale jobs")
+
+        stop = threading.Event()
+        kwargs = {
+            "stop": stop,
+            "burst": options["burst"],
+            "poll_interval": options["poll_interval"],
+            "kinds": options["kind"],
+        }
+        started = time.perf_counter()
+        if concurrency == 1:
+            done = work(worker_name(), **kwargs)
+        else:
+            done = self._run_threads(concurrency, stop, kwargs)
+        metrics_registry.flush()
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f"Done: {done} jobs in {elapsed:.2f}s"))
+
+    def _run_threads(self, concurrency, stop, kwargs):
+        counts = [0] * concurrency
+
+        def target(index):
+            counts[index] = work(worker_name(index), **kwargs)
+
+        threads = [threading.Thread(target=target, args=(index,), daemon=True) for index in range(concurrency)]
+        previous = signal.signal(signal.SIGTERM, lambda *_args: stop.set())
+        try:
+            for thread in threads:
+                thread.start()
+            # Poll so Ctrl-C reaches the main thread; running jobs finish first.
+            while any(thread.is_alive() for thread in threads):
+                for thread in threads:
+                    thread.join(timeout=0.5)
+        except KeyboardInterrupt:
+            self.stdout.write("Stopping after the running jobs finish...")
+            stop.set()
+            for thread in threads:
+                thread.join()
+        finally:
+            signal.signal(signal.SIGTERM, previous)
+        return sum(counts)
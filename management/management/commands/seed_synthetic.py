@@ -0,0 +1,49 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from management.models import BorrowerReport
+from management.snapshots import write_report_snapshot
+from management.synthetic import seed
+
+
+class Command(BaseCommand):
+    help = "Generate deterministic synthetic borrowers, reports and rows for every sheet model."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--borrowers", type=int, default=10, help="Borrowers to create (default: 10).")
+        parser.add_argument("--reports", type=int, default=3, help="Monthly reports per borrower (default: 3).")
+        parser.add_argument(
+            "--rows-per-sheet",
+            type=int,
+            default=5,
+            help="Rows per sheet model per report (default: 5).",
+        )
+        parser.add_argument("--seed", type=int, default=42, help="Random seed (default: 42).")
+        parser.add_argument("--batch-size", type=int, default=1000, help="bulk_create batch size (default: 1000).")
+        parser.add_argument(
+            "--snapshots",
+            action="store_true",
+            help="Also write the columnar snapshot of each borrower's latest report.",
+        )
+
+    def handle(self, *args, **options):
+        if min(options["borrowers"], options["reports"], options["rows_per_sheet"]) < 1:
+            raise CommandError("--borrowers, --reports and --rows-per-sheet must be positive.")
+        borrower_ids, total = seed(
+            borrowers=options["borrowers"],
+            reports=options["reports"],
+            rows_per_sheet=options["rows_per_sheet"],
+            seed_value=options["seed"],
+            batch_size=options["batch_size"],
+            log=self.stdout.write if options["verbosity"] > 1 else None,
+        )
+        if options["snapshots"]:
+            for borrower_id in borrower_ids:
+                report = (
+                    BorrowerReport.objects.filter(borrower_id=borrower_id)
+                    .order_by("-report_date", "-created_at", "-id")
+                    .first()
+                )
+                write_report_snapshot(report)
+        self.stdout.write(
+            self.style.SUCCESS(f"Seeded {len(borrower_ids)} borrowers with {total} sheet rows")
+        )
@@ -0,0 +1,305 @@
+"""
+In-process metrics registry with Prometheus text exposition.
+
+Every process keeps its own counters and histograms in memory. When
+settings.METRICS_DIR is set, each process also dumps them to
+<METRICS_DIR>/<pid>-<start>.json (at most once per METRICS_FLUSH_INTERVAL
+seconds, and at exit), and the exposition merges all files. That is how
+gunicorn workers and management commands such as import_cora_xlsx end up on
+the same /metrics/ page. The start stamp keeps a reused PID from
+overwriting an older process's file. On collection, the files of processes
+that have exited are folded into archive.json and deleted, so their
+counters stay in the totals while the directory stays one file per live
+process.
+"""
+import atexit
+import json
+import math
+import os
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (1, 5, 10, 20, 30, 50, 80, 120, 200, 500)
+THROUGHPUT_BUCKETS = (10, 100, 500, 1_000, 5_000, 10_000, 50_000, 100_000)
+SIZE_BUCKETS = (10_000, 100_000, 500_000, 1_000_000, 5_000_000, 20_000_000, 100_000_000)
+ARCHIVE_NAME = "archive.json"
+
+
+class Metric:
+    kind = None
+
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help_text = help_text
+        self.labels = tuple(labels)
+
+    def _key(self, labels):
+        return tuple(str(labels.get(label, "")) for label in self.labels)
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        registry.add(self, self._key(labels), amount)
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name, help_text, labels=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, **labels):
+        registry.add(self, self._key(labels), value)
+
+
+class Registry:
+    def __init__(self):
+        self.metrics = {}
+        self.values = {}
+        self._lock = threading.Lock()
+        # Request threads and dashboard load threads flush through one temp file.
+        self._flush_lock = threading.Lock()
+        self._last_flush = 0.0
+        self._pid = None
+        self._started = None
+
+    def register(self, metric):
+        self.metrics[metric.name] = metric
+        return metric
+
+    def add(self, metric, key, value):
+        with self._lock:
+            series = self.values.setdefault(metric.name, {})
+            if metric.kind == "counter":
+                series[key] = series.get(key, 0) + value
+            else:
+                state = series.setdefault(key, {"buckets": [0] * len(metric.buckets), "sum": 0.0, "count": 0})
+                for position, bound in enumerate(metric.buckets):
+                    if value <= bound:
+                        state["buckets"][position] += 1
+                state["sum"] += value
+                state["count"] += 1
+        self.maybe_flush()
+
+    def reset(self):
+        with self._lock:
+            self.values = {}
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                name: [[list(key), value] for key, value in series.items()]
+                for name, series in self.values.items()
+            }
+
+    def maybe_flush(self):
+        interval = getattr(settings, "METRICS_FLUSH_INTERVAL", 5)
+        if time.monotonic() - self._last_flush >= interval:
+            self.flush()
+
+    def flush(self):
+        directory = metrics_dir()
+        if directory is None or not self.values:
+            return
+        directory.mkdir(parents=True, exist_ok=True)
+        with self._flush_lock:
+            path = directory / f"{self._file_stem()}.json"
+            tmp_path = path.with_suffix(".tmp")
+            tmp_path.write_text(json.dumps(self.snapshot()))
+            os.replace(tmp_path, path)
+            self._last_flush = time.monotonic()
+
+    def _file_stem(self):
+        # Re-stamped after a fork, so a preforked worker gets its own file.
+        pid = os.getpid()
+        if pid != self._pid:
+            self._pid, self._started = pid, time.time_ns()
+        return f"{pid}-{self._started}"
+
+
+registry = Registry()
+atexit.register(lambda: registry.flush())
+
+
+def metrics_dir():
+    directory = getattr(settings, "METRICS_DIR", None)
+    return Path(directory) if directory else None
+
+
+def counter(name, help_text, labels=()):
+    return registry.register(Counter(name, help_text, labels))
+
+
+def histogram(name, help_text, labels=(), buckets=LATENCY_BUCKETS):
+    return registry.register(Histogram(name, help_text, labels, buckets))
+
+
+def _merge(target, snapshot):
+    for name, series in snapshot.items():
+        metric = registry.metrics.get(name)
+        if metric is None:
+            continue
+        merged = target.setdefault(name, {})
+        for key, value in series:
+            key = tuple(key)
+            if metric.kind == "counter":
+                merged[key] = merged.get(key, 0) + value
+            elif key not in merged:
+                merged[key] = {"buckets": list(value["buckets"]), "sum": value["sum"], "count": value["count"]}
+            else:
+                state = merged[key]
+                state["buckets"] = [a + b for a, b in zip(state["buckets"], value["buckets"])]
+                state["sum"] += value["sum"]
+                state["count"] += value["count"]
+
+
+def _as_snapshot(merged):
+    return {name: [[list(key), value] for key, value in series.items()] for name, series in merged.items()}
+
+
+def _file_pid(path):
+    pid = path.stem.split("-", 1)[0]
+    return int(pid) if pid.isdigit() else None
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def archive_exited(directory):
+    """
+    Fold the files of processes that are no longer running into
+    archive.json and delete them; returns how many were folded. POSIX only
+    (liveness is probed with signal 0).
+    """
+    if os.name != "posix":
+        return 0
+    import fcntl
+
+    with open(directory / ".archive.lock", "w") as lock:
+        # Two scrapes folding the same file would count it twice.
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        exited = [
+            path
+            for path in directory.glob("*.json")
+            if _file_pid(path) not in (None, os.getpid()) and not _pid_alive(_file_pid(path))
+        ]
+        if not exited:
+            return 0
+        archive_path = directory / ARCHIVE_NAME
+        merged = {}
+        for path in [archive_path, *exited]:
+            try:
+                _merge(merged, json.loads(path.read_text()))
+            except (OSError, ValueError):
+                continue
+        tmp_path = archive_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(_as_snapshot(merged)))
+        os.replace(tmp_path, archive_path)
+        for path in exited:
+            path.unlink(missing_ok=True)
+    return len(exited)
+
+
+def collect():
+    """Merged values of every process that has written to METRICS_DIR."""
+    directory = metrics_dir()
+    if directory is None:
+        merged = {}
+        _merge(merged, registry.snapshot())
+        return merged
+    registry.flush()
+    archive_exited(directory)
+    merged = {}
+    for path in sorted(directory.glob("*.json")):
+        try:
+            _merge(merged, json.loads(path.read_text()))
+        except (OSError, ValueError):
+            continue
+    return merged
+
+
+def _format_labels(metric, key, extra=None):
+    pairs = list(zip(metric.labels, key))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    escaped = (
+        f'{label}="{str(value).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"'
+        for label, value in pairs
+    )
+    return "{" + ",".join(escaped) + "}"
+
+
+def _format_number(value):
+    if isinstance(value, float) and math.isinf(value):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render_prometheus():
+    lines = []
+    values = collect()
+    for name, metric in sorted(registry.metrics.items()):
+        lines.append(f"# HELP {name} {metric.help_text}")
+        lines.append(f"# TYPE {name} {metric.kind}")
+        for key, value in sorted(values.get(name, {}).items()):
+            if metric.kind == "counter":
+                lines.append(f"{name}{_format_labels(metric, key)} {_format_number(value)}")
+                continue
+            # Bucket counts are stored cumulatively already (see Registry.add).
+            for bound, count in zip(metric.buckets, value["buckets"]):
+                lines.append(f"{name}_bucket{_format_labels(metric, key, ('le', _format_number(float(bound))))} {count}")
+            lines.append(f"{name}_bucket{_format_labels(metric, key, ('le', '+Inf'))} {value['count']}")
+            lines.append(f"{name}_sum{_format_labels(metric, key)} {_format_number(float(value['sum']))}")
+            lines.append(f"{name}_count{_format_labels(metric, key)} {value['count']}")
+    return "\n".join(lines) + "\n"
+
+
+REQUEST_LATENCY = histogram(
+    "http_request_duration_seconds",
+    "Request latency by URL name.",
+    labels=("view", "method"),
+)
+REQUESTS = counter("http_requests_total", "Requests by URL name and status.", labels=("view", "status"))
+REQUEST_QUERIES = histogram(
+    "http_request_db_queries",
+    "SQL queries per request by URL name.",
+    labels=("view",),
+    buckets=COUNT_BUCKETS,
+)
+CACHE_LOOKUPS = counter(
+    "cache_lookups_total",
+    "Lookups of precomputed data by cache and result (hit/miss).",
+    labels=("cache", "result"),
+)
+IMPORT_SHEET_ROWS = counter("import_sheet_rows_total", "Rows imported per sheet.", labels=("sheet",))
+IMPORT_SHEET_SECONDS = histogram("import_sheet_seconds", "Time to read and import one sheet.", labels=("sheet",))
+IMPORT_SHEET_THROUGHPUT = histogram(
+    "import_sheet_rows_per_second",
+    "Import throughput per sheet.",
+    labels=("sheet",),
+    buckets=THROUGHPUT_BUCKETS,
+)
+IMPORT_PUBLISH_SECONDS = histogram(
+    "import_publish_seconds",
+    "Time the import publish transaction stays open.",
+)
+JOBS = counter("jobs_total", "Background jobs finished by kind and outcome.", labels=("kind", "status"))
+JOB_SECONDS = histogram("job_seconds", "Background job run time.", labels=("kind",))
+EXPORT_BYTES = histogram("export_bytes", "Size of generated exports.", labels=("export",), buckets=SIZE_BUCKETS)
+EXPORT_SECONDS = histogram("export_seconds", "Time to generate an export.", labels=("export",))
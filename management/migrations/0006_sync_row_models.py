@@ -0,0 +1,813 @@
+# Generated by Django 4.2.30 on 2026-10-19 00:49
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("management", "0005_borrower_password"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CashFlowForecastRow",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("date", models.DateField(blank=True, null=True)),
+                ("category", models.CharField(blank=True, max_length=255, null=True)),
+                (
+                    "x",
+                    models.DecimalField(
+                        blank=True, decimal_places=6, max_digits=20, null=True
+                    ),
+                ),
+                (
+                    "week_1",
+                    models.DecimalField(
+                        blank=True, decimal_places=6, max_digits=20, null=True
+                    ),
+                ),
+                (
+                    "week_2",
+                    models.DecimalField(
+                        blank=True, decimal_places=6, max_digits=20, null=True
+                    ),
+                ),
+                (
+                    "week_3",
+                    models.DecimalField(
+                        blank=True, decimal_places=6, max_digits=20, null=True
+                    ),
+                ),
+                (
+                    "week_4",
+                    models.DecimalField(
+                        blank=True, decimal_places=6, max_digits=20, null=True
+                    ),
+                ),
+                (
+                    "week_5",
+                    models.DecimalField(
+                        blank=True, decimal_places=6, max_digits=20, null=True
+                    ),
+                ),
+                (
+                    "week_6",
+                    models.DecimalField(
+                        blank=True, decimal_places=6, max_digits=20, null=True
+                    ),
+                ),
+                (
+                    "week_7",
+                    models.DecimalField(
+                        blank=True, decimal_places=6, max_digits=20, null=True
+                    ),
+                ),
+                (
+                    "week_8",
+                    models.DecimalField(
+                        blank=True, decimal_places=6, max_digits=20, null=True
+                    ),
+                ),
+                (
+                    "week_9",
+                    models.DecimalField(
+                        blank=True, decimal_places=6, max_digits=20, null=True
+                    ),
+                ),
+                (
+                    "week_10",
+                    models.DecimalField(
+                        blank=True, decimal_places=6, max_digits=20, null=True
+                    ),
+                ),
+                (
+                    "week_11",
+                    models.DecimalField(
+                        blank=True, decimal_places=6, max_digits=20, null=True
+                    ),
+                ),
+                (
+                    "week_12",
+                    models.DecimalField(
+                        blank=True, decimal_places=6, max_digits=20, null=True
+                    ),
+                ),
+                (
+                    "week_13",
+                    models.DecimalField(
+                        blank=True, decimal_places=6, max_digits=20, null=True
+                    ),
+                ),
+                (
+                    "total",
+                    models.DecimalField(
+                        blank=True, decimal_places=2, max_digits=20, null=True
+                    ),
+                ),
+                (
+                    "report",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="%(class)s_rows",
+                        to="management.borrowerreport",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "cash_flow_forecast",
+            },
+        ),
+        migrations.CreateModel(
+            name="CashForecastRow",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("date", models.DateField(blank=True, null=True)),
+                ("category", models.CharField(blank=True, max_length=255, null=True)),
+                (
+                    "x",
+                    models.DecimalField(
+                        blank=True, decimal_places=6, max_digits=20, null=True
+                    ),
+                ),
+                (
+                    "week_1",
+                    models.DecimalField(
+                        blank=True, decimal_places=6, max_digits=20, null=True
+                    ),
+                ),
+                (
+                    "week_2",
+                    models.DecimalField(
+                        blank=True, decimal_places=6, max_digits=20, null=True
+                    ),
+                ),
+                (
+                    "week_3",
+                    models.DecimalField(
+                        blank=True, decimal_places=6, max_digits=20, null=True
+                    ),
+                ),
+                (
+                    "week_4",
+                    models.DecimalField(
+                        blank=True, decimal_places=6, max_digits=20, null=True
+                    ),
+                ),
+                (
+                    "week_5",
+                    models.DecimalField(
+                        blank=True, decimal_places=6, max_digits=20, null=True
+                    ),
+                ),
+                (
+                    "week_6",
+                    models.DecimalField(
+                        blank=True, decimal_places=6, max_digits=20, null=True
+                    ),
+                ),
+                (
+                    "week_7",
+                    models.DecimalField(
+                        blank=True, decimal_places=6, max_digits=20, null=True
+                    ),
+                ),
+                (
+                    "week_8",
+                    models.DecimalField(
+                        blank=True, decimal_places=6, max_digits=20, null=True
+                    ),
+                ),
+                (
+                    "week_9",
+                    models.DecimalField(
+                        blank=True, decimal_places=6, max_digits=20, null=True
+                    ),
+                ),
+                (
+                    "week_10",
+                    models.DecimalField(
+                        blank=True, decimal_places=6, max_digits=20, null=True
+                    ),
+                ),
+                (
+                    "week_11",
+                    models.DecimalField(
+                        blank=True, decimal_places=6, max_digits=20, null=True
+                    ),
+                ),
+                (
+                    "week_12",
+                    models.DecimalField(
+                        blank=True, decimal_places=6, max_digits=20, null=True
+                    ),
+                ),
+                (
+                    "week_13",
+                    models.DecimalField(
+                        blank=True, decimal_places=6, max_digits=20, null=True
+                    ),
+                ),
+                (
+                    "report",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="%(class)s_rows",
+                        to="management.borrowerreport",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "cash_forecast",
+            },
+        ),
+        migrations.RemoveField(
+            model_name="agingcompositionrow",
+            name="report",
+        ),
+        migrations.RemoveField(
+            model_name="armetricsrow",
+            name="report",
+        ),
+        migrations.RemoveField(
+            model_name="availabilityforecastrow",
+            name="report",
+        ),
+        migrations.RemoveField(
+            model_name="borrower",
+            name="password",
+        ),
+        migrations.RemoveField(
+            model_name="borroweroverviewrow",
+            name="report",
+        ),
+        migrations.RemoveField(
+            model_name="collaterallimitsrow",
+            name="report",
+        ),
+        migrations.RemoveField(
+            model_name="collateraloverviewrow",
+            name="report",
+        ),
+        migrations.RemoveField(
+            model_name="compositeindexrow",
+            name="report",
+        ),
+        migrations.RemoveField(
+            model_name="concentrationadodsorow",
+            name="report",
+        ),
+        migrations.RemoveField(
+            model_name="cummulativevariancerow",
+            name="report",
+        ),
+        migrations.RemoveField(
+            model_name="currentweekvariancerow",
+            name="report",
+        ),
+        migrations.RemoveField(
+            model_name="fgcompositionrow",
+            name="report",
+        ),
+        migrations.RemoveField(
+            model_name="fggrossrecoveryhistoryrow",
+            name="report",
+        ),
+        migrations.RemoveField(
+            model_name="fgineligibledetailrow",
+            name="report",
+        ),
+        migrations.RemoveField(
+            model_name="fginlinecategoryanalysisrow",
+            name="report",
+        ),
+        migrations.RemoveField(
+            model_name="fginlineexcessbycategoryrow",
+            name="report",
+        ),
+        migrations.RemoveField(
+            model_name="fginventorymetricsrow",
+            name="report",
+        ),
+        migrations.RemoveField(
+            model_name="forecastrow",
+            name="report",
+        ),
+        migrations.RemoveField(
+            model_name="historicaltop20skusrow",
+            name="report",
+        ),
+        migrations.RemoveField(
+            model_name="ineligibleoverviewrow",
+            name="report",
+        ),
+        migrations.RemoveField(
+            model_name="ineligiblesrow",
+            name="report",
+        ),
+        migrations.RemoveField(
+            model_name="ineligibletrendrow",
+            name="report",
+        ),
+        migrations.RemoveField(
+            model_name="machineryequipmentrow",
+            name="report",
+        ),
+        migrations.RemoveField(
+            model_name="nolvtablerow",
+            name="report",
+        ),
+        migrations.RemoveField(
+            model_name="rawmaterialrecoveryrow",
+            name="report",
+        ),
+        migrations.RemoveField(
+            model_name="risksubfactorsrow",
+            name="report",
+        ),
+        migrations.RemoveField(
+            model_name="rmcategoryhistoryrow",
+            name="report",
+        ),
+        migrations.RemoveField(
+            model_name="rmineligibleoverviewrow",
+            name="report",
+        ),
+        migrations.RemoveField(
+            model_name="rminventorymetricsrow",
+            name="report",
+        ),
+        migrations.RemoveField(
+            model_name="rmtop20historyrow",
+            name="report",
+        ),
+        migrations.RemoveField(
+            model_name="salesgmtrendrow",
+            name="report",
+        ),
+        migrations.RemoveField(
+            model_name="wipcategoryhistoryrow",
+            name="report",
+        ),
+        migrations.RemoveField(
+            model_name="wipineligibleoverviewrow",
+            name="report",
+        ),
+        migrations.RemoveField(
+            model_name="wipinventorymetricsrow",
+            name="report",
+        ),
+        migrations.RemoveField(
+            model_name="wiprecoveryrow",
+            name="report",
+        ),
+        migrations.RemoveField(
+            model_name="wiptop20historyrow",
+            name="report",
+        ),
+        migrations.AddField(
+            model_name="agingcompositionrow",
+            name="borrower",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="aging_composition_rows",
+                to="management.borrower",
+            ),
+        ),
+        migrations.AddField(
+            model_name="armetricsrow",
+            name="borrower",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="ar_metrics_rows",
+                to="management.borrower",
+            ),
+        ),
+        migrations.AddField(
+            model_name="availabilityforecastrow",
+            name="borrower",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="availability_forecast",
+                to="management.borrower",
+            ),
+        ),
+        migrations.AddField(
+            model_name="collaterallimitsrow",
+            name="borrower",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="collateral_limits_rows",
+                to="management.borrower",
+            ),
+        ),
+        migrations.AddField(
+            model_name="collateraloverviewrow",
+            name="borrower",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="collateral_overview_rows",
+                to="management.borrower",
+            ),
+        ),
+        migrations.AddField(
+            model_name="collateraloverviewrow",
+            name="snapshot_summary",
+            field=models.TextField(
+                blank=True, null=True, verbose_name="Snapshot Summary"
+            ),
+        ),
+        migrations.AddField(
+            model_name="company",
+            name="email",
+            field=models.EmailField(
+                blank=True, db_column="company_email", max_length=255, null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="company",
+            name="password",
+            field=models.CharField(
+                blank=True, db_column="company_password", max_length=128, null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="compositeindexrow",
+            name="borrower",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="composite_index_rows",
+                to="management.borrower",
+            ),
+        ),
+        migrations.AddField(
+            model_name="concentrationadodsorow",
+            name="borrower",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="concentration_ado_dso",
+                to="management.borrower",
+            ),
+        ),
+        migrations.AddField(
+            model_name="cummulativevariancerow",
+            name="borrower",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="cummulative_variance",
+                to="management.borrower",
+            ),
+        ),
+        migrations.AddField(
+            model_name="currentweekvariancerow",
+            name="borrower",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="current_week_variance",
+                to="management.borrower",
+            ),
+        ),
+        migrations.AddField(
+            model_name="fgcompositionrow",
+            name="borrower",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="fg_composition",
+                to="management.borrower",
+            ),
+        ),
+        migrations.AddField(
+            model_name="fggrossrecoveryhistoryrow",
+            name="borrower",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="fg_gross_recovery_history",
+                to="management.borrower",
+            ),
+        ),
+        migrations.AddField(
+            model_name="fgineligibledetailrow",
+            name="borrower",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="fg_ineligible_detail",
+                to="management.borrower",
+            ),
+        ),
+        migrations.AddField(
+            model_name="fginlinecategoryanalysisrow",
+            name="borrower",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="fg_inline_category_analysis",
+                to="management.borrower",
+            ),
+        ),
+        migrations.AddField(
+            model_name="fginlineexcessbycategoryrow",
+            name="borrower",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="fg_inline_excess_by_category",
+                to="management.borrower",
+            ),
+        ),
+        migrations.AddField(
+            model_name="fginventorymetricsrow",
+            name="borrower",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="fg_inventory_metrics",
+                to="management.borrower",
+            ),
+        ),
+        migrations.AddField(
+            model_name="forecastrow",
+            name="borrower",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="forecast",
+                to="management.borrower",
+            ),
+        ),
+        migrations.AddField(
+            model_name="historicaltop20skusrow",
+            name="borrower",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="historical_top_20_sk_us",
+                to="management.borrower",
+            ),
+        ),
+        migrations.AddField(
+            model_name="ineligibleoverviewrow",
+            name="borrower",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="ineligible_overview",
+                to="management.borrower",
+            ),
+        ),
+        migrations.AddField(
+            model_name="ineligiblesrow",
+            name="borrower",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="ineligibles_rows",
+                to="management.borrower",
+            ),
+        ),
+        migrations.AddField(
+            model_name="ineligibletrendrow",
+            name="borrower",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="ineligible_trend",
+                to="management.borrower",
+            ),
+        ),
+        migrations.AddField(
+            model_name="machineryequipmentrow",
+            name="borrower",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="machinery_equipment_rows",
+                to="management.borrower",
+            ),
+        ),
+        migrations.AddField(
+            model_name="nolvtablerow",
+            name="borrower",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="nolv_table",
+                to="management.borrower",
+            ),
+        ),
+        migrations.AddField(
+            model_name="rawmaterialrecoveryrow",
+            name="borrower",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="raw_material_recovery",
+                to="management.borrower",
+            ),
+        ),
+        migrations.AddField(
+            model_name="risksubfactorsrow",
+            name="borrower",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="risk_subfactors_rows",
+                to="management.borrower",
+            ),
+        ),
+        migrations.AddField(
+            model_name="rmcategoryhistoryrow",
+            name="borrower",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="rm_category_history",
+                to="management.borrower",
+            ),
+        ),
+        migrations.AddField(
+            model_name="rmineligibleoverviewrow",
+            name="borrower",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="rm_ineligible_overview",
+                to="management.borrower",
+            ),
+        ),
+        migrations.AddField(
+            model_name="rminventorymetricsrow",
+            name="borrower",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="rm_inventory_metrics",
+                to="management.borrower",
+            ),
+        ),
+        migrations.AddField(
+            model_name="rmtop20historyrow",
+            name="borrower",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="rm_top20_history",
+                to="management.borrower",
+            ),
+        ),
+        migrations.AddField(
+            model_name="salesgmtrendrow",
+            name="borrower",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="sales_gm_trend",
+                to="management.borrower",
+            ),
+        ),
+        migrations.AddField(
+            model_name="wipcategoryhistoryrow",
+            name="borrower",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="wip_category_history",
+                to="management.borrower",
+            ),
+        ),
+        migrations.AddField(
+            model_name="wipineligibleoverviewrow",
+            name="borrower",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="wip_ineligible_overview",
+                to="management.borrower",
+            ),
+        ),
+        migrations.AddField(
+            model_name="wipinventorymetricsrow",
+            name="borrower",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="wip_inventory_metrics",
+                to="management.borrower",
+            ),
+        ),
+        migrations.AddField(
+            model_name="wiprecoveryrow",
+            name="borrower",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="wip_recovery",
+                to="management.borrower",
+            ),
+        ),
+        migrations.AddField(
+            model_name="wiptop20historyrow",
+            name="borrower",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="wip_top20_history",
+                to="management.borrower",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="top20bypastduerow",
+            name="report",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="%(class)s_rows",
+                to="management.borrowerreport",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="top20bytotalarrow",
+            name="report",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="%(class)s_rows",
+                to="management.borrowerreport",
+            ),
+        ),
+        migrations.DeleteModel(
+            name="BorrowerUser",
+        ),
+    ]
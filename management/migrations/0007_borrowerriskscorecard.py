@@ -0,0 +1,66 @@
+# Generated by Django 4.2.30 on 2026-10-19 00:51
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("management", "0006_sync_row_models"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BorrowerRiskScorecard",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "overall_score",
+                    models.DecimalField(
+                        blank=True, decimal_places=6, max_digits=20, null=True
+                    ),
+                ),
+                (
+                    "ar_pct_past_due",
+                    models.DecimalField(
+                        blank=True, decimal_places=6, max_digits=12, null=True
+                    ),
+                ),
+                ("weights", models.JSONField(blank=True, default=list)),
+                ("category_scores", models.JSONField(blank=True, default=list)),
+                ("trend_points", models.JSONField(blank=True, default=list)),
+                ("high_impact_factors", models.JSONField(blank=True, default=list)),
+                (
+                    "borrower",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="risk_scorecard",
+                        to="management.borrower",
+                    ),
+                ),
+                (
+                    "report",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to="management.borrowerreport",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "borrower_risk_scorecard",
+            },
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 4.2.30 on 2026-10-19 00:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("management", "0007_borrowerriskscorecard"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="armetricsrow",
+            index=models.Index(
+                fields=["borrower", "as_of_date"], name="ar_metrics_borrower_date_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="compositeindexrow",
+            index=models.Index(
+                fields=["borrower", "date"], name="composite_borrower_date_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="forecastrow",
+            index=models.Index(
+                fields=["borrower", "as_of_date"], name="forecast_borrower_date_idx"
+            ),
+        ),
+    ]
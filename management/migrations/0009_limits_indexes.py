@@ -0,0 +1,31 @@
+# Generated by Django 4.2.30 on 2026-10-19 00:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("management", "0008_watchlist_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="collaterallimitsrow",
+            index=models.Index(
+                fields=["borrower", "division"], name="coll_limits_borrower_div_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="collaterallimitsrow",
+            index=models.Index(
+                fields=["borrower", "collateral_type"],
+                name="coll_limits_borrower_type_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="collateraloverviewrow",
+            index=models.Index(
+                fields=["borrower", "main_type"], name="coll_ov_borrower_type_idx"
+            ),
+        ),
+    ]
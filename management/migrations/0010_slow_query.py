@@ -0,0 +1,46 @@
+# Generated by Django 4.2.30 on 2026-10-19 01:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("management", "0009_limits_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SlowQuery",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("fingerprint", models.CharField(max_length=32)),
+                ("normalized_sql", models.TextField()),
+                ("sample_sql", models.TextField()),
+                ("duration_ms", models.FloatField()),
+                ("view", models.CharField(blank=True, default="", max_length=100)),
+                ("builder", models.CharField(blank=True, default="", max_length=100)),
+                ("database", models.CharField(default="default", max_length=50)),
+                ("explain", models.TextField(blank=True, default="")),
+            ],
+            options={
+                "db_table": "slow_query",
+                "indexes": [
+                    models.Index(
+                        fields=["fingerprint", "created_at"],
+                        name="slow_query_fingerprint_idx",
+                    ),
+                    models.Index(fields=["created_at"], name="slow_query_created_idx"),
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,74 @@
+# Generated by Django 4.2.30 on 2026-10-19 01:20
+
+from bisect import bisect_right
+from collections import defaultdict
+
+from django.db import migrations, models
+from django.utils import timezone
+
+BATCH_SIZE = 2000
+
+
+def backfill_as_of_date(apps, schema_editor):
+    """
+    Each row takes the report_date of the latest report its borrower had when
+    the row was created (imports create the report first, then its rows).
+    Rows older than any report fall back to their creation date.
+    """
+    CollateralOverviewRow = apps.get_model("management", "CollateralOverviewRow")
+    BorrowerReport = apps.get_model("management", "BorrowerReport")
+
+    reports = defaultdict(list)
+    for borrower_id, created_at, report_date in BorrowerReport.objects.order_by(
+        "borrower_id", "created_at", "id"
+    ).values_list("borrower_id", "created_at", "report_date"):
+        reports[borrower_id].append((created_at, report_date))
+    created_keys = {
+        borrower_id: [created_at for created_at, _ in entries]
+        for borrower_id, entries in reports.items()
+    }
+
+    batch = []
+    rows = CollateralOverviewRow.objects.filter(as_of_date__isnull=True).only(
+        "id", "borrower_id", "created_at"
+    )
+    for row in rows.iterator(chunk_size=BATCH_SIZE):
+        as_of_date = None
+        position = (
+            bisect_right(created_keys.get(row.borrower_id, []), row.created_at) - 1
+        )
+        if position >= 0:
+            as_of_date = reports[row.borrower_id][position][1]
+        if as_of_date is None:
+            created_at = row.created_at
+            if timezone.is_aware(created_at):
+                created_at = timezone.localtime(created_at)
+            as_of_date = created_at.date()
+        row.as_of_date = as_of_date
+        batch.append(row)
+        if len(batch) >= BATCH_SIZE:
+            CollateralOverviewRow.objects.bulk_update(batch, ["as_of_date"])
+            batch = []
+    if batch:
+        CollateralOverviewRow.objects.bulk_update(batch, ["as_of_date"])
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("management", "0010_slow_query"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="collateraloverviewrow",
+            name="as_of_date",
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.RunPython(backfill_as_of_date, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="collateraloverviewrow",
+            index=models.Index(
+                fields=["borrower", "as_of_date"], name="coll_ov_borrower_asof_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,652 @@
+# Generated by Django 4.2.30 on 2026-10-19 01:24
+
+from bisect import bisect_right
+from collections import defaultdict
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+BATCH_SIZE = 2000
+
+
+def backfill_row_reports(apps, schema_editor):
+    """
+    Attach each borrower row to the report it was imported under: the latest
+    report its borrower had when the row was created (imports create the
+    report first, then its rows). Rows older than every report join the
+    borrower's first report. BorrowerOverviewRow has no borrower and is left
+    for new imports to fill.
+    """
+    BorrowerReport = apps.get_model("management", "BorrowerReport")
+    reports = defaultdict(list)
+    for report_id, borrower_id, created_at in BorrowerReport.objects.order_by(
+        "borrower_id", "created_at", "id"
+    ).values_list("id", "borrower_id", "created_at"):
+        reports[borrower_id].append((created_at, report_id))
+    created_keys = {
+        borrower_id: [created_at for created_at, _ in entries]
+        for borrower_id, entries in reports.items()
+    }
+
+    for model in apps.get_app_config("management").get_models():
+        field_names = {field.name for field in model._meta.fields}
+        if (
+            not model.__name__.endswith("Row")
+            or not {"borrower", "report"} <= field_names
+        ):
+            continue
+        batch = []
+        rows = model.objects.filter(report__isnull=True, borrower__isnull=False).only(
+            "id", "borrower_id", "created_at"
+        )
+        for row in rows.iterator(chunk_size=BATCH_SIZE):
+            entries = reports.get(row.borrower_id)
+            if not entries:
+                continue
+            position = max(
+                bisect_right(created_keys[row.borrower_id], row.created_at) - 1, 0
+            )
+            row.report_id = entries[position][1]
+            batch.append(row)
+            if len(batch) >= BATCH_SIZE:
+                model.objects.bulk_update(batch, ["report"])
+                batch = []
+        if batch:
+            model.objects.bulk_update(batch, ["report"])
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("management", "0011_collateral_as_of_date"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="agingcompositionrow",
+            name="report",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="%(class)s_rows",
+                to="management.borrowerreport",
+            ),
+        ),
+        migrations.AddField(
+            model_name="armetricsrow",
+            name="report",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="%(class)s_rows",
+                to="management.borrowerreport",
+            ),
+        ),
+        migrations.AddField(
+            model_name="availabilityforecastrow",
+            name="report",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="%(class)s_rows",
+                to="management.borrowerreport",
+            ),
+        ),
+        migrations.AddField(
+            model_name="borroweroverviewrow",
+            name="report",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="%(class)s_rows",
+                to="management.borrowerreport",
+            ),
+        ),
+        migrations.AddField(
+            model_name="collaterallimitsrow",
+            name="report",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="%(class)s_rows",
+                to="management.borrowerreport",
+            ),
+        ),
+        migrations.AddField(
+            model_name="collateraloverviewrow",
+            name="report",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="%(class)s_rows",
+                to="management.borrowerreport",
+            ),
+        ),
+        migrations.AddField(
+            model_name="compositeindexrow",
+            name="report",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="%(class)s_rows",
+                to="management.borrowerreport",
+            ),
+        ),
+        migrations.AddField(
+            model_name="concentrationadodsorow",
+            name="report",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="%(class)s_rows",
+                to="management.borrowerreport",
+            ),
+        ),
+        migrations.AddField(
+            model_name="cummulativevariancerow",
+            name="report",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="%(class)s_rows",
+                to="management.borrowerreport",
+            ),
+        ),
+        migrations.AddField(
+            model_name="currentweekvariancerow",
+            name="report",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="%(class)s_rows",
+                to="management.borrowerreport",
+            ),
+        ),
+        migrations.AddField(
+            model_name="fgcompositionrow",
+            name="report",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="%(class)s_rows",
+                to="management.borrowerreport",
+            ),
+        ),
+        migrations.AddField(
+            model_name="fggrossrecoveryhistoryrow",
+            name="report",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="%(class)s_rows",
+                to="management.borrowerreport",
+            ),
+        ),
+        migrations.AddField(
+            model_name="fgineligibledetailrow",
+            name="report",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="%(class)s_rows",
+                to="management.borrowerreport",
+            ),
+        ),
+        migrations.AddField(
+            model_name="fginlinecategoryanalysisrow",
+            name="report",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="%(class)s_rows",
+                to="management.borrowerreport",
+            ),
+        ),
+        migrations.AddField(
+            model_name="fginlineexcessbycategoryrow",
+            name="report",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="%(class)s_rows",
+                to="management.borrowerreport",
+            ),
+        ),
+        migrations.AddField(
+            model_name="fginventorymetricsrow",
+            name="report",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="%(class)s_rows",
+                to="management.borrowerreport",
+            ),
+        ),
+        migrations.AddField(
+            model_name="forecastrow",
+            name="report",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="%(class)s_rows",
+                to="management.borrowerreport",
+            ),
+        ),
+        migrations.AddField(
+            model_name="historicaltop20skusrow",
+            name="report",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="%(class)s_rows",
+                to="management.borrowerreport",
+            ),
+        ),
+        migrations.AddField(
+            model_name="ineligibleoverviewrow",
+            name="report",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="%(class)s_rows",
+                to="management.borrowerreport",
+            ),
+        ),
+        migrations.AddField(
+            model_name="ineligiblesrow",
+            name="report",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="%(class)s_rows",
+                to="management.borrowerreport",
+            ),
+        ),
+        migrations.AddField(
+            model_name="ineligibletrendrow",
+            name="report",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="%(class)s_rows",
+                to="management.borrowerreport",
+            ),
+        ),
+        migrations.AddField(
+            model_name="machineryequipmentrow",
+            name="report",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="%(class)s_rows",
+                to="management.borrowerreport",
+            ),
+        ),
+        migrations.AddField(
+            model_name="nolvtablerow",
+            name="report",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="%(class)s_rows",
+                to="management.borrowerreport",
+            ),
+        ),
+        migrations.AddField(
+            model_name="rawmaterialrecoveryrow",
+            name="report",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="%(class)s_rows",
+                to="management.borrowerreport",
+            ),
+        ),
+        migrations.AddField(
+            model_name="risksubfactorsrow",
+            name="report",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="%(class)s_rows",
+                to="management.borrowerreport",
+            ),
+        ),
+        migrations.AddField(
+            model_name="rmcategoryhistoryrow",
+            name="report",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="%(class)s_rows",
+                to="management.borrowerreport",
+            ),
+        ),
+        migrations.AddField(
+            model_name="rmineligibleoverviewrow",
+            name="report",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="%(class)s_rows",
+                to="management.borrowerreport",
+            ),
+        ),
+        migrations.AddField(
+            model_name="rminventorymetricsrow",
+            name="report",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="%(class)s_rows",
+                to="management.borrowerreport",
+            ),
+        ),
+        migrations.AddField(
+            model_name="rmtop20historyrow",
+            name="report",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="%(class)s_rows",
+                to="management.borrowerreport",
+            ),
+        ),
+        migrations.AddField(
+            model_name="salesgmtrendrow",
+            name="report",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="%(class)s_rows",
+                to="management.borrowerreport",
+            ),
+        ),
+        migrations.AddField(
+            model_name="wipcategoryhistoryrow",
+            name="report",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="%(class)s_rows",
+                to="management.borrowerreport",
+            ),
+        ),
+        migrations.AddField(
+            model_name="wipineligibleoverviewrow",
+            name="report",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="%(class)s_rows",
+                to="management.borrowerreport",
+            ),
+        ),
+        migrations.AddField(
+            model_name="wipinventorymetricsrow",
+            name="report",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="%(class)s_rows",
+                to="management.borrowerreport",
+            ),
+        ),
+        migrations.AddField(
+            model_name="wiprecoveryrow",
+            name="report",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="%(class)s_rows",
+                to="management.borrowerreport",
+            ),
+        ),
+        migrations.AddField(
+            model_name="wiptop20historyrow",
+            name="report",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="%(class)s_rows",
+                to="management.borrowerreport",
+            ),
+        ),
+        migrations.RunPython(backfill_row_reports, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="agingcompositionrow",
+            index=models.Index(
+                fields=["borrower", "report"], name="aging_composition_rpt_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="armetricsrow",
+            index=models.Index(
+                fields=["borrower", "report"], name="ar_metrics_rpt_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="availabilityforecastrow",
+            index=models.Index(
+                fields=["borrower", "report"], name="availability_forecast_rpt_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="collaterallimitsrow",
+            index=models.Index(
+                fields=["borrower", "report"], name="collateral_limits_rpt_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="collateraloverviewrow",
+            index=models.Index(
+                fields=["borrower", "report"], name="collateral_overview_rpt_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="compositeindexrow",
+            index=models.Index(
+                fields=["borrower", "report"], name="composite_index_rpt_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="concentrationadodsorow",
+            index=models.Index(
+                fields=["borrower", "report"], name="concentration_ado_dso_rpt_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="cummulativevariancerow",
+            index=models.Index(
+                fields=["borrower", "report"], name="cummulative_variance_rpt_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="currentweekvariancerow",
+            index=models.Index(
+                fields=["borrower", "report"], name="current_week_variance_rpt_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="fgcompositionrow",
+            index=models.Index(
+                fields=["borrower", "report"], name="fg_composition_rpt_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="fggrossrecoveryhistoryrow",
+            index=models.Index(
+                fields=["borrower", "report"], name="fg_gross_recovery_rpt_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="fgineligibledetailrow",
+            index=models.Index(
+                fields=["borrower", "report"], name="fg_ineligible_detail_rpt_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="fginlinecategoryanalysisrow",
+            index=models.Index(
+                fields=["borrower", "report"], name="fg_inline_cat_anal_rpt_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="fginlineexcessbycategoryrow",
+            index=models.Index(
+                fields=["borrower", "report"], name="fg_inline_exc_cat_rpt_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="fginventorymetricsrow",
+            index=models.Index(
+                fields=["borrower", "report"], name="fg_inventory_metrics_rpt_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="forecastrow",
+            index=models.Index(fields=["borrower", "report"], name="forecast_rpt_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="historicaltop20skusrow",
+            index=models.Index(
+                fields=["borrower", "report"], name="hist_top20_skus_rpt_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="ineligibleoverviewrow",
+            index=models.Index(
+                fields=["borrower", "report"], name="ineligible_overview_rpt_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="ineligiblesrow",
+            index=models.Index(
+                fields=["borrower", "report"], name="ineligibles_rpt_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="ineligibletrendrow",
+            index=models.Index(
+                fields=["borrower", "report"], name="ineligible_trend_rpt_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="machineryequipmentrow",
+            index=models.Index(
+                fields=["borrower", "report"], name="machinery_equip_rpt_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="nolvtablerow",
+            index=models.Index(
+                fields=["borrower", "report"], name="nolv_table_rpt_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="rawmaterialrecoveryrow",
+            index=models.Index(
+                fields=["borrower", "report"], name="raw_material_recovery_rpt_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="risksubfactorsrow",
+            index=models.Index(
+                fields=["borrower", "report"], name="risk_subfactors_rpt_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="rmcategoryhistoryrow",
+            index=models.Index(
+                fields=["borrower", "report"], name="rm_category_history_rpt_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="rmineligibleoverviewrow",
+            index=models.Index(
+                fields=["borrower", "report"], name="rm_ineligible_overview_rpt_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="rminventorymetricsrow",
+            index=models.Index(
+                fields=["borrower", "report"], name="rm_inventory_metrics_rpt_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="rmtop20historyrow",
+            index=models.Index(
+                fields=["borrower", "report"], name="rm_top20_history_rpt_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="salesgmtrendrow",
+            index=models.Index(
+                fields=["borrower", "report"], name="sales_gm_trend_rpt_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="wipcategoryhistoryrow",
+            index=models.Index(
+                fields=["borrower", "report"], name="wip_category_history_rpt_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="wipineligibleoverviewrow",
+            index=models.Index(
+                fields=["borrower", "report"], name="wip_inelig_overview_rpt_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="wipinventorymetricsrow",
+            index=models.Index(
+                fields=["borrower", "report"], name="wip_inventory_metrics_rpt_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="wiprecoveryrow",
+            index=models.Index(
+                fields=["borrower", "report"], name="wip_recovery_rpt_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="wiptop20historyrow",
+            index=models.Index(
+                fields=["borrower", "report"], name="wip_top20_history_rpt_idx"
+            ),
+        ),
+    ]
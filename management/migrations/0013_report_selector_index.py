@@ -0,0 +1,19 @@
+# Generated by Django 4.2.30 on 2026-10-19 01:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("management", "0012_row_reports"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="borrowerreport",
+            index=models.Index(
+                fields=["borrower", "-report_date", "-created_at"],
+                name="borrower_report_date_idx",
+            ),
+        ),
+    ]
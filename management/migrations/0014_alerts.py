@@ -0,0 +1,198 @@
+# Generated by Django 4.2.30 on 2026-10-19 01:50
+
+from decimal import Decimal
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+DEFAULT_RULES = [
+    ("Availability below loan balance", "excess_availability", "lt", "0", "critical"),
+    ("AR past due spike", "pct_past_due_change", "gt", "0.05", "warning"),
+    (
+        "Customer concentration over cap",
+        "max_concentration_pct",
+        "gt",
+        "0.25",
+        "warning",
+    ),
+    (
+        "Composite risk score deteriorating",
+        "overall_score_change",
+        "gt",
+        "0.5",
+        "warning",
+    ),
+]
+
+
+def seed_default_rules(apps, schema_editor):
+    """The starter rule set; thresholds are edited in the admin afterwards."""
+    AlertRule = apps.get_model("management", "AlertRule")
+    for name, metric, comparison, threshold, severity in DEFAULT_RULES:
+        AlertRule.objects.create(
+            name=name,
+            metric=metric,
+            comparison=comparison,
+            threshold=Decimal(threshold),
+            severity=severity,
+        )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("management", "0013_report_selector_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AlertRule",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("name", models.CharField(max_length=255)),
+                (
+                    "metric",
+                    models.CharField(
+                        choices=[
+                            ("excess_availability", "Availability less loan balance"),
+                            ("pct_past_due", "AR % past due"),
+                            ("pct_past_due_change", "Change in AR % past due"),
+                            (
+                                "max_concentration_pct",
+                                "Largest customer concentration %",
+                            ),
+                            ("overall_score", "Composite risk score"),
+                            ("overall_score_change", "Change in composite risk score"),
+                        ],
+                        max_length=50,
+                    ),
+                ),
+                (
+                    "comparison",
+                    models.CharField(
+                        choices=[
+                            ("lt", "below"),
+                            ("lte", "at or below"),
+                            ("gt", "above"),
+                            ("gte", "at or above"),
+                        ],
+                        max_length=3,
+                    ),
+                ),
+                ("threshold", models.DecimalField(decimal_places=6, max_digits=20)),
+                (
+                    "severity",
+                    models.CharField(
+                        choices=[
+                            ("info", "Info"),
+                            ("warning", "Warning"),
+                            ("critical", "Critical"),
+                        ],
+                        default="warning",
+                        max_length=10,
+                    ),
+                ),
+                ("is_active", models.BooleanField(default=True)),
+                (
+                    "company",
+                    models.ForeignKey(
+                        blank=True,
+                        help_text="Limit the rule to this company's borrowers.",
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="alert_rules",
+                        to="management.company",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "alert_rule",
+            },
+        ),
+        migrations.CreateModel(
+            name="Alert",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "severity",
+                    models.CharField(
+                        choices=[
+                            ("info", "Info"),
+                            ("warning", "Warning"),
+                            ("critical", "Critical"),
+                        ],
+                        max_length=10,
+                    ),
+                ),
+                ("value", models.DecimalField(decimal_places=6, max_digits=20)),
+                ("threshold", models.DecimalField(decimal_places=6, max_digits=20)),
+                ("message", models.CharField(max_length=500)),
+                ("is_read", models.BooleanField(default=False)),
+                ("read_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "borrower",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="alerts",
+                        to="management.borrower",
+                    ),
+                ),
+                (
+                    "report",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="alerts",
+                        to="management.borrowerreport",
+                    ),
+                ),
+                (
+                    "rule",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="alerts",
+                        to="management.alertrule",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "alert",
+                "indexes": [
+                    models.Index(
+                        condition=models.Q(("is_read", False)),
+                        fields=["-created_at"],
+                        name="alert_unread_idx",
+                    ),
+                    models.Index(
+                        fields=["borrower", "-created_at"], name="alert_borrower_idx"
+                    ),
+                ],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="alert",
+            constraint=models.UniqueConstraint(
+                fields=("rule", "borrower", "report"),
+                name="alert_rule_borrower_report_uniq",
+            ),
+        ),
+        migrations.RunPython(seed_default_rules, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,226 @@
+# Generated by Django 4.2.30 on 2026-10-19 02:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("management", "0016_uploads"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="armetricsrow",
+            name="ar_metrics_borrower_date_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="collateraloverviewrow",
+            name="coll_ov_borrower_asof_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="compositeindexrow",
+            name="composite_borrower_date_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="forecastrow",
+            name="forecast_borrower_date_idx",
+        ),
+        migrations.AddIndex(
+            model_name="agingcompositionrow",
+            index=models.Index(
+                fields=["borrower", "as_of_date", "id"],
+                name="aging_composition_cur_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="armetricsrow",
+            index=models.Index(
+                fields=["borrower", "as_of_date", "id"],
+                name="ar_metrics_borrower_date_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="availabilityforecastrow",
+            index=models.Index(
+                fields=["borrower", "date", "id"], name="availability_forecast_cur_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="collateraloverviewrow",
+            index=models.Index(
+                fields=["borrower", "as_of_date", "id"],
+                name="coll_ov_borrower_asof_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="compositeindexrow",
+            index=models.Index(
+                fields=["borrower", "date", "id"], name="composite_borrower_date_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="concentrationadodsorow",
+            index=models.Index(
+                fields=["borrower", "as_of_date", "id"],
+                name="concentration_ado_dso_cur_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="cummulativevariancerow",
+            index=models.Index(
+                fields=["borrower", "date", "id"], name="cummulative_variance_cur_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="currentweekvariancerow",
+            index=models.Index(
+                fields=["borrower", "date", "id"], name="current_week_variance_cur_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="fgcompositionrow",
+            index=models.Index(
+                fields=["borrower", "as_of_date", "id"], name="fg_composition_cur_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="fggrossrecoveryhistoryrow",
+            index=models.Index(
+                fields=["borrower", "as_of_date", "id"],
+                name="fg_gross_recovery_cur_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="fgineligibledetailrow",
+            index=models.Index(
+                fields=["borrower", "date", "id"], name="fg_ineligible_detail_cur_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="fginlinecategoryanalysisrow",
+            index=models.Index(
+                fields=["borrower", "as_of_date", "id"],
+                name="fg_inline_cat_anal_cur_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="fginlineexcessbycategoryrow",
+            index=models.Index(
+                fields=["borrower", "as_of_date", "id"],
+                name="fg_inline_exc_cat_cur_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="fginventorymetricsrow",
+            index=models.Index(
+                fields=["borrower", "as_of_date", "id"],
+                name="fg_inventory_metrics_cur_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="forecastrow",
+            index=models.Index(
+                fields=["borrower", "as_of_date", "id"],
+                name="forecast_borrower_date_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="historicaltop20skusrow",
+            index=models.Index(
+                fields=["borrower", "as_of_date", "id"], name="hist_top20_skus_cur_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="ineligibleoverviewrow",
+            index=models.Index(
+                fields=["borrower", "date", "id"], name="ineligible_overview_cur_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="ineligibletrendrow",
+            index=models.Index(
+                fields=["borrower", "date", "id"], name="ineligible_trend_cur_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="nolvtablerow",
+            index=models.Index(
+                fields=["borrower", "date", "id"], name="nolv_table_cur_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="rawmaterialrecoveryrow",
+            index=models.Index(
+                fields=["borrower", "date", "id"], name="raw_material_recovery_cur_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="risksubfactorsrow",
+            index=models.Index(
+                fields=["borrower", "date", "id"], name="risk_subfactors_cur_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="rmcategoryhistoryrow",
+            index=models.Index(
+                fields=["borrower", "date", "id"], name="rm_category_history_cur_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="rmineligibleoverviewrow",
+            index=models.Index(
+                fields=["borrower", "date", "id"], name="rm_ineligible_overview_cur_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="rminventorymetricsrow",
+            index=models.Index(
+                fields=["borrower", "as_of_date", "id"],
+                name="rm_inventory_metrics_cur_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="rmtop20historyrow",
+            index=models.Index(
+                fields=["borrower", "as_of_date", "id"], name="rm_top20_history_cur_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="salesgmtrendrow",
+            index=models.Index(
+                fields=["borrower", "as_of_date", "id"], name="sales_gm_trend_cur_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="wipcategoryhistoryrow",
+            index=models.Index(
+                fields=["borrower", "date", "id"], name="wip_category_history_cur_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="wipineligibleoverviewrow",
+            index=models.Index(
+                fields=["borrower", "date", "id"], name="wip_inelig_overview_cur_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="wipinventorymetricsrow",
+            index=models.Index(
+                fields=["borrower", "as_of_date", "id"],
+                name="wip_inventory_metrics_cur_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="wiprecoveryrow",
+            index=models.Index(
+                fields=["borrower", "date", "id"], name="wip_recovery_cur_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="wiptop20historyrow",
+            index=models.Index(
+                fields=["borrower", "as_of_date", "id"],
+                name="wip_top20_history_cur_idx",
+            ),
+        ),
+    ]
@@ -1,6 +1,9 @@
 from django.conf import settings
 from django.contrib.auth.hashers import check_password, make_password
 from django.db import models
+from django.utils import timezone
+
+from management.report_scope import active_report
 
 
 # =========================
@@ -98,11 +101,98 @@ class BorrowerReport(TimeStampedModel):
     source_file = models.CharField(max_length=255, null=True, blank=True)
     report_date = models.DateField(null=True, blank=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["borrower", "-report_date", "-created_at"], name="borrower_report_date_idx"),
+        ]
+
+
+class ReportRowQuerySet(models.QuerySet):
+    def for_borrower(self, borrower):
+        """
+        Rows of `borrower`, limited to the report selected by the enclosing
+        `management.report_scope.report_scope` when it belongs to that borrower.
+        """
+        qs = self.filter(borrower=borrower)
+        report = _scoped_report(borrower)
+        if report is not None:
+            qs = qs.filter(report=report)
+        return qs
+
+    def history_for_borrower(self, borrower, date_field="as_of_date"):
+        """
+        Rows of `borrower` dated up to the selected report, for sheets that
+        carry one period per report (their history spans several reports).
+        """
+        qs = self.filter(borrower=borrower)
+        report = _scoped_report(borrower)
+        if report is not None and report.report_date:
+            qs = qs.filter(**{f"{date_field}__lte": report.report_date})
+        return qs
+
+
+def _scoped_report(borrower):
+    report = active_report()
+    if report is None or borrower is None or report.borrower_id != getattr(borrower, "pk", borrower):
+        return None
+    return report
+
 
 class ReportRow(TimeStampedModel):
+    """
+    Base for every imported sheet row. `report` is the BorrowerReport the
+    row was imported under; rows keyed in through the admin portal join the
+    borrower's latest report.
+    """
+    report = models.ForeignKey(
+        "BorrowerReport",
+        on_delete=models.CASCADE,
+        related_name="%(class)s_rows",
+        null=True,
+        blank=True,
+    )
+
+    objects = ReportRowQuerySet.as_manager()
+
     class Meta:
         abstract = True
 
+    def latest_borrower_report(self):
+        borrower_id = getattr(self, "borrower_id", None)
+        if not borrower_id:
+            return None
+        return (
+            BorrowerReport.objects.filter(borrower_id=borrower_id)
+            .order_by("-report_date", "-created_at", "-id")
+            .first()
+        )
+
+    def touch_report(self):
+        """
+        Retire the management.report_cache entries this row feeds. History
+        sheets are read across reports, so a hand edit bumps updated_at on
+        every report of the borrower.
+        """
+        borrower_id = getattr(self, "borrower_id", None)
+        if borrower_id:
+            reports = BorrowerReport.objects.filter(borrower_id=borrower_id)
+        elif self.report_id:
+            reports = BorrowerReport.objects.filter(pk=self.report_id)
+        else:
+            return
+        reports.update(updated_at=timezone.now())
+
+    def save(self, *args, **kwargs):
+        if self.report_id is None:
+            self.report = self.latest_borrower_report()
+        super().save(*args, **kwargs)
+        self.touch_report()
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        self.touch_report()
+        return result
+
 
 class SpecificIndividual(TimeStampedModel):
     borrower = models.ForeignKey(Borrower, on_delete=models.CASCADE, related_name='specific_individuals')
@@ -113,7 +203,7 @@ class SpecificIndividual(TimeStampedModel):
 # -------------------------
 # Sheet: Borrower Overview
 # -------------------------
-class BorrowerOverviewRow(TimeStampedModel):
+class BorrowerOverviewRow(ReportRow):
     company = models.CharField(max_length=255, null=True, blank=True)  # Company
     company_id = models.BigIntegerField(null=True, blank=True)  # Company ID
     industry = models.CharField(max_length=255, null=True, blank=True)  # Industry
@@ -138,7 +228,7 @@ class BorrowerOverviewRow(TimeStampedModel):
 # -------------------------
 # Sheet: Collateral Overview
 # -------------------------
-class CollateralOverviewRow(TimeStampedModel):
+class CollateralOverviewRow(ReportRow):
     borrower = models.ForeignKey(
         "Borrower",
         on_delete=models.CASCADE,
@@ -160,15 +250,31 @@ class CollateralOverviewRow(TimeStampedModel):
     reserves = models.DecimalField(max_digits=20, decimal_places=6, null=True, blank=True)  # Reserves
     net_collateral = MoneyField()  # Net Collateral
     snapshot_summary = models.TextField(null=True, blank=True, verbose_name="Snapshot Summary")
+    # Business date of the row: the report_date of the import that created it.
+    as_of_date = models.DateField(null=True, blank=True)
 
     class Meta:
         db_table = 'collateral_overview'
+        indexes = [
+            models.Index(fields=["borrower", "main_type"], name="coll_ov_borrower_type_idx"),
+            models.Index(fields=["borrower", "as_of_date", "id"], name="coll_ov_borrower_asof_idx"),
+            models.Index(fields=["borrower", "report"], name="collateral_overview_rpt_idx"),
+        ]
+
+    def save(self, *args, **kwargs):
+        # Rows keyed in through the admin portal take their report's date, or
+        # the day they are entered when the borrower has no report yet.
+        if self.report_id is None:
+            self.report = self.latest_borrower_report()
+        if self.as_of_date is None:
+            self.as_of_date = (self.report.report_date if self.report else None) or timezone.localdate()
+        super().save(*args, **kwargs)
 
 
 # -------------------------
 # Sheet: Machinery & Equipment 
 # -------------------------
-class MachineryEquipmentRow(TimeStampedModel):
+class MachineryEquipmentRow(ReportRow):
     equipment_type = models.CharField(max_length=255, null=True, blank=True)  # Equipment Type
     manufacturer = models.CharField(max_length=255, null=True, blank=True)  # Manufacturer
     serial_number = models.CharField(max_length=255, null=True, blank=True)  # Serial Number
@@ -189,12 +295,15 @@ class MachineryEquipmentRow(TimeStampedModel):
 
     class Meta:
         db_table = 'machinery_and_equipment'
+        indexes = [
+            models.Index(fields=["borrower", "report"], name="machinery_equip_rpt_idx"),
+        ]
 
 
 # -------------------------
 # Sheet: Aging Composition
 # -------------------------
-class AgingCompositionRow(TimeStampedModel):
+class AgingCompositionRow(ReportRow):
     division = models.CharField(max_length=255, null=True, blank=True)  # Division
     as_of_date = models.DateField(null=True, blank=True)  # AsOfDate
     bucket = models.CharField(max_length=255, null=True, blank=True)  # Bucket
@@ -210,12 +319,16 @@ class AgingCompositionRow(TimeStampedModel):
 
     class Meta:
         db_table = 'aging_composition'
+        indexes = [
+            models.Index(fields=["borrower", "report"], name="aging_composition_rpt_idx"),
+            models.Index(fields=["borrower", "as_of_date", "id"], name="aging_composition_cur_idx"),
+        ]
 
 
 # -------------------------
 # Sheet: AR_Metrics
 # -------------------------
-class ARMetricsRow(TimeStampedModel):
+class ARMetricsRow(ReportRow):
     borrower = models.ForeignKey(
         "Borrower",
         on_delete=models.CASCADE,
@@ -233,12 +346,16 @@ class ARMetricsRow(TimeStampedModel):
 
     class Meta:
         db_table = 'ar_metrics'
+        indexes = [
+            models.Index(fields=["borrower", "as_of_date", "id"], name="ar_metrics_borrower_date_idx"),
+            models.Index(fields=["borrower", "report"], name="ar_metrics_rpt_idx"),
+        ]
 
 
 # -------------------------
 # Sheet: Top20_By_Total_AR
 # -------------------------
-class Top20ByTotalARRow(TimeStampedModel):
+class Top20ByTotalARRow(ReportRow):
     division = models.CharField(max_length=255, null=True, blank=True)  # Division
     as_of_date = models.DateField(null=True, blank=True)  # AsOfDate
     customer = models.CharField(max_length=255, null=True, blank=True)  # Customer
@@ -249,13 +366,6 @@ class Top20ByTotalARRow(TimeStampedModel):
     col_91_plus = MoneyField()  # 91+
     total_ar = MoneyField()  # TotalAR
     coverage_pct_of_division_ar = PctField()  # CoveragePctOfDivisionAR
-    report = models.ForeignKey(
-        "BorrowerReport",
-        on_delete=models.CASCADE,
-        related_name="%(class)s_rows",
-        null=True,
-        blank=True,
-    )
 
     class Meta:
         db_table = 'top20_by_total_ar'
@@ -264,7 +374,7 @@ class Top20ByTotalARRow(TimeStampedModel):
 # -------------------------
 # Sheet: Top20_By_PastDue
 # -------------------------
-class Top20ByPastDueRow(TimeStampedModel):
+class Top20ByPastDueRow(ReportRow):
     division = models.CharField(max_length=255, null=True, blank=True)  # Division
     as_of_date = models.DateField(null=True, blank=True)  # AsOfDate
     customer = models.CharField(max_length=255, null=True, blank=True)  # Customer
@@ -276,13 +386,6 @@ class Top20ByPastDueRow(TimeStampedModel):
     total_ar = MoneyField()  # TotalAR
     total_past_due = MoneyField()  # TotalPastDue
     coverage_pct_of_division_past_due = PctField()  # CoveragePctOfDivisionPastDue
-    report = models.ForeignKey(
-        "BorrowerReport",
-        on_delete=models.CASCADE,
-        related_name="%(class)s_rows",
-        null=True,
-        blank=True,
-    )
 
     class Meta:
         db_table = 'top20_by_past_due'
@@ -291,7 +394,7 @@ class Top20ByPastDueRow(TimeStampedModel):
 # -------------------------
 # Sheet: Ineligible_Trend
 # -------------------------
-class IneligibleTrendRow(TimeStampedModel):
+class IneligibleTrendRow(ReportRow):
     date = models.DateField(null=True, blank=True)  # Date
     division = models.CharField(max_length=255, null=True, blank=True)  # Division
     total_ar = MoneyField()  # Total AR
@@ -307,12 +410,16 @@ class IneligibleTrendRow(TimeStampedModel):
 
     class Meta:
         db_table = 'ineligible_trend'
+        indexes = [
+            models.Index(fields=["borrower", "report"], name="ineligible_trend_rpt_idx"),
+            models.Index(fields=["borrower", "date", "id"], name="ineligible_trend_cur_idx"),
+        ]
 
 
 # -------------------------
 # Sheet: Ineligible_Overview
 # -------------------------
-class IneligibleOverviewRow(TimeStampedModel):
+class IneligibleOverviewRow(ReportRow):
     date = models.DateField(null=True, blank=True)  # Date
     division = models.CharField(max_length=255, null=True, blank=True)  # Division
     past_due_gt_90_days = MoneyField()  # Past Due >90 Days
@@ -336,12 +443,16 @@ class IneligibleOverviewRow(TimeStampedModel):
 
     class Meta:
         db_table = 'ineligible_overview'
+        indexes = [
+            models.Index(fields=["borrower", "report"], name="ineligible_overview_rpt_idx"),
+            models.Index(fields=["borrower", "date", "id"], name="ineligible_overview_cur_idx"),
+        ]
 
 
 # -------------------------
 # Sheet: Concentration_ADO_DSO
 # -------------------------
-class ConcentrationADODSORow(TimeStampedModel):
+class ConcentrationADODSORow(ReportRow):
     division = models.CharField(max_length=255, null=True, blank=True)  # Division
     as_of_date = models.DateField(null=True, blank=True)  # AsOfDate
     customer = models.CharField(max_length=255, null=True, blank=True)  # Customer
@@ -364,12 +475,16 @@ class ConcentrationADODSORow(TimeStampedModel):
 
     class Meta:
         db_table = 'concentration_ado_dso'
+        indexes = [
+            models.Index(fields=["borrower", "report"], name="concentration_ado_dso_rpt_idx"),
+            models.Index(fields=["borrower", "as_of_date", "id"], name="concentration_ado_dso_cur_idx"),
+        ]
 
 
 # -------------------------
 # Sheet: FG_Inventory_Metrics
 # -------------------------
-class FGInventoryMetricsRow(TimeStampedModel):
+class FGInventoryMetricsRow(ReportRow):
     borrower = models.ForeignKey(
         "Borrower",
         on_delete=models.CASCADE,
@@ -394,12 +509,16 @@ class FGInventoryMetricsRow(TimeStampedModel):
 
     class Meta:
         db_table = 'fg_inventory_metrics'
+        indexes = [
+            models.Index(fields=["borrower", "report"], name="fg_inventory_metrics_rpt_idx"),
+            models.Index(fields=["borrower", "as_of_date", "id"], name="fg_inventory_metrics_cur_idx"),
+        ]
 
 
 # -------------------------
 # Sheet: FG_Ineligible_detail
 # -------------------------
-class FGIneligibleDetailRow(TimeStampedModel):
+class FGIneligibleDetailRow(ReportRow):
     borrower = models.ForeignKey(
         "Borrower",
         on_delete=models.CASCADE,
@@ -428,11 +547,15 @@ class FGIneligibleDetailRow(TimeStampedModel):
 
     class Meta:
         db_table = 'fg_ineligible_detail'
+        indexes = [
+            models.Index(fields=["borrower", "report"], name="fg_ineligible_detail_rpt_idx"),
+            models.Index(fields=["borrower", "date", "id"], name="fg_ineligible_detail_cur_idx"),
+        ]
 
 # -------------------------
 # Sheet: FG_Composition
 # -------------------------
-class FGCompositionRow(TimeStampedModel):
+class FGCompositionRow(ReportRow):
     borrower = models.ForeignKey(
         "Borrower",
         on_delete=models.CASCADE,
@@ -461,12 +584,16 @@ class FGCompositionRow(TimeStampedModel):
 
     class Meta:
         db_table = 'fg_composition'
+        indexes = [
+            models.Index(fields=["borrower", "report"], name="fg_composition_rpt_idx"),
+            models.Index(fields=["borrower", "as_of_date", "id"], name="fg_composition_cur_idx"),
+        ]
 
 
 # -------------------------
 # Sheet: FG_Inline_Category_Analysis
 # -------------------------
-class FGInlineCategoryAnalysisRow(TimeStampedModel):
+class FGInlineCategoryAnalysisRow(ReportRow):
     borrower = models.ForeignKey(
         "Borrower",
         on_delete=models.CASCADE,
@@ -496,12 +623,16 @@ class FGInlineCategoryAnalysisRow(TimeStampedModel):
 
     class Meta:
         db_table = 'fg_inline_category_analysis'
+        indexes = [
+            models.Index(fields=["borrower", "report"], name="fg_inline_cat_anal_rpt_idx"),
+            models.Index(fields=["borrower", "as_of_date", "id"], name="fg_inline_cat_anal_cur_idx"),
+        ]
 
 
 # -------------------------
 # Sheet: Sales_GM_Trend
 # -------------------------
-class SalesGMTrendRow(TimeStampedModel):
+class SalesGMTrendRow(ReportRow):
     borrower = models.ForeignKey(
         "Borrower",
         on_delete=models.CASCADE,
@@ -530,12 +661,16 @@ class SalesGMTrendRow(TimeStampedModel):
 
     class Meta:
         db_table = 'sales_gm_trend'
+        indexes = [
+            models.Index(fields=["borrower", "report"], name="sales_gm_trend_rpt_idx"),
+            models.Index(fields=["borrower", "as_of_date", "id"], name="sales_gm_trend_cur_idx"),
+        ]
 
 
 # -------------------------
 # Sheet: FG_Inline_Excess_By_Category
 # -------------------------
-class FGInlineExcessByCategoryRow(TimeStampedModel):
+class FGInlineExcessByCategoryRow(ReportRow):
     borrower = models.ForeignKey(
         "Borrower",
         on_delete=models.CASCADE,
@@ -561,12 +696,16 @@ class FGInlineExcessByCategoryRow(TimeStampedModel):
 
     class Meta:
         db_table = 'fg_inline_excess_by_category'
+        indexes = [
+            models.Index(fields=["borrower", "report"], name="fg_inline_exc_cat_rpt_idx"),
+            models.Index(fields=["borrower", "as_of_date", "id"], name="fg_inline_exc_cat_cur_idx"),
+        ]
 
 
 # -------------------------
 # Sheet: Historical_Top_20_SKUs
 # -------------------------
-class HistoricalTop20SKUsRow(TimeStampedModel):
+class HistoricalTop20SKUsRow(ReportRow):
     division = models.CharField(max_length=255, null=True, blank=True)  # Division
     as_of_date = models.DateField(null=True, blank=True)  # AsOfDate
     item_number = models.DecimalField(max_digits=20, decimal_places=6, null=True, blank=True)  # ItemNumber
@@ -588,12 +727,16 @@ class HistoricalTop20SKUsRow(TimeStampedModel):
 
     class Meta:
         db_table = 'historical_top_20_sk_us'
+        indexes = [
+            models.Index(fields=["borrower", "report"], name="hist_top20_skus_rpt_idx"),
+            models.Index(fields=["borrower", "as_of_date", "id"], name="hist_top20_skus_cur_idx"),
+        ]
 
 
 # -------------------------
 # Sheet: RM_Inventory_Metrics
 # -------------------------
-class RMInventoryMetricsRow(TimeStampedModel):
+class RMInventoryMetricsRow(ReportRow):
     inventory_type = models.CharField(max_length=255, null=True, blank=True)  # InventoryType
     division = models.CharField(max_length=255, null=True, blank=True)  # Division
     as_of_date = models.DateField(null=True, blank=True)  # AsOfDate
@@ -611,12 +754,16 @@ class RMInventoryMetricsRow(TimeStampedModel):
 
     class Meta:
         db_table = 'rm_inventory_metrics'
+        indexes = [
+            models.Index(fields=["borrower", "report"], name="rm_inventory_metrics_rpt_idx"),
+            models.Index(fields=["borrower", "as_of_date", "id"], name="rm_inventory_metrics_cur_idx"),
+        ]
 
 
 # -------------------------
 # Sheet: RM_Ineligible_Overview
 # -------------------------
-class RMIneligibleOverviewRow(TimeStampedModel):
+class RMIneligibleOverviewRow(ReportRow):
     date = models.DateField(null=True, blank=True)  # Date
     inventory_type = models.CharField(max_length=255, null=True, blank=True)  # InventoryType
     division = models.CharField(max_length=255, null=True, blank=True)  # Division
@@ -638,12 +785,16 @@ class RMIneligibleOverviewRow(TimeStampedModel):
 
     class Meta:
         db_table = 'rm_ineligible_overview'
+        indexes = [
+            models.Index(fields=["borrower", "report"], name="rm_ineligible_overview_rpt_idx"),
+            models.Index(fields=["borrower", "date", "id"], name="rm_ineligible_overview_cur_idx"),
+        ]
 
 
 # -------------------------
 # Sheet: RM_Category_History
 # -------------------------
-class RMCategoryHistoryRow(TimeStampedModel):
+class RMCategoryHistoryRow(ReportRow):
     date = models.DateField(null=True, blank=True)  # Date
     inventory_type = models.CharField(max_length=255, null=True, blank=True)  # InventoryType
     division = models.CharField(max_length=255, null=True, blank=True)  # Division
@@ -662,12 +813,16 @@ class RMCategoryHistoryRow(TimeStampedModel):
 
     class Meta:
         db_table = 'rm_category_history'
+        indexes = [
+            models.Index(fields=["borrower", "report"], name="rm_category_history_rpt_idx"),
+            models.Index(fields=["borrower", "date", "id"], name="rm_category_history_cur_idx"),
+        ]
 
 
 # -------------------------
 # Sheet: RM_Top20_History
 # -------------------------
-class RMTop20HistoryRow(TimeStampedModel):
+class RMTop20HistoryRow(ReportRow):
     inventory_type = models.CharField(max_length=255, null=True, blank=True)  # InventoryType
     division = models.CharField(max_length=255, null=True, blank=True)  # Division
     as_of_date = models.DateField(null=True, blank=True)  # AsOfDate
@@ -688,13 +843,17 @@ class RMTop20HistoryRow(TimeStampedModel):
 
     class Meta:
         db_table = 'rm_top20_history'
+        indexes = [
+            models.Index(fields=["borrower", "report"], name="rm_top20_history_rpt_idx"),
+            models.Index(fields=["borrower", "as_of_date", "id"], name="rm_top20_history_cur_idx"),
+        ]
 
 
 
 # -------------------------
 # Sheet: WIP_Inventory_Metrics
 # -------------------------
-class WIPInventoryMetricsRow(TimeStampedModel):
+class WIPInventoryMetricsRow(ReportRow):
     inventory_type = models.CharField(max_length=255, null=True, blank=True)  # InventoryType
     division = models.CharField(max_length=255, null=True, blank=True)  # Division
     as_of_date = models.DateField(null=True, blank=True)  # AsOfDate
@@ -712,12 +871,16 @@ class WIPInventoryMetricsRow(TimeStampedModel):
 
     class Meta:
         db_table = 'wip_inventory_metrics'
+        indexes = [
+            models.Index(fields=["borrower", "report"], name="wip_inventory_metrics_rpt_idx"),
+            models.Index(fields=["borrower", "as_of_date", "id"], name="wip_inventory_metrics_cur_idx"),
+        ]
 
 
 # -------------------------
 # Sheet: WIP_Ineligible_Overview
 # -------------------------
-class WIPIneligibleOverviewRow(TimeStampedModel):
+class WIPIneligibleOverviewRow(ReportRow):
     date = models.DateField(null=True, blank=True)  # Date
     inventory_type = models.CharField(max_length=255, null=True, blank=True)  # InventoryType
     division = models.CharField(max_length=255, null=True, blank=True)  # Division
@@ -739,12 +902,16 @@ class WIPIneligibleOverviewRow(TimeStampedModel):
 
     class Meta:
         db_table = 'wip_ineligible_overview'
+        indexes = [
+            models.Index(fields=["borrower", "report"], name="wip_inelig_overview_rpt_idx"),
+            models.Index(fields=["borrower", "date", "id"], name="wip_inelig_overview_cur_idx"),
+        ]
 
 
 # -------------------------
 # Sheet: WIP_Category_History
 # -------------------------
-class WIPCategoryHistoryRow(TimeStampedModel):
+class WIPCategoryHistoryRow(ReportRow):
     date = models.DateField(null=True, blank=True)  # Date
     inventory_type = models.CharField(max_length=255, null=True, blank=True)  # InventoryType
     division = models.CharField(max_length=255, null=True, blank=True)  # Division
@@ -763,12 +930,16 @@ class WIPCategoryHistoryRow(TimeStampedModel):
 
     class Meta:
         db_table = 'wip_category_history'
+        indexes = [
+            models.Index(fields=["borrower", "report"], name="wip_category_history_rpt_idx"),
+            models.Index(fields=["borrower", "date", "id"], name="wip_category_history_cur_idx"),
+        ]
 
 
 # -------------------------
 # Sheet: WIP_Top20_History
 # -------------------------
-class WIPTop20HistoryRow(TimeStampedModel):
+class WIPTop20HistoryRow(ReportRow):
     inventory_type = models.CharField(max_length=255, null=True, blank=True)  # InventoryType
     division = models.CharField(max_length=255, null=True, blank=True)  # Division
     as_of_date = models.DateField(null=True, blank=True)  # AsOfDate
@@ -789,12 +960,16 @@ class WIPTop20HistoryRow(TimeStampedModel):
 
     class Meta:
         db_table = 'wip_top20_history'
+        indexes = [
+            models.Index(fields=["borrower", "report"], name="wip_top20_history_rpt_idx"),
+            models.Index(fields=["borrower", "as_of_date", "id"], name="wip_top20_history_cur_idx"),
+        ]
 
 
 # -------------------------
 # Sheet: FG_Gross_Recovery_History
 # -------------------------
-class FGGrossRecoveryHistoryRow(TimeStampedModel):
+class FGGrossRecoveryHistoryRow(ReportRow):
     borrower = models.ForeignKey(
         "Borrower",
         on_delete=models.CASCADE,
@@ -823,12 +998,16 @@ class FGGrossRecoveryHistoryRow(TimeStampedModel):
 
     class Meta:
         db_table = 'fg_gross_recovery_history'
+        indexes = [
+            models.Index(fields=["borrower", "report"], name="fg_gross_recovery_rpt_idx"),
+            models.Index(fields=["borrower", "as_of_date", "id"], name="fg_gross_recovery_cur_idx"),
+        ]
 
 
 # -------------------------
 # Sheet: WIP_Recovery
 # -------------------------
-class WIPRecoveryRow(TimeStampedModel):
+class WIPRecoveryRow(ReportRow):
     date = models.DateField(null=True, blank=True)  # Date
     inventory_type = models.CharField(max_length=255, null=True, blank=True)  # InventoryType
     division = models.CharField(max_length=255, null=True, blank=True)  # Division
@@ -849,12 +1028,16 @@ class WIPRecoveryRow(TimeStampedModel):
 
     class Meta:
         db_table = 'wip_recovery'
+        indexes = [
+            models.Index(fields=["borrower", "report"], name="wip_recovery_rpt_idx"),
+            models.Index(fields=["borrower", "date", "id"], name="wip_recovery_cur_idx"),
+        ]
 
 
 # -------------------------
 # Sheet: Raw_Material_Recovery
 # -------------------------
-class RawMaterialRecoveryRow(TimeStampedModel):
+class RawMaterialRecoveryRow(ReportRow):
     date = models.DateField(null=True, blank=True)  # Date
     inventory_type = models.CharField(max_length=255, null=True, blank=True)  # InventoryType
     division = models.CharField(max_length=255, null=True, blank=True)  # Division
@@ -875,12 +1058,16 @@ class RawMaterialRecoveryRow(TimeStampedModel):
 
     class Meta:
         db_table = 'raw_material_recovery'
+        indexes = [
+            models.Index(fields=["borrower", "report"], name="raw_material_recovery_rpt_idx"),
+            models.Index(fields=["borrower", "date", "id"], name="raw_material_recovery_cur_idx"),
+        ]
 
 
 # -------------------------
 # Sheet: NOLV_Table
 # -------------------------
-class NOLVTableRow(TimeStampedModel):
+class NOLVTableRow(ReportRow):
     date = models.DateField(null=True, blank=True)  # Date
     division = models.CharField(max_length=255, null=True, blank=True)  # Division
     line_item = models.CharField(max_length=255, null=True, blank=True)  # LineItem
@@ -902,12 +1089,16 @@ class NOLVTableRow(TimeStampedModel):
 
     class Meta:
         db_table = 'nolv_table'
+        indexes = [
+            models.Index(fields=["borrower", "report"], name="nolv_table_rpt_idx"),
+            models.Index(fields=["borrower", "date", "id"], name="nolv_table_cur_idx"),
+        ]
 
 
 # -------------------------
 # Sheet: Risk_Subfactors
 # -------------------------
-class RiskSubfactorsRow(TimeStampedModel):
+class RiskSubfactorsRow(ReportRow):
     borrower = models.ForeignKey(
         "Borrower",
         on_delete=models.CASCADE,
@@ -923,12 +1114,16 @@ class RiskSubfactorsRow(TimeStampedModel):
 
     class Meta:
         db_table = 'risk_subfactors'
+        indexes = [
+            models.Index(fields=["borrower", "report"], name="risk_subfactors_rpt_idx"),
+            models.Index(fields=["borrower", "date", "id"], name="risk_subfactors_cur_idx"),
+        ]
 
 
 # -------------------------
 # Sheet: Composite_Index
 # -------------------------
-class CompositeIndexRow(TimeStampedModel):
+class CompositeIndexRow(ReportRow):
     borrower = models.ForeignKey(
         "Borrower",
         on_delete=models.CASCADE,
@@ -949,12 +1144,16 @@ class CompositeIndexRow(TimeStampedModel):
 
     class Meta:
         db_table = 'composite_index'
+        indexes = [
+            models.Index(fields=["borrower", "date", "id"], name="composite_borrower_date_idx"),
+            models.Index(fields=["borrower", "report"], name="composite_index_rpt_idx"),
+        ]
 
 
 # -------------------------
 # Sheet: Forecast
 # -------------------------
-class ForecastRow(TimeStampedModel):
+class ForecastRow(ReportRow):
     as_of_date = models.DateField(null=True, blank=True)  # AsOfDate
     period = models.DateField(null=True, blank=True)  # Period
     actual_forecast = models.CharField(max_length=255, null=True, blank=True)  # ActualForecast
@@ -977,10 +1176,14 @@ class ForecastRow(TimeStampedModel):
 
     class Meta:
         db_table = 'forecast'
+        indexes = [
+            models.Index(fields=["borrower", "as_of_date", "id"], name="forecast_borrower_date_idx"),
+            models.Index(fields=["borrower", "report"], name="forecast_rpt_idx"),
+        ]
 
 # -------------------------
 # Sheet: Availability Forecast
-class AvailabilityForecastRow(TimeStampedModel):
+class AvailabilityForecastRow(ReportRow):
     date = models.DateField(null=True, blank=True)  # Date
     category = models.CharField(max_length=255, null=True, blank=True)  # Category
     x = models.DecimalField(max_digits=20, decimal_places=6, null=True, blank=True)  # X
@@ -1008,12 +1211,16 @@ class AvailabilityForecastRow(TimeStampedModel):
 
     class Meta:
         db_table = 'availability_forecast'
+        indexes = [
+            models.Index(fields=["borrower", "report"], name="availability_forecast_rpt_idx"),
+            models.Index(fields=["borrower", "date", "id"], name="availability_forecast_cur_idx"),
+        ]
 
 
 # -------------------------
 # Sheet: Cash Forecast
 # -------------------------
-class CashForecastRow(TimeStampedModel):
+class CashForecastRow(ReportRow):
     date = models.DateField(null=True, blank=True)  # Date
     category = models.CharField(max_length=255, null=True, blank=True)  # Category
     x = models.DecimalField(max_digits=20, decimal_places=6, null=True, blank=True)  # X
@@ -1030,13 +1237,6 @@ class CashForecastRow(TimeStampedModel):
     week_11 = models.DecimalField(max_digits=20, decimal_places=6, null=True, blank=True)  # Week 11
     week_12 = models.DecimalField(max_digits=20, decimal_places=6, null=True, blank=True)  # Week 12
     week_13 = models.DecimalField(max_digits=20, decimal_places=6, null=True, blank=True)  # Week 13
-    report = models.ForeignKey(
-        "BorrowerReport",
-        on_delete=models.CASCADE,
-        related_name="%(class)s_rows",
-        null=True,
-        blank=True,
-    )
 
     class Meta:
         db_table = 'cash_forecast'
@@ -1045,7 +1245,7 @@ class CashForecastRow(TimeStampedModel):
 # -------------------------
 # Sheet: Cash Flow Forecast
 # -------------------------
-class CashFlowForecastRow(TimeStampedModel):
+class CashFlowForecastRow(ReportRow):
     date = models.DateField(null=True, blank=True)  # Date
     category = models.CharField(max_length=255, null=True, blank=True)  # Category
     x = models.DecimalField(max_digits=20, decimal_places=6, null=True, blank=True)  # X
@@ -1063,13 +1263,6 @@ class CashFlowForecastRow(TimeStampedModel):
     week_12 = models.DecimalField(max_digits=20, decimal_places=6, null=True, blank=True)  # Week 12
     week_13 = models.DecimalField(max_digits=20, decimal_places=6, null=True, blank=True)  # Week 13
     total = models.DecimalField(max_digits=20, decimal_places=2, null=True, blank=True)  # Total
-    report = models.ForeignKey(
-        "BorrowerReport",
-        on_delete=models.CASCADE,
-        related_name="%(class)s_rows",
-        null=True,
-        blank=True,
-    )
 
     class Meta:
         db_table = 'cash_flow_forecast'
@@ -1077,7 +1270,7 @@ class CashFlowForecastRow(TimeStampedModel):
 # -------------------------
 # Sheet: Current Week Variance
 # -------------------------
-class CurrentWeekVarianceRow(TimeStampedModel):
+class CurrentWeekVarianceRow(ReportRow):
     date = models.DateField(null=True, blank=True)  # Date 
     category = models.CharField(max_length=255, null=True, blank=True)  # Category
     projected = models.DecimalField(max_digits=20, decimal_places=6, null=True, blank=True)  # Projected
@@ -1094,12 +1287,16 @@ class CurrentWeekVarianceRow(TimeStampedModel):
 
     class Meta:
         db_table = 'current_week_variance'
+        indexes = [
+            models.Index(fields=["borrower", "report"], name="current_week_variance_rpt_idx"),
+            models.Index(fields=["borrower", "date", "id"], name="current_week_variance_cur_idx"),
+        ]
 
 
 # -------------------------
 # Sheet: Cummulative Variance
 # -------------------------
-class CummulativeVarianceRow(TimeStampedModel):
+class CummulativeVarianceRow(ReportRow):
     date = models.DateField(null=True, blank=True)  # Date 
     category = models.CharField(max_length=255, null=True, blank=True)  # Category
     projected = models.DecimalField(max_digits=20, decimal_places=6, null=True, blank=True)  # Projected
@@ -1116,12 +1313,16 @@ class CummulativeVarianceRow(TimeStampedModel):
 
     class Meta:
         db_table = 'cummulative_variance'
+        indexes = [
+            models.Index(fields=["borrower", "report"], name="cummulative_variance_rpt_idx"),
+            models.Index(fields=["borrower", "date", "id"], name="cummulative_variance_cur_idx"),
+        ]
 
 
 # -------------------------
 # Sheet: Collateral Limits 
 # -------------------------
-class CollateralLimitsRow(TimeStampedModel):
+class CollateralLimitsRow(ReportRow):
     borrower = models.ForeignKey(
         "Borrower",
         on_delete=models.CASCADE,
@@ -1137,12 +1338,17 @@ class CollateralLimitsRow(TimeStampedModel):
 
     class Meta:
         db_table = 'collateral_limits'
+        indexes = [
+            models.Index(fields=["borrower", "division"], name="coll_limits_borrower_div_idx"),
+            models.Index(fields=["borrower", "collateral_type"], name="coll_limits_borrower_type_idx"),
+            models.Index(fields=["borrower", "report"], name="collateral_limits_rpt_idx"),
+        ]
 
 
 # -------------------------
 # Sheet: Ineligibles
 # -------------------------
-class IneligiblesRow(TimeStampedModel):
+class IneligiblesRow(ReportRow):
     division = models.CharField(max_length=255, null=True, blank=True)  # Division
     collateral_type = models.CharField(max_length=255, null=True, blank=True)  # Collateral Type 
     collateral_sub_type = models.CharField(max_length=255, null=True, blank=True)  # Collateral Sub-Type 
@@ -1156,3 +1362,241 @@ class IneligiblesRow(TimeStampedModel):
 
     class Meta:
         db_table = 'ineligibles'
+        indexes = [
+            models.Index(fields=["borrower", "report"], name="ineligibles_rpt_idx"),
+        ]
+
+
+# =========================
+# Materialized read models (rebuilt from the *Row tables)
+# =========================
+class BorrowerRiskScorecard(TimeStampedModel):
+    """
+    Per-borrower risk snapshot consumed by the Risk tab and the dashboard
+    risk cards. Rebuilt by `management.risk_scorecard.refresh_risk_scorecard`
+    after every import and every admin edit of a risk input.
+    """
+    borrower = models.OneToOneField(
+        "Borrower",
+        on_delete=models.CASCADE,
+        related_name="risk_scorecard",
+    )
+    report = models.ForeignKey(
+        "BorrowerReport",
+        on_delete=models.SET_NULL,
+        related_name="+",
+        null=True,
+        blank=True,
+    )
+    overall_score = models.DecimalField(max_digits=20, decimal_places=6, null=True, blank=True)
+    ar_pct_past_due = PctField()
+    weights = models.JSONField(default=list, blank=True)  # [{"label", "value"}]
+    category_scores = models.JSONField(default=list, blank=True)  # [{"label", "score", "bars"}]
+    trend_points = models.JSONField(default=list, blank=True)  # [{"label", "score"}]
+    high_impact_factors = models.JSONField(default=list, blank=True)
+
+    class Meta:
+        db_table = 'borrower_risk_scorecard'
+
+
+# =========================
+# Alerts
+# =========================
+class AlertRule(TimeStampedModel):
+    """
+    A threshold on one borrower metric, evaluated for every borrower at once
+    by `management.alerts.evaluate_rules`. See `management.alerts.METRICS`
+    for what each metric measures.
+    """
+    METRIC_CHOICES = [
+        ("excess_availability", "Availability less loan balance"),
+        ("pct_past_due", "AR % past due"),
+        ("pct_past_due_change", "Change in AR % past due"),
+        ("max_concentration_pct", "Largest customer concentration %"),
+        ("overall_score", "Composite risk score"),
+        ("overall_score_change", "Change in composite risk score"),
+    ]
+    COMPARISON_CHOICES = [
+        ("lt", "below"),
+        ("lte", "at or below"),
+        ("gt", "above"),
+        ("gte", "at or above"),
+    ]
+    SEVERITY_CHOICES = [
+        ("info", "Info"),
+        ("warning", "Warning"),
+        ("critical", "Critical"),
+    ]
+
+    name = models.CharField(max_length=255)
+    metric = models.CharField(max_length=50, choices=METRIC_CHOICES)
+    comparison = models.CharField(max_length=3, choices=COMPARISON_CHOICES)
+    threshold = models.DecimalField(max_digits=20, decimal_places=6)  # rates as fractions
+    severity = models.CharField(max_length=10, choices=SEVERITY_CHOICES, default="warning")
+    company = models.ForeignKey(
+        Company,
+        on_delete=models.CASCADE,
+        related_name="alert_rules",
+        null=True,
+        blank=True,
+        help_text="Limit the rule to this company's borrowers.",
+    )
+    is_active = models.BooleanField(default=True)
+
+    class Meta:
+        db_table = 'alert_rule'
+
+    def __str__(self):
+        return self.name
+
+
+class Alert(TimeStampedModel):
+    """One borrower tripping one rule on one report; raised at most once per report."""
+    rule = models.ForeignKey(AlertRule, on_delete=models.CASCADE, related_name="alerts")
+    borrower = models.ForeignKey("Borrower", on_delete=models.CASCADE, related_name="alerts")
+    report = models.ForeignKey("BorrowerReport", on_delete=models.CASCADE, related_name="alerts")
+    severity = models.CharField(max_length=10, choices=AlertRule.SEVERITY_CHOICES)
+    value = models.DecimalField(max_digits=20, decimal_places=6)
+    threshold = models.DecimalField(max_digits=20, decimal_places=6)
+    message = models.CharField(max_length=500)
+    is_read = models.BooleanField(default=False)
+    read_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'alert'
+        constraints = [
+            models.UniqueConstraint(fields=["rule", "borrower", "report"], name="alert_rule_borrower_report_uniq"),
+        ]
+        indexes = [
+            # The inbox: unread alerts, newest first.
+            models.Index(fields=["-created_at"], condition=models.Q(is_read=False), name="alert_unread_idx"),
+            models.Index(fields=["borrower", "-created_at"], name="alert_borrower_idx"),
+        ]
+
+
+# =========================
+# Background jobs
+# =========================
+class Job(TimeStampedModel):
+    """
+    A unit of background work (import, export, cache warming, archival)
+    run by `manage.py run_workers`; see management.jobs. Workers claim
+    queued jobs with SELECT ... FOR UPDATE SKIP LOCKED and report progress
+    here, which the JSON status endpoint serves.
+    """
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    STATUS_CHOICES = [
+        (QUEUED, "Queued"),
+        (RUNNING, "Running"),
+        (SUCCEEDED, "Succeeded"),
+        (FAILED, "Failed"),
+    ]
+
+    kind = models.CharField(max_length=50)
+    params = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=QUEUED)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=3)
+    run_after = models.DateTimeField(default=timezone.now)
+    progress = models.PositiveSmallIntegerField(default=0)  # percent
+    message = models.CharField(max_length=255, blank=True, default="")
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True, default="")
+    worker = models.CharField(max_length=100, blank=True, default="")
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        related_name="jobs",
+        null=True,
+        blank=True,
+    )
+
+    class Meta:
+        db_table = 'job'
+        indexes = [
+            # The claim query: due queued jobs, oldest first.
+            models.Index(fields=["run_after", "id"], condition=models.Q(status="queued"), name="job_queued_idx"),
+            models.Index(fields=["status", "updated_at"], name="job_status_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} #{self.pk} ({self.status})"
+
+    def set_progress(self, percent, message=""):
+        """Record progress; also the heartbeat that keeps a running job from looking stale."""
+        self.progress = max(0, min(100, int(percent)))
+        self.message = message[:255]
+        Job.objects.filter(pk=self.pk).update(progress=self.progress, message=self.message, updated_at=timezone.now())
+
+
+class Upload(TimeStampedModel):
+    """
+    A workbook arriving in chunks; see management.uploads. `received` is
+    the offset the next chunk must start at, so an interrupted upload
+    resumes from there. Once every byte is in and the checksum matches,
+    `job` imports it.
+    """
+    RECEIVING = "receiving"
+    COMPLETE = "complete"
+    FAILED = "failed"
+    STATUS_CHOICES = [
+        (RECEIVING, "Receiving"),
+        (COMPLETE, "Complete"),
+        (FAILED, "Failed"),
+    ]
+
+    filename = models.CharField(max_length=255)
+    size = models.BigIntegerField()
+    received = models.BigIntegerField(default=0)
+    sha256 = models.CharField(max_length=64)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=RECEIVING)
+    error = models.CharField(max_length=255, blank=True, default="")
+    report_date = models.DateField(null=True, blank=True)
+    job = models.OneToOneField(Job, on_delete=models.SET_NULL, related_name="upload", null=True, blank=True)
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        related_name="uploads",
+        null=True,
+        blank=True,
+    )
+
+    class Meta:
+        db_table = 'upload'
+        indexes = [
+            models.Index(fields=["created_by", "-created_at"], name="upload_user_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.filename} ({self.received}/{self.size})"
+
+
+# =========================
+# Diagnostics
+# =========================
+class SlowQuery(TimeStampedModel):
+    """
+    One SQL statement that ran over settings.SLOW_QUERY_THRESHOLD_MS during
+    a request. Captured by `management.slow_queries`; a sampled subset also
+    carries the database's EXPLAIN output.
+    """
+    fingerprint = models.CharField(max_length=32)  # md5 of the normalized SQL
+    normalized_sql = models.TextField()
+    sample_sql = models.TextField()
+    duration_ms = models.FloatField()
+    view = models.CharField(max_length=100, blank=True, default="")
+    builder = models.CharField(max_length=100, blank=True, default="")
+    database = models.CharField(max_length=50, default="default")
+    explain = models.TextField(blank=True, default="")
+
+    class Meta:
+        db_table = 'slow_query'
+        indexes = [
+            models.Index(fields=["fingerprint", "created_at"], name="slow_query_fingerprint_idx"),
+            models.Index(fields=["created_at"], name="slow_query_created_idx"),
+        ]
@@ -0,0 +1,92 @@
+import base64
+import binascii
+import json
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils.dateparse import parse_date
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Forward-only cursor pagination over (date, id), or id alone when the view
+    sets no `cursor_date_field`. Undated rows sort last. The cursor carries
+    the last row's key, so rows added behind it never shift a page, and a
+    page costs at most two index range scans on (borrower, date, id) however
+    deep the client has paged: dated rows from the cursor's date on, then,
+    once those run out, undated rows after the cursor's id.
+    """
+
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    invalid_cursor_message = "Invalid cursor."
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.date_field = getattr(view, "cursor_date_field", None)
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+        day, pk = self.decode_cursor(request) or (None, None)
+        limit = self.page_size + 1
+        if self.date_field is None:
+            rows = list(self.undated(queryset, pk)[:limit])
+        else:
+            rows = []
+            if pk is None or day is not None:
+                rows = list(self.dated(queryset, day, pk)[:limit])
+                pk = None
+            if len(rows) < limit:
+                undated = queryset.filter(**{f"{self.date_field}__isnull": True})
+                rows += list(self.undated(undated, pk)[: limit - len(rows)])
+        self.has_next = len(rows) > self.page_size
+        rows = rows[: self.page_size]
+        self.last = rows[-1] if rows else None
+        return rows
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return settings.API_PAGE_SIZE
+        return min(max(size, 1), settings.API_MAX_PAGE_SIZE)
+
+    def dated(self, queryset, day, pk):
+        queryset = queryset.filter(**{f"{self.date_field}__isnull": False}).order_by(self.date_field, "pk")
+        if day is None:
+            return queryset
+        # date >= day bounds the index scan; the OR only sifts the rows dated `day`.
+        return queryset.filter(Q(**{f"{self.date_field}__gt": day}) | Q(pk__gt=pk), **{f"{self.date_field}__gte": day})
+
+    def undated(self, queryset, pk):
+        queryset = queryset.order_by("pk")
+        return queryset if pk is None else queryset.filter(pk__gt=pk)
+
+    def encode_cursor(self, row):
+        day = getattr(row, self.date_field) if self.date_field else None
+        payload = json.dumps([day.isoformat() if day else None, row.pk])
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            payload = base64.urlsafe_b64decode(encoded + "=" * (-len(encoded) % 4))
+            day, pk = json.loads(payload)
+            day = parse_date(day) if day else None
+            if not isinstance(pk, int):
+                raise ValueError(pk)
+        except (binascii.Error, ValueError, TypeError):
+            raise NotFound(self.invalid_cursor_message)
+        return day, pk
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return replace_query_param(self.base_url, self.cursor_query_param, self.encode_cursor(self.last))
+
+    def get_paginated_response(self, data):
+        return Response({"next": self.get_next_link(), "results": data})
@@ -0,0 +1,224 @@
+import datetime as dt
+
+from django.conf import settings
+from django.db import connection, transaction
+
+
+DEFAULT_HASH_PARTITIONS = 16
+LEGACY_SUFFIX = "_unpartitioned"
+
+
+def partition_config():
+    """Normalized copy of settings.ROW_TABLE_PARTITIONING keyed by table."""
+    config = {}
+    for table, spec in getattr(settings, "ROW_TABLE_PARTITIONING", {}).items():
+        strategy = spec.get("strategy", "hash")
+        if strategy not in ("hash", "range"):
+            raise ValueError(f"{table}: unknown partition strategy '{strategy}'")
+        if strategy == "range" and not spec.get("column"):
+            raise ValueError(f"{table}: range partitioning needs a date column")
+        config[table] = {
+            "strategy": strategy,
+            "column": spec.get("column") or "borrower_id",
+            "partitions": int(spec.get("partitions") or DEFAULT_HASH_PARTITIONS),
+        }
+    return config
+
+
+def _month_start(value):
+    return dt.date(value.year, value.month, 1)
+
+
+def _add_months(value, months):
+    month_index = value.month - 1 + months
+    return dt.date(value.year + month_index // 12, month_index % 12 + 1, 1)
+
+
+def month_partition_name(table, month):
+    return f"{table}_p{month:%Y_%m}"
+
+
+def month_partition_sql(table, month):
+    start = _month_start(month)
+    end = _add_months(start, 1)
+    name = month_partition_name(table, start)
+    return (
+        f'CREATE TABLE IF NOT EXISTS "{name}" PARTITION OF "{table}" '
+        f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+    )
+
+
+def hash_partition_sql(table, modulus, remainder):
+    return (
+        f'CREATE TABLE IF NOT EXISTS "{table}_h{remainder}" PARTITION OF "{table}" '
+        f"FOR VALUES WITH (MODULUS {modulus}, REMAINDER {remainder})"
+    )
+
+
+def months_between(first, last):
+    month = _month_start(first)
+    last = _month_start(last)
+    while month <= last:
+        yield month
+        month = _add_months(month, 1)
+
+
+def is_partitioned(table):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM pg_partitioned_table pt JOIN pg_class c ON c.oid = pt.partrelid "
+            "WHERE c.relname = %s",
+            [table],
+        )
+        return cursor.fetchone() is not None
+
+
+def list_partitions(table):
+    """(name, bound expression) for each attached partition of `table`."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT child.relname, pg_get_expr(child.relpartbound, child.oid) "
+            "FROM pg_inherits i "
+            "JOIN pg_class parent ON parent.oid = i.inhparent "
+            "JOIN pg_class child ON child.oid = i.inhrelid "
+            "WHERE parent.relname = %s ORDER BY child.relname",
+            [table],
+        )
+        return cursor.fetchall()
+
+
+def _table_date_span(cursor, table, column):
+    cursor.execute(f'SELECT MIN("{column}"), MAX("{column}") FROM "{table}"')
+    return cursor.fetchone()
+
+
+def convert_table(table, spec, months_ahead=3, log=None):
+    """
+    Rebuild `table` as a partitioned table with the same columns, defaults,
+    identity, indexes and foreign keys, then copy the rows across.
+
+    This is an offline migration: it runs in one transaction that holds an
+    ACCESS EXCLUSIVE lock on `table` from the rename until the copy and the
+    index builds finish, so every read and write of the table waits for the
+    whole copy. Schedule downtime for it.
+
+    Postgres requires unique constraints on a partitioned table to include
+    the partition key, so the primary key becomes (id, <key>). A nullable
+    key column (a range-partitioned date that may be NULL) cannot be part of
+    a primary key; the pair is then enforced by UNIQUE NULLS NOT DISTINCT,
+    which needs PostgreSQL 15.
+    """
+    log = log or (lambda message: None)
+    legacy = f"{table}{LEGACY_SUFFIX}"
+    column = spec["column"]
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT indexdef FROM pg_indexes WHERE tablename = %s "
+            "AND indexname NOT IN (SELECT conname FROM pg_constraint WHERE contype = 'p')",
+            [table],
+        )
+        index_defs = [row[0] for row in cursor.fetchall()]
+        cursor.execute(
+            "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+            "WHERE conrelid = %s::regclass AND contype = 'f'",
+            [table],
+        )
+        foreign_keys = cursor.fetchall()
+        cursor.execute(
+            "SELECT is_nullable = 'YES' FROM information_schema.columns "
+            "WHERE table_schema = current_schema() AND table_name = %s AND column_name = %s",
+            [table, column],
+        )
+        row = cursor.fetchone()
+        if row is None:
+            raise ValueError(f"{table}: no column '{column}' to partition on")
+        key_nullable = row[0]
+        if key_nullable and connection.pg_version < 150000:
+            raise ValueError(
+                f"{table}: '{column}' is nullable; keeping (id, {column}) unique needs PostgreSQL 15 or later"
+            )
+
+        cursor.execute(f'ALTER TABLE "{table}" RENAME TO "{legacy}"')
+        if spec["strategy"] == "hash":
+            partition_by = f'HASH ("{column}")'
+        else:
+            partition_by = f'RANGE ("{column}")'
+        cursor.execute(
+            f'CREATE TABLE "{table}" (LIKE "{legacy}" INCLUDING DEFAULTS INCLUDING IDENTITY) '
+            f"PARTITION BY {partition_by}"
+        )
+
+        if spec["strategy"] == "hash":
+            for remainder in range(spec["partitions"]):
+                cursor.execute(hash_partition_sql(table, spec["partitions"], remainder))
+        else:
+            first, last = _table_date_span(cursor, legacy, column)
+            horizon = _add_months(_month_start(dt.date.today()), months_ahead)
+            for month in months_between(first or dt.date.today(), max(last or horizon, horizon)):
+                cursor.execute(month_partition_sql(table, month))
+            cursor.execute(f'CREATE TABLE IF NOT EXISTS "{table}_pdefault" PARTITION OF "{table}" DEFAULT')
+
+        cursor.execute(f'INSERT INTO "{table}" SELECT * FROM "{legacy}"')
+        copied = cursor.rowcount
+        cursor.execute(f'DROP TABLE "{legacy}"')
+
+        if key_nullable:
+            cursor.execute(
+                f'ALTER TABLE "{table}" ADD CONSTRAINT "{table}_id_key_uniq" '
+                f'UNIQUE NULLS NOT DISTINCT ("id", "{column}")'
+            )
+        else:
+            cursor.execute(f'ALTER TABLE "{table}" ADD CONSTRAINT "{table}_pkey" PRIMARY KEY ("id", "{column}")')
+        for index_def in index_defs:
+            cursor.execute(index_def)
+        for name, definition in foreign_keys:
+            cursor.execute(f'ALTER TABLE "{table}" ADD CONSTRAINT "{name}" {definition}')
+        cursor.execute(
+            f"SELECT setval(pg_get_serial_sequence('\"{table}\"', 'id'), "
+            f'COALESCE((SELECT MAX("id") FROM "{table}"), 0) + 1, false)'
+        )
+    log(f"{table}: partitioned by {spec['strategy']} on {column}, {copied} rows copied")
+    return copied
+
+
+def extend_partitions(table, spec, months_ahead=3, today=None):
+    """Create monthly partitions up to `months_ahead` months past today."""
+    if spec["strategy"] != "range":
+        return []
+    today = today or dt.date.today()
+    created = []
+    with connection.cursor() as cursor:
+        existing = {name for name, _bound in list_partitions(table)}
+        for month in months_between(today, _add_months(today, months_ahead)):
+            name = month_partition_name(table, month)
+            if name in existing:
+                continue
+            cursor.execute(month_partition_sql(table, month))
+            created.append(name)
+    return created
+
+
+def detach_partitions(table, spec, keep_months, archive_schema=None, today=None):
+    """
+    Detach monthly partitions that end before the retention window. Detached
+    tables are left in place, or moved into `archive_schema` when given.
+    """
+    if spec["strategy"] != "range":
+        return []
+    today = today or dt.date.today()
+    cutoff = _add_months(_month_start(today), -keep_months)
+    cutoff_name = month_partition_name(table, cutoff)
+    prefix = f"{table}_p"
+    detached = []
+    with transaction.atomic(), connection.cursor() as cursor:
+        if archive_schema:
+            cursor.execute(f'CREATE SCHEMA IF NOT EXISTS "{archive_schema}"')
+        for name, _bound in list_partitions(table):
+            # Monthly partitions sort chronologically by name; skip the default one.
+            if not name.startswith(prefix) or name == f"{table}_pdefault" or name >= cutoff_name:
+                continue
+            cursor.execute(f'ALTER TABLE "{table}" DETACH PARTITION "{name}"')
+            if archive_schema:
+                cursor.execute(f'ALTER TABLE "{name}" SET SCHEMA "{archive_schema}"')
+            detached.append(name)
+    return detached
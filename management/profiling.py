@@ -0,0 +1,153 @@
+"""
+cProfile capture for dashboard views.
+
+`profile_request` runs one request under cProfile and writes two files to
+settings.PROFILE_OUTPUT_ROOT:
+
+* <name>.collapsed: "frame;frame;frame microseconds" lines for
+  flamegraph.pl, speedscope or inferno. cProfile only keeps caller/callee
+  pairs, so a function's time is split across its callers in proportion to
+  the time each caller spent in it.
+* <name>.txt: the top functions by cumulative time, limited to
+  management/views/*.py by default so builders and helpers stand out from
+  ORM and template internals.
+
+Both the `profile_view` command and the staff-only `?__profile=1` flag
+(ProfilingMiddleware) use it.
+"""
+import cProfile
+import pstats
+from datetime import datetime
+from pathlib import Path
+
+from django.conf import settings
+from django.http import HttpResponse
+
+PROFILE_ROOT = Path(getattr(settings, "PROFILE_OUTPUT_ROOT", Path(settings.BASE_DIR) / "uploads" / "profiles"))
+VIEWS_PATH = str(Path(settings.BASE_DIR) / "management" / "views")
+PROFILE_PARAM = "__profile"
+DEFAULT_TOP = 25
+MIN_FRAME_SECONDS = 1e-5
+
+
+def _frame_label(func):
+    filename, line, name = func
+    if filename == "~":
+        label = name
+    else:
+        path = Path(filename)
+        try:
+            location = str(path.relative_to(settings.BASE_DIR))
+        except ValueError:
+            location = path.name
+        label = f"{name} ({location}:{line})"
+    # ";" separates frames in the collapsed format.
+    return label.replace(";", ",")
+
+
+def collapsed_stacks(stats):
+    """Flamegraph input derived from a `pstats.Stats` call graph."""
+    entries = stats.stats
+    callees = {}
+    for func, (_cc, _nc, _tt, _ct, callers) in entries.items():
+        for caller, edge in callers.items():
+            if caller != func:
+                callees.setdefault(caller, []).append((func, edge[3]))
+    roots = [
+        func for func, (_cc, _nc, _tt, _ct, callers) in entries.items()
+        if not any(caller != func for caller in callers)
+    ]
+
+    totals = {}
+
+    def walk(func, path, scale):
+        _cc, _nc, own, cumulative, _callers = entries[func]
+        path = path + (_frame_label(func),)
+        if own * scale > 0:
+            key = ";".join(path)
+            totals[key] = totals.get(key, 0.0) + own * scale
+        for callee, edge_seconds in callees.get(func, ()):
+            callee_cumulative = entries[callee][3]
+            if not callee_cumulative or _frame_label(callee) in path:
+                continue
+            child_scale = scale * edge_seconds / callee_cumulative
+            if callee_cumulative * child_scale >= MIN_FRAME_SECONDS:
+                walk(callee, path, child_scale)
+
+    for root in roots:
+        walk(root, (), 1.0)
+    return [
+        f"{stack} {round(seconds * 1_000_000)}"
+        for stack, seconds in sorted(totals.items())
+        if round(seconds * 1_000_000) > 0
+    ]
+
+
+def top_functions(stats, top=DEFAULT_TOP, path_prefix=VIEWS_PATH):
+    """(label, calls, own_ms, cumulative_ms) by cumulative time."""
+    rows = []
+    for func, (_cc, calls, own, cumulative, _callers) in stats.stats.items():
+        if path_prefix and not func[0].startswith(path_prefix):
+            continue
+        rows.append((_frame_label(func), calls, own * 1000, cumulative * 1000))
+    rows.sort(key=lambda row: row[3], reverse=True)
+    return rows[:top]
+
+
+def format_summary(title, stats, top=DEFAULT_TOP, path_prefix=VIEWS_PATH):
+    lines = [title, f"total: {stats.total_tt * 1000:.1f}ms", ""]
+    lines.append(f"{'cumulative ms':>14} {'own ms':>10} {'calls':>7}  function")
+    for label, calls, own_ms, cumulative_ms in top_functions(stats, top, path_prefix):
+        lines.append(f"{cumulative_ms:>14.1f} {own_ms:>10.1f} {calls:>7}  {label}")
+    return "\n".join(lines) + "\n"
+
+
+def write_profile(name, stats, title, top=DEFAULT_TOP, path_prefix=VIEWS_PATH, output_dir=None):
+    """Write the collapsed stacks and summary; returns (collapsed_path, summary_path, summary)."""
+    directory = Path(output_dir) if output_dir else PROFILE_ROOT
+    directory.mkdir(parents=True, exist_ok=True)
+    stem = f"{name}-{datetime.now().strftime('%Y%m%d-%H%M%S-%f')}"
+    collapsed_path = directory / f"{stem}.collapsed"
+    collapsed_path.write_text("\n".join(collapsed_stacks(stats)) + "\n")
+    summary = format_summary(title, stats, top, path_prefix)
+    summary_path = directory / f"{stem}.txt"
+    summary_path.write_text(summary)
+    return collapsed_path, summary_path, summary
+
+
+def profile_call(func, *args, **kwargs):
+    """Run `func` under cProfile; returns (result, pstats.Stats)."""
+    profiler = cProfile.Profile()
+    result = profiler.runcall(func, *args, **kwargs)
+    return result, pstats.Stats(profiler)
+
+
+class ProfilingMiddleware:
+    """
+    `?__profile=1` on any page, for staff users, runs the request under
+    cProfile and answers with the text summary instead of the page;
+    `?__profile=collapsed` answers with the collapsed stacks. Both are also
+    written to PROFILE_OUTPUT_ROOT.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        mode = request.GET.get(PROFILE_PARAM)
+        user = getattr(request, "user", None)
+        if not mode or not (user and user.is_staff):
+            return self.get_response(request)
+
+        response, stats = profile_call(self.get_response, request)
+        match = getattr(request, "resolver_match", None)
+        name = (match.url_name if match else None) or "request"
+        collapsed_path, summary_path, summary = write_profile(
+            name,
+            stats,
+            title=f"{request.method} {request.get_full_path()} -> {response.status_code}",
+        )
+        if mode == "collapsed":
+            return HttpResponse(collapsed_path.read_text(), content_type="text/plain; charset=utf-8")
+        body = f"{summary}\ncollapsed stacks: {collapsed_path}\nsummary: {summary_path}\n"
+        return HttpResponse(body, content_type="text/plain; charset=utf-8")
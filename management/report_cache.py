@@ -0,0 +1,59 @@
+"""
+Per-report cache for dashboard builders.
+
+An imported report never changes, so whatever a builder computes from the
+report's rows can be kept for as long as the report exists. Entries are
+keyed by report id and the report's updated_at, which ReportRow.save() and
+delete() bump whenever one of the borrower's rows is edited by hand; stale
+entries are simply never read again and age out of the cache.
+"""
+import functools
+import hashlib
+
+from django.conf import settings
+from django.core.cache import caches
+
+from management.metrics import CACHE_LOOKUPS
+from management.report_scope import active_report
+
+_MISSING = object()
+
+
+def report_cache():
+    return caches[getattr(settings, "REPORT_CACHE_ALIAS", "default")]
+
+
+def cache_key(report, name, args=(), kwargs=None):
+    version = report.updated_at.timestamp() if report.updated_at else 0
+    arguments = repr((args, sorted((kwargs or {}).items())))
+    digest = hashlib.md5(arguments.encode("utf-8")).hexdigest()
+    return f"report:{report.pk}:{version:.6f}:{name}:{digest}"
+
+
+def report_cached(name=None):
+    """
+    Cache `func(borrower, *args)` under the report selected by
+    management.report_scope. Calls outside a report scope, or for another
+    borrower than the scoped report's, are passed straight through.
+    """
+
+    def decorator(func):
+        cache_name = name or func.__name__.lstrip("_")
+
+        @functools.wraps(func)
+        def wrapper(borrower, *args, **kwargs):
+            report = active_report()
+            if borrower is None or report is None or report.borrower_id != borrower.pk:
+                return func(borrower, *args, **kwargs)
+            cache = report_cache()
+            key = cache_key(report, cache_name, args, kwargs)
+            value = cache.get(key, _MISSING)
+            CACHE_LOOKUPS.inc(cache="report", result="miss" if value is _MISSING else "hit")
+            if value is _MISSING:
+                value = func(borrower, *args, **kwargs)
+                cache.set(key, value)
+            return value
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,120 @@
+"""
+Which BorrowerReport a dashboard request reads.
+
+Every imported workbook is a complete picture of the borrower (history
+sheets included), so a dashboard renders one report's rows. `report_scope`
+selects that report for the duration of a request; `Model.objects
+.for_borrower(borrower)` on any *Row model then filters on
+(borrower_id, report_id), which the per-model composite index covers.
+Without a scope, or for a borrower with no reports, all of the borrower's
+rows are returned as before.
+"""
+import functools
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.utils import timezone
+
+REPORT_PARAM = "report"
+SESSION_KEY = "selected_report_id"
+
+_active = ContextVar("active_report", default=None)
+
+
+def active_report():
+    return _active.get()
+
+
+@contextmanager
+def report_scope(report):
+    token = _active.set(report)
+    try:
+        yield report
+    finally:
+        _active.reset(token)
+
+
+def reference_date():
+    """The date dashboards measure ranges back from: the report's, else today."""
+    report = active_report()
+    if report is not None and report.report_date:
+        return report.report_date
+    return timezone.localdate()
+
+
+def report_options(borrower, limit=None):
+    """A borrower's most recent reports, newest first, for the report selector."""
+    from management.models import BorrowerReport
+
+    if not borrower:
+        return []
+    limit = limit or getattr(settings, "REPORT_SELECTOR_LIMIT", 24)
+    return list(
+        BorrowerReport.objects.filter(borrower=borrower)
+        .order_by("-report_date", "-created_at", "-id")[:limit]
+    )
+
+
+def latest_report(borrower):
+    from management.models import BorrowerReport
+
+    if not borrower:
+        return None
+    return (
+        BorrowerReport.objects.filter(borrower=borrower)
+        .order_by("-report_date", "-created_at", "-id")
+        .first()
+    )
+
+
+def resolve_report(request, borrower, options=None):
+    """
+    The borrower's report named by ?report=<id>, else the one last picked in
+    this session, else its latest report. Like the borrower selection, a
+    pick is remembered in the session so every tab renders the same report;
+    picking the latest report clears it. `options` (see report_options)
+    saves the lookup when it already holds the report.
+    """
+    from management.models import BorrowerReport
+
+    if not borrower:
+        return None
+    requested = request.GET.get(REPORT_PARAM)
+    if not (requested and str(requested).isdigit()):
+        requested = request.session.get(SESSION_KEY)
+    latest = options[0] if options else latest_report(borrower)
+    report = None
+    if requested and str(requested).isdigit():
+        report_id = int(requested)
+        report = next((option for option in options or [] if option.pk == report_id), None)
+        if report is None:
+            report = BorrowerReport.objects.filter(pk=report_id, borrower=borrower).first()
+    if report is None or report == latest:
+        request.session.pop(SESSION_KEY, None)
+        return latest
+    if request.session.get(SESSION_KEY) != report.pk:
+        request.session[SESSION_KEY] = report.pk
+    return report
+
+
+def report_scoped(view):
+    """
+    Run a single-borrower dashboard view inside the resolved report's scope.
+    The report and the selector's options are left on the request for the
+    report_selector context processor.
+    """
+
+    @functools.wraps(view)
+    def wrapper(request, *args, **kwargs):
+        from management.views.summary import get_preferred_borrower
+
+        borrower = get_preferred_borrower(request)
+        options = report_options(borrower)
+        report = resolve_report(request, borrower, options)
+        request.borrower_report = report
+        request.report_options = options
+        with report_scope(report):
+            return view(request, *args, **kwargs)
+
+    return wrapper
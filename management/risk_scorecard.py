@@ -0,0 +1,276 @@
+from collections import defaultdict
+from decimal import Decimal
+
+from management.formatting import _normalize_pct, _to_decimal
+from management.instrumentation import timed
+from management.metrics import CACHE_LOOKUPS
+from management.report_cache import report_cached
+from management.report_scope import active_report, latest_report, report_scope
+from management.models import (
+    ARMetricsRow,
+    BorrowerRiskScorecard,
+    CompositeIndexRow,
+    RiskSubfactorsRow,
+)
+
+
+RISK_CATEGORY_ORDER = {
+    "accounts receivable": [
+        "DSO Trend",
+        "Past Due % AR",
+        "Concentration",
+        "Dilution",
+        "Write-off",
+        "Sales Volatility",
+        "Dispute Frequency",
+        "Eligibility Impact",
+        "Process Risk",
+        "Cross Aging Risk",
+    ],
+    "inventory": [
+        "Inventory Velocity & Turn",
+        "Excess & Obsolete",
+        "Margin Volatility",
+        "Cost Inflation",
+        "Write Down & Scrap",
+        "Inventory Mix",
+        "WIP & RM Build",
+        "SKU Concentration",
+        "Seasonality",
+        "Customer Specific Exposure",
+        "Lead Time & Supply Disruption",
+        "Vendor Concentration",
+        "Production Lead Time",
+    ],
+    "company": [
+        "Liquidity",
+        "Profitability",
+        "Cash Flow Stability",
+        "DPO Trend",
+        "Sales Trends",
+        "Customer Health",
+        "Vendor Health",
+        "Liquidation Channel Risk",
+        "Inventory Count Accuracy",
+        "System Risk",
+        "Data Quality & Integrity",
+        "Customer Relationship Strength",
+        "Operational Risk",
+    ],
+    "industry": [
+        "Demand Volatility",
+        "Input Cost Variability",
+        "Competitive Pressure",
+        "Sector Level Distress",
+        "Industry Seasonality",
+        "Inflation & Deflation Risk",
+        "Regulatory Stability",
+        "Disruption Risk",
+        "Supply Chain Stability",
+        "Geopolitical Risk",
+        "End Market Outlook",
+        "Competitive Risk",
+    ],
+}
+
+HIGH_IMPACT_FACTORS = [
+    "Inventory Velocity & Turn",
+    "Excess & Obsolete",
+    "Sales Trend",
+    "Seasonality",
+    "Sector Level Distress",
+]
+
+TREND_POINTS = 8
+
+
+def _score_ratio(score):
+    return min(max(_to_decimal(score) / Decimal("5"), Decimal("0")), Decimal("1"))
+
+
+def _row_label(row):
+    return row.sub_risk or row.high_impact_factor or row.main_category or "Metric"
+
+
+def _build_high_impact(borrower):
+    prior_scores = {}
+    history_map = {}
+    top_rows = RiskSubfactorsRow.objects.for_borrower(borrower).order_by("-risk_score", "-date")[:12]
+    for row in top_rows:
+        key = (row.sub_risk or row.high_impact_factor or row.main_category or "Risk").strip()
+        if not key:
+            continue
+        current = _normalize_pct(row.risk_score) or Decimal("0")
+        prior = prior_scores.get(key, None)
+        change = (current - prior) if prior is not None else None
+        direction = "up" if change and change > 0 else "down" if change and change < 0 else ""
+        change_display = (
+            f"{'▲ ' if direction == 'up' else '▼ ' if direction == 'down' else ''}{abs(change):.1f}"
+            if change is not None and change != 0
+            else "—"
+        )
+        history_map[key.lower()] = {
+            "risk": key,
+            "current": f"{current:.1f}",
+            "prior": f"{prior:.1f}" if prior is not None else "—",
+            "change": change_display,
+            "direction": direction,
+        }
+        prior_scores[key] = current
+
+    factors = []
+    for label in HIGH_IMPACT_FACTORS:
+        entry = history_map.get(label.lower())
+        if entry:
+            factors.append(entry)
+        else:
+            factors.append({
+                "risk": label,
+                "current": "—",
+                "prior": "—",
+                "change": "—",
+                "direction": "",
+            })
+    return factors
+
+
+def _build_category_scores(borrower, ar_row, composite_latest):
+    ar_past_due_pct = (
+        _normalize_pct(ar_row.pct_past_due)
+        if ar_row and ar_row.pct_past_due is not None
+        else Decimal("0")
+    )
+    ar_score = max(Decimal("0"), min(Decimal("5"), Decimal("5") - (ar_past_due_pct / Decimal("20"))))
+
+    rows_by_category = defaultdict(list)
+    risk_rows = RiskSubfactorsRow.objects.for_borrower(borrower).order_by("main_category", "sub_risk")
+    for row in risk_rows:
+        key = (row.main_category or "").strip().lower()
+        if not key:
+            continue
+        rows_by_category[key].append(row)
+
+    def _metric_rows(label):
+        key = label.lower()
+        if key in rows_by_category:
+            return rows_by_category[key]
+        for stored_key in rows_by_category:
+            if stored_key.startswith(key) or key.startswith(stored_key):
+                return rows_by_category[stored_key]
+        return []
+
+    definitions = [
+        ("Accounts Receivable", max(ar_score, Decimal("3"))),
+        ("Inventory", _to_decimal(composite_latest.inventory_risk) if composite_latest else Decimal("3")),
+        ("Company", _to_decimal(composite_latest.company_risk) if composite_latest else Decimal("2.5")),
+        ("Industry", _to_decimal(composite_latest.industry_risk) if composite_latest else Decimal("2")),
+    ]
+
+    categories = []
+    for label, fallback in definitions:
+        bars_dict = {}
+        score_vals = []
+        for row in _metric_rows(label):
+            metric_label = _row_label(row)
+            if metric_label in bars_dict:
+                continue
+            score = _to_decimal(row.risk_score)
+            score_vals.append(score)
+            bars_dict[metric_label] = f"{float(_score_ratio(score) * 100):.1f}%"
+
+        bars = []
+        for name in RISK_CATEGORY_ORDER.get(label.lower(), []):
+            if name in bars_dict:
+                bars.append({"label": name, "width": bars_dict.pop(name)})
+        bars.extend({"label": name, "width": width} for name, width in bars_dict.items())
+
+        score = sum(score_vals) / Decimal(len(score_vals)) if score_vals else fallback
+        categories.append({"label": label, "score": str(score), "bars": bars})
+    return categories
+
+
+def build_risk_scorecard(borrower):
+    """Compute the scorecard payload for `borrower` without saving it."""
+    ar_row = (
+        ARMetricsRow.objects.for_borrower(borrower)
+        .order_by("-as_of_date", "-created_at")
+        .first()
+    )
+    recent_composite = list(
+        CompositeIndexRow.objects.for_borrower(borrower)
+        .order_by("-date", "-created_at", "-id")[:TREND_POINTS]
+    )
+    recent_composite.reverse()
+    composite_latest = recent_composite[-1] if recent_composite else None
+
+    weights = []
+    if composite_latest:
+        for label, value in (
+            ("Accounts Receivable", composite_latest.weight_ar),
+            ("Inventory", composite_latest.weight_inventory),
+            ("Company", composite_latest.weight_company),
+            ("Industry", composite_latest.weight_industry),
+        ):
+            weights.append({"label": label, "value": str(value) if value is not None else None})
+
+    trend_points = []
+    for idx, row in enumerate(recent_composite):
+        score = _to_decimal(row.overall_score) if row.overall_score else Decimal("0")
+        label = row.date.strftime("%b") if row.date else str(idx + 1)
+        trend_points.append({"label": label, "score": str(score)})
+
+    return {
+        "overall_score": getattr(composite_latest, "overall_score", None),
+        "ar_pct_past_due": ar_row.pct_past_due if ar_row else None,
+        "weights": weights,
+        "category_scores": _build_category_scores(borrower, ar_row, composite_latest),
+        "trend_points": trend_points,
+        "high_impact_factors": _build_high_impact(borrower),
+    }
+
+
+@report_cached("risk_scorecard")
+def _report_scorecard_payload(borrower):
+    return build_risk_scorecard(borrower)
+
+
+def refresh_risk_scorecard(borrower, report=None):
+    if not borrower:
+        return None
+    if report is None:
+        report = latest_report(borrower)
+    with report_scope(report):
+        defaults = build_risk_scorecard(borrower)
+    defaults["report"] = report
+    scorecard, _ = BorrowerRiskScorecard.objects.update_or_create(
+        borrower=borrower,
+        defaults=defaults,
+    )
+    return scorecard
+
+
+@timed()
+def get_risk_scorecard(borrower):
+    """
+    Single-query read of the materialized scorecard. Borrowers whose data
+    predates the scorecard table are materialized on first access.
+    """
+    if not borrower:
+        return None
+    scorecard = BorrowerRiskScorecard.objects.filter(borrower=borrower).first()
+    CACHE_LOOKUPS.inc(cache="risk_scorecard", result="miss" if scorecard is None else "hit")
+    if scorecard is None:
+        scorecard = refresh_risk_scorecard(borrower)
+    report = active_report()
+    if report is not None and report.borrower_id == borrower.pk and report.pk != scorecard.report_id:
+        materialized_report_id = scorecard.report_id or getattr(latest_report(borrower), "pk", None)
+        if report.pk != materialized_report_id:
+            # Only the latest report is materialized; older ones are scored from their own rows.
+            return BorrowerRiskScorecard(borrower=borrower, report=report, **_report_scorecard_payload(borrower))
+    return scorecard
+
+
+def refresh_scorecard_for_row(row):
+    borrower_id = getattr(row, "borrower_id", None)
+    if borrower_id:
+        refresh_risk_scorecard(row.borrower)
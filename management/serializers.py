@@ -0,0 +1,55 @@
+from rest_framework import serializers
+
+from management.models import Borrower, BorrowerReport
+
+
+class SparseFieldsSerializer(serializers.ModelSerializer):
+    """Keeps only the fields named in the `fields` context entry (?fields=), when given."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        requested = self.context.get("fields")
+        if requested:
+            for name in set(self.fields) - set(requested):
+                self.fields.pop(name)
+
+
+class BorrowerSerializer(SparseFieldsSerializer):
+    company_name = serializers.CharField(source="company.company", read_only=True)
+
+    class Meta:
+        model = Borrower
+        fields = [
+            "id",
+            "company",
+            "company_name",
+            "primary_contact",
+            "update_interval",
+            "current_update",
+            "previous_update",
+            "next_update",
+            "lender",
+            "lender_id",
+            "created_at",
+            "updated_at",
+        ]
+
+
+class BorrowerReportSerializer(SparseFieldsSerializer):
+    class Meta:
+        model = BorrowerReport
+        fields = ["id", "borrower", "report_date", "source_file", "created_at", "updated_at"]
+
+
+_row_serializers = {}
+
+
+def row_serializer(model_cls):
+    """Serializer over every column of a *Row model; built once per model."""
+    serializer = _row_serializers.get(model_cls)
+    if serializer is None:
+        meta = type("Meta", (), {"model": model_cls, "fields": "__all__"})
+        serializer = _row_serializers[model_cls] = type(
+            f"{model_cls.__name__}Serializer", (SparseFieldsSerializer,), {"Meta": meta}
+        )
+    return serializer
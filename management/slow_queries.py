@@ -0,0 +1,137 @@
+"""
+Slow-query capture for dashboard requests.
+
+`track_request` already wraps every connection with an execute_wrapper; it
+hands statements slower than settings.SLOW_QUERY_THRESHOLD_MS to
+`RequestTimings`, which notes the current view and innermost builder span.
+Once the response is built the middleware calls `save_slow_queries`, which
+stores them as SlowQuery rows and, for a sampled share of plain SELECTs,
+queues an "explain_slow_query" job. The worker re-runs the statement under
+EXPLAIN (ANALYZE, BUFFERS) on PostgreSQL or EXPLAIN QUERY PLAN on sqlite,
+in a transaction it rolls back, and fills in the row's plan. Statements
+that lock rows or write (FOR UPDATE/SHARE, data-modifying CTEs) are never
+explained: ANALYZE executes them.
+"""
+import hashlib
+import json
+import logging
+import random
+import re
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import DatabaseError, connections, transaction
+
+from management.models import SlowQuery
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_THRESHOLD_MS = 200
+DEFAULT_EXPLAIN_SAMPLE_RATE = 0.1
+MAX_SQL_LENGTH = 20_000
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*(?:%s|\?)(?:\s*,\s*(?:%s|\?))*\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+_UNSAFE_TO_EXPLAIN = re.compile(
+    r"\b(?:INSERT|UPDATE|DELETE|MERGE|TRUNCATE|FOR\s+(?:NO\s+KEY\s+UPDATE|KEY\s+SHARE|SHARE))\b",
+    re.IGNORECASE,
+)
+
+
+def threshold_ms():
+    return getattr(settings, "SLOW_QUERY_THRESHOLD_MS", DEFAULT_THRESHOLD_MS)
+
+
+def normalize_sql(sql):
+    """
+    Collapse literals, placeholder lists and whitespace so the same ORM query
+    issued for different borrowers, dates or IN-list sizes shares one
+    fingerprint.
+    """
+    sql = _STRING_LITERAL.sub("?", sql)
+    sql = _NUMBER_LITERAL.sub("?", sql)
+    sql = sql.replace("%s", "?")
+    sql = _PLACEHOLDER_LIST.sub("(...)", sql)
+    return _WHITESPACE.sub(" ", sql).strip()
+
+
+def fingerprint(normalized_sql):
+    return hashlib.md5(normalized_sql.encode()).hexdigest()
+
+
+def _explain_sql(vendor):
+    if vendor == "postgresql":
+        return "EXPLAIN (ANALYZE, BUFFERS) "
+    if vendor == "sqlite":
+        return "EXPLAIN QUERY PLAN "
+    return None
+
+
+def explainable(sql):
+    """
+    Whether `sql` is a plain read that is safe to run again under EXPLAIN
+    ANALYZE: a SELECT or WITH that neither writes nor takes row locks.
+    """
+    if not sql.lstrip().upper().startswith(("SELECT", "WITH")):
+        return False
+    # Match against the literal-free form so a quoted 'delete' is not a write.
+    return not _UNSAFE_TO_EXPLAIN.search(_STRING_LITERAL.sub("?", sql))
+
+
+def explain(alias, sql, params):
+    """EXPLAIN output for a read-only statement, or "" when unavailable."""
+    if not explainable(sql):
+        return ""
+    connection = connections[alias]
+    prefix = _explain_sql(connection.vendor)
+    if prefix is None:
+        return ""
+    try:
+        # ANALYZE really runs the statement; roll back whatever it did. The
+        # atomic block also keeps a failed EXPLAIN from poisoning an open
+        # PostgreSQL transaction.
+        with transaction.atomic(using=alias), connection.cursor() as cursor:
+            cursor.execute(prefix + sql, params)
+            rows = cursor.fetchall()
+            transaction.set_rollback(True, using=alias)
+    except DatabaseError as exc:
+        logger.warning("EXPLAIN failed for slow query: %s", exc)
+        return ""
+    return "\n".join(" | ".join(str(value) for value in row) for row in rows)
+
+
+def save_slow_queries(captured, view):
+    """Persist the statements collected by `RequestTimings.record_query`."""
+    if not captured:
+        return []
+    from management.jobs import enqueue
+
+    sample_rate = getattr(settings, "SLOW_QUERY_EXPLAIN_SAMPLE_RATE", DEFAULT_EXPLAIN_SAMPLE_RATE)
+    records = []
+    to_explain = []
+    for entry in captured:
+        normalized = normalize_sql(entry["sql"])
+        if explainable(entry["sql"]) and random.random() < sample_rate:
+            to_explain.append((len(records), entry))
+        records.append(SlowQuery(
+            fingerprint=fingerprint(normalized),
+            normalized_sql=normalized[:MAX_SQL_LENGTH],
+            sample_sql=entry["sql"][:MAX_SQL_LENGTH],
+            duration_ms=round(entry["seconds"] * 1000, 3),
+            view=view or "",
+            builder=entry["builder"] or "",
+            database=entry["alias"],
+        ))
+    records = SlowQuery.objects.bulk_create(records)
+    # EXPLAIN ANALYZE costs as much as the slow statement itself; keep it off
+    # the response path.
+    for position, entry in to_explain:
+        params = json.loads(json.dumps(entry["params"] or [], cls=DjangoJSONEncoder))
+        enqueue(
+            "explain_slow_query",
+            {"slow_query_id": records[position].pk, "sql": entry["sql"], "params": params},
+            max_attempts=1,
+        )
+    return records
@@ -0,0 +1,285 @@
+import json
+import os
+import shutil
+from decimal import Decimal
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+from django.conf import settings
+from django.db import models
+
+from management.archive import report_rows, row_models
+from management.metrics import CACHE_LOOKUPS
+from management.report_scope import active_report, latest_report
+
+try:  # Parquet needs pyarrow; fall back to one .npy file per column without it.
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+SNAPSHOT_ROOT = Path(getattr(settings, "REPORT_SNAPSHOT_ROOT", Path(settings.BASE_DIR) / "uploads" / "snapshots"))
+SKIPPED_COLUMNS = {"borrower", "report", "created_at", "updated_at"}
+INT64_LIMIT = 2 ** 63 - 1
+EPOCH = np.datetime64("1970-01-01", "D")
+
+
+VERSION_FILE = "report_version.txt"
+
+
+def snapshot_dir(borrower_id, report_id):
+    return SNAPSHOT_ROOT / f"borrower_{borrower_id}" / f"report_{report_id}"
+
+
+def _report_version(report_id):
+    from management.models import BorrowerReport
+
+    updated_at = BorrowerReport.objects.filter(pk=report_id).values_list("updated_at", flat=True).first()
+    return updated_at.isoformat() if updated_at else ""
+
+
+def _column_kind(field):
+    if isinstance(field, models.DecimalField):
+        return "decimal"
+    if isinstance(field, models.DateField) and not isinstance(field, models.DateTimeField):
+        return "date"
+    if isinstance(field, (models.IntegerField, models.AutoField)):
+        return "int"
+    if isinstance(field, (models.CharField, models.TextField)):
+        return "str"
+    return None
+
+
+def _encode(field, kind, values):
+    """
+    Encode one column as a fixed-width numpy array plus a validity mask.
+    Decimals are stored as int64 scaled by 10**decimal_places so sums and
+    comparisons stay exact; dates as days since the epoch.
+    """
+    valid = np.array([value is not None for value in values], dtype=bool)
+    meta = {"kind": kind}
+    if kind == "decimal":
+        scale = field.decimal_places
+        scaled = [int(value.scaleb(scale)) if value is not None else 0 for value in values]
+        if any(abs(value) > INT64_LIMIT for value in scaled):
+            meta["kind"] = "float"
+            data = np.array([float(value) if value is not None else np.nan for value in values])
+        else:
+            meta["scale"] = scale
+            data = np.array(scaled, dtype=np.int64)
+    elif kind == "date":
+        data = np.array(
+            [(np.datetime64(value, "D") - EPOCH).astype(np.int64) if value is not None else 0 for value in values],
+            dtype=np.int64,
+        )
+    elif kind == "int":
+        data = np.array([value if value is not None else 0 for value in values], dtype=np.int64)
+    else:
+        data = np.array([value if value is not None else "" for value in values], dtype=str)
+    return data, valid, meta
+
+
+def _write_npy_bundle(directory, columns, masks, manifest):
+    directory.mkdir(parents=True, exist_ok=True)
+    for name, data in columns.items():
+        np.save(directory / f"{name}.npy", data)
+        np.save(directory / f"{name}.mask.npy", masks[name])
+    (directory / "manifest.json").write_text(json.dumps(manifest))
+
+
+def _write_parquet(path, columns, masks, manifest):
+    arrays = {}
+    for name, data in columns.items():
+        arrays[name] = data
+        arrays[f"{name}__valid"] = masks[name]
+    table = pa.table(arrays).replace_schema_metadata({"manifest": json.dumps(manifest)})
+    pq.write_table(table, path)
+
+
+def write_model_snapshot(directory, model_cls, qs):
+    fields = [
+        field
+        for field in model_cls._meta.concrete_fields
+        if field.name not in SKIPPED_COLUMNS and _column_kind(field)
+    ]
+    records = list(qs.order_by("pk").values_list(*(field.attname for field in fields)))
+    if not records:
+        return 0
+    columns, masks, manifest = {}, {}, {"rows": len(records), "columns": {}}
+    for position, field in enumerate(fields):
+        data, valid, meta = _encode(field, _column_kind(field), [record[position] for record in records])
+        columns[field.attname] = data
+        masks[field.attname] = valid
+        manifest["columns"][field.attname] = meta
+    table = model_cls._meta.db_table
+    if pq is not None:
+        _write_parquet(directory / f"{table}.parquet", columns, masks, manifest)
+    else:
+        _write_npy_bundle(directory / table, columns, masks, manifest)
+    return len(records)
+
+
+def write_report_snapshot(report):
+    """
+    Write every sheet of `report` as typed column files. The directory is
+    built under a temporary name and swapped in, so readers never see a
+    partial snapshot. It is stamped with the report's updated_at, read
+    before the rows, so a row edited since (ReportRow.save/delete bump it)
+    retires the snapshot.
+    """
+    final_dir = snapshot_dir(report.borrower_id, report.pk)
+    build_dir = final_dir.with_name(final_dir.name + ".tmp")
+    shutil.rmtree(build_dir, ignore_errors=True)
+    build_dir.mkdir(parents=True)
+    (build_dir / VERSION_FILE).write_text(_report_version(report.pk))
+    counts = {}
+    for model_cls in row_models():
+        rows = write_model_snapshot(build_dir, model_cls, report_rows(model_cls, report))
+        if rows:
+            counts[model_cls._meta.db_table] = rows
+    shutil.rmtree(final_dir, ignore_errors=True)
+    os.replace(build_dir, final_dir)
+    return counts
+
+
+class Snapshot:
+    """Read-only, memory-mapped columns of one sheet from one report."""
+
+    def __init__(self, columns, masks, manifest):
+        self.columns = columns
+        self.masks = masks
+        self.manifest = manifest
+
+    def __len__(self):
+        return self.manifest["rows"]
+
+    def valid(self, name):
+        return self.masks[name]
+
+    def values(self, name):
+        """Decoded column as floats (decimals) or datetime64 (dates)."""
+        data = self.columns[name]
+        meta = self.manifest["columns"][name]
+        if meta["kind"] == "decimal":
+            return data / (10 ** meta["scale"])
+        if meta["kind"] == "date":
+            return EPOCH + data.astype("timedelta64[D]")
+        return data
+
+    def division_mask(self, division, field="division"):
+        if not division or division == "all":
+            return np.ones(len(self), dtype=bool)
+        lowered = np.char.lower(np.asarray(self.columns[field], dtype=str))
+        return self.masks[field] & (lowered == division.lower())
+
+    def date_range_mask(self, field, start, end):
+        dates = self.values(field)
+        return (
+            self.masks[field]
+            & (dates >= np.datetime64(start, "D"))
+            & (dates <= np.datetime64(end, "D"))
+        )
+
+    def _decode(self, name, index):
+        if not self.masks[name][index]:
+            return None
+        meta = self.manifest["columns"][name]
+        value = self.columns[name][index]
+        if meta["kind"] == "decimal":
+            return Decimal(int(value)).scaleb(-meta["scale"])
+        if meta["kind"] == "date":
+            return (EPOCH + np.timedelta64(int(value), "D")).astype(object)
+        if meta["kind"] == "int":
+            return int(value)
+        if meta["kind"] == "float":
+            return Decimal(str(float(value)))
+        return str(value)
+
+    def rows(self, indices):
+        """Rows at `indices` as attribute objects, like model instances."""
+        names = list(self.columns)
+        return [
+            SimpleNamespace(**{name: self._decode(name, int(index)) for name in names})
+            for index in indices
+        ]
+
+
+def _load_npy_bundle(directory):
+    manifest = json.loads((directory / "manifest.json").read_text())
+    columns, masks = {}, {}
+    for name in manifest["columns"]:
+        columns[name] = np.load(directory / f"{name}.npy", mmap_mode="r")
+        masks[name] = np.load(directory / f"{name}.mask.npy", mmap_mode="r")
+    return Snapshot(columns, masks, manifest)
+
+
+def _load_parquet(path):
+    table = pq.read_table(path, memory_map=True)
+    manifest = json.loads(table.schema.metadata[b"manifest"])
+    columns, masks = {}, {}
+    for name in manifest["columns"]:
+        columns[name] = table.column(name).to_numpy()
+        masks[name] = table.column(f"{name}__valid").to_numpy()
+    return Snapshot(columns, masks, manifest)
+
+
+def load_snapshot(borrower_id, report_id, model_cls):
+    directory = snapshot_dir(borrower_id, report_id)
+    table = model_cls._meta.db_table
+    parquet_path = directory / f"{table}.parquet"
+    if pq is not None and parquet_path.exists():
+        return _load_parquet(parquet_path)
+    if (directory / table / "manifest.json").exists():
+        return _load_npy_bundle(directory / table)
+    return None
+
+
+def load_latest_snapshot(borrower, model_cls):
+    """
+    Columns of `model_cls` from the selected report (see
+    management.report_scope) or else the borrower's latest one, or None when
+    that report has no snapshot or its rows changed after the snapshot was
+    written (callers then fall back to the ORM).
+    """
+    if not borrower:
+        return None
+    report = active_report()
+    if report is None or report.borrower_id != borrower.pk:
+        report = latest_report(borrower)
+    if report is None or not snapshot_dir(report.borrower_id, report.pk).is_dir():
+        CACHE_LOOKUPS.inc(cache="report_snapshot", result="miss")
+        return None
+    version_path = snapshot_dir(report.borrower_id, report.pk) / VERSION_FILE
+    current = report.updated_at.isoformat() if report.updated_at else ""
+    if not version_path.exists() or version_path.read_text() != current:
+        CACHE_LOOKUPS.inc(cache="report_snapshot", result="stale")
+        return None
+    CACHE_LOOKUPS.inc(cache="report_snapshot", result="hit")
+    return load_snapshot(report.borrower_id, report.pk, model_cls)
+
+
+def latest_date_top_rows(snapshot, mask, date_field, rank_field, limit):
+    """
+    Rows selected by `mask` on their latest `date_field`, ranked by
+    `rank_field` descending (nulls last) then id. Without any dated row the
+    newest rows by id are returned instead.
+    """
+    ids = snapshot.columns["id"]
+    dated = mask & snapshot.valid(date_field)
+    if dated.any():
+        dates = snapshot.columns[date_field]
+        indices = np.flatnonzero(dated & (dates == dates[dated].max()))
+        rank = snapshot.columns[rank_field][indices]
+        order = np.lexsort((ids[indices], -rank, ~snapshot.valid(rank_field)[indices]))
+    else:
+        indices = np.flatnonzero(mask)
+        order = np.argsort(-ids[indices], kind="stable")
+    return snapshot.rows(indices[order][:limit])
+
+
+def dated_rows(snapshot, mask, date_field):
+    """Rows selected by `mask` that carry a date, oldest first."""
+    indices = np.flatnonzero(mask & snapshot.valid(date_field))
+    order = np.lexsort((snapshot.columns["id"][indices], snapshot.columns[date_field][indices]))
+    return snapshot.rows(indices[order])
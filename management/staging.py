@@ -0,0 +1,123 @@
+"""
+Per-import staging tables.
+
+The importer parses and converts a workbook with no transaction open and
+loads the rows into TEMP tables shaped like the sheet tables (one per
+model, private to the importing connection, never WAL-logged and dropped
+afterwards). Publishing copies every staged table into its sheet table with
+INSERT ... SELECT inside the caller's transaction, filling in the report
+and borrower that only exist by then. Readers see all of a report or none
+of it, and the publish transaction lasts as long as the copies, not the
+parse.
+"""
+from django.db import connections
+from django.utils import timezone
+
+STAGING_PREFIX = "staging_"
+BATCH_SIZE = 1000
+
+# Filled in at publish time rather than staged.
+PUBLISH_FIELDS = ("report", "borrower", "created_at", "updated_at")
+
+
+class ImportStaging:
+    """
+    Staged rows of one import. Use as a context manager so the TEMP tables
+    are dropped however the import ends:
+
+        with ImportStaging() as staging:
+            staging.stage(ARMetricsRow, objs)
+            with transaction.atomic():
+                staging.publish(report, borrower)
+    """
+
+    def __init__(self, using="default"):
+        self.connection = connections[using]
+        self.tables = {}  # model -> staging table
+        self.counts = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.discard()
+
+    def _columns(self, model_cls):
+        return [field for field in model_cls._meta.concrete_fields if not field.primary_key]
+
+    def _table(self, model_cls):
+        if model_cls not in self.tables:
+            quote = self.connection.ops.quote_name
+            table = STAGING_PREFIX + model_cls._meta.db_table
+            with self.connection.cursor() as cursor:
+                cursor.execute(
+                    f"CREATE TEMPORARY TABLE {quote(table)} AS "
+                    f"SELECT * FROM {quote(model_cls._meta.db_table)} WHERE 1 = 0"
+                )
+            self.tables[model_cls] = table
+            self.counts[model_cls] = 0
+        return self.tables[model_cls]
+
+    def stage(self, model_cls, objs):
+        """Write unsaved `objs` to the model's staging table; returns the row count."""
+        quote = self.connection.ops.quote_name
+        table = self._table(model_cls)
+        fields = [field for field in self._columns(model_cls) if field.name not in PUBLISH_FIELDS]
+        sql = (
+            f"INSERT INTO {quote(table)} ({', '.join(quote(field.column) for field in fields)}) "
+            f"VALUES ({', '.join(['%s'] * len(fields))})"
+        )
+        rows = [
+            [field.get_db_prep_save(getattr(obj, field.attname), self.connection) for field in fields]
+            for obj in objs
+        ]
+        with self.connection.cursor() as cursor:
+            for start in range(0, len(rows), BATCH_SIZE):
+                cursor.executemany(sql, rows[start : start + BATCH_SIZE])
+        self.counts[model_cls] += len(rows)
+        return len(rows)
+
+    def publish(self, report, borrower=None):
+        """
+        Copy every staged table into its sheet table under `report` (and
+        `borrower`, where the model has one). Run inside a transaction.
+        Returns {model: rows published}.
+        """
+        quote = self.connection.ops.quote_name
+        now = timezone.now()
+        published = {}
+        with self.connection.cursor() as cursor:
+            for model_cls, table in self.tables.items():
+                if not self.counts[model_cls]:
+                    published[model_cls] = 0
+                    continue
+                fixed = {
+                    "report": report.pk,
+                    "borrower": getattr(borrower, "pk", None),
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                columns, select, params = [], [], []
+                for field in self._columns(model_cls):
+                    columns.append(quote(field.column))
+                    if field.name in fixed:
+                        select.append("%s")
+                        params.append(field.get_db_prep_save(fixed[field.name], self.connection))
+                    else:
+                        select.append(quote(field.column))
+                cursor.execute(
+                    f"INSERT INTO {quote(model_cls._meta.db_table)} ({', '.join(columns)}) "
+                    f"SELECT {', '.join(select)} FROM {quote(table)}",
+                    params,
+                )
+                published[model_cls] = self.counts[model_cls]
+        return published
+
+    def discard(self):
+        quote = self.connection.ops.quote_name
+        if self.tables:
+            with self.connection.cursor() as cursor:
+                for table in self.tables.values():
+                    cursor.execute(f"DROP TABLE IF EXISTS {quote(table)}")
+        self.tables = {}
+        self.counts = {}
@@ -0,0 +1,220 @@
+import datetime as dt
+import random
+from decimal import Decimal
+
+from django.db import models, transaction
+
+from management.archive import preserve_timestamps, row_models
+from management.models import Borrower, BorrowerReport, Company
+
+DIVISIONS = ["East", "West", "Central"]
+CHOICES = {
+    "division": DIVISIONS,
+    "main_type": ["Accounts Receivable", "Inventory"],
+    "sub_type": ["Domestic", "Finished Goods", "Raw Materials", "Work In Progress"],
+    "collateral_type": ["Accounts Receivable", "Inventory"],
+    "collateral_sub_type": ["Domestic", "Finished Goods", "Raw Materials", "Work In Progress"],
+    "inventory_type": ["Finished Goods", "Raw Materials", "Work In Progress"],
+    "bucket": ["Current", "1-30", "31-60", "61-90", "91-120", "120+"],
+    "category": ["Cabinets", "Doors", "Flooring", "Windows", "Roofing", "Trim"],
+    "main_category": ["Accounts Receivable", "Inventory", "Company", "Industry"],
+    "sub_risk": ["Past Due % AR", "Concentration", "Excess & Obsolete", "Seasonality", "Liquidity"],
+    "high_impact_factor": ["Inventory Velocity & Turn", "Excess & Obsolete", "Sales Trend", "Seasonality"],
+}
+PCT_HINTS = ("pct", "rate", "share", "percent", "margin", "_gm")
+SCORE_HINTS = ("score", "risk", "weight")
+
+
+def month_end(value):
+    first_next = dt.date(value.year + value.month // 12, value.month % 12 + 1, 1)
+    return first_next - dt.timedelta(days=1)
+
+
+def report_dates(count, end=None):
+    """`count` consecutive month-end dates, oldest first, ending at `end`."""
+    current = month_end(end or dt.date.today())
+    dates = []
+    for _ in range(count):
+        dates.append(current)
+        current = month_end(current.replace(day=1) - dt.timedelta(days=1))
+    return list(reversed(dates))
+
+
+def synthetic_value(field, rng, as_of, index=0):
+    """A plausible value for one model field on a sheet dated `as_of`."""
+    name = field.name
+    is_text = isinstance(field, (models.CharField, models.TextField))
+    if is_text and name in CHOICES:
+        return CHOICES[name][index % len(CHOICES[name])]
+    if isinstance(field, models.DateField) and not isinstance(field, models.DateTimeField):
+        return as_of
+    if isinstance(field, models.DecimalField):
+        if any(hint in name for hint in PCT_HINTS):
+            value = rng.uniform(0, 1)
+        elif any(hint in name for hint in SCORE_HINTS):
+            value = rng.uniform(1, 5)
+        elif field.decimal_places == 2:
+            value = rng.uniform(1_000, 5_000_000)
+        else:
+            value = rng.uniform(0, 500)
+        quantum = Decimal(1).scaleb(-min(field.decimal_places, 4))
+        return Decimal(str(value)).quantize(quantum)
+    if isinstance(field, (models.IntegerField, models.BigIntegerField)):
+        return rng.randint(1, 10_000)
+    if is_text:
+        return f"{name.replace('_', ' ').title()} {index + 1}"
+    return None
+
+
+def synthetic_fields(model_cls):
+    return [
+        field
+        for field in model_cls._meta.concrete_fields
+        if not field.auto_created
+        and field.name not in {"borrower", "report", "created_at", "updated_at"}
+        and not field.is_relation
+    ]
+
+
+def seed(borrowers=10, reports=3, rows_per_sheet=5, seed_value=42, batch_size=1000, log=None):
+    """
+    Create `borrowers` borrowers, each with `reports` monthly reports and
+    `rows_per_sheet` rows per sheet model per report. The same seed always
+    produces the same data. Returns the created borrower ids and the number
+    of sheet rows written.
+    """
+    log = log or (lambda message: None)
+    rng = random.Random(seed_value)
+    dates = report_dates(reports)
+    models_to_seed = row_models()
+    total = 0
+    borrower_ids = []
+    company_base = Company.objects.aggregate(top=models.Max("company_id"))["top"] or 0
+    for borrower_index in range(borrowers):
+        with transaction.atomic():
+            company = Company.objects.create(
+                company=f"Synthetic Company {borrower_index + 1}",
+                company_id=company_base + borrower_index + 1,
+                industry=rng.choice(["Manufacturing", "Distribution", "Retail"]),
+            )
+            borrower = Borrower.objects.create(
+                company=company,
+                primary_contact=f"Synthetic Borrower {borrower_index + 1}",
+                current_update=dates[-1],
+                previous_update=dates[-2] if len(dates) > 1 else None,
+            )
+            for report_date in dates:
+                stamp = dt.datetime.combine(report_date, dt.time(6), tzinfo=dt.timezone.utc)
+                report = BorrowerReport.objects.create(
+                    borrower=borrower,
+                    source_file="synthetic.xlsx",
+                    report_date=report_date,
+                )
+                BorrowerReport.objects.filter(pk=report.pk).update(created_at=stamp, updated_at=stamp)
+                for model_cls in models_to_seed:
+                    field_names = {field.name for field in model_cls._meta.fields}
+                    objs = []
+                    for row_index in range(rows_per_sheet):
+                        data = {
+                            field.name: synthetic_value(field, rng, report_date, row_index)
+                            for field in synthetic_fields(model_cls)
+                        }
+                        if "borrower" in field_names:
+                            data["borrower"] = borrower
+                        if "report" in field_names:
+                            data["report"] = report
+                        data["created_at"] = data["updated_at"] = stamp
+                        objs.append(model_cls(**data))
+                    with preserve_timestamps(model_cls):
+                        model_cls.objects.bulk_create(objs, batch_size=batch_size)
+                    total += len(objs)
+        borrower_ids.append(borrower.pk)
+        log(f"borrower {borrower.pk}: {reports} reports seeded")
+    return borrower_ids, total
+
+
+EXCEL_EPOCH = dt.date(1899, 12, 30)
+SECTION_MARKER_SHEETS = ["Accounts Receivable >>>", "Risk>>>"]
+OVERVIEW_HEADERS = [
+    "Company", "Company ID", "Industry", "Primary NAICS", "Website", "Primary Contact",
+    "Primary Contact Phone", "Primary Contact Email", "Update Interval ", "Current Update",
+    "Previous Update", "Next Update ", "Lender", "Lender ID", "Specific Individual", "Specific ID",
+]
+
+
+def sheet_header(field_name):
+    """Human header text that the importer normalizes back to `field_name`."""
+    from management.management.commands.import_cora_xlsx import normalize_header
+
+    candidate = field_name.replace("_", " ").title()
+    return candidate if normalize_header(candidate) == field_name else field_name
+
+
+def _noisy_cell(field, value, rng, noise):
+    if value is None:
+        return None
+    if noise and rng.random() < noise:
+        return "-"
+    if isinstance(value, dt.date):
+        if noise and rng.random() < noise:
+            return (value - EXCEL_EPOCH).days
+        return dt.datetime.combine(value, dt.time())
+    if isinstance(value, Decimal):
+        if noise and rng.random() < noise:
+            if any(hint in field.name for hint in PCT_HINTS):
+                return f"{value * 100:.2f}%"
+            return f"({value:,.2f})"
+        return float(value)
+    return value
+
+
+def _sheet_rows(sheet, model_cls, rng, rows, noise, group_headers, as_of):
+    from management.management.commands.import_cora_xlsx import HEADER_HINTS
+
+    fields = synthetic_fields(model_cls)
+    header = [sheet_header(field.name) for field in fields]
+    grid = []
+    if sheet in HEADER_HINTS:
+        # Cash/availability forecasts: an "Actual"/"Forecast" band above the header.
+        grid.append([None, None] + ["Actual"] + ["Forecast"] * max(len(header) - 3, 0))
+    elif group_headers and len(header) >= 3:
+        grid.append(["Forecast"] * len(header))
+    grid.append(header)
+    for row_index in range(rows):
+        grid.append([
+            _noisy_cell(field, synthetic_value(field, rng, as_of, row_index), rng, noise)
+            for field in fields
+        ])
+        if noise and rng.random() < noise:
+            grid.append([None] * len(header))
+    return grid
+
+
+def write_cora_workbook(path, rows_per_sheet=100, noise=0.05, seed_value=42, group_headers=True, as_of=None):
+    """
+    Write a CORA-format workbook with every sheet the importer maps.
+    `noise` is the per-cell probability of each kind of messiness the
+    importer has to cope with: "-" placeholders, Excel serial dates, percent
+    strings, parenthesized negatives and stray blank rows.
+    """
+    import pandas as pd
+
+    from management.management.commands.import_cora_xlsx import SHEET_MODEL_MAP
+
+    rng = random.Random(seed_value)
+    as_of = as_of or month_end(dt.date.today())
+    overview_values = [
+        f"Synthetic Company {seed_value}", str(900000 + seed_value), "Manufacturing", "448410",
+        "www.example.com", "Synthetic Contact", "555-0100", "contact@example.com", "Monthly ",
+        dt.datetime.combine(as_of, dt.time()), None, None, "Synthetic Lender", "100", None, None,
+    ]
+    with pd.ExcelWriter(path, engine="openpyxl") as writer:
+        pd.DataFrame([["Borrower Overview"], OVERVIEW_HEADERS, overview_values]).to_excel(
+            writer, sheet_name="Borrower Overview", header=False, index=False
+        )
+        for marker in SECTION_MARKER_SHEETS:
+            pd.DataFrame([]).to_excel(writer, sheet_name=marker, header=False, index=False)
+        for sheet, model_cls in SHEET_MODEL_MAP.items():
+            grid = _sheet_rows(sheet, model_cls, rng, rows_per_sheet, noise, group_headers, as_of)
+            pd.DataFrame(grid).to_excel(writer, sheet_name=sheet, header=False, index=False)
+    return path
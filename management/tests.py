@@ -1,4 +1,25 @@
-from django.test import TestCase
+import base64
+import datetime
+import hashlib
+import importlib
+import json
+import tempfile
+import threading
+from decimal import Decimal
+from functools import partial
+from io import BytesIO, StringIO
+from pathlib import Path
+from unittest import mock
+
+import pandas as pd
+from django.apps import apps as django_apps
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection, transaction
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
 
 from .forms import (
     AgingCompositionForm,
@@ -6,7 +27,58 @@ from .forms import (
     CollateralOverviewForm,
     CompanyForm,
 )
-from .models import Borrower, Company
+from .models import (
+    Alert,
+    AlertRule,
+    ARMetricsRow,
+    Borrower,
+    BorrowerReport,
+    BorrowerRiskScorecard,
+    CollateralLimitsRow,
+    CollateralOverviewRow,
+    Company,
+    CompositeIndexRow,
+    ConcentrationADODSORow,
+    ForecastRow,
+    HistoricalTop20SKUsRow,
+    Job,
+    RiskSubfactorsRow,
+    SlowQuery,
+    Upload,
+)
+from . import archive
+from .alerts import evaluate_rules, rule_matches
+from .benchmarks import (
+    BENCHMARK_VIEWS,
+    BOOK_VIEWS,
+    budget_overruns,
+    compare,
+    percentile,
+    run_concurrency_benchmark,
+    run_date_filter_benchmark,
+    run_import_benchmark,
+    run_view_benchmarks,
+)
+from .borrowing_base import COLLATERAL_FIELDS, BorrowingBase
+from .concurrency import gather
+from .db_router import SESSION_KEY, PrimaryReplicaRouter, replica_reads
+from .formatting import _format_currency
+from .management.commands.import_cora_xlsx import build_sheet_objects
+from .metrics import REQUESTS, registry, render_prometheus
+from .jobs import enqueue, job_handler, work
+from .instrumentation import QueryBudgetExceeded, span, track_request
+from .partitioning import hash_partition_sql, month_partition_sql, months_between
+from .profiling import collapsed_stacks, profile_call
+from .report_cache import report_cache, report_cached
+from .report_scope import active_report, report_scope
+from .slow_queries import explain, explainable, normalize_sql
+from .snapshots import load_latest_snapshot, write_report_snapshot
+from .staging import ImportStaging
+from .risk_scorecard import get_risk_scorecard, refresh_risk_scorecard
+from .scenarios import run_scenario
+from .synthetic import seed, write_cora_workbook
+from .uploads import start_upload, upload_path
+from .views.collateral_dynamic import _accounts_receivable_context, _finished_goals_context, _inventory_state
 from .views.summary import _collateral_row_payload
 
 
@@ -108,3 +180,1381 @@ class FormValidationTests(TestCase):
 
         payload = _collateral_row_payload(instance)
         self.assertEqual(payload.get("snapshot_summary"), "Quarter-end snapshot.")
+
+
+class RiskScorecardTests(TestCase):
+    def setUp(self):
+        self.company = Company.objects.create(company="Acme Corp")
+        self.borrower = Borrower.objects.create(company=self.company, primary_contact="Owner")
+        CompositeIndexRow.objects.create(
+            borrower=self.borrower,
+            date="2024-01-31",
+            overall_score=Decimal("3.2"),
+            inventory_risk=Decimal("2.5"),
+            company_risk=Decimal("2.0"),
+            industry_risk=Decimal("1.5"),
+            weight_ar=Decimal("0.4"),
+        )
+        CompositeIndexRow.objects.create(borrower=self.borrower, date="2024-02-29", overall_score=Decimal("3.6"))
+        RiskSubfactorsRow.objects.create(
+            borrower=self.borrower,
+            main_category="Inventory",
+            sub_risk="Excess & Obsolete",
+            risk_score=Decimal("4"),
+        )
+        RiskSubfactorsRow.objects.create(
+            borrower=self.borrower,
+            main_category="Inventory",
+            sub_risk="Seasonality",
+            risk_score=Decimal("2"),
+        )
+        self.user = get_user_model().objects.create_user(username="analyst", password="pw")
+
+    def test_refresh_materializes_category_scores_and_trend(self):
+        scorecard = refresh_risk_scorecard(self.borrower)
+        categories = {entry["label"]: entry for entry in scorecard.category_scores}
+        self.assertEqual(Decimal(categories["Inventory"]["score"]), Decimal("3"))
+        self.assertEqual(
+            [bar["label"] for bar in categories["Inventory"]["bars"]],
+            ["Excess & Obsolete", "Seasonality"],
+        )
+        self.assertEqual([point["label"] for point in scorecard.trend_points], ["Jan", "Feb"])
+        self.assertEqual(scorecard.overall_score, Decimal("3.6"))
+
+    def test_get_scorecard_materializes_once(self):
+        get_risk_scorecard(self.borrower)
+        with self.assertNumQueries(1):
+            get_risk_scorecard(self.borrower)
+        self.assertEqual(BorrowerRiskScorecard.objects.count(), 1)
+
+    def test_risk_view_reads_scorecard(self):
+        refresh_risk_scorecard(self.borrower)
+        self.client.force_login(self.user)
+        response = self.client.get(reverse("risk"), {"borrower_id": self.borrower.pk})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["risk"]["rating_score"], "3.6")
+        labels = [metric["label"] for metric in response.context["risk"]["metrics"]]
+        self.assertEqual(labels, ["Accounts Receivable", "Inventory", "Company", "Industry"])
+
+
+class WatchlistTests(TestCase):
+    def setUp(self):
+        self.company = Company.objects.create(company="Lender Book")
+        self.scores = {}
+        for idx, (prior, latest) in enumerate([("2.0", "4.5"), ("3.0", "2.5"), ("1.0", "3.5")]):
+            borrower = Borrower.objects.create(company=self.company, primary_contact=f"Borrower {idx}")
+            CompositeIndexRow.objects.create(borrower=borrower, date="2024-01-31", overall_score=Decimal(prior))
+            CompositeIndexRow.objects.create(borrower=borrower, date="2024-02-29", overall_score=Decimal(latest))
+            self.scores[borrower.pk] = Decimal(latest)
+        self.unscored = Borrower.objects.create(company=self.company, primary_contact="No data")
+        first = Borrower.objects.order_by("id").first()
+        ARMetricsRow.objects.create(borrower=first, as_of_date="2024-02-29", pct_past_due=Decimal("0.12"))
+        ForecastRow.objects.create(
+            borrower=first,
+            as_of_date="2024-02-29",
+            available_collateral=Decimal("1000"),
+            loan_balance=Decimal("250"),
+        )
+        self.user = get_user_model().objects.create_user(username="watcher", password="pw")
+        self.client.force_login(self.user)
+        session = self.client.session
+        session["company_id"] = self.company.pk
+        session.save()
+
+    def test_ranks_by_latest_score_with_trend(self):
+        response = self.client.get(reverse("watchlist"))
+        rows = response.context["watchlist_rows"]
+        self.assertEqual([row["overall_score"] for row in rows], ["4.5", "3.5", "2.5", "—"])
+        self.assertEqual(rows[0]["trend"]["display"], "▲ 2.5")
+        self.assertEqual(rows[2]["trend"]["class"], "down")
+        self.assertEqual(rows[0]["pct_past_due"], "12.0%")
+        self.assertEqual(rows[0]["utilization"], "25.0%")
+
+    def test_reads_only_the_latest_report(self):
+        company = Company.objects.create(company="Restated Book")
+        borrower = Borrower.objects.create(company=company, primary_contact="Restated")
+        january = BorrowerReport.objects.create(borrower=borrower, report_date=datetime.date(2024, 2, 29))
+        february = BorrowerReport.objects.create(borrower=borrower, report_date=datetime.date(2024, 3, 31))
+        # Each report re-imports the history; the later one restates February.
+        for report, scores in ((january, ("2.0", "3.0")), (february, ("2.0", "3.5"))):
+            for day, score in zip(("2024-01-31", "2024-02-29"), scores):
+                CompositeIndexRow.objects.create(borrower=borrower, report=report, date=day, overall_score=Decimal(score))
+        ARMetricsRow.objects.create(borrower=borrower, report=february, as_of_date="2024-02-29", pct_past_due=Decimal("0.2"))
+        ARMetricsRow.objects.create(borrower=borrower, report=january, as_of_date="2024-03-15", pct_past_due=Decimal("0.9"))
+        # A leftover row tied to no report only stands in for borrowers without reports.
+        leftover = ARMetricsRow.objects.create(borrower=borrower, as_of_date="2024-04-30", pct_past_due=Decimal("0.5"))
+        ARMetricsRow.objects.filter(pk=leftover.pk).update(report=None)
+        session = self.client.session
+        session["company_id"] = company.pk
+        session.save()
+
+        row = self.client.get(reverse("watchlist")).context["watchlist_rows"][0]
+        self.assertEqual(row["overall_score"], "3.5")
+        self.assertEqual(row["trend"]["display"], "▲ 1.5")
+        self.assertEqual(row["pct_past_due"], "20.0%")
+
+    def test_keyset_pagination_continues_ranking(self):
+        from .views import watchlist
+
+        original = watchlist.WATCHLIST_PAGE_SIZE
+        watchlist.WATCHLIST_PAGE_SIZE = 2
+        try:
+            first = self.client.get(reverse("watchlist"))
+            cursor = first.context["next_cursor"]
+            second = self.client.get(reverse("watchlist"), {"after": cursor})
+        finally:
+            watchlist.WATCHLIST_PAGE_SIZE = original
+        self.assertEqual([row["rank"] for row in second.context["watchlist_rows"]], [3, 4])
+        self.assertEqual(second.context["watchlist_rows"][1]["id"], self.unscored.pk)
+        self.assertIsNone(second.context["next_cursor"])
+
+
+class LimitsViewTests(TestCase):
+    def setUp(self):
+        company = Company.objects.create(company="Limits Co")
+        self.borrower = Borrower.objects.create(company=company, primary_contact="Limits Owner")
+        for idx in range(25):
+            CollateralLimitsRow.objects.create(
+                borrower=self.borrower,
+                division="East" if idx % 2 else "West",
+                collateral_type="Inventory" if idx < 5 else "Accounts Receivable",
+                usd_limit=Decimal("1000") * (idx + 1),
+                pct_limit=Decimal("0.5"),
+            )
+        CollateralOverviewRow.objects.create(borrower=self.borrower, main_type="Inventory", ineligibles=Decimal("10"))
+        CollateralOverviewRow.objects.create(borrower=self.borrower, main_type="Receivables", ineligibles=Decimal("0"))
+        CollateralOverviewRow.objects.create(borrower=self.borrower, main_type="Equipment", ineligibles=None)
+        user = get_user_model().objects.create_user(username="limits", password="pw")
+        self.client.force_login(user)
+        session = self.client.session
+        session["selected_borrower_id"] = self.borrower.pk
+        session.save()
+
+    def test_paginates_in_database_and_skips_empty_ineligibles(self):
+        response = self.client.get(reverse("limits"), {"limits_page": 2})
+        limit_page = response.context["limit_page"]
+        self.assertEqual(limit_page.paginator.count, 25)
+        self.assertEqual(len(limit_page.object_list), 5)
+        self.assertEqual(limit_page.object_list[0]["usd_limit"], "$21,000")
+        ineligibles = response.context["ineligible_page"].object_list
+        self.assertEqual([row["collateral_type"] for row in ineligibles], ["Inventory"])
+
+    def test_filters_by_division_and_collateral_type(self):
+        response = self.client.get(
+            reverse("limits"),
+            {"division": "East", "collateral_type": "Inventory", "sort": "-division"},
+        )
+        limit_page = response.context["limit_page"]
+        self.assertEqual(limit_page.paginator.count, 2)
+        self.assertIn("division=East", response.context["filter_query"])
+        ineligibles = response.context["ineligible_page"].object_list
+        self.assertEqual([row["collateral_type"] for row in ineligibles], ["Inventory"])
+
+        response = self.client.get(reverse("limits"), {"collateral_type": "Accounts Receivable"})
+        self.assertEqual(response.context["ineligible_page"].paginator.count, 0)
+
+    def test_division_filter_keeps_ineligibles(self):
+        response = self.client.get(reverse("limits"), {"division": "East"})
+        self.assertEqual(response.context["limit_page"].paginator.count, 12)
+        ineligibles = response.context["ineligible_page"].object_list
+        self.assertEqual([row["collateral_type"] for row in ineligibles], ["Inventory"])
+
+    def test_collateral_pages_cap_inventory_at_the_limits_sheet(self):
+        row = CollateralOverviewRow.objects.create(
+            borrower=self.borrower,
+            main_type="Inventory",
+            sub_type="Finished Goods",
+            eligible_collateral=Decimal("1000"),
+            advanced_rate=Decimal("0.8"),
+        )
+        self.assertEqual(_collateral_row_payload(row)["pre_reserve_collateral"], _format_currency(Decimal("500")))
+        state = _inventory_state(self.borrower)
+        self.assertEqual(state["inventory_available_total"], Decimal("500"))
+
+
+class PartitioningTests(TestCase):
+    def test_partition_ddl(self):
+        self.assertEqual(
+            month_partition_sql("ar_metrics", datetime.date(2024, 12, 15)),
+            'CREATE TABLE IF NOT EXISTS "ar_metrics_p2024_12" PARTITION OF "ar_metrics" '
+            "FOR VALUES FROM ('2024-12-01') TO ('2025-01-01')",
+        )
+        self.assertIn("MODULUS 16, REMAINDER 3", hash_partition_sql("aging_composition", 16, 3))
+        months = list(months_between(datetime.date(2024, 11, 20), datetime.date(2025, 2, 1)))
+        self.assertEqual([m.month for m in months], [11, 12, 1, 2])
+
+    def test_command_requires_postgres(self):
+        with self.assertRaises(CommandError):
+            call_command("partition_rows", "status")
+
+
+class ArchiveReportsTests(TestCase):
+    def setUp(self):
+        company = Company.objects.create(company="Archive Co")
+        self.borrower = Borrower.objects.create(company=company, primary_contact="Archivist")
+        base = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+        self.reports = []
+        for idx, report_date in enumerate(["2024-01-10", "2024-01-20", "2024-02-10"]):
+            report = BorrowerReport.objects.create(borrower=self.borrower, report_date=report_date)
+            created = base + datetime.timedelta(days=idx)
+            BorrowerReport.objects.filter(pk=report.pk).update(created_at=created)
+            row = ARMetricsRow.objects.create(
+                borrower=self.borrower,
+                as_of_date=report_date,
+                balance=Decimal("100.50") * (idx + 1),
+            )
+            ARMetricsRow.objects.filter(pk=row.pk).update(created_at=created + datetime.timedelta(minutes=1))
+            self.reports.append(report)
+        self.archive_root = Path(tempfile.mkdtemp())
+        patcher = mock.patch("management.archive.ARCHIVE_ROOT", self.archive_root)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_archives_superseded_reports_and_restores_them(self):
+        call_command("archive_reports", "--keep", "1", stdout=mock.MagicMock())
+        # The 2024-01-20 report is January's month-end snapshot, so only the first moves out.
+        self.assertEqual(
+            list(ARMetricsRow.objects.order_by("as_of_date").values_list("as_of_date", flat=True)),
+            [datetime.date(2024, 1, 20), datetime.date(2024, 2, 10)],
+        )
+        archived = self.archive_root / f"borrower_{self.borrower.pk}" / f"report_{self.reports[0].pk}"
+        self.assertEqual(len(list(archived.iterdir())), 1)
+
+        call_command("archive_reports", "--restore", stdout=mock.MagicMock())
+        restored = ARMetricsRow.objects.get(as_of_date="2024-01-10")
+        self.assertEqual(restored.balance, Decimal("100.50"))
+        self.assertEqual(restored.created_at, datetime.datetime(2024, 1, 1, 0, 1, tzinfo=datetime.timezone.utc))
+        self.assertFalse(archived.exists())
+
+
+    def test_rerun_after_an_interrupted_delete_keeps_every_row(self):
+        report = self.reports[0]
+        for idx in range(4):
+            ARMetricsRow.objects.create(borrower=self.borrower, report=report, balance=Decimal(idx))
+        expected = set(archive.report_rows(ARMetricsRow, report).values_list("pk", flat=True))
+        original_delete = archive._delete_in_batches
+
+        def delete_first_batch_then_die(model_cls, ids, batch_size):
+            original_delete(model_cls, ids[:batch_size], batch_size)
+            raise RuntimeError("worker died")
+
+        with mock.patch("management.archive._delete_in_batches", delete_first_batch_then_die):
+            with self.assertRaises(RuntimeError):
+                archive.archive_report(report, next_report=self.reports[1], batch_size=2)
+        self.assertEqual(archive.report_rows(ARMetricsRow, report).count(), len(expected) - 2)
+
+        archive.archive_report(report, next_report=self.reports[1], batch_size=2)
+        self.assertFalse(archive.report_rows(ARMetricsRow, report).exists())
+        counts = archive.restore_report(self.borrower.pk, report.pk)
+        self.assertEqual(counts["ar_metrics"], len(expected))
+        self.assertEqual(set(ARMetricsRow.objects.filter(pk__in=expected).values_list("pk", flat=True)), expected)
+
+
+class ReportSnapshotTests(TestCase):
+    def setUp(self):
+        company = Company.objects.create(company="Snapshot Co")
+        self.borrower = Borrower.objects.create(company=company, primary_contact="Snap")
+        self.report = BorrowerReport.objects.create(borrower=self.borrower, report_date=datetime.date.today())
+        today = datetime.date.today()
+        CollateralOverviewRow.objects.create(
+            borrower=self.borrower,
+            main_type="Inventory",
+            sub_type="Finished Goods",
+            eligible_collateral=Decimal("5000"),
+            net_collateral=Decimal("4000"),
+        )
+        for month in range(3):
+            as_of = today - datetime.timedelta(days=30 * month)
+            for division, balance in (("East", "1200.25"), ("West", "800.10")):
+                ARMetricsRow.objects.create(
+                    borrower=self.borrower,
+                    division=division,
+                    as_of_date=as_of,
+                    balance=Decimal(balance) + month,
+                    dso=Decimal("41.5"),
+                    current_amt=Decimal("700"),
+                    past_due_amt=Decimal("300.5") + month,
+                )
+            for rank in range(4):
+                HistoricalTop20SKUsRow.objects.create(
+                    borrower=self.borrower,
+                    division="East" if rank % 2 else "West",
+                    as_of_date=as_of,
+                    item_number=Decimal(1000 + rank),
+                    description=f"SKU {month}-{rank}",
+                    cost=Decimal("12.5"),
+                    pct_of_total=Decimal("0.01") * (rank + 1) if rank != 2 else None,
+                )
+        self.snapshot_root = Path(tempfile.mkdtemp())
+        patcher = mock.patch("management.snapshots.SNAPSHOT_ROOT", self.snapshot_root)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_snapshot_reads_match_orm(self):
+        orm_ar = _accounts_receivable_context(self.borrower, "last_12_months", "East")
+        orm_fg = _finished_goals_context(self.borrower, "last_12_months")
+        self.assertEqual(len(orm_ar["ar_current_vs_past_due_trend"]["labels"]), 3)
+        self.assertEqual(orm_fg["finished_goals_top_skus"][0]["description"], "SKU 0-3")
+        self.assertIsNone(load_latest_snapshot(self.borrower, ARMetricsRow))
+
+        counts = write_report_snapshot(self.report)
+        self.assertEqual(counts["ar_metrics"], 6)
+        snapshot = load_latest_snapshot(self.borrower, HistoricalTop20SKUsRow)
+        self.assertEqual(len(snapshot), 12)
+
+        self.assertEqual(_accounts_receivable_context(self.borrower, "last_12_months", "East"), orm_ar)
+        self.assertEqual(
+            _finished_goals_context(self.borrower, "last_12_months")["finished_goals_top_skus"],
+            orm_fg["finished_goals_top_skus"],
+        )
+
+    def test_row_edits_retire_the_snapshot(self):
+        write_report_snapshot(self.report)
+        self.assertIsNotNone(load_latest_snapshot(self.borrower, ARMetricsRow))
+        for row in ARMetricsRow.objects.filter(borrower=self.borrower):
+            row.balance = Decimal("5000000")
+            row.save()
+        self.assertIsNone(load_latest_snapshot(self.borrower, ARMetricsRow))
+        edited = _accounts_receivable_context(self.borrower, "last_12_months", "East")
+        with mock.patch("management.views.collateral_dynamic.load_latest_snapshot", return_value=None):
+            self.assertEqual(edited, _accounts_receivable_context(self.borrower, "last_12_months", "East"))
+
+        write_report_snapshot(self.report)
+        self.assertIsNotNone(load_latest_snapshot(self.borrower, ARMetricsRow))
+        HistoricalTop20SKUsRow.objects.filter(borrower=self.borrower).first().delete()
+        self.assertIsNone(load_latest_snapshot(self.borrower, HistoricalTop20SKUsRow))
+
+
+class SyntheticBenchmarkTests(TestCase):
+    def test_seed_is_deterministic_and_views_render(self):
+        borrower_ids, total = seed(borrowers=2, reports=2, rows_per_sheet=2, seed_value=7)
+        self.assertEqual(len(borrower_ids), 2)
+        self.assertEqual(BorrowerReport.objects.count(), 4)
+        self.assertEqual(ARMetricsRow.objects.count(), 8)
+        first_balances = list(ARMetricsRow.objects.order_by("id").values_list("balance", flat=True))
+
+        Borrower.objects.all().delete()
+        Company.objects.all().delete()
+        _, repeat_total = seed(borrowers=2, reports=2, rows_per_sheet=2, seed_value=7)
+        self.assertEqual(repeat_total, total)
+        self.assertEqual(list(ARMetricsRow.objects.order_by("id").values_list("balance", flat=True)), first_balances)
+
+        results = run_view_benchmarks(borrowers=1, repeat=1)
+        self.assertEqual(set(results["results"]), {name for name, _url, _params in BENCHMARK_VIEWS + BOOK_VIEWS})
+        self.assertEqual(compare(results, results), [])
+        self.assertEqual(budget_overruns(results, {"watchlist_book": 10 ** 6}), [])
+        self.assertEqual(len(budget_overruns(results, {"watchlist_book": 0})), 1)
+
+    def test_compare_flags_regressions(self):
+        baseline = {"results": {"summary": {"wall_ms": 100, "queries": 10, "rows": 50, "peak_kb": 200}}}
+        current = {"results": {"summary": {"wall_ms": 105, "queries": 12, "rows": 50, "peak_kb": 400}}}
+        self.assertEqual(
+            compare(baseline, current),
+            ["summary: queries 10 -> 12", "summary: peak_kb 200 -> 400"],
+        )
+
+
+class SyntheticWorkbookTests(TestCase):
+    def setUp(self):
+        self.path = Path(tempfile.mkdtemp()) / "synthetic.xlsx"
+        write_cora_workbook(self.path, rows_per_sheet=6, noise=0.2, seed_value=3)
+
+    def test_importer_reads_noisy_workbook(self):
+        with mock.patch("management.snapshots.SNAPSHOT_ROOT", self.path.parent / "snapshots"):
+            with self.captureOnCommitCallbacks(execute=True):
+                call_command("import_cora_xlsx", file=str(self.path), stdout=mock.MagicMock())
+        borrower = Borrower.objects.get(company__company_id=900003)
+        self.assertEqual(ARMetricsRow.objects.filter(borrower=borrower).count(), 6)
+        self.assertTrue(ARMetricsRow.objects.filter(borrower=borrower, balance__lt=0).exists())
+        self.assertEqual(CollateralLimitsRow.objects.filter(borrower=borrower).count(), 6)
+
+    def test_import_publishes_all_rows_at_once_or_none(self):
+        original_publish = ImportStaging.publish
+        seen = {}
+
+        def publish(staging, report, borrower=None):
+            seen["rows_before_publish"] = ARMetricsRow.objects.count()
+            return original_publish(staging, report, borrower)
+
+        with mock.patch.object(ImportStaging, "publish", publish), mock.patch(
+            "management.management.commands.import_cora_xlsx.refresh_risk_scorecard",
+            side_effect=RuntimeError("scorecard failed"),
+        ):
+            with self.assertRaises(RuntimeError):
+                call_command("import_cora_xlsx", file=str(self.path), stdout=mock.MagicMock())
+        self.assertEqual(seen, {"rows_before_publish": 0})
+        self.assertFalse(BorrowerReport.objects.exists())
+        self.assertFalse(ARMetricsRow.objects.exists())
+        self.assertFalse(Borrower.objects.filter(company__company_id=900003).exists())
+
+    def test_import_job_reports_progress_and_the_report(self):
+        job = enqueue("import_workbook", {"path": str(self.path), "source_file": "upload.xlsx"})
+        progress = []
+        original = Job.set_progress
+
+        def set_progress(job, percent, message=""):
+            progress.append(percent)
+            original(job, percent, message)
+
+        with mock.patch.object(Job, "set_progress", set_progress), mock.patch(
+            "management.snapshots.SNAPSHOT_ROOT", self.path.parent / "snapshots"
+        ):
+            self.assertEqual(work("test", burst=True), 1)
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.SUCCEEDED, job.error)
+        self.assertEqual(progress, sorted(progress))
+        self.assertEqual(progress[-1], 90)
+        report = BorrowerReport.objects.get(pk=job.result["report_id"])
+        self.assertEqual(report.source_file, "upload.xlsx")
+        self.assertEqual(ARMetricsRow.objects.filter(report=report).count(), 6)
+
+    def test_chunked_upload_resumes_and_queues_the_import(self):
+        staff = get_user_model().objects.create_user(username="ops", password="pw", is_staff=True)
+        self.client.force_login(staff)
+        content = self.path.read_bytes()
+        chunk = len(content) // 3 + 1
+        with override_settings(UPLOAD_ROOT=self.path.parent / "incoming", UPLOAD_CHUNK_BYTES=chunk):
+            response = self.client.post(
+                reverse("upload_create"),
+                {"filename": "cora.xlsx", "size": len(content), "sha256": hashlib.sha256(content).hexdigest()},
+            )
+            self.assertEqual(response.status_code, 201)
+            url = reverse("upload_detail", args=[response.json()["id"]])
+
+            def put(offset):
+                return self.client.put(
+                    url,
+                    content[offset : offset + chunk],
+                    content_type="application/octet-stream",
+                    headers={"Upload-Offset": str(offset)},
+                )
+
+            self.assertEqual(put(0).json()["offset"], chunk)
+            # A resent first chunk is refused with the offset to resume from.
+            self.assertEqual(put(0).status_code, 409)
+            offset = self.client.get(url).json()["offset"]
+            while True:
+                payload = put(offset).json()
+                offset = payload["offset"]
+                if payload["job"]:
+                    break
+            self.assertEqual((payload["status"], payload["job"]["kind"]), (Upload.COMPLETE, "import_workbook"))
+
+            with mock.patch("management.snapshots.SNAPSHOT_ROOT", self.path.parent / "snapshots"):
+                work("test", burst=True)
+        job = Job.objects.get(pk=payload["job"]["id"])
+        self.assertEqual(job.status, Job.SUCCEEDED, job.error)
+        self.assertEqual(BorrowerReport.objects.get(pk=job.result["report_id"]).source_file, "cora.xlsx")
+        self.assertContains(self.client.get(reverse("reports")), "Import succeeded")
+
+    def test_upload_with_a_bad_checksum_is_not_imported(self):
+        staff = get_user_model().objects.create_user(username="ops", password="pw", is_staff=True)
+        self.client.force_login(staff)
+        content = self.path.read_bytes()
+        with override_settings(UPLOAD_ROOT=self.path.parent / "incoming"):
+            upload = start_upload("cora.xlsx", len(content), "0" * 64, user=staff)
+            response = self.client.put(
+                reverse("upload_detail", args=[upload.pk]),
+                content,
+                content_type="application/octet-stream",
+                headers={"Upload-Offset": "0"},
+            )
+            self.assertFalse(upload_path(upload).exists())
+        self.assertEqual((response.status_code, response.json()["status"]), (400, Upload.FAILED))
+        self.assertFalse(Job.objects.exists())
+        self.client.force_login(get_user_model().objects.create_user(username="viewer", password="pw"))
+        self.assertEqual(self.client.get(reverse("upload_detail", args=[upload.pk])).status_code, 403)
+
+    def test_import_benchmark_covers_every_stage(self):
+        results = run_import_benchmark(self.path)
+        self.assertEqual(results["stages"]["conversion"]["rows"], results["stages"]["header_detection"]["rows"])
+        self.assertGreater(results["stages"]["staging"]["rows"], 0)
+        self.assertEqual(results["stages"]["publish"]["rows"], results["stages"]["staging"]["rows"])
+        self.assertFalse(ARMetricsRow.objects.exists())
+
+
+class RequestTimingTests(TestCase):
+    def setUp(self):
+        company = Company.objects.create(company="Timing Co")
+        self.borrower = Borrower.objects.create(company=company, primary_contact="Timer")
+        user = get_user_model().objects.create_user(username="timer", password="pw")
+        self.client.force_login(user)
+        session = self.client.session
+        session["selected_borrower_id"] = self.borrower.pk
+        session.save()
+
+    def test_spans_count_their_own_queries(self):
+        with track_request() as timings:
+            Borrower.objects.count()
+            with span("outer"):
+                Company.objects.count()
+                with span("inner"):
+                    Borrower.objects.count()
+        self.assertEqual(timings.sql_count, 3)
+        self.assertEqual(timings.spans["outer"]["sql_count"], 2)
+        self.assertEqual(timings.spans["inner"]["sql_count"], 1)
+
+    def test_server_timing_header_lists_builders(self):
+        response = self.client.get(reverse("risk"))
+        header = response["Server-Timing"]
+        self.assertTrue(header.startswith("total;dur="))
+        self.assertIn("get_risk_scorecard;dur=", header)
+
+    @override_settings(VIEW_QUERY_BUDGETS={"risk": 2}, QUERY_BUDGET_RAISE=True)
+    def test_query_budget_fails_when_exceeded(self):
+        with self.assertRaises(QueryBudgetExceeded):
+            self.client.get(reverse("risk"))
+
+    @override_settings(VIEW_QUERY_BUDGETS={"risk": 2}, QUERY_BUDGET_RAISE=False)
+    def test_query_budget_warns_in_production(self):
+        with self.assertLogs("management.timing", level="WARNING") as logs:
+            response = self.client.get(reverse("risk"))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("query_budget_exceeded", logs.output[0])
+
+
+class MetricsTests(TestCase):
+    def setUp(self):
+        registry.reset()
+        self.addCleanup(registry.reset)
+
+    def test_exposition_merges_worker_files(self):
+        with tempfile.TemporaryDirectory() as tmp, override_settings(METRICS_DIR=tmp):
+            REQUESTS.inc(view="risk", status=200)
+            other_worker = {"http_requests_total": [[["risk", "200"], 4]]}
+            Path(tmp, "999999.json").write_text(json.dumps(other_worker))
+            output = render_prometheus()
+        self.assertIn("# TYPE http_requests_total counter", output)
+        self.assertIn('http_requests_total{view="risk",status="200"} 5', output)
+
+    def test_exited_processes_are_archived_not_dropped(self):
+        with tempfile.TemporaryDirectory() as tmp, override_settings(METRICS_DIR=tmp):
+            REQUESTS.inc(view="risk", status=200)
+            for stem in ("999999", "999998-1"):
+                Path(tmp, f"{stem}.json").write_text(json.dumps({"http_requests_total": [[["risk", "200"], 2]]}))
+            with mock.patch("management.metrics._pid_alive", side_effect=lambda pid: pid != 999999):
+                first = render_prometheus()
+            files = sorted(path.name for path in Path(tmp).glob("*.json"))
+            REQUESTS.inc(view="risk", status=200)
+            second = render_prometheus()
+        self.assertIn('http_requests_total{view="risk",status="200"} 5', first)
+        self.assertEqual(len(files), 3)
+        self.assertIn("archive.json", files)
+        self.assertNotIn("999999.json", files)
+        self.assertIn('http_requests_total{view="risk",status="200"} 6', second)
+
+    def test_requests_are_recorded_and_endpoint_is_staff_only(self):
+        user = get_user_model().objects.create_user(username="viewer", password="pw")
+        self.client.force_login(user)
+        self.assertEqual(self.client.get(reverse("metrics")).status_code, 403)
+
+        user.is_staff = True
+        user.save()
+        response = self.client.get(reverse("metrics"))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("text/plain; version=0.0.4"))
+        body = response.content.decode()
+        self.assertIn('http_requests_total{view="metrics",status="403"} 1', body)
+        self.assertIn('http_request_duration_seconds_bucket{view="metrics",method="GET",le="+Inf"} 1', body)
+
+    @override_settings(METRICS_SCRAPE_TOKEN="scrape-secret")
+    def test_scrapers_authenticate_with_the_scrape_token(self):
+        self.assertEqual(self.client.get(reverse("metrics")).status_code, 302)
+        self.assertEqual(self.client.get(reverse("metrics"), HTTP_AUTHORIZATION="Bearer wrong").status_code, 302)
+        response = self.client.get(reverse("metrics"), HTTP_AUTHORIZATION="Bearer scrape-secret")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("text/plain; version=0.0.4"))
+        basic = base64.b64encode(b"prometheus:scrape-secret").decode()
+        self.assertEqual(self.client.get(reverse("metrics"), HTTP_AUTHORIZATION=f"Basic {basic}").status_code, 200)
+
+
+class SlowQueryTests(TestCase):
+    def setUp(self):
+        company = Company.objects.create(company="Slow Co")
+        self.borrower = Borrower.objects.create(company=company, primary_contact="Sloth")
+        self.user = get_user_model().objects.create_user(username="sloth", password="pw")
+        self.client.force_login(self.user)
+        session = self.client.session
+        session["selected_borrower_id"] = self.borrower.pk
+        session.save()
+
+    def test_normalize_sql_shares_fingerprint_across_literals(self):
+        first = normalize_sql("SELECT * FROM t WHERE id IN (%s, %s, %s) AND name = 'a'  AND n > 10")
+        second = normalize_sql("SELECT * FROM t WHERE id IN (%s) AND name = 'it''s' AND n > 3.5")
+        self.assertEqual(first, second)
+        self.assertEqual(first, "SELECT * FROM t WHERE id IN (...) AND name = ? AND n > ?")
+
+    @override_settings(SLOW_QUERY_THRESHOLD_MS=0, SLOW_QUERY_EXPLAIN_SAMPLE_RATE=1.0)
+    def test_request_queries_are_captured_with_builder_and_plan(self):
+        self.client.get(reverse("risk"))
+        captured = SlowQuery.objects.filter(view="risk")
+        self.assertTrue(captured.exists())
+        self.assertTrue(captured.filter(builder="get_risk_scorecard").exists())
+        self.assertFalse(captured.exclude(explain="").exists())
+        queued = Job.objects.filter(kind="explain_slow_query")
+        self.assertTrue(queued.exists())
+        work("test-worker", burst=True, kinds=["explain_slow_query"])
+        self.assertTrue(captured.exclude(explain="").exists())
+        self.assertFalse(queued.exclude(status=Job.SUCCEEDED).exists())
+
+    def test_explain_skips_writes_and_locks_and_rolls_back(self):
+        self.assertTrue(explainable("SELECT id FROM borrower WHERE note = 'delete me'"))
+        for sql in (
+            "SELECT id FROM borrower FOR UPDATE",
+            "SELECT id FROM borrower FOR SHARE",
+            "WITH gone AS (DELETE FROM borrower RETURNING id) SELECT * FROM gone",
+            "UPDATE borrower SET primary_contact = 'x'",
+        ):
+            self.assertFalse(explainable(sql), sql)
+            self.assertEqual(explain("default", sql, []), "")
+        with mock.patch("management.slow_queries.transaction.set_rollback") as set_rollback:
+            self.assertTrue(explain("default", f"SELECT id FROM {Borrower._meta.db_table}", []))
+        set_rollback.assert_called_once_with(True, using="default")
+
+    def test_ranking_page_is_staff_only(self):
+        for duration in (10, 30):
+            SlowQuery.objects.create(fingerprint="a" * 32, normalized_sql="SELECT ?", sample_sql="SELECT 1", duration_ms=duration)
+        SlowQuery.objects.create(fingerprint="b" * 32, normalized_sql="SELECT ? + ?", sample_sql="SELECT 1 + 1", duration_ms=35)
+        self.assertEqual(self.client.get(reverse("slow_queries")).status_code, 403)
+
+        self.user.is_staff = True
+        self.user.save()
+        response = self.client.get(reverse("slow_queries"))
+        rows = response.context["slow_query_rows"]
+        self.assertEqual([row["fingerprint"] for row in rows], ["a" * 32, "b" * 32])
+        self.assertEqual(rows[0]["calls"], 2)
+
+
+def _profiled_leaf():
+    return sum(range(20000))
+
+
+def _profiled_parent():
+    return _profiled_leaf() + _profiled_leaf()
+
+
+class ProfilingTests(TestCase):
+    def setUp(self):
+        company = Company.objects.create(company="Profile Co")
+        self.borrower = Borrower.objects.create(company=company, primary_contact="Profiler")
+        self.user = get_user_model().objects.create_user(username="profiler", password="pw")
+        self.client.force_login(self.user)
+
+    def test_collapsed_stacks_nest_callees_under_callers(self):
+        result, stats = profile_call(_profiled_parent)
+        self.assertEqual(result, 2 * sum(range(20000)))
+        stacks = collapsed_stacks(stats)
+        leaf = [line for line in stacks if "_profiled_leaf" in line.rsplit(" ", 1)[0].split(";")[-1]]
+        self.assertTrue(leaf)
+        self.assertIn("_profiled_parent", leaf[0].split(";")[-2])
+        self.assertTrue(all(int(line.rsplit(" ", 1)[1]) > 0 for line in stacks))
+
+    def test_profile_flag_is_staff_only(self):
+        with tempfile.TemporaryDirectory() as tmp, mock.patch("management.profiling.PROFILE_ROOT", Path(tmp)):
+            response = self.client.get(reverse("risk"), {"__profile": "1"})
+            self.assertIn("text/html", response["Content-Type"])
+
+            self.user.is_staff = True
+            self.user.save()
+            response = self.client.get(reverse("risk"), {"__profile": "1"})
+            self.assertEqual(response["Content-Type"], "text/plain; charset=utf-8")
+            self.assertIn("risk_view (management/views/risk.py", response.content.decode())
+            self.assertEqual(len(list(Path(tmp).glob("risk-*.collapsed"))), 1)
+
+    def test_profile_view_command_writes_outputs(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            call_command("profile_view", "risk", borrower=self.borrower.pk, output_dir=tmp, stdout=StringIO())
+            self.assertEqual(len(list(Path(tmp).glob("risk-*.collapsed"))), 1)
+            self.assertEqual(len(list(Path(tmp).glob("risk-*.txt"))), 1)
+
+
+class CollateralAsOfDateTests(TestCase):
+    def setUp(self):
+        company = Company.objects.create(company="As Of Co")
+        self.borrower = Borrower.objects.create(company=company, primary_contact="Dated")
+        self.user = get_user_model().objects.create_user(username="dated", password="pw")
+        self.client.force_login(self.user)
+
+    def _collateral(self, as_of_date, net):
+        return CollateralOverviewRow.objects.create(
+            borrower=self.borrower,
+            main_type="Accounts Receivable",
+            sub_type="Domestic",
+            net_collateral=Decimal(net),
+            eligible_collateral=Decimal(net),
+            as_of_date=as_of_date,
+        )
+
+    def test_importer_dates_collateral_rows_with_report_date(self):
+        report = BorrowerReport.objects.create(borrower=self.borrower, report_date=datetime.date(2025, 3, 31))
+        frame = pd.DataFrame([{"main_type": "Inventory", "sub_type": "Finished Goods", "net_collateral": 10}])
+        objs, skipped, _reasons, _debug = build_sheet_objects(CollateralOverviewRow, frame, report, borrower=self.borrower)
+        self.assertEqual(skipped, 0)
+        self.assertEqual(objs[0].as_of_date, datetime.date(2025, 3, 31))
+
+    def test_backfill_uses_report_date_in_effect_at_creation(self):
+        BorrowerReport.objects.create(borrower=self.borrower, report_date=datetime.date(2025, 1, 31))
+        row = self._collateral(None, "5")
+        CollateralOverviewRow.objects.filter(pk=row.pk).update(as_of_date=None)
+        migration = importlib.import_module("management.migrations.0011_collateral_as_of_date")
+        migration.backfill_as_of_date(django_apps, None)
+        row.refresh_from_db()
+        self.assertEqual(row.as_of_date, datetime.date(2025, 1, 31))
+
+    def test_portfolio_totals_only_the_latest_period(self):
+        # Both periods are loaded the same day; the old created_at__date filter summed them together.
+        self._collateral(datetime.date(2025, 1, 31), "100")
+        self._collateral(datetime.date(2025, 2, 28), "250")
+        response = self.client.get(reverse("borrower_portfolio"))
+        row = response.context["borrowers"][0]
+        self.assertEqual(row["net_collateral"], "$250")
+
+    def test_date_filter_benchmark_reports_both_plans(self):
+        self._collateral(datetime.date(2025, 2, 28), "250")
+        results = run_date_filter_benchmark(borrowers=1, repeat=1)["results"]
+        self.assertEqual(set(results), {"range_12_months", "latest_period"})
+        self.assertIn("as_of_date", results["latest_period"]["as_of_plan"].lower())
+
+
+
+class ReportScopeTests(TestCase):
+    def setUp(self):
+        company = Company.objects.create(company="Scoped Co")
+        self.borrower = Borrower.objects.create(company=company, primary_contact="Scoped")
+        self.march = BorrowerReport.objects.create(borrower=self.borrower, report_date=datetime.date(2025, 3, 31))
+        self._limit("Inventory", "1000")
+        self.april = BorrowerReport.objects.create(borrower=self.borrower, report_date=datetime.date(2025, 4, 30))
+        self._limit("Inventory", "2000")
+        self._limit("Accounts Receivable", "3000")
+        user = get_user_model().objects.create_user(username="scoped", password="pw")
+        self.client.force_login(user)
+        session = self.client.session
+        session["selected_borrower_id"] = self.borrower.pk
+        session.save()
+
+    def _limit(self, collateral_type, usd_limit):
+        return CollateralLimitsRow.objects.create(
+            borrower=self.borrower,
+            collateral_type=collateral_type,
+            usd_limit=Decimal(usd_limit),
+        )
+
+    def test_rows_attach_to_latest_report_on_save(self):
+        reports = list(CollateralLimitsRow.objects.order_by("id").values_list("report_id", flat=True))
+        self.assertEqual(reports, [self.march.pk, self.april.pk, self.april.pk])
+
+    def test_for_borrower_follows_report_scope(self):
+        self.assertEqual(CollateralLimitsRow.objects.for_borrower(self.borrower).count(), 3)
+        with report_scope(self.march):
+            self.assertEqual(CollateralLimitsRow.objects.for_borrower(self.borrower).count(), 1)
+
+    def test_dashboard_renders_requested_report(self):
+        latest = self.client.get(reverse("limits"))
+        self.assertEqual(latest.context["limit_page"].paginator.count, 2)
+        historical = self.client.get(reverse("limits"), {"report": self.march.pk})
+        self.assertEqual(historical.context["limit_page"].paginator.count, 1)
+        self.assertEqual(historical.context["limit_page"].object_list[0]["usd_limit"], "$1,000")
+
+    def test_foreign_report_id_falls_back_to_latest(self):
+        other = Borrower.objects.create(company=self.borrower.company, primary_contact="Other")
+        foreign = BorrowerReport.objects.create(borrower=other, report_date=datetime.date(2025, 1, 31))
+        response = self.client.get(reverse("limits"), {"report": foreign.pk})
+        self.assertEqual(response.context["limit_page"].paginator.count, 2)
+
+    def test_backfill_matches_rows_to_reports_by_creation_time(self):
+        CollateralLimitsRow.objects.update(report=None)
+        migration = importlib.import_module("management.migrations.0012_row_reports")
+        migration.backfill_row_reports(django_apps, None)
+        reports = list(CollateralLimitsRow.objects.order_by("id").values_list("report_id", flat=True))
+        self.assertEqual(reports, [self.march.pk, self.april.pk, self.april.pk])
+
+
+class ReportSelectorTests(TestCase):
+    def setUp(self):
+        report_cache().clear()
+        company = Company.objects.create(company="Selector Co")
+        self.borrower = Borrower.objects.create(company=company, primary_contact="Selector")
+        self.march = BorrowerReport.objects.create(borrower=self.borrower, report_date=datetime.date(2025, 3, 31))
+        CollateralLimitsRow.objects.create(borrower=self.borrower, collateral_type="Inventory", usd_limit=Decimal("1000"))
+        self.april = BorrowerReport.objects.create(borrower=self.borrower, report_date=datetime.date(2025, 4, 30))
+        user = get_user_model().objects.create_user(username="selector", password="pw")
+        self.client.force_login(user)
+        session = self.client.session
+        session["selected_borrower_id"] = self.borrower.pk
+        session.save()
+
+    def test_selector_lists_reports_and_session_keeps_the_pick(self):
+        response = self.client.get(reverse("limits"), {"report": self.march.pk})
+        choices = response.context["report_choices"]
+        self.assertEqual([choice["id"] for choice in choices], [self.april.pk, self.march.pk])
+        self.assertTrue(response.context["is_historical_report"])
+        self.assertContains(response, 'id="report-select"')
+        # Other tabs follow the pick without carrying ?report= in their links.
+        response = self.client.get(reverse("limits"))
+        self.assertEqual(response.context["selected_report"], self.march)
+        response = self.client.get(reverse("limits"), {"report": self.april.pk})
+        self.assertFalse(response.context["is_historical_report"])
+        self.assertNotIn("selected_report_id", self.client.session)
+
+    def test_builders_are_cached_per_report_until_a_row_changes(self):
+        calls = []
+
+        @report_cached("test_builder")
+        def builder(borrower, label):
+            calls.append(label)
+            return {"label": label}
+
+        with report_scope(self.march):
+            builder(self.borrower, "a")
+            builder(self.borrower, "a")
+            builder(self.borrower, "b")
+        with report_scope(self.april):
+            builder(self.borrower, "a")
+        self.assertEqual(calls, ["a", "b", "a"])
+
+        CollateralLimitsRow.objects.get().save()
+        self.march.refresh_from_db()
+        with report_scope(self.march):
+            builder(self.borrower, "a")
+        self.assertEqual(calls, ["a", "b", "a", "a"])
+
+    def test_historical_summary_is_served_from_cache(self):
+        with CaptureQueriesContext(connection) as cold:
+            self.client.get(reverse("dashboard"), {"report": self.march.pk})
+        with CaptureQueriesContext(connection) as warm:
+            response = self.client.get(reverse("dashboard"))
+        self.assertEqual(response.status_code, 200)
+        # Only session, user, borrower, report and company lookups remain.
+        self.assertEqual(len(warm), 5)
+        self.assertLess(len(warm), len(cold))
+
+    def test_reports_page_accepts_legacy_section_param(self):
+        response = self.client.get(reverse("reports"), {"report": "complete_analysis"})
+        self.assertEqual(response.context["active_report"], "complete_analysis")
+        response = self.client.get(reverse("reports"), {"section": "cashflow", "report": self.march.pk})
+        self.assertEqual(response.context["active_report"], "cashflow")
+        self.assertEqual(response.context["selected_report"], self.march)
+
+
+class BorrowingBaseTests(TestCase):
+    def _row(self, **values):
+        fields = dict.fromkeys(COLLATERAL_FIELDS)
+        fields.update(id=1, borrower_id=1, main_type="Accounts Receivable", sub_type="Domestic")
+        fields.update(values)
+        return tuple(fields[name] for name in COLLATERAL_FIELDS)
+
+    def test_recomputes_sheet_figures_to_the_cent(self):
+        row = self._row(
+            beginning_collateral=Decimal("24026412.32"),
+            ineligibles=Decimal("-2599691.55"),
+            nolv_pct=Decimal("0.9"),
+            dilution_rate=Decimal("1"),
+            rate_limit=Decimal("0.9"),
+            reserves=Decimal("-1748856.94"),
+        )
+        values = BorrowingBase([row], sheet_values=False).row(0)
+        self.assertEqual(values["eligible_collateral"], Decimal("21426720.77"))
+        self.assertEqual(values["utilized_rate"], Decimal("0.900000"))
+        self.assertEqual(values["pre_reserve_collateral"], Decimal("19284048.69"))
+        self.assertEqual(values["net_collateral"], Decimal("17535191.75"))
+
+    def test_rounds_half_up_and_applies_limits_sheet(self):
+        rows = [
+            self._row(id=1, eligible_collateral=Decimal("0.05"), advanced_rate=Decimal("50")),
+            self._row(id=2, main_type="Inventory", eligible_collateral=Decimal("1000"), advanced_rate=Decimal("0.8")),
+        ]
+        base = BorrowingBase(rows, [(1, "Inventory", Decimal("0.5"))])
+        self.assertEqual(base.row(0)["pre_reserve_collateral"], Decimal("0.03"))
+        self.assertEqual(base.row(1)["rate_limit"], Decimal("0.500000"))
+        self.assertEqual(base.row(1)["pre_reserve_collateral"], Decimal("500.00"))
+
+    def test_sheet_values_win_and_totals_group_rows(self):
+        rows = [
+            self._row(id=1, eligible_collateral=Decimal("100"), advanced_rate=Decimal("0.5"), net_collateral=Decimal("42")),
+            self._row(id=2, eligible_collateral=Decimal("300"), advanced_rate=Decimal("0.9")),
+            self._row(id=3, borrower_id=2, net_collateral=Decimal("7")),
+        ]
+        base = BorrowingBase(rows)
+        self.assertEqual(base.row(0)["net_collateral"], Decimal("42.00"))
+        totals = base.borrower_totals()
+        self.assertEqual(totals[1]["net_collateral"], Decimal("312.00"))
+        self.assertEqual(totals[1]["advanced_rate"], Decimal("0.8"))
+        self.assertEqual(totals[2]["net_collateral"], Decimal("7.00"))
+        self.assertIsNone(totals[2]["eligible_collateral"])
+
+
+class ScenarioTests(TestCase):
+    def setUp(self):
+        report_cache().clear()
+        self.company = Company.objects.create(company="Scenario Co", industry="Food")
+        other = Company.objects.create(company="Other Co", industry="Metals")
+        self.food = Borrower.objects.create(company=self.company, primary_contact="Food")
+        self.metals = Borrower.objects.create(company=other, primary_contact="Metals")
+        for borrower in (self.food, self.metals):
+            report = BorrowerReport.objects.create(borrower=borrower, report_date=datetime.date(2025, 4, 30))
+            CollateralOverviewRow.objects.create(
+                borrower=borrower,
+                report=report,
+                main_type="Inventory",
+                eligible_collateral=Decimal("1000"),
+                nolv_pct=Decimal("0.8"),
+                dilution_rate=Decimal("1"),
+                advanced_rate=Decimal("0.8"),
+                pre_reserve_collateral=Decimal("800"),
+                reserves=Decimal("-100"),
+                net_collateral=Decimal("700"),
+            )
+        self.user = get_user_model().objects.create_user(username="analyst", password="pw")
+        self.client.force_login(self.user)
+
+    def _post(self, overrides):
+        return self.client.post(
+            reverse("scenarios"),
+            data=json.dumps({"overrides": overrides}),
+            content_type="application/json",
+        )
+
+    def test_industry_override_returns_deltas_without_writes(self):
+        overrides = [{"field": "advanced_rate", "change": "-5", "industry": "food"}]
+        with CaptureQueriesContext(connection) as queries:
+            response = self._post(overrides)
+        self.assertEqual(response.status_code, 200)
+        writes = [q["sql"] for q in queries.captured_queries if q["sql"].lstrip().upper().startswith(("INSERT", "UPDATE"))]
+        self.assertEqual([sql for sql in writes if "django_session" not in sql], [])
+        rows = {row["borrower_id"]: row for row in response.json()["borrowers"]}
+        self.assertEqual(rows[self.food.pk]["baseline_availability"], "800.00")
+        self.assertEqual(rows[self.food.pk]["scenario_availability"], "750.00")
+        self.assertEqual(rows[self.food.pk]["net_delta"], "-50.00")
+        self.assertEqual(rows[self.metals.pk]["availability_delta"], "0.00")
+        self.assertEqual(response.json()["portfolio"]["availability_delta"], "-50.00")
+
+        reserves = run_scenario([{"field": "reserves", "set": "250", "borrower": self.metals.pk}])
+        rows = {row["borrower_id"]: row for row in reserves["borrowers"]}
+        self.assertEqual(rows[self.metals.pk]["scenario_net"], "550.00")
+
+    def test_results_are_cached_until_a_report_changes(self):
+        overrides = [{"field": "rate_limit", "set": "50", "main_type": "Inventory"}]
+        with mock.patch("management.scenarios.BorrowingBase", wraps=BorrowingBase) as engine:
+            first = run_scenario(overrides)
+            self.assertEqual(run_scenario(overrides), first)
+            self.assertEqual(engine.call_count, 1)
+            CollateralOverviewRow.objects.filter(borrower=self.food).first().save()
+            run_scenario(overrides)
+            self.assertEqual(engine.call_count, 2)
+        self.assertEqual(first["portfolio"]["availability_delta"], "-600.00")
+
+    def test_bad_override_is_rejected(self):
+        response = self._post([{"field": "eligible_collateral", "set": "1"}])
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("field must be one of", response.json()["error"])
+        with self.assertRaises(CommandError):
+            call_command("run_scenario", "--override", "field=nolv_pct,change=x", stdout=StringIO())
+
+
+class AlertTests(TestCase):
+    def setUp(self):
+        AlertRule.objects.all().delete()
+        self.company = Company.objects.create(company="Alert Co")
+        self.troubled = Borrower.objects.create(company=self.company, primary_contact="Troubled")
+        self.healthy = Borrower.objects.create(company=self.company, primary_contact="Healthy")
+        for borrower, stressed in ((self.troubled, True), (self.healthy, False)):
+            BorrowerReport.objects.create(borrower=borrower, report_date=datetime.date(2025, 4, 30))
+            ForecastRow.objects.create(
+                borrower=borrower,
+                as_of_date="2025-04-30",
+                available_collateral=Decimal("100"),
+                loan_balance=Decimal("150") if stressed else Decimal("50"),
+            )
+            ARMetricsRow.objects.create(borrower=borrower, as_of_date="2025-03-31", pct_past_due=Decimal("0.10"))
+            # Whole-percent values compare as fractions.
+            ARMetricsRow.objects.create(
+                borrower=borrower,
+                as_of_date="2025-04-30",
+                pct_past_due=Decimal("20") if stressed else Decimal("11"),
+            )
+            CompositeIndexRow.objects.create(borrower=borrower, date="2025-03-31", overall_score=Decimal("2.0"))
+            CompositeIndexRow.objects.create(
+                borrower=borrower,
+                date="2025-04-30",
+                overall_score=Decimal("3.0") if stressed else Decimal("1.5"),
+            )
+            ConcentrationADODSORow.objects.create(
+                borrower=borrower,
+                customer="Anchor",
+                current_concentration_pct=Decimal("0.40") if stressed else Decimal("0.10"),
+            )
+        for name, metric, comparison, threshold in (
+            ("Overadvance", "excess_availability", "lt", "0"),
+            ("Past due spike", "pct_past_due_change", "gt", "0.05"),
+            ("Concentration cap", "max_concentration_pct", "gt", "0.25"),
+            ("Score deteriorating", "overall_score_change", "gt", "0.5"),
+        ):
+            AlertRule.objects.create(name=name, metric=metric, comparison=comparison, threshold=Decimal(threshold))
+
+    def test_rules_raise_one_alert_per_report_in_one_query_each(self):
+        with CaptureQueriesContext(connection) as queries:
+            created = evaluate_rules()
+        self.assertEqual(sorted(created.values()), [1, 1, 1, 1])
+        # One query for the rules, then one select and one insert per rule.
+        self.assertEqual(len(queries), 1 + 2 * len(created))
+        alerts = Alert.objects.filter(borrower=self.troubled)
+        self.assertEqual(alerts.count(), 4)
+        self.assertFalse(Alert.objects.filter(borrower=self.healthy).exists())
+        message = alerts.get(rule__metric="pct_past_due_change").message
+        self.assertEqual(message, "Change in AR % past due 10.0% is above 5.0%")
+
+        self.assertEqual(sum(evaluate_rules().values()), 0)
+        # A new report is judged on its own rows only: without any, April's data raises nothing again.
+        BorrowerReport.objects.create(borrower=self.troubled, report_date=datetime.date(2025, 5, 31))
+        self.assertEqual(sum(evaluate_rules().values()), 0)
+        ConcentrationADODSORow.objects.create(
+            borrower=self.troubled,
+            customer="Anchor",
+            current_concentration_pct=Decimal("30"),
+        )
+        created = evaluate_rules()
+        self.assertEqual(sum(created.values()), 1)
+        self.assertEqual(Alert.objects.get(report__report_date="2025-05-31").rule.metric, "max_concentration_pct")
+
+    def test_overadvance_reads_the_actual_forecast_row(self):
+        report = BorrowerReport.objects.create(borrower=self.healthy, report_date=datetime.date(2025, 5, 31))
+        for period, kind, loan_balance in (("2025-06-30", "Forecast", "500"), ("2025-05-31", "Actual", "50")):
+            ForecastRow.objects.create(
+                borrower=self.healthy,
+                report=report,
+                as_of_date="2025-05-31",
+                period=period,
+                actual_forecast=kind,
+                available_collateral=Decimal("100"),
+                loan_balance=Decimal(loan_balance),
+            )
+        rule = AlertRule.objects.get(metric="excess_availability")
+        self.assertEqual(list(rule_matches(rule, Borrower.objects.filter(pk=self.healthy.pk))), [])
+        ForecastRow.objects.filter(report=report, actual_forecast="Actual").update(loan_balance=Decimal("150"))
+        [(_borrower, _report, value)] = rule_matches(rule, Borrower.objects.filter(pk=self.healthy.pk))
+        self.assertEqual(value, Decimal("-50"))
+
+    def test_inbox_lists_unread_alerts_and_marks_them_read(self):
+        evaluate_rules()
+        user = get_user_model().objects.create_user(username="inbox", password="pw")
+        self.client.force_login(user)
+        response = self.client.get(reverse("alerts"))
+        rows = response.context["alert_rows"]
+        self.assertEqual(len(rows), 4)
+        self.assertEqual({row["borrower_id"] for row in rows}, {self.troubled.pk})
+        self.assertContains(self.client.get(reverse("borrower_portfolio")), "Alerts (4)")
+
+        self.client.post(reverse("alerts"), {"alert": [rows[0]["id"]]})
+        self.assertEqual(len(self.client.get(reverse("alerts")).context["alert_rows"]), 3)
+        self.client.post(reverse("alerts"), {"mark": "all"})
+        self.assertEqual(self.client.get(reverse("alerts")).context["alert_rows"], [])
+        self.assertEqual(Alert.objects.filter(read_at__isnull=False, is_read=True).count(), 4)
+
+
+@job_handler("test_flaky")
+def _flaky_job(job):
+    if job.attempts < job.params.get("succeed_on", 1):
+        raise RuntimeError(f"attempt {job.attempts} failed")
+    job.set_progress(50, "Halfway")
+    return {"attempts": job.attempts}
+
+
+class JobQueueTests(TestCase):
+    def setUp(self):
+        self.company = Company.objects.create(company="Job Co")
+        self.borrower = Borrower.objects.create(company=self.company, primary_contact="Jobs")
+        report = BorrowerReport.objects.create(borrower=self.borrower, report_date=datetime.date(2025, 4, 30))
+        CollateralOverviewRow.objects.create(
+            borrower=self.borrower,
+            report=report,
+            main_type="Accounts Receivable",
+            eligible_collateral=Decimal("100"),
+        )
+        self.user = get_user_model().objects.create_user(username="jobs", password="pw")
+        self.client.force_login(self.user)
+        session = self.client.session
+        session["selected_borrower_id"] = self.borrower.pk
+        session.save()
+
+    @override_settings(JOB_RETRY_BACKOFF_SECONDS=30)
+    def test_failed_attempts_retry_with_backoff_then_fail(self):
+        job = enqueue("test_flaky", {"succeed_on": 3}, max_attempts=3)
+        self.assertEqual(work("test", burst=True), 1)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (Job.QUEUED, 1))
+        self.assertIn("attempt 1 failed", job.error)
+        self.assertAlmostEqual((job.run_after - job.updated_at).total_seconds(), 30, delta=1)
+        # Not due yet: the burst worker finds nothing to do.
+        self.assertEqual(work("test", burst=True), 0)
+
+        Job.objects.filter(pk=job.pk).update(run_after=job.created_at)
+        work("test", burst=True)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (Job.QUEUED, 2))
+        self.assertAlmostEqual((job.run_after - job.updated_at).total_seconds(), 60, delta=1)
+
+        Job.objects.filter(pk=job.pk).update(run_after=job.created_at)
+        work("test", burst=True)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.progress, job.result), (Job.SUCCEEDED, 100, {"attempts": 3}))
+
+        doomed = enqueue("test_flaky", {"succeed_on": 5}, max_attempts=1)
+        with self.assertLogs("management.jobs", "ERROR"):
+            work("test", burst=True)
+        doomed.refresh_from_db()
+        self.assertEqual(doomed.status, Job.FAILED)
+        self.assertIsNotNone(doomed.finished_at)
+
+    def test_export_job_runs_in_the_background_and_downloads(self):
+        with tempfile.TemporaryDirectory() as export_root, override_settings(JOB_EXPORT_ROOT=export_root):
+            response = self.client.post(reverse("job_submit"), {"kind": "export_report", "report_type": "borrowing_base"})
+            self.assertEqual(response.status_code, 202)
+            status_url = reverse("job_status", args=[response.json()["id"]])
+            self.assertEqual(self.client.get(status_url).json()["status"], Job.QUEUED)
+
+            work("test", burst=True)
+            payload = self.client.get(status_url).json()
+            self.assertEqual((payload["status"], payload["progress"]), (Job.SUCCEEDED, 100))
+            self.assertEqual(payload["result"]["filename"], "Job Co - BBC 2025-04-30.xlsx")
+            download = self.client.get(reverse("job_download", args=[payload["id"]]))
+            self.assertEqual(download.status_code, 200)
+            frames = pd.read_excel(BytesIO(b"".join(download.streaming_content)), sheet_name=None)
+            self.assertIn("Borrowing Base", frames)
+
+    def test_status_is_private_and_maintenance_jobs_are_staff_only(self):
+        response = self.client.post(reverse("job_submit"), {"kind": "archive_reports"})
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(self.client.post(reverse("job_submit"), {"kind": "bogus"}).status_code, 400)
+
+        job = enqueue("test_flaky")
+        self.assertEqual(self.client.get(reverse("job_status", args=[job.pk])).status_code, 404)
+        staff = get_user_model().objects.create_user(username="ops", password="pw", is_staff=True)
+        self.client.force_login(staff)
+        self.assertEqual(self.client.get(reverse("job_status", args=[job.pk])).json()["kind"], "test_flaky")
+        response = self.client.post(reverse("job_submit"), {"kind": "warm_cache"})
+        self.assertEqual(response.status_code, 202)
+
+
+@override_settings(DATABASE_REPLICAS=["replica"])
+class ReplicaRoutingTests(TestCase):
+    databases = {"default", "replica"}
+
+    def setUp(self):
+        # The same borrower on both databases, named after where it lives.
+        for alias, name in (("default", "Primary Co"), ("replica", "Replica Co")):
+            company = Company.objects.using(alias).create(pk=1, company=name, company_id=1)
+            Borrower.objects.using(alias).create(pk=1, company=company, primary_contact=name)
+        self.user = get_user_model().objects.create_user(username="reader", password="pw", is_staff=True)
+        self.client.force_login(self.user)
+
+    def test_dashboards_read_from_the_replica_and_transactions_from_the_primary(self):
+        response = self.client.get(reverse("borrower_portfolio"))
+        self.assertContains(response, "Replica Co")
+        self.assertNotContains(response, "Primary Co")
+
+        router = PrimaryReplicaRouter()
+        with replica_reads():
+            self.assertEqual(router.db_for_read(Borrower), "replica")
+            self.assertIsNone(router.db_for_read(get_user_model()))
+            self.assertEqual(Borrower.objects.get(pk=1).primary_contact, "Replica Co")
+            with transaction.atomic():
+                self.assertIsNone(router.db_for_read(Borrower))
+                self.assertEqual(Borrower.objects.get(pk=1).primary_contact, "Primary Co")
+        self.assertIsNone(router.db_for_read(Borrower))
+        self.assertEqual(router.db_for_write(Borrower), "default")
+
+    @override_settings(READ_YOUR_WRITES_SECONDS=30)
+    def test_users_read_their_own_writes_from_the_primary(self):
+        self.client.post(reverse("alerts"), {"mark": "all"})
+        self.assertGreater(self.client.session[SESSION_KEY], 0)
+        self.assertContains(self.client.get(reverse("borrower_portfolio")), "Primary Co")
+
+        session = self.client.session
+        session[SESSION_KEY] = 0
+        session.save()
+        self.assertContains(self.client.get(reverse("borrower_portfolio")), "Replica Co")
+
+
+@override_settings(DASHBOARD_LOAD_WORKERS=4)
+class ConcurrentLoadTests(TransactionTestCase):
+    def setUp(self):
+        company = Company.objects.create(company="Gather Co")
+        self.borrower = Borrower.objects.create(company=company, primary_contact="Gatherer")
+
+    def test_gather_runs_loads_on_the_pool_in_the_callers_context(self):
+        def load(value):
+            return value, threading.current_thread().name, active_report(), Borrower.objects.count()
+
+        with track_request() as timings, report_scope("scoped"), span("outer"):
+            results = gather(*(partial(load, value) for value in range(3)))
+        self.assertEqual([result[0] for result in results], [0, 1, 2])
+        self.assertTrue(all(result[1].startswith("dashboard-load") for result in results))
+        self.assertEqual({result[2] for result in results}, {"scoped"})
+        self.assertEqual({result[3] for result in results}, {1})
+        self.assertEqual(timings.sql_count, 3)
+        self.assertEqual(timings.spans["outer"]["sql_count"], 3)
+
+    def test_gather_runs_inline_inside_a_transaction_and_reraises(self):
+        with transaction.atomic():
+            Borrower.objects.create(company=self.borrower.company, primary_contact="Uncommitted")
+            names = gather(lambda: threading.current_thread().name, lambda: Borrower.objects.count())
+        self.assertEqual(names, [threading.current_thread().name, 2])
+
+        def fail():
+            raise ValueError("load failed")
+
+        with self.assertRaisesMessage(ValueError, "load failed"):
+            gather(lambda: 1, fail)
+
+    def test_concurrency_benchmark_reports_percentiles_through_asgi(self):
+        self.assertEqual(percentile([5, 1, 4, 2, 3], 50), 3)
+        self.assertEqual(percentile(list(range(1, 21)), 95), 19)
+        seed(borrowers=1, reports=1, rows_per_sheet=2, seed_value=7)
+        results = run_concurrency_benchmark(views=["summary"], requests=2, concurrency=2, workers=2)
+        self.assertEqual(set(results["results"]), {"summary"})
+        for mode in ("sync", "gathered"):
+            self.assertLessEqual(
+                results["results"]["summary"][mode]["p50_ms"],
+                results["results"]["summary"][mode]["p95_ms"],
+            )
+
+
+class DataAPITests(TestCase):
+    def setUp(self):
+        company = Company.objects.create(company="API Co")
+        self.borrower = Borrower.objects.create(company=company, primary_contact="Reader")
+        self.reports = [
+            BorrowerReport.objects.create(borrower=self.borrower, report_date=datetime.date(2025, month, 28))
+            for month in (1, 2)
+        ]
+        for report in self.reports:
+            for day in (report.report_date, None, report.report_date - datetime.timedelta(days=30)):
+                ARMetricsRow.objects.create(borrower=self.borrower, report=report, as_of_date=day, balance=Decimal("10"))
+        self.user = get_user_model().objects.create_user(username="api", password="pw", is_staff=True)
+        self.client.force_login(self.user)
+        self.url = reverse("api_sheet_rows", args=["v1", self.borrower.pk, "ar_metrics"])
+
+    def test_cursor_pages_cover_every_row_once_in_date_order(self):
+        seen = []
+        url, params = self.url, {"page_size": 4, "fields": "id,as_of_date"}
+        while url:
+            with CaptureQueriesContext(connection) as queries:
+                payload = self.client.get(url, params).json()
+            row_queries = [query["sql"] for query in queries.captured_queries if 'FROM "ar_metrics"' in query["sql"]]
+            # Dated and undated rows are separate range scans, never one OR'd scan.
+            self.assertFalse(any("IS NULL" in sql and " OR " in sql for sql in row_queries))
+            self.assertTrue(all(set(row) == {"id", "as_of_date"} for row in payload["results"]))
+            seen.extend(payload["results"])
+            url, params = payload["next"], None
+        expected = sorted(
+            ARMetricsRow.objects.filter(borrower=self.borrower).values("id", "as_of_date"),
+            key=lambda row: (row["as_of_date"] is None, row["as_of_date"] or datetime.date.min, row["id"]),
+        )
+        self.assertEqual([row["id"] for row in seen], [row["id"] for row in expected])
+
+        response = self.client.get(self.url, {"fields": "id,missing"})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.client.get(self.url, {"cursor": "garbage"}).status_code, 404)
+
+    def test_report_and_as_of_filters(self):
+        first, second = self.reports
+        rows = self.client.get(self.url, {"report": first.pk}).json()["results"]
+        self.assertEqual({row["report"] for row in rows}, {first.pk})
+        rows = self.client.get(self.url, {"as_of": "2025-02-10"}).json()["results"]
+        self.assertEqual({row["report"] for row in rows}, {first.pk})
+        self.assertEqual(self.client.get(self.url, {"as_of": "2024-12-31"}).json()["results"], [])
+        self.assertEqual(self.client.get(self.url, {"as_of": "yesterday"}).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {"report": first.pk, "as_of": "2025-02-10"}).status_code, 400)
+        reports = self.client.get(reverse("api_reports", args=["v1", self.borrower.pk]), {"as_of": "2025-02-10"})
+        self.assertEqual([report["id"] for report in reports.json()["results"]], [first.pk])
+
+    def test_etag_answers_304_until_the_data_changes(self):
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING="gzip")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        etag = response["ETag"]
+        with CaptureQueriesContext(connection) as queries:
+            cached = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(cached.status_code, 304)
+        self.assertFalse(any("ar_metrics" in query["sql"] for query in queries.captured_queries))
+
+        row = ARMetricsRow.objects.filter(borrower=self.borrower).first()
+        row.balance = Decimal("11")
+        row.save()
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_access_is_limited_to_signed_in_staff(self):
+        self.assertEqual(self.client.get(reverse("api_borrower", args=["v1", self.borrower.pk])).status_code, 200)
+        self.assertEqual(self.client.get(reverse("api_sheet_rows", args=["v1", self.borrower.pk, "nope"])).status_code, 404)
+        self.assertEqual(self.client.get(reverse("api_borrowers", args=["v2"])).status_code, 404)
+
+        viewer = get_user_model().objects.create_user(username="viewer", password="pw")
+        self.client.force_login(viewer)
+        self.assertEqual(self.client.get(reverse("api_borrowers", args=["v1"])).json()["results"], [])
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+        self.client.logout()
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+
+class RowExportTests(TestCase):
+    def setUp(self):
+        company = Company.objects.create(company="Export Co")
+        self.borrower = Borrower.objects.create(company=company, primary_contact="Exporter")
+        self.reports = [
+            BorrowerReport.objects.create(borrower=self.borrower, report_date=datetime.date(2025, month, 28))
+            for month in (1, 2)
+        ]
+        for report in self.reports:
+            for day in (report.report_date, None):
+                ARMetricsRow.objects.create(borrower=self.borrower, report=report, as_of_date=day, balance=Decimal("10"))
+        self.client.force_login(get_user_model().objects.create_user(username="exporter", password="pw", is_staff=True))
+        self.url = reverse("export_rows", args=["ar_metrics"])
+
+    def test_streams_csv_and_ndjson_in_small_chunks(self):
+        with override_settings(EXPORT_CHUNK_SIZE=1):
+            response = self.client.get(self.url, {"borrower": self.borrower.pk})
+            chunks = list(response.streaming_content)
+        self.assertEqual(response["Content-Type"], "text/csv; charset=utf-8")
+        self.assertIn(f'filename="ar_metrics_borrower_{self.borrower.pk}.csv"', response["Content-Disposition"])
+        self.assertEqual(len(chunks), 5)
+        lines = b"".join(chunks).decode().splitlines()
+        self.assertTrue({"id", "borrower", "report", "as_of_date", "balance"} <= set(lines[0].split(",")))
+        self.assertEqual(len(lines), 5)
+
+        response = self.client.get(self.url, {"report": self.reports[1].pk, "format": "ndjson"})
+        rows = [json.loads(line) for line in b"".join(response.streaming_content).decode().splitlines()]
+        self.assertEqual(response["Content-Type"], "application/x-ndjson; charset=utf-8")
+        self.assertEqual([row["as_of_date"] for row in rows], ["2025-02-28", None])
+        self.assertEqual({row["report"] for row in rows}, {self.reports[1].pk})
+
+    def test_date_range_and_bad_requests(self):
+        response = self.client.get(
+            self.url, {"borrower": self.borrower.pk, "start": "2025-02-01", "end": "2025-02-28", "format": "ndjson"}
+        )
+        rows = [json.loads(line) for line in b"".join(response.streaming_content).decode().splitlines()]
+        self.assertEqual([row["as_of_date"] for row in rows], ["2025-02-28"])
+
+        self.assertEqual(self.client.get(self.url).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {"borrower": self.borrower.pk, "format": "xml"}).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {"borrower": self.borrower.pk, "start": "soon"}).status_code, 400)
+        bad_sheet = reverse("export_rows", args=["nope"])
+        self.assertEqual(self.client.get(bad_sheet, {"borrower": self.borrower.pk}).status_code, 400)
+
+        other = Borrower.objects.create(company=self.borrower.company, primary_contact="Other")
+        response = self.client.get(self.url, {"borrower": other.pk, "report": self.reports[0].pk})
+        self.assertEqual(response.status_code, 400)
+        self.client.force_login(get_user_model().objects.create_user(username="viewer", password="pw"))
+        self.assertEqual(self.client.get(self.url, {"borrower": self.borrower.pk}).status_code, 404)
+
+    def test_command_writes_the_export_to_a_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "rows.csv"
+            out = StringIO()
+            call_command(
+                "export_rows", "ar_metrics", borrower=self.borrower.pk, end="2025-01-31", output=str(path), stdout=out
+            )
+            lines = path.read_text().splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertIn("2025-01-28", lines[1])
+        self.assertIn("Done: 1 rows", out.getvalue())
+        with self.assertRaises(CommandError):
+            call_command("export_rows", "ar_metrics", stdout=StringIO())
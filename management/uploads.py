@@ -0,0 +1,154 @@
+"""
+Resumable, chunked workbook uploads.
+
+A client declares the file (name, size, SHA-256) and gets an Upload back,
+then sends the bytes in order, each chunk tagged with the offset it starts
+at. Chunks are streamed to a file under UPLOAD_ROOT a block at a time, so a
+request never holds more than BLOCK_SIZE of the workbook in memory. The
+upload's `received` offset only moves forward through a conditional update,
+so a retried or duplicated chunk is either rewritten in place or refused
+with the offset to resume from. When the last byte is in, the file is
+hashed and, if it matches, queued for import as an import_workbook job.
+"""
+import hashlib
+import re
+from pathlib import Path
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.dateparse import parse_date
+
+from management.jobs import enqueue, job_payload
+from management.models import Upload
+
+BLOCK_SIZE = 64 * 1024
+UPLOAD_EXTENSIONS = (".xlsx", ".xlsm")
+SHA256_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+
+
+class UploadError(ValueError):
+    """An upload request that cannot be accepted."""
+
+
+class OffsetMismatch(UploadError):
+    """A chunk that does not start where the upload stands; resume from `offset`."""
+
+    def __init__(self, offset):
+        super().__init__(f"Chunk must start at offset {offset}.")
+        self.offset = offset
+
+
+def upload_path(upload):
+    return Path(settings.UPLOAD_ROOT) / f"upload_{upload.pk}{Path(upload.filename).suffix.lower()}"
+
+
+def start_upload(filename, size, sha256, user=None, report_date=None):
+    """Register an upload and create its empty file; chunks follow through write_chunk."""
+    filename = Path(str(filename or "")).name
+    if not filename.lower().endswith(UPLOAD_EXTENSIONS):
+        raise UploadError("Only .xlsx workbooks can be imported.")
+    try:
+        size = int(size)
+    except (TypeError, ValueError):
+        raise UploadError("Size must be a number of bytes.")
+    if not 0 < size <= settings.UPLOAD_MAX_BYTES:
+        raise UploadError(f"Size must be between 1 and {settings.UPLOAD_MAX_BYTES} bytes.")
+    sha256 = str(sha256 or "").lower()
+    if not SHA256_PATTERN.match(sha256):
+        raise UploadError("sha256 must be the file's hex digest.")
+    if report_date:
+        try:
+            report_date = parse_date(str(report_date))
+        except ValueError:
+            report_date = None
+        if report_date is None:
+            raise UploadError("Report date must be YYYY-MM-DD.")
+    upload = Upload.objects.create(
+        filename=filename[:255],
+        size=size,
+        sha256=sha256,
+        report_date=report_date or None,
+        created_by=user if getattr(user, "is_authenticated", False) else None,
+    )
+    path = upload_path(upload)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.touch()
+    return upload
+
+
+def write_chunk(upload, offset, stream, length):
+    """
+    Write `length` bytes read from `stream` at `offset`, which must be where
+    the upload stands. Returns the upload, finished and queued for import
+    once the last byte is in.
+    """
+    if upload.status != Upload.RECEIVING:
+        raise UploadError(f"Upload is {upload.get_status_display().lower()}.")
+    if offset != upload.received:
+        raise OffsetMismatch(upload.received)
+    if not 0 < length <= settings.UPLOAD_CHUNK_BYTES:
+        raise UploadError(f"Chunks must be between 1 and {settings.UPLOAD_CHUNK_BYTES} bytes.")
+    if offset + length > upload.size:
+        raise UploadError("Chunk runs past the declared size.")
+
+    written = 0
+    with upload_path(upload).open("r+b") as handle:
+        handle.seek(offset)
+        while written < length:
+            block = stream.read(min(BLOCK_SIZE, length - written))
+            if not block:
+                break
+            handle.write(block)
+            written += len(block)
+    # Keep what arrived even if the connection dropped mid-chunk; the client
+    # resumes from the new offset.
+    moved = Upload.objects.filter(pk=upload.pk, status=Upload.RECEIVING, received=offset).update(
+        received=offset + written
+    )
+    upload.refresh_from_db()
+    if not moved:
+        raise OffsetMismatch(upload.received)
+    if upload.received == upload.size:
+        finish_upload(upload)
+    return upload
+
+
+def _file_sha256(path):
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for block in iter(lambda: handle.read(BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def finish_upload(upload):
+    """Verify the complete file and queue its import; a bad checksum fails the upload."""
+    path = upload_path(upload)
+    if _file_sha256(path) != upload.sha256:
+        path.unlink(missing_ok=True)
+        upload.status = Upload.FAILED
+        upload.error = "Checksum mismatch; upload the file again."
+        upload.save(update_fields=["status", "error", "updated_at"])
+        raise UploadError(upload.error)
+    with transaction.atomic():
+        params = {"path": str(path), "source_file": upload.filename}
+        if upload.report_date:
+            params["report_date"] = upload.report_date.isoformat()
+        upload.job = enqueue("import_workbook", params, user=upload.created_by)
+        upload.status = Upload.COMPLETE
+        upload.save(update_fields=["job", "status", "updated_at"])
+    return upload
+
+
+def upload_payload(upload):
+    """What the upload endpoints return for `upload`."""
+    return {
+        "id": upload.pk,
+        "filename": upload.filename,
+        "size": upload.size,
+        "offset": upload.received,
+        "status": upload.status,
+        "error": upload.error,
+        "chunk_size": settings.UPLOAD_CHUNK_BYTES,
+        "job": job_payload(upload.job) if upload.job_id else None,
+    }
@@ -5,6 +5,15 @@ from .forecast import forecast_view
 from .risk import risk_view
 from .reports import reports_view, reports_download, reports_generate_bbc
 from .limits import limits_view
+from .watchlist import watchlist_view
+from .scenarios import scenarios_view
+from .alerts import alerts_view
+from .jobs import job_submit, job_status, job_download
+from .uploads import upload_create, upload_detail
+from .api import api_borrowers, api_borrower, api_reports, api_sheets, api_sheet_rows
+from .exports import export_rows_view
+from .metrics import metrics_view
+from .slow_queries import slow_queries_view
 from .admin_portal import admin_component_view, admin_dashboard_view, admin_company_view
 from .admin_borrower import admin_borrower_view
 
@@ -21,6 +30,22 @@ __all__ = [
     "reports_download",
     "reports_generate_bbc",
     "limits_view",
+    "watchlist_view",
+    "scenarios_view",
+    "alerts_view",
+    "job_submit",
+    "job_status",
+    "job_download",
+    "upload_create",
+    "upload_detail",
+    "api_borrowers",
+    "api_borrower",
+    "api_reports",
+    "api_sheets",
+    "api_sheet_rows",
+    "export_rows_view",
+    "metrics_view",
+    "slow_queries_view",
     "admin_dashboard_view",
     "admin_company_view",
     "admin_component_view",
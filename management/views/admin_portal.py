@@ -74,6 +74,7 @@ from management.models import (
     SalesGMTrendRow,
     SpecificIndividual,
 )
+from management.risk_scorecard import refresh_scorecard_for_row
 
 
 COMPONENT_REGISTRY = {
@@ -247,13 +248,21 @@ COMPONENT_REGISTRY = {
     },
 }
 class ModelComponentHandler:
-    def __init__(self, *, slug, model, form_class, ordering=None, select_related=None, filters=None):
+    def __init__(self, *, slug, model, form_class, ordering=None, select_related=None, filters=None, on_change=None):
         self.slug = slug
         self.model = model
         self.form_class = form_class
         self.ordering = ordering or ["-created_at"]
         self.select_related = select_related or []
         self.filters = filters or []
+        self.on_change = on_change
+
+    def notify_change(self, *instances):
+        if not self.on_change:
+            return
+        for instance in instances:
+            if instance is not None:
+                self.on_change(instance)
 
     def build_filters(self, request, queryset):
         filter_defs = []
@@ -332,16 +341,23 @@ class ModelComponentHandler:
             if action == "delete":
                 obj_id = request.POST.get("object_id")
                 if obj_id:
+                    removed = self.model.objects.filter(pk=obj_id).first()
                     self.model.objects.filter(pk=obj_id).delete()
+                    self.notify_change(removed)
                 return self.redirect()
 
             instance = None
+            previous = None
             if action == "update":
                 obj_id = request.POST.get("object_id")
                 instance = get_object_or_404(self.model, pk=obj_id)
+                previous = self.model.objects.filter(pk=obj_id).first()
             form = self.form_class(request.POST, instance=instance)
             if form.is_valid():
-                form.save()
+                saved = form.save()
+                self.notify_change(saved)
+                if previous is not None and getattr(previous, "borrower_id", None) != getattr(saved, "borrower_id", None):
+                    self.notify_change(previous)
                 return self.redirect()
             if action == "update":
                 edit_form = form
@@ -408,6 +424,7 @@ HANDLERS = {
         form_class=ARMetricsForm,
         ordering=["-as_of_date", "division"],
         select_related=["borrower", "borrower__company"],
+        on_change=refresh_scorecard_for_row,
         filters=[
             {
                 "param": "borrower",
@@ -707,6 +724,7 @@ HANDLERS = {
         form_class=RiskSubfactorsForm,
         ordering=["-date", "main_category", "sub_risk"],
         select_related=["borrower", "borrower__company"],
+        on_change=refresh_scorecard_for_row,
         filters=[
             {
                 "param": "borrower",
@@ -723,6 +741,7 @@ HANDLERS = {
         form_class=CompositeIndexForm,
         ordering=["-date"],
         select_related=["borrower", "borrower__company"],
+        on_change=refresh_scorecard_for_row,
     ),
     "forecast": ModelComponentHandler(
         slug="forecast",
@@ -0,0 +1,54 @@
+from django.contrib.auth.decorators import login_required
+from django.shortcuts import redirect, render
+from django.utils import timezone
+
+from management.models import Alert
+from management.views.summary import _safe_str, get_accessible_borrowers, get_active_company
+
+ALERT_INBOX_LIMIT = 100
+
+
+@login_required(login_url="login")
+def alerts_view(request):
+    """
+    Unread alerts for the borrowers the user can see, newest first (served
+    by the partial alert_unread_idx). POST marks the listed ids, or
+    everything with mark=all, as read.
+    """
+    company = get_active_company(request)
+    unread = Alert.objects.filter(
+        is_read=False,
+        borrower__in=get_accessible_borrowers(request, company),
+    )
+    if request.method == "POST":
+        if request.POST.get("mark") != "all":
+            unread = unread.filter(pk__in=[pk for pk in request.POST.getlist("alert") if pk.isdigit()])
+        unread.update(is_read=True, read_at=timezone.now())
+        return redirect("alerts")
+
+    alerts = list(
+        unread.select_related("rule", "borrower__company", "report").order_by("-created_at", "-id")[
+            : ALERT_INBOX_LIMIT + 1
+        ]
+    )
+    rows = [
+        {
+            "id": alert.pk,
+            "severity": alert.severity,
+            "severity_label": alert.get_severity_display(),
+            "rule": alert.rule.name,
+            "borrower_id": alert.borrower_id,
+            "borrower_label": _safe_str(alert.borrower.primary_contact),
+            "company_name": _safe_str(alert.borrower.company.company if alert.borrower.company else None),
+            "report_date": alert.report.report_date.strftime("%m/%d/%Y") if alert.report.report_date else "—",
+            "message": alert.message,
+            "raised": timezone.localtime(alert.created_at).strftime("%m/%d/%Y %H:%M"),
+        }
+        for alert in alerts[:ALERT_INBOX_LIMIT]
+    ]
+    context = {
+        "active_tab": "alerts",
+        "alert_rows": rows,
+        "has_more": len(alerts) > ALERT_INBOX_LIMIT,
+    }
+    return render(request, "dashboard/alerts.html", context)
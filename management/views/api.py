@@ -0,0 +1,207 @@
+"""
+Read-only data API, version 1: borrowers, their reports and every imported
+sheet (the *Row models, named by table) as JSON.
+
+Listings are cursor-paginated on (date, id) within a borrower; follow
+`next` until it is null. ?fields=a,b trims each object to those fields.
+Sheet rows take ?report=<id> for one report's rows, or ?as_of=YYYY-MM-DD
+for the rows of the borrower's latest report dated on or before that day.
+
+Responses are gzipped and carry an ETag derived from the borrower's data
+version (the borrower, its report count and the latest report change,
+which hand edits of rows bump), so a client polling with If-None-Match
+gets a 304 without the rows being read again.
+"""
+import hashlib
+
+from django.db.models import Count, Max
+from django.shortcuts import get_object_or_404
+from django.utils.cache import patch_cache_control
+from django.utils.dateparse import parse_date
+from django.utils.decorators import method_decorator
+from django.utils.http import parse_etags, quote_etag
+from django.views.decorators.gzip import gzip_page
+from rest_framework import generics
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from management.db_router import read_replica
+from management.exports import sheet_date_field, sheet_models
+from management.models import Borrower, BorrowerReport
+from management.pagination import KeysetPagination
+from management.serializers import BorrowerReportSerializer, BorrowerSerializer, row_serializer
+
+
+def borrowers_for(user):
+    """Borrowers `user` may read: their own with a borrower profile, else all of them for staff."""
+    borrower_profile = getattr(user, "borrower_profile", None)
+    if borrower_profile and borrower_profile.borrower_id:
+        return Borrower.objects.filter(pk=borrower_profile.borrower_id)
+    if user.is_staff or user.is_superuser:
+        return Borrower.objects.all()
+    return Borrower.objects.none()
+
+
+def data_version(borrower):
+    """Changes whenever the borrower, or any of its reports or rows, changes."""
+    reports = BorrowerReport.objects.filter(borrower=borrower).aggregate(
+        count=Count("id"), updated=Max("updated_at")
+    )
+    latest = reports["updated"].timestamp() if reports["updated"] else 0
+    return f"{borrower.pk}:{borrower.updated_at.timestamp()}:{reports['count']}:{latest}"
+
+
+def _etag_matches(request, etag):
+    # GZip weakens the ETag on the way out, so compare weakly.
+    tags = parse_etags(request.META.get("HTTP_IF_NONE_MATCH", ""))
+    return "*" in tags or etag in (tag.removeprefix("W/") for tag in tags)
+
+
+def _parse_fields(request, serializer_class):
+    raw = request.query_params.get("fields", "")
+    requested = [name.strip() for name in raw.split(",") if name.strip()]
+    unknown = set(requested) - set(serializer_class().fields)
+    if unknown:
+        raise ValidationError({"fields": f"Unknown fields: {', '.join(sorted(unknown))}."})
+    return requested
+
+
+def _parse_as_of(request):
+    raw = request.query_params.get("as_of")
+    if not raw:
+        return None
+    try:
+        day = parse_date(raw)
+    except ValueError:
+        day = None
+    if day is None:
+        raise ValidationError({"as_of": "Use YYYY-MM-DD."})
+    return day
+
+
+@method_decorator([gzip_page, read_replica], name="dispatch")
+class DataAPIView(generics.GenericAPIView):
+    pagination_class = KeysetPagination
+    cursor_date_field = None
+
+    def data_version(self):
+        raise NotImplementedError
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context["fields"] = _parse_fields(self.request, self.get_serializer_class())
+        return context
+
+    def get(self, request, *args, **kwargs):
+        digest = hashlib.md5(f"{self.data_version()}|{request.get_full_path()}".encode()).hexdigest()
+        etag = quote_etag(digest)
+        response = Response(status=304) if _etag_matches(request, etag) else self.get_data()
+        response["ETag"] = etag
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    def get_data(self):
+        page = self.paginate_queryset(self.filter_queryset(self.get_queryset()))
+        return self.get_paginated_response(self.get_serializer(page, many=True).data)
+
+
+class BorrowerScopedAPIView(DataAPIView):
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self.borrower = get_object_or_404(
+            borrowers_for(request.user).select_related("company"), pk=kwargs["borrower_id"]
+        )
+
+    def data_version(self):
+        return data_version(self.borrower)
+
+
+class BorrowerListView(DataAPIView):
+    serializer_class = BorrowerSerializer
+
+    def get_queryset(self):
+        return borrowers_for(self.request.user).select_related("company")
+
+    def data_version(self):
+        borrowers = borrowers_for(self.request.user)
+        latest = borrowers.aggregate(count=Count("id"), updated=Max("updated_at"))
+        return f"{latest['count']}:{latest['updated'].timestamp() if latest['updated'] else 0}"
+
+
+class BorrowerDetailView(BorrowerScopedAPIView):
+    serializer_class = BorrowerSerializer
+
+    def get_data(self):
+        return Response(self.get_serializer(self.borrower).data)
+
+
+class BorrowerReportListView(BorrowerScopedAPIView):
+    serializer_class = BorrowerReportSerializer
+    cursor_date_field = "report_date"
+
+    def get_queryset(self):
+        reports = BorrowerReport.objects.filter(borrower=self.borrower)
+        as_of = _parse_as_of(self.request)
+        if as_of:
+            reports = reports.filter(report_date__lte=as_of)
+        return reports
+
+
+class SheetListView(APIView):
+    def get(self, request, *args, **kwargs):
+        return Response(
+            [
+                {
+                    "name": name,
+                    "date_field": sheet_date_field(model_cls),
+                    "fields": list(row_serializer(model_cls)().fields),
+                }
+                for name, model_cls in sorted(sheet_models().items())
+            ]
+        )
+
+
+class SheetRowListView(BorrowerScopedAPIView):
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self.model = sheet_models().get(kwargs["sheet"])
+        if self.model is None:
+            raise NotFound("Unknown sheet.")
+        self.cursor_date_field = sheet_date_field(self.model)
+
+    def get_serializer_class(self):
+        return row_serializer(self.model)
+
+    def get_queryset(self):
+        names = {field.name for field in self.model._meta.fields}
+        if "borrower" in names:
+            rows = self.model.objects.filter(borrower=self.borrower)
+        else:
+            rows = self.model.objects.filter(report__borrower=self.borrower)
+        report_id = self.request.query_params.get("report")
+        as_of = _parse_as_of(self.request)
+        if report_id and as_of:
+            raise ValidationError({"report": "Use either report or as_of."})
+        if report_id:
+            report = None
+            if report_id.isdigit():
+                report = BorrowerReport.objects.filter(borrower=self.borrower, pk=report_id).first()
+            if report is None:
+                raise ValidationError({"report": "No such report for this borrower."})
+            rows = rows.filter(report=report)
+        elif as_of:
+            report = (
+                BorrowerReport.objects.filter(borrower=self.borrower, report_date__lte=as_of)
+                .order_by("-report_date", "-created_at", "-id")
+                .first()
+            )
+            rows = rows.filter(report=report) if report else rows.none()
+        return rows
+
+
+api_borrowers = BorrowerListView.as_view()
+api_borrower = BorrowerDetailView.as_view()
+api_reports = BorrowerReportListView.as_view()
+api_sheets = SheetListView.as_view()
+api_sheet_rows = SheetRowListView.as_view()
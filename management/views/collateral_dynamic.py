@@ -2,19 +2,21 @@ import json
 import math
 from collections import OrderedDict
 from datetime import date, timedelta
+from functools import partial
 
 from decimal import Decimal
 
 from django.contrib.auth.decorators import login_required
 from django.shortcuts import redirect, render
 
+from management.instrumentation import timed
 from management.models import (
     ARMetricsRow,
     AgingCompositionRow,
     AvailabilityForecastRow,
-    BorrowerReport,
     CashFlowForecastRow,
     CashForecastRow,
+    CollateralLimitsRow,
     CollateralOverviewRow,
     ConcentrationADODSORow,
     CurrentWeekVarianceRow,
@@ -33,6 +35,12 @@ from management.models import (
     RiskSubfactorsRow,
     SalesGMTrendRow,
 )
+from management.borrowing_base import BorrowingBase
+from management.concurrency import gather
+from management.db_router import read_replica
+from management.report_cache import report_cached
+from management.report_scope import active_report, latest_report, reference_date, report_scoped
+from management.snapshots import dated_rows, latest_date_top_rows, load_latest_snapshot
 from management.views.summary import (
     _build_borrower_summary,
     _format_currency,
@@ -46,6 +54,8 @@ from management.views.summary import (
 
 
 @login_required(login_url="login")
+@read_replica
+@report_scoped
 def collateral_dynamic_view(request):
     borrower = get_preferred_borrower(request)
 
@@ -78,24 +88,30 @@ def collateral_dynamic_view(request):
     work_in_progress_range = request.GET.get("work_in_progress_range", "last_12_months")
     work_in_progress_division = request.GET.get("work_in_progress_division", "all")
 
+    borrower_summary, *sections = gather(
+        partial(_build_borrower_summary, borrower),
+        partial(_inventory_context, borrower),
+        partial(_accounts_receivable_context, borrower, ar_range, ar_division),
+        partial(_finished_goals_context, borrower, finished_goals_range, finished_goals_division),
+        partial(_raw_materials_context, borrower, raw_materials_range, raw_materials_division),
+        partial(_work_in_progress_context, borrower, work_in_progress_range, work_in_progress_division),
+        partial(_other_collateral_context, borrower),
+        partial(_liquidation_model_context, borrower),
+    )
     context = {
-        "borrower_summary": _build_borrower_summary(borrower),
+        "borrower_summary": borrower_summary,
         "active_section": section,
         "inventory_tab": inventory_tab,
         "active_tab": "collateral_dynamic",
         **get_borrower_status_context(request),
-        **_inventory_context(borrower),
-        **_accounts_receivable_context(borrower, ar_range, ar_division),
-        **_finished_goals_context(borrower, finished_goals_range, finished_goals_division),
-        **_raw_materials_context(borrower, raw_materials_range, raw_materials_division),
-        **_work_in_progress_context(borrower, work_in_progress_range, work_in_progress_division),
-        **_other_collateral_context(borrower),
-        **_liquidation_model_context(borrower),
     }
+    for section_context in sections:
+        context.update(section_context)
     return render(request, "collateral_dynamic/accounts_receivable.html", context)
 
 
 @login_required(login_url="login")
+@report_scoped
 def collateral_static_view(request):
     borrower = get_preferred_borrower(request)
     context = {
@@ -106,6 +122,8 @@ def collateral_static_view(request):
     return render(request, "week_summary.html", context)
 
 
+@timed()
+@report_cached()
 def _week_summary_context(borrower):
     placeholder_stats = [
         {"label": "Beginning Cash", "value": "$—"},
@@ -557,85 +575,78 @@ def _week_summary_context(borrower):
         context["cashflow_cash_colspan"] = 15
         return context
 
-    forecast_qs = ForecastRow.objects.filter(borrower=borrower)
-    latest_forecast = (
-        forecast_qs.exclude(as_of_date__isnull=True)
-        .order_by("-as_of_date", "-created_at", "-id")
-        .first()
-    )
-    if latest_forecast and latest_forecast.as_of_date:
-        forecast_rows = list(forecast_qs.filter(as_of_date=latest_forecast.as_of_date))
-    else:
-        forecast_rows = list(forecast_qs.order_by("created_at", "id"))
-
-    cw_qs = CurrentWeekVarianceRow.objects.filter(borrower=borrower)
-    latest_cw = (
-        cw_qs.exclude(date__isnull=True)
-        .order_by("-date", "-created_at", "-id")
-        .first()
-    )
-    if latest_cw and latest_cw.date:
-        cw_rows = list(cw_qs.filter(date=latest_cw.date).order_by("category", "id"))
-    else:
-        cw_rows = list(cw_qs.order_by("created_at", "id"))
-
-    cum_qs = CummulativeVarianceRow.objects.filter(borrower=borrower)
-    latest_cum = (
-        cum_qs.exclude(date__isnull=True)
-        .order_by("-date", "-created_at", "-id")
-        .first()
-    )
-    if latest_cum and latest_cum.date:
-        cum_rows = list(cum_qs.filter(date=latest_cum.date).order_by("category", "id"))
-    else:
-        cum_rows = list(cum_qs.order_by("created_at", "id"))
-
-    concentration_qs = ConcentrationADODSORow.objects.filter(borrower=borrower)
-    latest_concentration = (
-        concentration_qs.exclude(as_of_date__isnull=True)
-        .order_by("-as_of_date", "-created_at", "-id")
-        .first()
-    )
-    if latest_concentration and latest_concentration.as_of_date:
-        concentration_rows = list(
-            concentration_qs.filter(as_of_date=latest_concentration.as_of_date).order_by("id")
+    # The six sheets below are independent; load them side by side.
+    def _load_forecast():
+        forecast_qs = ForecastRow.objects.for_borrower(borrower)
+        latest_forecast = (
+            forecast_qs.exclude(as_of_date__isnull=True)
+            .order_by("-as_of_date", "-created_at", "-id")
+            .first()
         )
-    else:
-        concentration_rows = list(concentration_qs.order_by("id"))
-
-    availability_qs = AvailabilityForecastRow.objects.filter(borrower=borrower)
-    latest_availability = (
-        availability_qs.exclude(date__isnull=True)
-        .order_by("-date", "-created_at", "-id")
-        .first()
-    )
-    if latest_availability and latest_availability.date:
-        availability_rows_qs = list(
-            availability_qs.filter(date=latest_availability.date).order_by("id")
+        if latest_forecast and latest_forecast.as_of_date:
+            return latest_forecast, list(forecast_qs.filter(as_of_date=latest_forecast.as_of_date))
+        return latest_forecast, list(forecast_qs.order_by("created_at", "id"))
+
+    def _load_current_week():
+        cw_qs = CurrentWeekVarianceRow.objects.for_borrower(borrower)
+        latest_cw = (
+            cw_qs.exclude(date__isnull=True)
+            .order_by("-date", "-created_at", "-id")
+            .first()
         )
-    else:
-        availability_rows_qs = list(availability_qs.order_by("id"))
+        if latest_cw and latest_cw.date:
+            return latest_cw, list(cw_qs.filter(date=latest_cw.date).order_by("category", "id"))
+        return latest_cw, list(cw_qs.order_by("created_at", "id"))
+
+    def _load_cumulative():
+        cum_qs = CummulativeVarianceRow.objects.for_borrower(borrower)
+        latest_cum = (
+            cum_qs.exclude(date__isnull=True)
+            .order_by("-date", "-created_at", "-id")
+            .first()
+        )
+        if latest_cum and latest_cum.date:
+            return latest_cum, list(cum_qs.filter(date=latest_cum.date).order_by("category", "id"))
+        return latest_cum, list(cum_qs.order_by("created_at", "id"))
+
+    def _load_concentration():
+        concentration_qs = ConcentrationADODSORow.objects.for_borrower(borrower)
+        latest_concentration = (
+            concentration_qs.exclude(as_of_date__isnull=True)
+            .order_by("-as_of_date", "-created_at", "-id")
+            .first()
+        )
+        if latest_concentration and latest_concentration.as_of_date:
+            return list(
+                concentration_qs.filter(as_of_date=latest_concentration.as_of_date).order_by("id")
+            )
+        return list(concentration_qs.order_by("id"))
 
-    report_qs = BorrowerReport.objects.filter(borrower=borrower).order_by(
-        "-report_date",
-        "-created_at",
-        "-id",
-    )
-    latest_report = report_qs.exclude(report_date__isnull=True).first() or report_qs.first()
+    def _load_availability():
+        availability_qs = AvailabilityForecastRow.objects.for_borrower(borrower)
+        latest_availability = (
+            availability_qs.exclude(date__isnull=True)
+            .order_by("-date", "-created_at", "-id")
+            .first()
+        )
+        if latest_availability and latest_availability.date:
+            return latest_availability, list(
+                availability_qs.filter(date=latest_availability.date).order_by("id")
+            )
+        return latest_availability, list(availability_qs.order_by("id"))
 
-    cashflow_rows = []
-    cash_rows = []
-    cashflow_report_date = None
+    def _load_cashflow():
+        selected_report = active_report() or latest_report(borrower)
+        if selected_report:
+            cashflow_rows = list(
+                CashFlowForecastRow.objects.filter(report=selected_report).order_by("id")
+            )
+            cash_rows = list(
+                CashForecastRow.objects.filter(report=selected_report).order_by("id")
+            )
+            return cashflow_rows, cash_rows, selected_report.report_date
 
-    if latest_report:
-        cashflow_rows = list(
-            CashFlowForecastRow.objects.filter(report=latest_report).order_by("id")
-        )
-        cash_rows = list(
-            CashForecastRow.objects.filter(report=latest_report).order_by("id")
-        )
-        cashflow_report_date = latest_report.report_date
-    else:
+        cashflow_report_date = None
         latest_cashflow = (
             CashFlowForecastRow.objects.filter(report__borrower=borrower)
             .order_by("-date", "-created_at", "-id")
@@ -672,6 +683,23 @@ def _week_summary_context(borrower):
             cash_rows = list(
                 CashForecastRow.objects.filter(report__borrower=borrower).order_by("id")
             )
+        return cashflow_rows, cash_rows, cashflow_report_date
+
+    (
+        (latest_forecast, forecast_rows),
+        (latest_cw, cw_rows),
+        (latest_cum, cum_rows),
+        concentration_rows,
+        (latest_availability, availability_rows_qs),
+        (cashflow_rows, cash_rows, cashflow_report_date),
+    ) = gather(
+        _load_forecast,
+        _load_current_week,
+        _load_cumulative,
+        _load_concentration,
+        _load_availability,
+        _load_cashflow,
+    )
 
     report_date_candidates = []
     if latest_forecast:
@@ -1427,13 +1455,14 @@ def _matches_category(row, keywords):
     return any(keyword in text for keyword in keywords)
 
 
+@timed()
 def _inventory_state(borrower, start_date=None, end_date=None):
     if not borrower:
         return None
 
-    collateral_qs = CollateralOverviewRow.objects.filter(borrower=borrower)
+    collateral_qs = CollateralOverviewRow.objects.for_borrower(borrower)
     if start_date and end_date:
-        collateral_qs = collateral_qs.filter(created_at__date__range=(start_date, end_date))
+        collateral_qs = collateral_qs.filter(as_of_date__range=(start_date, end_date))
     collateral_rows = list(collateral_qs.order_by("id"))
     inventory_rows = [
         row for row in collateral_rows if row.main_type and "inventory" in row.main_type.lower()
@@ -1441,53 +1470,38 @@ def _inventory_state(borrower, start_date=None, end_date=None):
     if not inventory_rows:
         return None
 
-    inventory_total = Decimal("0")
-    inventory_ineligible = Decimal("0")
-    inventory_net_total = Decimal("0")
-
-    category_metrics = {
-        category["key"]: {
-            "eligible": Decimal("0"),
-            "beginning": Decimal("0"),
-            "net": Decimal("0"),
-            "pre_reserve": Decimal("0"),
-            "reserves": Decimal("0"),
-            "nolv_numerator": Decimal("0"),
-            "nolv_denominator": Decimal("0"),
-            "trend_numerator": Decimal("0"),
-            "trend_denominator": Decimal("0"),
-            "has_data": False,
+    limit_rows = list(CollateralLimitsRow.objects.for_borrower(borrower).order_by("id"))
+    base = BorrowingBase.from_instances(inventory_rows, limit_rows)
+    overall = base.total()
+    totals = base.totals(
+        next((category["key"] for category in CATEGORY_CONFIG if _matches_category(row, category["match"])), None)
+        for row in inventory_rows
+    )
+    inventory_total = _to_decimal(overall["eligible_collateral"])
+    inventory_ineligible = _to_decimal(overall["ineligibles"])
+    inventory_net_total = _to_decimal(overall["net_collateral"])
+
+    category_metrics = {}
+    for category in CATEGORY_CONFIG:
+        values = totals.get(category["key"])
+        eligible = _to_decimal(values["eligible_collateral"]) if values else Decimal("0")
+        beginning = _to_decimal(values["beginning_collateral"]) if values else Decimal("0")
+        net_collateral = _to_decimal(values["net_collateral"]) if values else Decimal("0")
+        category_metrics[category["key"]] = {
+            "eligible": eligible,
+            "beginning": beginning,
+            "net": net_collateral,
+            "pre_reserve": _to_decimal(values["pre_reserve_collateral"]) if values else Decimal("0"),
+            "reserves": _to_decimal(values["reserves"]) if values else Decimal("0"),
+            "nolv_numerator": _to_decimal(values["nolv_pct"]) * eligible if values and eligible > 0 else Decimal("0"),
+            "nolv_denominator": eligible if eligible > 0 else Decimal("0"),
+            "trend_numerator": net_collateral - beginning if beginning > 0 else Decimal("0"),
+            "trend_denominator": beginning if beginning > 0 else Decimal("0"),
+            "has_data": values is not None,
             "trend_pct": Decimal("0"),
         }
-        for category in CATEGORY_CONFIG
-    }
-
-    for row in inventory_rows:
-        eligible = _to_decimal(row.eligible_collateral)
-        inventory_total += eligible
-        inventory_ineligible += _to_decimal(row.ineligibles)
-        net_collateral = _to_decimal(row.net_collateral)
-        inventory_net_total += net_collateral
-        for category in CATEGORY_CONFIG:
-            if _matches_category(row, category["match"]):
-                metrics = category_metrics[category["key"]]
-                metrics["eligible"] += eligible
-                row_beginning = _to_decimal(row.beginning_collateral)
-                metrics["beginning"] += row_beginning
-                metrics["net"] += net_collateral
-                metrics["pre_reserve"] += _to_decimal(row.pre_reserve_collateral)
-                metrics["reserves"] += _to_decimal(row.reserves)
-                metrics["has_data"] = True
-
-                if eligible > 0:
-                    metrics["nolv_numerator"] += _to_decimal(row.nolv_pct) * eligible
-                    metrics["nolv_denominator"] += eligible
-                if row_beginning > 0:
-                    metrics["trend_numerator"] += net_collateral - row_beginning
-                    metrics["trend_denominator"] += row_beginning
-                break
 
-    inventory_available_total = inventory_total - inventory_ineligible
+    inventory_available_total = _to_decimal(overall["pre_reserve_collateral"])
     if inventory_available_total < 0:
         inventory_available_total = Decimal("0")
 
@@ -1535,6 +1549,8 @@ def _format_compact_currency(value):
     return _format_currency(val)
 
 
+@timed()
+@report_cached()
 def _inventory_context(borrower):
     empty_mix = [
         {"label": item["label"], "percentage_display": "0%", "bar_class": item["bar_class"]}
@@ -1891,6 +1907,8 @@ def _inventory_context(borrower):
         "inventory_trend_series": inventory_trend_series,
     }
 
+@timed()
+@report_cached()
 def _accounts_receivable_context(borrower, range_key="today", division="all"):
     normalized_range = _normalize_range(range_key)
     normalized_division = _normalize_division(division)
@@ -1920,15 +1938,18 @@ def _accounts_receivable_context(borrower, range_key="today", division="all"):
         IneligibleOverviewRow,
         IneligibleTrendRow,
     ]
-    divisions = set()
-    for model in division_sources:
-        for value in (
-            model.objects.filter(borrower=borrower)
+    def _load_divisions(model):
+        return list(
+            model.objects.for_borrower(borrower)
             .exclude(division__isnull=True)
             .exclude(division__exact="")
             .values_list("division", flat=True)
             .distinct()
-        ):
+        )
+
+    divisions = set()
+    for values in gather(*(partial(_load_divisions, model) for model in division_sources)):
+        for value in values:
             cleaned = str(value).strip()
             if cleaned:
                 divisions.add(cleaned)
@@ -1986,11 +2007,62 @@ def _accounts_receivable_context(borrower, range_key="today", division="all"):
             "total_past_due_amt": total_past_due,
         }
 
-    ar_rows = list(
-        _apply_date_filter(
-            _apply_division_filter(ARMetricsRow.objects.filter(borrower=borrower)),
-            "as_of_date",
-        ).order_by("as_of_date", "created_at", "id")
+    def _load_ar_rows():
+        ar_snapshot = load_latest_snapshot(borrower, ARMetricsRow)
+        if ar_snapshot is not None:
+            ar_mask = ar_snapshot.division_mask(normalized_division)
+            if start_date and end_date:
+                ar_mask &= ar_snapshot.date_range_mask("as_of_date", start_date, end_date)
+            return dated_rows(ar_snapshot, ar_mask, "as_of_date")
+        return list(
+            _apply_date_filter(
+                _apply_division_filter(ARMetricsRow.objects.for_borrower(borrower)),
+                "as_of_date",
+            ).order_by("as_of_date", "created_at", "id")
+        )
+
+    def _load_aging_rows():
+        return list(
+            _apply_date_filter(
+                _apply_division_filter(AgingCompositionRow.objects.for_borrower(borrower)),
+                "as_of_date",
+            ).order_by("-as_of_date", "-created_at", "-id")
+        )
+
+    concentration_qs = _apply_division_filter(
+        ConcentrationADODSORow.objects.for_borrower(borrower)
+    )
+
+    def _load_concentration_rows():
+        return list(
+            _apply_date_filter(concentration_qs, "as_of_date")
+            .order_by("-as_of_date", "-created_at", "-id")
+        )
+
+    def _load_ineligible_overview():
+        return (
+            _apply_date_filter(
+                _apply_division_filter(IneligibleOverviewRow.objects.for_borrower(borrower)),
+                "date",
+            )
+            .order_by("-date", "-id")
+            .first()
+        )
+
+    def _load_ineligible_trend_rows():
+        return list(
+            _apply_date_filter(
+                _apply_division_filter(IneligibleTrendRow.objects.for_borrower(borrower)),
+                "date",
+            ).order_by("date", "id")
+        )
+
+    ar_rows, aging_rows, concentration_rows, ineligible_overview, ineligible_trend_rows = gather(
+        _load_ar_rows,
+        _load_aging_rows,
+        _load_concentration_rows,
+        _load_ineligible_overview,
+        _load_ineligible_trend_rows,
     )
     if not ar_rows:
         return base_context
@@ -2240,12 +2312,6 @@ def _accounts_receivable_context(borrower, range_key="today", division="all"):
             }
         )
 
-    aging_rows = list(
-        _apply_date_filter(
-            _apply_division_filter(AgingCompositionRow.objects.filter(borrower=borrower)),
-            "as_of_date",
-        ).order_by("-as_of_date", "-created_at", "-id")
-    )
     AGING_BUCKET_DEFS = [
         {"key": "current", "label": "Current", "color": "#1b2a55"},
         {"key": "0-30", "label": "0-30", "color": "rgba(43,111,247,.35)"},
@@ -2389,14 +2455,6 @@ def _accounts_receivable_context(borrower, range_key="today", division="all"):
         (latest_pct / Decimal("100")) if latest_pct is not None else Decimal("0")
     )
 
-    concentration_qs = _apply_division_filter(
-        ConcentrationADODSORow.objects.filter(borrower=borrower)
-    )
-    concentration_rows = list(
-        _apply_date_filter(concentration_qs, "as_of_date")
-        .order_by("-as_of_date", "-created_at", "-id")
-    )
-
     def _latest_snapshot_rows(rows):
         if not rows:
             return []
@@ -2465,20 +2523,6 @@ def _accounts_receivable_context(borrower, range_key="today", division="all"):
                 }
             )
 
-    ineligible_overview = (
-        _apply_date_filter(
-            _apply_division_filter(IneligibleOverviewRow.objects.filter(borrower=borrower)),
-            "date",
-        )
-        .order_by("-date", "-id")
-        .first()
-    )
-    ineligible_trend_rows = list(
-        _apply_date_filter(
-            _apply_division_filter(IneligibleTrendRow.objects.filter(borrower=borrower)),
-            "date",
-        ).order_by("date", "id")
-    )
     ineligible_rows = []
     ineligible_total_row = None
     if ineligible_overview:
@@ -2722,7 +2766,7 @@ def _normalize_range(range_key):
     return RANGE_ALIASES.get(normalized_range, "last_12_months")
 
 def _range_dates(range_key):
-    today = date.today()
+    today = reference_date()
     if range_key == "last_12_months":
         return today - timedelta(days=364), today
     if range_key == "last_6_months":
@@ -2740,6 +2784,8 @@ def _normalize_division(division):
     return normalized_division
 
 
+@timed()
+@report_cached()
 def _finished_goals_context(borrower, range_key="today", division="all"):
     normalized_range = _normalize_range(range_key)
     normalized_division = _normalize_division(division)
@@ -2799,7 +2845,7 @@ def _finished_goals_context(borrower, range_key="today", division="all"):
     divisions = set()
     for model in division_sources:
         for value in (
-            model.objects.filter(borrower=borrower)
+            model.objects.for_borrower(borrower)
             .exclude(division__isnull=True)
             .exclude(division__exact="")
             .values_list("division", flat=True)
@@ -2827,7 +2873,7 @@ def _finished_goals_context(borrower, range_key="today", division="all"):
     category_metrics = state["category_metrics"]
     inventory_rows = state["inventory_rows"]
 
-    metrics_qs = FGInventoryMetricsRow.objects.filter(borrower=borrower)
+    metrics_qs = FGInventoryMetricsRow.objects.for_borrower(borrower)
     fg_type_qs = metrics_qs.filter(inventory_type__icontains="finished")
     if fg_type_qs.exists():
         metrics_qs = fg_type_qs
@@ -2841,7 +2887,7 @@ def _finished_goals_context(borrower, range_key="today", division="all"):
         inventory_net_total = inventory_available_total
 
     ar_row = (
-        ARMetricsRow.objects.filter(borrower=borrower)
+        ARMetricsRow.objects.for_borrower(borrower)
         .order_by("-as_of_date", "-created_at", "-id")
         .first()
     )
@@ -2887,7 +2933,7 @@ def _finished_goals_context(borrower, range_key="today", division="all"):
         )
 
     ineligible_detail_rows = []
-    ineligible_qs = FGIneligibleDetailRow.objects.filter(borrower=borrower)
+    ineligible_qs = FGIneligibleDetailRow.objects.for_borrower(borrower)
     ineligible_division_qs = _apply_division_filter(ineligible_qs)
     ineligible_filtered_qs = _apply_date_filter(ineligible_division_qs, "date")
     ineligible_row = ineligible_filtered_qs.order_by("-date", "-created_at", "-id").first()
@@ -2990,7 +3036,7 @@ def _finished_goals_context(borrower, range_key="today", division="all"):
             "delta_class": "good" if delta >= 0 else "bad",
         }
 
-    sales_trend_base = SalesGMTrendRow.objects.filter(borrower=borrower)
+    sales_trend_base = SalesGMTrendRow.objects.for_borrower(borrower)
     sales_trend_base = _apply_division_filter(sales_trend_base)
     sales_trend_qs = _apply_date_filter_or_latest(sales_trend_base, "as_of_date")
     sales_rows = list(
@@ -3124,7 +3170,7 @@ def _finished_goals_context(borrower, range_key="today", division="all"):
     ]
 
     inline_bucket_totals = OrderedDict((label, Decimal("0")) for label in inline_excess_labels)
-    inline_rows = FGInlineCategoryAnalysisRow.objects.filter(borrower=borrower)
+    inline_rows = FGInlineCategoryAnalysisRow.objects.for_borrower(borrower)
     inline_rows = _apply_division_filter(inline_rows)
     inline_rows = _apply_date_filter_or_latest(inline_rows, "as_of_date")
     inline_latest = inline_rows.exclude(as_of_date__isnull=True).order_by("-as_of_date").first()
@@ -3182,7 +3228,7 @@ def _finished_goals_context(borrower, range_key="today", division="all"):
 
     inline_excess_trend_labels = []
     inline_excess_trend_values = []
-    inline_trend_rows = FGInlineCategoryAnalysisRow.objects.filter(borrower=borrower).exclude(
+    inline_trend_rows = FGInlineCategoryAnalysisRow.objects.for_borrower(borrower).exclude(
         as_of_date__isnull=True
     )
     inline_trend_rows = _apply_division_filter(inline_trend_rows)
@@ -3222,15 +3268,14 @@ def _finished_goals_context(borrower, range_key="today", division="all"):
             pct = max(Decimal("0"), min(Decimal("100"), pct))
             inventory_trend_values.append(float(pct))
     else:
-        inventory_rows_all = CollateralOverviewRow.objects.filter(
-            borrower=borrower,
+        inventory_rows_all = CollateralOverviewRow.objects.history_for_borrower(borrower).filter(
             main_type__icontains="inventory",
-        ).exclude(created_at__isnull=True)
-        inventory_rows_all = _apply_date_filter(inventory_rows_all, "created_at")
-        inventory_rows_all = inventory_rows_all.order_by("created_at", "id")
+        ).exclude(as_of_date__isnull=True)
+        inventory_rows_all = _apply_date_filter(inventory_rows_all, "as_of_date")
+        inventory_rows_all = inventory_rows_all.order_by("as_of_date", "id")
         inventory_trend_map = OrderedDict()
         for row in inventory_rows_all:
-            dt = row.created_at.date()
+            dt = row.as_of_date
             if dt not in inventory_trend_map:
                 inventory_trend_map[dt] = {"eligible": Decimal("0"), "total": Decimal("0")}
             inventory_trend_map[dt]["eligible"] += _to_decimal(row.eligible_collateral)
@@ -3424,7 +3469,7 @@ def _finished_goals_context(borrower, range_key="today", division="all"):
         },
     }
 
-    inline_excess_qs = FGInlineExcessByCategoryRow.objects.filter(borrower=borrower)
+    inline_excess_qs = FGInlineExcessByCategoryRow.objects.for_borrower(borrower)
     inline_excess_qs = _apply_division_filter(inline_excess_qs)
     inline_excess_qs = _apply_date_filter_or_latest(inline_excess_qs, "as_of_date")
     inline_excess_rows = list(
@@ -3532,17 +3577,26 @@ def _finished_goals_context(borrower, range_key="today", division="all"):
         }
 
     top_sku_rows = []
-    sku_query = HistoricalTop20SKUsRow.objects.filter(borrower=borrower)
-    sku_query = _apply_division_filter(sku_query)
-    sku_query = _apply_date_filter_or_latest(sku_query, "as_of_date")
-    latest_sku_row = sku_query.order_by("-as_of_date", "-created_at", "-id").first()
-    if latest_sku_row and latest_sku_row.as_of_date:
-        sku_rows = list(
-            sku_query.filter(as_of_date=latest_sku_row.as_of_date)
-            .order_by("-pct_of_total", "id")[:20]
-        )
+    sku_snapshot = load_latest_snapshot(borrower, HistoricalTop20SKUsRow)
+    if sku_snapshot is not None:
+        sku_mask = sku_snapshot.division_mask(normalized_division)
+        if start_date and end_date:
+            in_range = sku_mask & sku_snapshot.date_range_mask("as_of_date", start_date, end_date)
+            if in_range.any():
+                sku_mask = in_range
+        sku_rows = latest_date_top_rows(sku_snapshot, sku_mask, "as_of_date", "pct_of_total", 20)
     else:
-        sku_rows = list(sku_query.order_by("-created_at", "-id")[:20])
+        sku_query = HistoricalTop20SKUsRow.objects.for_borrower(borrower)
+        sku_query = _apply_division_filter(sku_query)
+        sku_query = _apply_date_filter_or_latest(sku_query, "as_of_date")
+        latest_sku_row = sku_query.order_by("-as_of_date", "-created_at", "-id").first()
+        if latest_sku_row and latest_sku_row.as_of_date:
+            sku_rows = list(
+                sku_query.filter(as_of_date=latest_sku_row.as_of_date)
+                .order_by("-pct_of_total", "id")[:20]
+            )
+        else:
+            sku_rows = list(sku_query.order_by("-created_at", "-id")[:20])
 
     if sku_rows:
         for row in sku_rows:
@@ -3718,6 +3772,8 @@ REASON_ORDER = [
     ("damaged/non-saleable", ["damage", "non-saleable", "non saleable"]),
 ]
 
+@timed()
+@report_cached()
 def _raw_materials_context(borrower, range_key="today", division="all"):
     normalized_range = _normalize_range(range_key)
     normalized_division = _normalize_division(division)
@@ -4034,6 +4090,8 @@ def _raw_materials_context(borrower, range_key="today", division="all"):
     }
 
 
+@timed()
+@report_cached()
 def _work_in_progress_context(borrower, range_key="today", division="all"):
     normalized_range = _normalize_range(range_key)
     normalized_division = _normalize_division(division)
@@ -4359,6 +4417,8 @@ DEFAULT_OTHER_COLLATERAL_CHART = {
 }
 
 
+@timed()
+@report_cached()
 def _other_collateral_context(borrower):
     base_context = {
         "other_collateral_value_monitor": [],
@@ -4373,7 +4433,7 @@ def _other_collateral_context(borrower):
     }
 
     equipment_rows = list(
-        MachineryEquipmentRow.objects.filter(borrower=borrower).order_by("created_at", "id")
+        MachineryEquipmentRow.objects.for_borrower(borrower).order_by("created_at", "id")
     )
     if not equipment_rows:
         return base_context
@@ -4658,6 +4718,8 @@ def _build_liquidation_category_table(rows, max_rows=5):
     return table
 
 
+@timed()
+@report_cached()
 def _liquidation_model_context(borrower):
     base_context = {
         "liquidation_summary_metrics": [],
@@ -4729,7 +4791,7 @@ def _liquidation_model_context(borrower):
         return base_context
 
     metrics_rows = list(
-        FGInventoryMetricsRow.objects.filter(borrower=borrower).order_by("-as_of_date")
+        FGInventoryMetricsRow.objects.for_borrower(borrower).order_by("-as_of_date")
     )
     current_metrics = metrics_rows[0] if metrics_rows else None
     previous_metrics = metrics_rows[1] if len(metrics_rows) > 1 else None
@@ -4737,7 +4799,7 @@ def _liquidation_model_context(borrower):
     summary_metrics = _build_liquidation_metrics(current_metrics, previous_metrics)
 
     fg_expenses = (
-        FGIneligibleDetailRow.objects.filter(borrower=borrower).order_by("-date").first()
+        FGIneligibleDetailRow.objects.for_borrower(borrower).order_by("-date").first()
     )
     expense_groups = [
         {
@@ -4943,7 +5005,7 @@ def _liquidation_model_context(borrower):
     liquidation_rows = []
     liquidation_totals = {"fg": "—", "rm": "—", "wip": "—", "total": "—"}
 
-    nolv_entries = list(NOLVTableRow.objects.filter(borrower=borrower).order_by("-date", "-id"))
+    nolv_entries = list(NOLVTableRow.objects.for_borrower(borrower).order_by("-date", "-id"))
     liquidation_net_orderly_rows = net_rows
     liquidation_net_orderly_footer = net_footer
     if nolv_entries:
@@ -5210,7 +5272,7 @@ def _liquidation_model_context(borrower):
     total_cost = Decimal("0")
     total_selling = Decimal("0")
     total_gross = Decimal("0")
-    for history_row in FGGrossRecoveryHistoryRow.objects.filter(borrower=borrower).order_by("id"):
+    for history_row in FGGrossRecoveryHistoryRow.objects.for_borrower(borrower).order_by("id"):
         raw_cost = history_row.cost
         raw_selling = history_row.selling_price
         raw_gross = history_row.gross_recovery
@@ -0,0 +1,54 @@
+from django.contrib.auth.decorators import login_required
+from django.http import Http404, JsonResponse, StreamingHttpResponse
+from django.views.decorators.gzip import gzip_page
+
+from management.db_router import read_replica
+from management.exports import ExportError, RowExport
+from management.models import BorrowerReport
+from management.views.api import borrowers_for
+
+
+@login_required(login_url="login")
+@gzip_page
+@read_replica
+def export_rows_view(request, sheet):
+    """
+    Stream one sheet's rows as CSV, or NDJSON with format=ndjson, for
+    borrower=<id> and/or report=<id>, optionally limited to start/end
+    (YYYY-MM-DD) on the sheet's date.
+    """
+    borrowers = borrowers_for(request.user)
+    borrower = report = None
+    borrower_id = request.GET.get("borrower", "")
+    report_id = request.GET.get("report", "")
+    if not all(value.isdigit() for value in (borrower_id, report_id) if value):
+        return JsonResponse({"error": "borrower and report must be ids."}, status=400)
+    if borrower_id:
+        borrower = borrowers.filter(pk=borrower_id).first()
+        if borrower is None:
+            raise Http404("Borrower not found")
+    if report_id:
+        report = BorrowerReport.objects.filter(pk=report_id, borrower__in=borrowers).first()
+        if report is None:
+            raise Http404("Report not found")
+    try:
+        export = RowExport(
+            sheet,
+            borrower=borrower,
+            report=report,
+            start=request.GET.get("start"),
+            end=request.GET.get("end"),
+            fmt=request.GET.get("format", "csv"),
+        )
+    except ExportError as exc:
+        return JsonResponse({"error": str(exc)}, status=400)
+    queryset = export.queryset()
+    # The rows are read while the response streams, after @read_replica's
+    # scope has closed; pin the database it picked now.
+    queryset = queryset.using(queryset.db)
+    response = StreamingHttpResponse(
+        export.stream(queryset),
+        content_type=f"{export.content_type}; charset=utf-8",
+    )
+    response["Content-Disposition"] = f'attachment; filename="{export.filename}"'
+    return response
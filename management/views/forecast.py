@@ -6,7 +6,11 @@ import json
 from django.contrib.auth.decorators import login_required
 from django.shortcuts import render
 
+from management.db_router import read_replica
+from management.instrumentation import timed
 from management.models import ForecastRow
+from management.report_cache import report_cached
+from management.report_scope import report_scoped
 from management.views.summary import (
     _build_borrower_summary,
     get_borrower_status_context,
@@ -45,6 +49,7 @@ def _build_series(rows, accessor):
     return [_to_decimal(accessor(row)) for row in rows]
 
 
+@timed()
 def _build_chart_data(rows):
     if not rows:
         return {}
@@ -251,23 +256,28 @@ def _price_target_snapshot():
     return snapshot
 
 
+@report_cached()
+def _forecast_charts(borrower):
+    rows = (
+        ForecastRow.objects.for_borrower(borrower)
+        .order_by("as_of_date", "period", "created_at", "id")
+    )
+    return _build_chart_data(rows)
+
+
 def _borrower_context(request):
     borrower = get_preferred_borrower(request)
     return {"borrower_summary": _build_borrower_summary(borrower)}
 
 
 @login_required(login_url="login")
+@read_replica
+@report_scoped
 def forecast_view(request):
     borrower = get_preferred_borrower(request)
-    rows = []
-    if borrower:
-        rows = (
-            ForecastRow.objects.filter(borrower=borrower)
-            .order_by("as_of_date", "period", "created_at", "id")
-        )
     context = _borrower_context(request)
     context.update(get_borrower_status_context(request))
-    context["forecast_charts"] = _build_chart_data(rows)
+    context["forecast_charts"] = _forecast_charts(borrower) if borrower else _build_chart_data([])
     context["active_tab"] = "forecast"
     context["forecast_charts_json"] = json.dumps(context["forecast_charts"])
     context["price_target"] = _price_target_snapshot()
@@ -0,0 +1,89 @@
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth.decorators import login_required
+from django.http import FileResponse, Http404, HttpResponseForbidden, JsonResponse
+from django.shortcuts import get_object_or_404
+from django.views.decorators.http import require_POST
+
+from management.db_router import note_write
+from management.jobs import enqueue, job_payload
+from management.models import BorrowerReport, Job
+from management.report_scope import resolve_report
+from management.views.reports import PREFIX_MAP
+from management.views.summary import get_preferred_borrower
+
+# Jobs that touch every borrower or the hot tables are for staff.
+STAFF_JOB_KINDS = {"warm_cache", "archive_reports"}
+
+
+def _can_view(user, job):
+    return user.is_staff or job.created_by_id == user.pk
+
+
+@login_required(login_url="login")
+@require_POST
+def job_submit(request):
+    """
+    Queue a background job and answer 202 with its status payload; poll
+    job_status for progress. kind=export_report builds the selected
+    borrower's workbook (report_type names the export, report= picks the
+    report); warm_cache and archive_reports are staff only. Workbook imports
+    are queued by the upload endpoint.
+    """
+    kind = request.POST.get("kind", "")
+    if kind in STAFF_JOB_KINDS and not request.user.is_staff:
+        return HttpResponseForbidden("Staff only")
+    if kind == "export_report":
+        borrower = get_preferred_borrower(request)
+        if not borrower:
+            return JsonResponse({"error": "No borrower selected."}, status=400)
+        report_type = request.POST.get("report_type", "borrowing_base")
+        if report_type not in PREFIX_MAP:
+            return JsonResponse({"error": "Unknown report type."}, status=400)
+        report = None
+        report_id = request.POST.get("report", "")
+        if report_id.isdigit():
+            report = BorrowerReport.objects.filter(pk=report_id, borrower=borrower).first()
+        report = report or resolve_report(request, borrower)
+        params = {
+            "borrower_id": borrower.pk,
+            "report_id": report.pk if report else None,
+            "report_type": report_type,
+        }
+    elif kind == "warm_cache":
+        params = {}
+    elif kind == "archive_reports":
+        keep = request.POST.get("keep", "")
+        params = {"keep": int(keep)} if keep.isdigit() and int(keep) > 0 else {}
+    else:
+        return JsonResponse({"error": "Unknown job kind."}, status=400)
+    job = enqueue(kind, params, user=request.user)
+    return JsonResponse(job_payload(job), status=202)
+
+
+@login_required(login_url="login")
+def job_status(request, job_id):
+    job = get_object_or_404(Job, pk=job_id)
+    if not _can_view(request.user, job):
+        raise Http404("Job not found")
+    if job.kind == "import_workbook" and job.status == Job.SUCCEEDED:
+        # The import's rows may not have reached the replicas yet.
+        note_write(request, at=job.finished_at)
+    return JsonResponse(job_payload(job))
+
+
+@login_required(login_url="login")
+def job_download(request, job_id):
+    job = get_object_or_404(Job, pk=job_id, kind="export_report", status=Job.SUCCEEDED)
+    if not _can_view(request.user, job):
+        raise Http404("Job not found")
+    path = Path(settings.JOB_EXPORT_ROOT) / Path(job.result.get("file", "")).name
+    if not path.is_file():
+        raise Http404("Export expired")
+    return FileResponse(
+        path.open("rb"),
+        as_attachment=True,
+        filename=job.result.get("filename") or path.name,
+        content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    )
@@ -1,3 +1,5 @@
+from urllib.parse import urlencode
+
 from django.contrib.auth.decorators import login_required
 from django.core.paginator import Paginator
 from django.shortcuts import render
@@ -6,6 +8,7 @@ from management.models import (
     CollateralLimitsRow,
     CollateralOverviewRow,
 )
+from management.report_scope import report_scoped
 from management.views.summary import (
     _build_borrower_summary,
     _format_currency,
@@ -14,6 +17,24 @@ from management.views.summary import (
     get_preferred_borrower,
 )
 
+LIMITS_PAGE_SIZE = 20
+
+# Query-param name -> column for each table. Collateral overview rows carry no
+# division: the main type stands in for it when sorting (matching what the
+# table shows), but the division filter is not applied to them.
+LIMIT_COLUMNS = {
+    "division": "division",
+    "collateral_type": "collateral_type",
+    "collateral_sub_type": "collateral_sub_type",
+}
+INELIGIBLE_COLUMNS = {
+    "division": "main_type",
+    "collateral_type": "main_type",
+    "collateral_sub_type": "sub_type",
+}
+LIMIT_FILTERS = ("division", "collateral_type")
+INELIGIBLE_FILTERS = ("collateral_type",)
+
 
 def _borrower_context(request):
     borrower = get_preferred_borrower(request)
@@ -24,36 +45,100 @@ def _borrower_context(request):
     }
 
 
+def _limits_filters(request):
+    filters = {}
+    for key in ("division", "collateral_type"):
+        value = (request.GET.get(key) or "").strip()
+        if value:
+            filters[key] = value
+    sort = (request.GET.get("sort") or "").strip()
+    if sort.lstrip("-") in LIMIT_COLUMNS:
+        filters["sort"] = sort
+    return filters
+
+
+def _filtered_queryset(qs, columns, filters, filter_keys):
+    for key in filter_keys:
+        if key in filters:
+            qs = qs.filter(**{columns[key]: filters[key]})
+    sort = filters.get("sort")
+    if sort:
+        prefix = "-" if sort.startswith("-") else ""
+        return qs.order_by(f"{prefix}{columns[sort.lstrip('-')]}", "id")
+    return qs.order_by("id")
+
+
 @login_required(login_url="login")
+@report_scoped
 def limits_view(request):
     context = _borrower_context(request)
     context["active_tab"] = "limits"
     borrower = context.get("borrower")
-    limits = []
+    filters = _limits_filters(request)
+
     if borrower:
-        for row in CollateralLimitsRow.objects.filter(borrower=borrower).order_by("id"):
-            limits.append({
-                "division": row.division or "—",
-                "collateral_type": row.collateral_type or "—",
-                "collateral_sub_type": row.collateral_sub_type or "—",
-                "usd_limit": _format_currency(row.usd_limit),
-                "pct_limit": _format_pct(row.pct_limit),
-            })
-        ineligibles = []
-        for row in CollateralOverviewRow.objects.filter(borrower=borrower):
-            if not row.ineligibles:
-                continue
-            ineligibles.append({
-                "division": getattr(row, "division", None) or row.main_type or "—",
-                "collateral_type": row.main_type or "—",
-                "collateral_sub_type": row.sub_type or "—",
-            })
+        limits_qs = _filtered_queryset(
+            CollateralLimitsRow.objects.for_borrower(borrower),
+            LIMIT_COLUMNS,
+            filters,
+            LIMIT_FILTERS,
+        ).values("division", "collateral_type", "collateral_sub_type", "usd_limit", "pct_limit")
+        ineligibles_qs = _filtered_queryset(
+            CollateralOverviewRow.objects.for_borrower(borrower)
+            .exclude(ineligibles__isnull=True)
+            .exclude(ineligibles=0),
+            INELIGIBLE_COLUMNS,
+            filters,
+            INELIGIBLE_FILTERS,
+        ).values("main_type", "sub_type")
+        division_options = (
+            CollateralLimitsRow.objects.for_borrower(borrower)
+            .exclude(division__isnull=True)
+            .values_list("division", flat=True)
+            .order_by("division")
+            .distinct()
+        )
+        type_options = (
+            CollateralLimitsRow.objects.for_borrower(borrower)
+            .exclude(collateral_type__isnull=True)
+            .values_list("collateral_type", flat=True)
+            .order_by("collateral_type")
+            .distinct()
+        )
     else:
-        ineligibles = []
-    limits_page_number = request.GET.get("limits_page", 1)
-    ineligibles_page_number = request.GET.get("ineligibles_page", 1)
-    limits_paginator = Paginator(limits, 20)
-    ineligibles_paginator = Paginator(ineligibles, 20)
-    context["limit_page"] = limits_paginator.get_page(limits_page_number)
-    context["ineligible_page"] = ineligibles_paginator.get_page(ineligibles_page_number)
+        limits_qs = CollateralLimitsRow.objects.none()
+        ineligibles_qs = CollateralOverviewRow.objects.none()
+        division_options = []
+        type_options = []
+
+    limit_page = Paginator(limits_qs, LIMITS_PAGE_SIZE).get_page(request.GET.get("limits_page", 1))
+    ineligible_page = Paginator(ineligibles_qs, LIMITS_PAGE_SIZE).get_page(
+        request.GET.get("ineligibles_page", 1)
+    )
+    # Only the rows on the visible page are formatted.
+    limit_page.object_list = [
+        {
+            "division": row["division"] or "—",
+            "collateral_type": row["collateral_type"] or "—",
+            "collateral_sub_type": row["collateral_sub_type"] or "—",
+            "usd_limit": _format_currency(row["usd_limit"]),
+            "pct_limit": _format_pct(row["pct_limit"]),
+        }
+        for row in limit_page.object_list
+    ]
+    ineligible_page.object_list = [
+        {
+            "division": row["main_type"] or "—",
+            "collateral_type": row["main_type"] or "—",
+            "collateral_sub_type": row["sub_type"] or "—",
+        }
+        for row in ineligible_page.object_list
+    ]
+
+    context["limit_page"] = limit_page
+    context["ineligible_page"] = ineligible_page
+    context["limits_filters"] = filters
+    context["filter_query"] = urlencode(filters)
+    context["division_options"] = list(division_options)
+    context["collateral_type_options"] = list(type_options)
     return render(request, "limits/limits.html", context)
@@ -0,0 +1,50 @@
+import base64
+import binascii
+
+from django.conf import settings
+from django.contrib.auth.decorators import login_required
+from django.http import HttpResponse, HttpResponseForbidden
+from django.utils.crypto import constant_time_compare
+
+from management.metrics import render_prometheus
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _scrape_credentials(request):
+    """The secret a scraper sent: a bearer token, or the password of basic auth."""
+    scheme, _, credentials = request.META.get("HTTP_AUTHORIZATION", "").partition(" ")
+    scheme = scheme.lower()
+    if scheme == "bearer":
+        return credentials.strip()
+    if scheme == "basic":
+        try:
+            decoded = base64.b64decode(credentials.strip(), validate=True).decode("utf-8")
+        except (binascii.Error, UnicodeDecodeError):
+            return None
+        return decoded.partition(":")[2]
+    return None
+
+
+def _scrape_authorized(request):
+    token = settings.METRICS_SCRAPE_TOKEN
+    credentials = _scrape_credentials(request)
+    return bool(token and credentials and constant_time_compare(credentials, token))
+
+
+def metrics_view(request):
+    """
+    Prometheus exposition. Scrapers authenticate with METRICS_SCRAPE_TOKEN
+    (as a bearer token or as the basic-auth password); staff can also read
+    it from a browser session.
+    """
+    if _scrape_authorized(request):
+        return HttpResponse(render_prometheus(), content_type=PROMETHEUS_CONTENT_TYPE)
+    return _staff_metrics_view(request)
+
+
+@login_required(login_url="login")
+def _staff_metrics_view(request):
+    if not request.user.is_staff:
+        return HttpResponseForbidden("Staff only")
+    return HttpResponse(render_prometheus(), content_type=PROMETHEUS_CONTENT_TYPE)
@@ -1,4 +1,5 @@
 import os
+import time
 from io import BytesIO
 from datetime import datetime, timezone
 
@@ -10,17 +11,25 @@ from django.http import FileResponse, Http404
 from django.shortcuts import render
 from django.urls import reverse
 
+from management.borrowing_base import BorrowingBase
+from management.db_router import read_replica
+from management.metrics import EXPORT_BYTES, EXPORT_SECONDS
 from management.models import (
     ARMetricsRow,
     BorrowerOverviewRow,
+    CollateralLimitsRow,
     CollateralOverviewRow,
+    Upload,
 )
+from management.report_scope import report_scoped
 from management.views.summary import (
     _build_borrower_summary,
     get_borrower_status_context,
     get_preferred_borrower,
 )
 
+RECENT_UPLOADS_LIMIT = 5
+
 REPORT_MENU = [
     {"key": "borrowing_base", "label": "Borrowing Base Report", "icon": "document"},
     {"key": "complete_analysis", "label": "Complete Analysis Report", "icon": "chart"},
@@ -101,6 +110,7 @@ def _build_report_rows(report_type, timestamps, company_label):
 
 
 @login_required(login_url="login")
+@read_replica
 def reports_download(request, report_id):
     borrower = get_preferred_borrower(request)
     if not borrower:
@@ -134,7 +144,26 @@ def _ensure_naive(value):
     return value
 
 
+def _write_borrowing_base(writer, borrower):
+    """Computed borrowing base: every collateral line, a subtotal per main type and the total."""
+    base = BorrowingBase.from_queryset(
+        CollateralOverviewRow.objects.for_borrower(borrower),
+        CollateralLimitsRow.objects.for_borrower(borrower),
+    )
+    records = []
+    for index, values in enumerate(base.rows()):
+        records.append({"main_type": base.main_types[index], "sub_type": base.sub_types[index], **values})
+    for (_borrower_id, main_type), values in base.main_type_totals().items():
+        records.append({"main_type": f"Total {main_type.title()}", "sub_type": None, **values})
+    total = base.total()
+    if total:
+        records.append({"main_type": "Total", "sub_type": None, **total})
+    df = pd.DataFrame(records) if records else pd.DataFrame([{"info": "no data"}])
+    df.to_excel(writer, sheet_name="Borrowing Base", index=False)
+
+
 def _build_bbc_workbook(borrower):
+    started = time.perf_counter()
     buffer = BytesIO()
     with pd.ExcelWriter(buffer, engine="openpyxl") as writer:
         _write_sheet(
@@ -142,13 +171,18 @@ def _build_bbc_workbook(borrower):
             "Borrower Overview",
             BorrowerOverviewRow.objects.filter(company_id=borrower.company.company_id if borrower.company else None),
         )
-        _write_sheet(writer, "Collateral Overview", CollateralOverviewRow.objects.filter(borrower=borrower))
-        _write_sheet(writer, "AR Metrics", ARMetricsRow.objects.filter(borrower=borrower))
+        _write_sheet(writer, "Collateral Overview", CollateralOverviewRow.objects.for_borrower(borrower))
+        _write_borrowing_base(writer, borrower)
+        _write_sheet(writer, "AR Metrics", ARMetricsRow.objects.for_borrower(borrower))
     buffer.seek(0)
+    EXPORT_SECONDS.observe(time.perf_counter() - started, export="bbc")
+    EXPORT_BYTES.observe(buffer.getbuffer().nbytes, export="bbc")
     return buffer
 
 
 @login_required(login_url="login")
+@read_replica
+@report_scoped
 def reports_generate_bbc(request):
     borrower = get_preferred_borrower(request)
     if not borrower:
@@ -166,8 +200,10 @@ def reports_generate_bbc(request):
 
 
 @login_required(login_url="login")
+@report_scoped
 def reports_view(request):
-    requested_report = request.GET.get("report", "borrowing_base")
+    # ?report= selects the BorrowerReport; older links named the section with it.
+    requested_report = request.GET.get("section") or request.GET.get("report", "borrowing_base")
     if requested_report not in REPORT_SECTIONS:
         requested_report = "borrowing_base"
 
@@ -190,5 +226,12 @@ def reports_view(request):
         "active_report": requested_report,
         "report_section": report_section,
     })
+    if request.user.is_staff:
+        # Workbook imports: the upload form and the user's latest uploads with their import jobs.
+        context["recent_uploads"] = list(
+            Upload.objects.filter(created_by=request.user)
+            .select_related("job")
+            .order_by("-created_at")[:RECENT_UPLOADS_LIMIT]
+        )
     context.update(get_borrower_status_context(request))
     return render(request, "reports/borrowing_base.html", context)
@@ -0,0 +1,29 @@
+import json
+
+from django.contrib.auth.decorators import login_required
+from django.http import JsonResponse
+from django.views.decorators.http import require_POST
+
+from management.scenarios import ScenarioError, run_scenario
+from management.views.summary import get_accessible_borrowers, get_active_company
+
+
+@login_required(login_url="login")
+@require_POST
+def scenarios_view(request):
+    """
+    POST {"overrides": [...]} (see management.scenarios) and get availability
+    deltas for every borrower the user can see. Nothing is saved.
+    """
+    try:
+        payload = json.loads(request.body or b"{}")
+    except (TypeError, ValueError):
+        return JsonResponse({"error": "Body must be JSON."}, status=400)
+    if not isinstance(payload, dict):
+        return JsonResponse({"error": "Body must be a JSON object."}, status=400)
+    borrowers = get_accessible_borrowers(request, get_active_company(request))
+    try:
+        result = run_scenario(payload.get("overrides", []), borrowers=borrowers)
+    except ScenarioError as exc:
+        return JsonResponse({"error": str(exc)}, status=400)
+    return JsonResponse(result)
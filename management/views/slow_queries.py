@@ -0,0 +1,69 @@
+from datetime import timedelta
+
+from django.contrib.auth.decorators import login_required
+from django.db.models import Avg, Count, Max, OuterRef, Subquery, Sum
+from django.http import HttpResponseForbidden
+from django.shortcuts import render
+from django.utils import timezone
+
+from management.models import SlowQuery
+
+SLOW_QUERY_PAGE_SIZE = 50
+DEFAULT_WINDOW_DAYS = 7
+
+
+def _window_days(request):
+    try:
+        return max(1, int(request.GET.get("days", DEFAULT_WINDOW_DAYS)))
+    except (TypeError, ValueError):
+        return DEFAULT_WINDOW_DAYS
+
+
+def _ranked_fingerprints(since):
+    """Fingerprints by total captured time, each with its latest sample and plan."""
+    recent = SlowQuery.objects.filter(created_at__gte=since)
+    latest = recent.filter(fingerprint=OuterRef("fingerprint")).order_by("-created_at", "-id")
+    latest_plan = latest.exclude(explain="")
+    return (
+        recent.values("fingerprint")
+        .annotate(
+            total_ms=Sum("duration_ms"),
+            calls=Count("id"),
+            avg_ms=Avg("duration_ms"),
+            max_ms=Max("duration_ms"),
+            last_seen=Max("created_at"),
+            normalized_sql=Subquery(latest.values("normalized_sql")[:1]),
+            view=Subquery(latest.values("view")[:1]),
+            builder=Subquery(latest.values("builder")[:1]),
+            explain=Subquery(latest_plan.values("explain")[:1]),
+        )
+        .order_by("-total_ms")[:SLOW_QUERY_PAGE_SIZE]
+    )
+
+
+@login_required(login_url="login")
+def slow_queries_view(request):
+    if not request.user.is_staff:
+        return HttpResponseForbidden("Staff only")
+    days = _window_days(request)
+    rows = []
+    for idx, entry in enumerate(_ranked_fingerprints(timezone.now() - timedelta(days=days)), start=1):
+        rows.append({
+            "rank": idx,
+            "fingerprint": entry["fingerprint"],
+            "sql": entry["normalized_sql"],
+            "view": entry["view"] or "—",
+            "builder": entry["builder"] or "—",
+            "calls": entry["calls"],
+            "total_ms": f"{entry['total_ms']:,.1f}",
+            "avg_ms": f"{entry['avg_ms']:,.1f}",
+            "max_ms": f"{entry['max_ms']:,.1f}",
+            "last_seen": entry["last_seen"],
+            "explain": entry["explain"] or "",
+        })
+    context = {
+        "active_tab": "slow_queries",
+        "slow_query_rows": rows,
+        "window_days": days,
+    }
+    return render(request, "diagnostics/slow_queries.html", context)
@@ -1,107 +1,40 @@
 import math
-from collections import defaultdict
 from datetime import timedelta
 
-from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from decimal import Decimal, ROUND_HALF_UP
+from functools import partial
 
 from django.contrib.auth.decorators import login_required
 from django.shortcuts import redirect, render
-from django.utils import timezone
 from django.urls import reverse
 from django.utils.text import slugify
 
-from django.db.models import Max, Q
-
+from django.db.models import Max, OuterRef, Q, Subquery
+
+from management.borrowing_base import BorrowingBase
+from management.concurrency import gather
+from management.db_router import read_replica
+from management.instrumentation import timed
+from management.formatting import (
+    _format_currency,
+    _format_date,
+    _format_datetime,
+    _format_pct,
+    _safe_str,
+    _to_decimal,
+)
 from management.models import (
+    Alert,
     ARMetricsRow,
     Borrower,
+    BorrowerReport,
     CollateralLimitsRow,
     CollateralOverviewRow,
     Company,
-    CompositeIndexRow,
-    RiskSubfactorsRow,
 )
-
-
-def _format_currency(value):
-    if value is None:
-        return "—"
-    try:
-        amount = Decimal(value)
-    except (InvalidOperation, TypeError, ValueError):
-        try:
-            amount = Decimal(str(value))
-        except Exception:
-            return "—"
-    return f"${amount:,.0f}"
-
-
-def _format_pct(value):
-    if value is None:
-        return "—"
-    try:
-        pct = Decimal(value)
-    except (InvalidOperation, TypeError, ValueError):
-        try:
-            pct = Decimal(str(value))
-        except Exception:
-            return "—"
-
-    if pct <= Decimal("1"):
-        pct *= Decimal("100")
-
-    return f"{pct:.1f}%"
-
-
-def _normalize_pct(value):
-    if value is None:
-        return None
-    try:
-        pct = Decimal(value)
-    except (InvalidOperation, TypeError, ValueError):
-        try:
-            pct = Decimal(str(value))
-        except Exception:
-            return None
-
-    if pct <= Decimal("1"):
-        pct *= Decimal("100")
-
-    return pct
-
-
-def _format_date(value):
-    if not value:
-        return "—"
-    return value.strftime("%m/%d/%Y")
-
-
-def _format_datetime(value):
-    if not value:
-        return "—"
-    if timezone.is_aware(value):
-        value = timezone.localtime(value)
-    return value.strftime("%Y-%m-%d %H:%M:%S")
-
-
-def _safe_str(value, default="—"):
-    if value is None or value == "":
-        return default
-    return str(value)
-
-
-def _to_decimal(value):
-    if value is None:
-        return Decimal("0")
-    if isinstance(value, Decimal):
-        return value
-    try:
-        return Decimal(value)
-    except (InvalidOperation, TypeError, ValueError):
-        try:
-            return Decimal(str(value))
-        except Exception:
-            return Decimal("0")
+from management.report_cache import report_cached
+from management.report_scope import active_report, reference_date, report_scoped
+from management.risk_scorecard import get_risk_scorecard
 
 
 def get_active_borrower_id(request):
@@ -111,8 +44,13 @@ def get_active_borrower_id(request):
 def get_preferred_borrower(request):
     borrower_id = get_active_borrower_id(request)
     if borrower_id:
+        # Views, builders and the report scope all ask; load it once per request.
+        cached = getattr(request, "_preferred_borrower", None)
+        if cached is not None and str(cached.pk) == str(borrower_id):
+            return cached
         borrower = Borrower.objects.filter(pk=borrower_id).first()
         if borrower:
+            request._preferred_borrower = borrower
             return borrower
         request.session.pop("selected_borrower_id", None)
     borrower_profile = getattr(request.user, "borrower_profile", None)
@@ -159,6 +97,16 @@ def _user_can_access_borrower(user, borrower, company):
     return user.is_staff or user.is_superuser
 
 
+def get_accessible_borrowers(request, company=None):
+    borrowers_qs = Borrower.objects.all()
+    borrower_profile = getattr(request.user, "borrower_profile", None)
+    if company:
+        borrowers_qs = borrowers_qs.filter(company=company)
+    elif borrower_profile and borrower_profile.borrower_id:
+        borrowers_qs = borrowers_qs.filter(pk=borrower_profile.borrower_id)
+    return borrowers_qs
+
+
 def _format_axis_value(value):
     val = float(value)
     abs_val = abs(val)
@@ -304,7 +252,7 @@ def _build_line_series(values, labels, series_label=None, width=220, height=140)
 
 
 def _range_dates(range_key):
-    today = timezone.localdate()
+    today = reference_date()
     if range_key == "last_12_months":
         return today - timedelta(days=364), today
     if range_key == "last_6_months":
@@ -322,6 +270,7 @@ def _apply_date_filter(qs, field_name, start_date, end_date):
     return qs
 
 
+@timed()
 def _build_borrower_summary(borrower):
     if not borrower:
         return {
@@ -383,148 +332,59 @@ def _build_company_summary(company):
     }
 
 
-def _build_limit_map(limit_rows):
-    limit_map = {}
-    for row in limit_rows:
-        key = (row.collateral_type or "").strip().lower()
-        if not key:
-            continue
-        limit_map.setdefault(key, []).append(row)
-    return limit_map
-
-
-def _collateral_row_payload(row, limit_map=None):
-    return {
-        "label": _safe_str(row.main_type),
-        "detail": row.sub_type or "",
-        "beginning_collateral": _format_currency(row.beginning_collateral),
-        "ineligibles": _format_currency(row.ineligibles),
-        "eligible_collateral": _format_currency(row.eligible_collateral),
-        "nolv_pct": _format_pct(row.nolv_pct),
-        "dilution_rate": _format_pct(row.dilution_rate),
-        "advanced_rate": _format_pct(row.advanced_rate),
-        "rate_limit": _format_pct(
-            _resolve_rate_limit(row, limit_map) or row.rate_limit
-        ),
-        "utilized_rate": _format_pct(row.utilized_rate),
-        "pre_reserve_collateral": _format_currency(row.pre_reserve_collateral),
-        "reserves": _format_currency(row.reserves),
-        "net_collateral": _format_currency(row.net_collateral),
-        "snapshot_summary": _safe_str(row.snapshot_summary, default=""),
-    }
-
-
-def _resolve_rate_limit(row, limit_map):
-    if not limit_map:
-        return None
-    candidates = []
-    if row.main_type:
-        candidates.append(row.main_type.strip().lower())
-    if row.sub_type:
-        candidates.append(row.sub_type.strip().lower())
-    for key in candidates:
-        entries = limit_map.get(key)
-        if entries:
-            entry = entries[0]
-            return entry.pct_limit
-    return None
-
-
-def _sum_collateral_field(rows, field_name):
-    values = [getattr(row, field_name) for row in rows if getattr(row, field_name) is not None]
-    if not values:
-        return None
-    return sum((_to_decimal(value) for value in values), Decimal("0"))
+def _collateral_row_payload(row, values=None):
+    """
+    Display payload of one CollateralOverviewRow. `values` are the row's
+    figures from management.borrowing_base; computed here when not given.
+    """
+    if values is None:
+        limit_rows = CollateralLimitsRow.objects.for_borrower(row.borrower_id).order_by("id") if row.borrower_id else ()
+        values = BorrowingBase.from_instances([row], limit_rows).row(0)
+    payload = _collateral_values_payload(_safe_str(row.main_type), row.sub_type or "", values)
+    payload["snapshot_summary"] = _safe_str(row.snapshot_summary, default="")
+    return payload
 
 
-def _weighted_collateral_pct(rows, value_fn, weight_field="eligible_collateral"):
-    weighted_sum = Decimal("0")
-    total_weight = Decimal("0")
-    values = []
-    for row in rows:
-        raw_value = value_fn(row)
-        if raw_value is None:
-            continue
-        value = _to_decimal(raw_value)
-        values.append(value)
-        raw_weight = getattr(row, weight_field, None)
-        weight = _to_decimal(raw_weight) if raw_weight is not None else Decimal("0")
-        weighted_sum += value * weight
-        total_weight += weight
-    if total_weight > 0:
-        return weighted_sum / total_weight
-    if values:
-        return sum(values) / Decimal(len(values))
-    return None
-
-
-def _build_collateral_parent_payload(label, rows, limit_map=None):
-    def resolved_rate(row):
-        return _resolve_rate_limit(row, limit_map) or row.rate_limit
-
-    beginning = _sum_collateral_field(rows, "beginning_collateral")
-    ineligibles = _sum_collateral_field(rows, "ineligibles")
-    eligible = _sum_collateral_field(rows, "eligible_collateral")
-    pre_reserve = _sum_collateral_field(rows, "pre_reserve_collateral")
-    reserves = _sum_collateral_field(rows, "reserves")
-    net = _sum_collateral_field(rows, "net_collateral")
-
+def _collateral_values_payload(label, detail, values):
     return {
-        "label": _safe_str(label, default="Collateral"),
-        "detail": "",
-        "beginning_collateral": _format_currency(beginning),
-        "ineligibles": _format_currency(ineligibles),
-        "eligible_collateral": _format_currency(eligible),
-        "nolv_pct": _format_pct(
-            _weighted_collateral_pct(rows, lambda row: row.nolv_pct)
-        ),
-        "dilution_rate": _format_pct(
-            _weighted_collateral_pct(rows, lambda row: row.dilution_rate)
-        ),
-        "advanced_rate": _format_pct(
-            _weighted_collateral_pct(rows, lambda row: row.advanced_rate)
-        ),
-        "rate_limit": _format_pct(
-            _weighted_collateral_pct(rows, resolved_rate)
-        ),
-        "utilized_rate": _format_pct(
-            _weighted_collateral_pct(rows, lambda row: row.utilized_rate)
-        ),
-        "pre_reserve_collateral": _format_currency(pre_reserve),
-        "reserves": _format_currency(reserves),
-        "net_collateral": _format_currency(net),
+        "label": label,
+        "detail": detail,
+        "beginning_collateral": _format_currency(values["beginning_collateral"]),
+        "ineligibles": _format_currency(values["ineligibles"]),
+        "eligible_collateral": _format_currency(values["eligible_collateral"]),
+        "nolv_pct": _format_pct(values["nolv_pct"]),
+        "dilution_rate": _format_pct(values["dilution_rate"]),
+        "advanced_rate": _format_pct(values["advanced_rate"]),
+        "rate_limit": _format_pct(values["rate_limit"]),
+        "utilized_rate": _format_pct(values["utilized_rate"]),
+        "pre_reserve_collateral": _format_currency(values["pre_reserve_collateral"]),
+        "reserves": _format_currency(values["reserves"]),
+        "net_collateral": _format_currency(values["net_collateral"]),
     }
 
 
-def _build_collateral_child_payload(row, limit_map=None, detail_override=None):
-    payload = _collateral_row_payload(row, limit_map=limit_map)
-    if detail_override:
-        payload["detail"] = detail_override
-    return payload
-
-
-def _build_collateral_tree(collateral_rows, limit_map=None):
+@timed()
+def _build_collateral_tree(collateral_rows, base):
+    """Main-type nodes with their rows as children; `base` covers `collateral_rows` in order."""
+    labels = [_safe_str(row.main_type, default="Collateral") for row in collateral_rows]
+    totals = base.totals(labels)
     grouped = {}
-    for row in collateral_rows:
-        label = _safe_str(row.main_type, default="Collateral")
-        grouped.setdefault(label, []).append(row)
+    for index, (label, row) in enumerate(zip(labels, collateral_rows)):
+        grouped.setdefault(label, []).append((index, row))
 
     tree = []
-    for label, rows in grouped.items():
+    for label, entries in grouped.items():
         node = {
             "id": slugify(label),
-            "row": _build_collateral_parent_payload(label, rows, limit_map=limit_map),
+            "row": _collateral_values_payload(label, "", totals[label]),
             "children": [],
         }
-        has_details = any((row.sub_type or "").strip() for row in rows)
-        if len(rows) > 1 or has_details:
+        has_details = any((row.sub_type or "").strip() for _index, row in entries)
+        if len(entries) > 1 or has_details:
             children = []
-            for idx, row in enumerate(rows, start=1):
-                payload = _build_collateral_child_payload(
-                    row,
-                    limit_map=limit_map,
-                    detail_override=(row.sub_type or f"Line {idx}"),
-                )
+            for idx, (index, row) in enumerate(entries, start=1):
+                payload = _collateral_row_payload(row, base.row(index))
+                payload["detail"] = row.sub_type or f"Line {idx}"
                 children.append({
                     "id": slugify(f"{label}-{payload['detail']}-{idx}"),
                     "row": payload,
@@ -535,6 +395,14 @@ def _build_collateral_tree(collateral_rows, limit_map=None):
     return tree
 
 
+def _availability(values):
+    """Advance-rate-limited availability of a BorrowingBase total, floored at zero."""
+    available = values["pre_reserve_collateral"] if values else None
+    if available is None:
+        return Decimal("0")
+    return max(available, Decimal("0"))
+
+
 def _risk_direction(score):
     if score is None:
         return "up"
@@ -551,82 +419,13 @@ def _risk_color(score):
     return palette[bucket - 1]
 
 
-def _build_summary_risk_metrics(borrower, ar_row, composite_latest):
-    ar_past_due_pct = (
-        _normalize_pct(ar_row.pct_past_due)
-        if ar_row and ar_row.pct_past_due is not None
-        else Decimal("0")
-    )
-    ar_score = max(
-        Decimal("0"),
-        min(Decimal("5"), Decimal("5") - (ar_past_due_pct / Decimal("20"))),
-    )
-
-    risk_rows = list(
-        RiskSubfactorsRow.objects.filter(borrower=borrower).order_by(
-            "main_category", "sub_risk"
-        )
-    )
-    rows_by_category = defaultdict(list)
-    for row in risk_rows:
-        key = (row.main_category or "").strip().lower()
-        if not key:
-            continue
-        rows_by_category[key].append(row)
-
-    def _metric_rows(label):
-        key = label.lower()
-        if key in rows_by_category:
-            return rows_by_category[key]
-        for stored_key in rows_by_category:
-            if stored_key.startswith(key) or key.startswith(stored_key):
-                return rows_by_category[stored_key]
-        return []
-
-    def _row_label(row):
-        return row.sub_risk or row.high_impact_factor or row.main_category or "Metric"
-
-    def _metric_score(label, fallback_score):
-        rows = _metric_rows(label)
-        score_vals = []
-        seen = set()
-        for row in rows:
-            metric_label = _row_label(row)
-            if metric_label in seen:
-                continue
-            seen.add(metric_label)
-            score_vals.append(_to_decimal(row.risk_score))
-        if score_vals:
-            return sum(score_vals) / Decimal(len(score_vals))
-        return fallback_score
-
-    metric_definitions = [
-        ("Accounts Receivable", max(ar_score, Decimal("3"))),
-        (
-            "Inventory",
-            _to_decimal(getattr(composite_latest, "inventory_risk", None))
-            if composite_latest
-            else Decimal("3"),
-        ),
-        (
-            "Company",
-            _to_decimal(getattr(composite_latest, "company_risk", None))
-            if composite_latest
-            else Decimal("2.5"),
-        ),
-        (
-            "Industry",
-            _to_decimal(getattr(composite_latest, "industry_risk", None))
-            if composite_latest
-            else Decimal("2"),
-        ),
-    ]
-
+@timed()
+def _build_summary_risk_metrics(scorecard):
     risk_metrics = []
-    for label, fallback in metric_definitions:
-        score = _metric_score(label, fallback)
+    for category in (scorecard.category_scores if scorecard else []):
+        score = _to_decimal(category.get("score"))
         risk_metrics.append({
-            "label": label,
+            "label": category.get("label"),
             "detail": f"{score:.1f}",
             "direction": _risk_direction(score),
             "color": _risk_color(score),
@@ -634,59 +433,40 @@ def _build_summary_risk_metrics(borrower, ar_row, composite_latest):
     return risk_metrics
 
 
-@login_required(login_url="login")
-def summary_view(request):
-    company = get_active_company(request)
-    selected_id = request.GET.get("select")
-    if selected_id:
-        selected_borrower = Borrower.objects.filter(pk=selected_id).first()
-        if _user_can_access_borrower(request.user, selected_borrower, company):
-            request.session["selected_borrower_id"] = selected_borrower.id
-            request.session.modified = True
-        return redirect("dashboard")
-
-    borrower = get_preferred_borrower(request)
-    if not borrower:
-        return redirect("borrower_portfolio")
-
-    borrower_summary = _build_borrower_summary(borrower)
-
-    range_options = [
-        {"value": "last_12_months", "label": "12 Months"},
-        {"value": "last_6_months", "label": "6 Months"},
-        {"value": "last_3_months", "label": "3 Months"},
-        {"value": "last_1_month", "label": "1 Month"},
-    ]
-    range_aliases = {
-        "last_12_months": "last_12_months",
-        "last12months": "last_12_months",
-        "last 12 months": "last_12_months",
-        "12 months": "last_12_months",
-        "last_6_months": "last_6_months",
-        "last6months": "last_6_months",
-        "last 6 months": "last_6_months",
-        "6 months": "last_6_months",
-        "last_3_months": "last_3_months",
-        "last3months": "last_3_months",
-        "last 3 months": "last_3_months",
-        "3 months": "last_3_months",
-        "last_1_month": "last_1_month",
-        "last1month": "last_1_month",
-        "last 1 month": "last_1_month",
-        "1 month": "last_1_month",
-    }
-
-    summary_range = request.GET.get("summary_range", "last_12_months")
-    normalized_range = range_aliases.get(str(summary_range).strip().lower(), "last_12_months")
-    summary_division = request.GET.get("summary_division", "all")
-    normalized_division = str(summary_division).strip()
-    if normalized_division.lower() in {"all", "all divisions", "all_divisions"}:
-        normalized_division = "all"
-
+SUMMARY_RANGE_OPTIONS = [
+    {"value": "last_12_months", "label": "12 Months"},
+    {"value": "last_6_months", "label": "6 Months"},
+    {"value": "last_3_months", "label": "3 Months"},
+    {"value": "last_1_month", "label": "1 Month"},
+]
+SUMMARY_RANGE_ALIASES = {
+    "last_12_months": "last_12_months",
+    "last12months": "last_12_months",
+    "last 12 months": "last_12_months",
+    "12 months": "last_12_months",
+    "last_6_months": "last_6_months",
+    "last6months": "last_6_months",
+    "last 6 months": "last_6_months",
+    "6 months": "last_6_months",
+    "last_3_months": "last_3_months",
+    "last3months": "last_3_months",
+    "last 3 months": "last_3_months",
+    "3 months": "last_3_months",
+    "last_1_month": "last_1_month",
+    "last1month": "last_1_month",
+    "last 1 month": "last_1_month",
+    "1 month": "last_1_month",
+}
+
+
+@timed()
+@report_cached()
+def _summary_context(borrower, normalized_range, normalized_division):
+    """Report-dependent part of the summary dashboard, cached per report."""
     range_start, range_end = _range_dates(normalized_range)
 
     division_values = (
-        ARMetricsRow.objects.filter(borrower=borrower)
+        ARMetricsRow.objects.for_borrower(borrower)
         .exclude(division__isnull=True)
         .exclude(division__exact="")
         .values_list("division", flat=True)
@@ -702,43 +482,38 @@ def summary_view(request):
     if normalized_division != "all" and normalized_division not in division_set:
         normalized_division = "all"
 
-    collateral_base_qs = CollateralOverviewRow.objects.filter(borrower=borrower)
+    # Collateral history spans reports (one period each), so it is read up to
+    # the selected report's date rather than from that report alone.
+    report = active_report()
+    collateral_base_qs = CollateralOverviewRow.objects.history_for_borrower(borrower)
     collateral_range_qs = _apply_date_filter(
-        collateral_base_qs, "created_at__date", range_start, range_end
-    )
-    latest_collateral_time = collateral_range_qs.aggregate(time=Max("created_at"))["time"]
-    latest_collateral_date = latest_collateral_time.date() if latest_collateral_time else None
-    collateral_rows = (
-        list(collateral_range_qs.filter(created_at__date=latest_collateral_date))
-        if latest_collateral_date
-        else []
+        collateral_base_qs, "as_of_date", range_start, range_end
     )
-    limit_rows = list(CollateralLimitsRow.objects.filter(borrower=borrower))
-    limit_map = _build_limit_map(limit_rows)
-    net_total = sum((_to_decimal(row.net_collateral) for row in collateral_rows), Decimal("0"))
-    eligible_total = sum((_to_decimal(row.eligible_collateral) for row in collateral_rows), Decimal("0"))
-    ineligibles_total = sum((_to_decimal(row.ineligibles) for row in collateral_rows), Decimal("0"))
-
-    ar_qs = ARMetricsRow.objects.filter(borrower=borrower)
+    latest_collateral_date = collateral_range_qs.aggregate(date=Max("as_of_date"))["date"]
+    if latest_collateral_date and report is not None and latest_collateral_date == report.report_date:
+        collateral_rows = list(collateral_range_qs.filter(report=report))
+    elif latest_collateral_date:
+        collateral_rows = list(collateral_range_qs.filter(as_of_date=latest_collateral_date))
+    else:
+        collateral_rows = []
+    limit_rows = list(CollateralLimitsRow.objects.for_borrower(borrower))
+    base = BorrowingBase.from_instances(collateral_rows, limit_rows)
+    current = base.total() or {}
+    net_total = _to_decimal(current.get("net_collateral"))
+    ineligibles_total = _to_decimal(current.get("ineligibles"))
+
+    ar_qs = ARMetricsRow.objects.for_borrower(borrower)
     if normalized_division != "all":
         ar_qs = ar_qs.filter(division__iexact=normalized_division)
     ar_qs = _apply_date_filter(ar_qs, "as_of_date", range_start, range_end)
     ar_recent = list(ar_qs.order_by("-as_of_date", "-created_at", "-id")[:2])
     ar_row = ar_recent[0] if ar_recent else None
     ar_prev_row = ar_recent[1] if len(ar_recent) > 1 else None
-    risk_ar_row = (
-        ARMetricsRow.objects.filter(borrower=borrower)
-        .order_by("-as_of_date", "-created_at")
-        .first()
-    )
 
     collateral_data = [
-        _collateral_row_payload(row, limit_map=limit_map) for row in collateral_rows
+        _collateral_row_payload(row, base.row(index)) for index, row in enumerate(collateral_rows)
     ]
-
-    available_total = eligible_total - ineligibles_total
-    if available_total < Decimal("0"):
-        available_total = Decimal("0")
+    available_total = _availability(current)
 
     insights = {
         "net": {
@@ -756,66 +531,41 @@ def summary_view(request):
     }
 
     previous_collateral_rows = []
-    if latest_collateral_time:
-        previous_collateral_time = (
-            collateral_range_qs.filter(created_at__lt=latest_collateral_time)
-            .order_by("-created_at")
-            .values_list("created_at", flat=True)
-            .first()
+    if latest_collateral_date:
+        previous_collateral_date = (
+            collateral_range_qs.filter(as_of_date__lt=latest_collateral_date)
+            .aggregate(date=Max("as_of_date"))["date"]
         )
-        if previous_collateral_time:
+        if previous_collateral_date:
             previous_collateral_rows = list(
-                collateral_range_qs.filter(created_at=previous_collateral_time)
+                collateral_range_qs.filter(as_of_date=previous_collateral_date)
             )
 
-    previous_net_total = sum(
-        (_to_decimal(row.net_collateral) for row in previous_collateral_rows),
-        Decimal("0"),
-    )
-    previous_eligible_total = sum(
-        (_to_decimal(row.eligible_collateral) for row in previous_collateral_rows),
-        Decimal("0"),
-    )
-    previous_ineligibles_total = sum(
-        (_to_decimal(row.ineligibles) for row in previous_collateral_rows),
-        Decimal("0"),
-    )
-    previous_available_total = previous_eligible_total - previous_ineligibles_total
-    if previous_available_total < Decimal("0"):
-        previous_available_total = Decimal("0")
+    previous = BorrowingBase.from_instances(previous_collateral_rows, limit_rows).total()
+    previous_net_total = _to_decimal(previous.get("net_collateral")) if previous else Decimal("0")
+    previous_available_total = _availability(previous)
 
     chart_points = 5
     collateral_history = list(
         _apply_date_filter(
-            CollateralOverviewRow.objects.filter(borrower=borrower)
-            .exclude(created_at__isnull=True),
-            "created_at__date",
+            collateral_base_qs.exclude(as_of_date__isnull=True),
+            "as_of_date",
             range_start,
             range_end,
         )
-        .order_by("-created_at")[:200]
+        .order_by("-as_of_date", "-id")[:200]
     )
     collateral_labels = []
     net_series = []
     availability_series = []
     if collateral_history:
-        buckets = {}
-        for row in collateral_history:
-            date_key = row.created_at.date()
-            bucket = buckets.setdefault(
-                date_key,
-                {"net": Decimal("0"), "eligible": Decimal("0"), "ineligible": Decimal("0")},
-            )
-            bucket["net"] += _to_decimal(row.net_collateral)
-            bucket["eligible"] += _to_decimal(row.eligible_collateral)
-            bucket["ineligible"] += _to_decimal(row.ineligibles)
+        buckets = BorrowingBase.from_instances(collateral_history, limit_rows).totals(
+            row.as_of_date for row in collateral_history
+        )
         for date_key in sorted(buckets.keys())[-chart_points:]:
             bucket = buckets[date_key]
-            net_series.append(bucket["net"])
-            available = bucket["eligible"] - bucket["ineligible"]
-            if available < Decimal("0"):
-                available = Decimal("0")
-            availability_series.append(available)
+            net_series.append(_to_decimal(bucket["net_collateral"]))
+            availability_series.append(_availability(bucket))
             collateral_labels.append(date_key.strftime("%m/%d"))
 
     ar_rows = list(
@@ -879,60 +629,113 @@ def summary_view(request):
         series_label="Availability",
     )
 
-    inventory_rows = [
-        row for row in collateral_rows if row.main_type and "inventory" in row.main_type.lower()
-    ]
-    inventory_eligible = sum((_to_decimal(row.eligible_collateral) for row in inventory_rows), Decimal("0"))
-    inventory_ineligible = sum((_to_decimal(row.ineligibles) for row in inventory_rows), Decimal("0"))
+    inventory = base.totals(
+        bool(row.main_type and "inventory" in row.main_type.lower()) for row in collateral_rows
+    ).get(True, {})
+    inventory_eligible = _to_decimal(inventory.get("eligible_collateral"))
+    inventory_ineligible = _to_decimal(inventory.get("ineligibles"))
     inventory_total_base = inventory_eligible + inventory_ineligible
     inventory_ratio = (inventory_ineligible / inventory_total_base) if inventory_total_base else None
 
-    composite_latest = (
-        CompositeIndexRow.objects.filter(borrower=borrower)
-        .order_by("-date", "-created_at", "-id")
-        .first()
-    )
-    risk_metrics = _build_summary_risk_metrics(borrower, risk_ar_row, composite_latest)
+    scorecard = get_risk_scorecard(borrower)
+    risk_metrics = _build_summary_risk_metrics(scorecard)
 
     inventory_pct_text = _format_pct(inventory_ratio) if inventory_ratio is not None else "—"
     ar_pct_text = (
-        _format_pct(risk_ar_row.pct_past_due)
-        if risk_ar_row and risk_ar_row.pct_past_due is not None
+        _format_pct(scorecard.ar_pct_past_due)
+        if scorecard and scorecard.ar_pct_past_due is not None
         else "—"
     )
-    risk_profile_score = _to_decimal(getattr(composite_latest, "overall_score", None))
+    risk_profile_score = _to_decimal(getattr(scorecard, "overall_score", None))
     risk_profile_detail = f"AR past due {ar_pct_text} · Inventory ineligible {inventory_pct_text}"
 
     risk_profile_position = float(
         min(max(risk_profile_score / Decimal("5"), Decimal("0")), Decimal("1")) * 100
     )
 
-    context = {
-        "borrower_summary": borrower_summary,
+    return {
         "collateral_rows": collateral_data,
-        "collateral_tree": _build_collateral_tree(collateral_rows, limit_map=limit_map),
+        "collateral_tree": _build_collateral_tree(collateral_rows, base),
         "insights": insights,
         "risk_metrics": risk_metrics,
-        "user": request.user,
-        "active_tab": "summary",
         "net_chart": net_chart,
         "outstanding_chart": outstanding_chart,
         "availability_chart": availability_chart,
         "risk_profile_value": f"{risk_profile_score:.1f}",
         "risk_profile_detail": risk_profile_detail,
         "risk_profile_position": f"{risk_profile_position:.0f}",
-        "summary_range_options": range_options,
+        "summary_range_options": SUMMARY_RANGE_OPTIONS,
         "summary_selected_range": normalized_range,
         "summary_division_options": division_options,
         "summary_selected_division": normalized_division,
     }
+
+
+@login_required(login_url="login")
+@read_replica
+@report_scoped
+def summary_view(request):
+    company = get_active_company(request)
+    selected_id = request.GET.get("select")
+    if selected_id:
+        selected_borrower = Borrower.objects.filter(pk=selected_id).first()
+        if _user_can_access_borrower(request.user, selected_borrower, company):
+            request.session["selected_borrower_id"] = selected_borrower.id
+            request.session.modified = True
+        return redirect("dashboard")
+
+    borrower = get_preferred_borrower(request)
+    if not borrower:
+        return redirect("borrower_portfolio")
+
+    summary_range = request.GET.get("summary_range", "last_12_months")
+    normalized_range = SUMMARY_RANGE_ALIASES.get(str(summary_range).strip().lower(), "last_12_months")
+    summary_division = request.GET.get("summary_division", "all")
+    normalized_division = str(summary_division).strip()
+    if normalized_division.lower() in {"all", "all divisions", "all_divisions"}:
+        normalized_division = "all"
+
+    borrower_summary, summary_context = gather(
+        partial(_build_borrower_summary, borrower),
+        partial(_summary_context, borrower, normalized_range, normalized_division),
+    )
+    context = {
+        "borrower_summary": borrower_summary,
+        "user": request.user,
+        "active_tab": "summary",
+        **summary_context,
+    }
     return render(request, "dashboard/summary.html", context)
 
 
+def _portfolio_collateral(borrowers):
+    """
+    Collateral and limit rows of each borrower's latest report, in two
+    queries for the whole page. Borrowers without reports fall back to their
+    latest as-of date.
+    """
+    report_ids = [borrower.latest_report_id for borrower in borrowers if borrower.latest_report_id]
+    collateral_rows = list(CollateralOverviewRow.objects.filter(report_id__in=report_ids).order_by("borrower_id", "id"))
+    limit_rows = list(CollateralLimitsRow.objects.filter(report_id__in=report_ids).order_by("borrower_id", "id"))
+    for borrower in borrowers:
+        if borrower.latest_report_id:
+            continue
+        latest_collateral_date = (
+            CollateralOverviewRow.objects.filter(borrower=borrower)
+            .aggregate(date=Max("as_of_date"))["date"]
+        )
+        if latest_collateral_date:
+            collateral_rows.extend(
+                CollateralOverviewRow.objects.filter(borrower=borrower, as_of_date=latest_collateral_date).order_by("id")
+            )
+            limit_rows.extend(CollateralLimitsRow.objects.filter(borrower=borrower).order_by("id"))
+    return collateral_rows, limit_rows
+
+
 @login_required(login_url="login")
+@read_replica
 def borrower_portfolio_view(request):
     company = get_active_company(request)
-    borrower_profile = getattr(request.user, "borrower_profile", None)
     selected_id = request.GET.get("select")
     if selected_id:
         selected_borrower = Borrower.objects.filter(pk=selected_id).first()
@@ -942,11 +745,7 @@ def borrower_portfolio_view(request):
         return redirect("dashboard")
 
     search_term = request.GET.get("q", "").strip()
-    borrowers_qs = Borrower.objects.select_related("company").order_by("id")
-    if company:
-        borrowers_qs = borrowers_qs.filter(company=company)
-    elif borrower_profile and borrower_profile.borrower_id:
-        borrowers_qs = borrowers_qs.filter(pk=borrower_profile.borrower_id)
+    borrowers_qs = get_accessible_borrowers(request, company).select_related("company").order_by("id")
     if search_term:
         borrowers_qs = borrowers_qs.filter(
             Q(company__company__icontains=search_term)
@@ -955,34 +754,34 @@ def borrower_portfolio_view(request):
         )
 
     borrower_rows = []
-    for borrower in borrowers_qs:
-        latest_collateral_time = (
-            CollateralOverviewRow.objects.filter(borrower=borrower)
-            .aggregate(time=Max("created_at"))["time"]
-        )
-        latest_collateral_date = latest_collateral_time.date() if latest_collateral_time else None
-        collateral_rows = (
-            list(
-                CollateralOverviewRow.objects.filter(
-                    borrower=borrower,
-                    created_at__date=latest_collateral_date,
-                )
+    borrowers = list(
+        borrowers_qs.annotate(
+            latest_report_id=Subquery(
+                BorrowerReport.objects.filter(borrower=OuterRef("pk"))
+                .order_by("-report_date", "-created_at", "-id")
+                .values("id")[:1]
             )
-            if latest_collateral_date
-            else []
         )
-        net_total = sum((_to_decimal(row.net_collateral) for row in collateral_rows), Decimal("0"))
-        eligible_total = sum((_to_decimal(row.eligible_collateral) for row in collateral_rows), Decimal("0"))
-        ineligibles_total = sum((_to_decimal(row.ineligibles) for row in collateral_rows), Decimal("0"))
-        available_total = eligible_total - ineligibles_total
-        if available_total < Decimal("0"):
-            available_total = Decimal("0")
-        ar_row = (
-            ARMetricsRow.objects.filter(borrower=borrower)
-            .order_by("-as_of_date", "-created_at")
-            .first()
+    )
+    collateral_rows, limit_rows = _portfolio_collateral(borrowers)
+    rows_by_borrower = {}
+    for row in collateral_rows:
+        rows_by_borrower.setdefault(row.borrower_id, []).append(row)
+    borrower_totals = BorrowingBase.from_instances(collateral_rows, limit_rows).borrower_totals()
+    for borrower in borrowers:
+        latest_collateral_time = max(
+            (row.created_at for row in rows_by_borrower.get(borrower.pk, [])),
+            default=None,
         )
-        availability_pct = (available_total / net_total) if net_total else None
+        totals = borrower_totals.get(borrower.pk)
+        net_total = _to_decimal(totals["net_collateral"]) if totals else Decimal("0")
+        eligible_total = _to_decimal(totals["eligible_collateral"]) if totals else Decimal("0")
+        available_total = _availability(totals)
+        ar_qs = ARMetricsRow.objects.filter(borrower=borrower)
+        if borrower.latest_report_id:
+            ar_qs = ar_qs.filter(report_id=borrower.latest_report_id)
+        ar_row = ar_qs.order_by("-as_of_date", "-created_at").first()
+        availability_pct = (available_total / eligible_total) if eligible_total > 0 else None
         last_updated_dt = (
             latest_collateral_time
             or (ar_row.as_of_date if ar_row and getattr(ar_row, "as_of_date", None) else None)
@@ -1017,5 +816,9 @@ def borrower_portfolio_view(request):
         "active_tab": "portfolio",
         "company_summary": company_summary,
         "is_company_context": bool(company),
+        "unread_alerts": Alert.objects.filter(
+            is_read=False,
+            borrower__in=get_accessible_borrowers(request, company),
+        ).count(),
     }
     return render(request, "dashboard/borrower_portfolio.html", context)
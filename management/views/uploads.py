@@ -0,0 +1,63 @@
+from django.contrib.auth.decorators import login_required
+from django.http import Http404, HttpResponseForbidden, JsonResponse
+from django.shortcuts import get_object_or_404
+from django.views.decorators.http import require_http_methods, require_POST
+
+from management.models import Upload
+from management.uploads import OffsetMismatch, UploadError, start_upload, upload_payload, write_chunk
+
+OFFSET_HEADER = "Upload-Offset"
+
+
+@login_required(login_url="login")
+@require_POST
+def upload_create(request):
+    """
+    Start a workbook upload: POST filename, size, sha256 (hex) and an
+    optional report_date. Answers 201 with the upload; send the bytes to
+    upload_detail.
+    """
+    if not request.user.is_staff:
+        return HttpResponseForbidden("Staff only")
+    try:
+        upload = start_upload(
+            request.POST.get("filename"),
+            request.POST.get("size"),
+            request.POST.get("sha256"),
+            user=request.user,
+            report_date=request.POST.get("report_date"),
+        )
+    except UploadError as exc:
+        return JsonResponse({"error": str(exc)}, status=400)
+    return JsonResponse(upload_payload(upload), status=201)
+
+
+@login_required(login_url="login")
+@require_http_methods(["GET", "PUT"])
+def upload_detail(request, upload_id):
+    """
+    GET the upload's state; `offset` is where to resume. PUT a chunk as the
+    raw body with an Upload-Offset header naming where it starts; the body
+    is streamed to disk, never read whole. The response after the last
+    chunk carries the queued import job.
+    """
+    if not request.user.is_staff:
+        return HttpResponseForbidden("Staff only")
+    upload = get_object_or_404(Upload.objects.select_related("job"), pk=upload_id)
+    if upload.created_by_id != request.user.pk and not request.user.is_superuser:
+        raise Http404("Upload not found")
+    if request.method == "GET":
+        return JsonResponse(upload_payload(upload))
+
+    try:
+        offset = int(request.headers.get(OFFSET_HEADER, ""))
+        length = int(request.headers.get("Content-Length") or 0)
+    except ValueError:
+        return JsonResponse({"error": f"{OFFSET_HEADER} must be a byte offset."}, status=400)
+    try:
+        write_chunk(upload, offset, request, length)
+    except OffsetMismatch as exc:
+        return JsonResponse({"error": str(exc), "offset": exc.offset}, status=409)
+    except UploadError as exc:
+        return JsonResponse({"error": str(exc), **upload_payload(upload)}, status=400)
+    return JsonResponse(upload_payload(upload))
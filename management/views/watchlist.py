@@ -0,0 +1,161 @@
+from decimal import Decimal, InvalidOperation
+
+from django.contrib.auth.decorators import login_required
+from django.db.models import DecimalField, ExpressionWrapper, F, OuterRef, Q, Subquery, Window
+from django.db.models.functions import Lag
+from django.db.models.lookups import IsNull
+from django.shortcuts import render
+
+from management.models import ARMetricsRow, BorrowerReport, CompositeIndexRow, ForecastRow
+from management.views.summary import (
+    _format_pct,
+    _safe_str,
+    get_accessible_borrowers,
+    get_active_company,
+)
+
+WATCHLIST_PAGE_SIZE = 50
+
+SCORE_FIELD = DecimalField(max_digits=20, decimal_places=6)
+
+
+def _watchlist_queryset(borrowers_qs):
+    """
+    One statement for the whole lender book: each borrower is joined to its
+    latest composite index row (with the prior score pulled in through LAG),
+    latest AR metrics row and latest forecast row via correlated subqueries.
+    Every report re-imports the history sheets, so each subquery reads only
+    the rows of the borrower's latest report (rows tied to no report, for
+    borrowers without any) and hits the (borrower, report) indexes; the
+    latest and prior scores then always come from the same workbook.
+    """
+    latest_report = (
+        BorrowerReport.objects.filter(borrower=OuterRef("pk"))
+        .order_by("-report_date", "-created_at", "-id")
+        .values("id")[:1]
+    )
+    in_latest_report = Q(report=OuterRef("latest_report_id")) | Q(
+        IsNull(OuterRef("latest_report_id"), True),
+        report__isnull=True,
+    )
+    composite_history = (
+        CompositeIndexRow.objects.filter(in_latest_report, borrower=OuterRef("pk"))
+        .annotate(
+            prior_score=Window(
+                Lag("overall_score"),
+                partition_by=[F("borrower")],
+                order_by=[F("date").asc(), F("id").asc()],
+            )
+        )
+        .order_by("-date", "-id")
+    )
+    latest_ar = ARMetricsRow.objects.filter(in_latest_report, borrower=OuterRef("pk")).order_by(
+        "-as_of_date", "-created_at", "-id"
+    )
+    latest_forecast = ForecastRow.objects.filter(
+        in_latest_report,
+        borrower=OuterRef("pk"),
+        available_collateral__isnull=False,
+    ).order_by("-as_of_date", "-period", "-id")
+
+    return (
+        borrowers_qs.select_related("company")
+        .annotate(latest_report_id=Subquery(latest_report))
+        .annotate(
+            overall_score=Subquery(composite_history.values("overall_score")[:1], output_field=SCORE_FIELD),
+            prior_score=Subquery(composite_history.values("prior_score")[:1], output_field=SCORE_FIELD),
+            pct_past_due=Subquery(latest_ar.values("pct_past_due")[:1], output_field=SCORE_FIELD),
+            loan_balance=Subquery(latest_forecast.values("loan_balance")[:1], output_field=SCORE_FIELD),
+            available_collateral=Subquery(
+                latest_forecast.values("available_collateral")[:1],
+                output_field=SCORE_FIELD,
+            ),
+        )
+        .annotate(
+            score_trend=ExpressionWrapper(F("overall_score") - F("prior_score"), output_field=SCORE_FIELD),
+        )
+        .order_by(F("overall_score").desc(nulls_last=True), "id")
+    )
+
+
+def _encode_cursor(borrower, position):
+    score = "" if borrower.overall_score is None else str(borrower.overall_score)
+    return f"{score}~{borrower.pk}~{position}"
+
+
+def _decode_cursor(value):
+    try:
+        score, pk, position = value.split("~")
+        return (Decimal(score) if score else None), int(pk), int(position)
+    except (AttributeError, ValueError, InvalidOperation):
+        return None
+
+
+def _apply_cursor(qs, cursor):
+    """Keyset filter matching ORDER BY overall_score DESC NULLS LAST, id."""
+    score, pk, _position = cursor
+    if score is None:
+        return qs.filter(overall_score__isnull=True, pk__gt=pk)
+    return qs.filter(
+        Q(overall_score__lt=score)
+        | Q(overall_score=score, pk__gt=pk)
+        | Q(overall_score__isnull=True)
+    )
+
+
+def _utilization(borrower):
+    if borrower.loan_balance is None or not borrower.available_collateral:
+        return None
+    return borrower.loan_balance / borrower.available_collateral
+
+
+def _format_score(value):
+    if value is None:
+        return "—"
+    return f"{value:.1f}"
+
+
+def _trend_payload(value):
+    if value is None or value == 0:
+        return {"display": "—", "class": ""}
+    return {
+        "display": f"{'▲' if value > 0 else '▼'} {abs(value):.1f}",
+        "class": "up" if value > 0 else "down",
+    }
+
+
+@login_required(login_url="login")
+def watchlist_view(request):
+    company = get_active_company(request)
+    qs = _watchlist_queryset(get_accessible_borrowers(request, company))
+
+    cursor = _decode_cursor(request.GET.get("after"))
+    offset = 0
+    if cursor:
+        qs = _apply_cursor(qs, cursor)
+        offset = cursor[2]
+
+    page = list(qs[: WATCHLIST_PAGE_SIZE + 1])
+    has_next = len(page) > WATCHLIST_PAGE_SIZE
+    page = page[:WATCHLIST_PAGE_SIZE]
+
+    rows = []
+    for idx, borrower in enumerate(page, start=offset + 1):
+        rows.append({
+            "id": borrower.pk,
+            "rank": idx,
+            "borrower_label": _safe_str(borrower.primary_contact),
+            "company_name": _safe_str(borrower.company.company if borrower.company else None),
+            "overall_score": _format_score(borrower.overall_score),
+            "trend": _trend_payload(borrower.score_trend),
+            "pct_past_due": _format_pct(borrower.pct_past_due),
+            "utilization": _format_pct(_utilization(borrower)),
+        })
+
+    context = {
+        "active_tab": "watchlist",
+        "watchlist_rows": rows,
+        "next_cursor": _encode_cursor(page[-1], offset + len(page)) if has_next else None,
+        "is_first_page": cursor is None,
+    }
+    return render(request, "dashboard/watchlist.html", context)